@@ -38,6 +38,7 @@ from tsf.io.sideload import JsonSideLoad
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 from pl_parking.common_ft_helper import CemSignals, MfCustomTestcaseReport, MfCustomTeststepReport, rep
+from pl_parking.PLP.CEM.cem_association import FP, TP, CemAssociationEngine
 from pl_parking.PLP.CEM.constants import AssociationConstants
 from pl_parking.PLP.CEM.ft_pcl_helper import FtPclHelper
 from pl_parking.PLP.CEM.inputs.input_CemPclReader import PclDelimiterReader
@@ -92,28 +93,22 @@ class TestStepFtPCLFalsePositive(TestStep):
         gt_data = self.side_load["JsonGt"]
         park_marker_gt = FtPclHelper.get_pcl_from_json_gt(gt_data)
         pmd_lines_gt = FtPclHelper.get_pmdlines_from_json_gt(gt_data)
-        number_associated_pcl: typing.List[typing.Tuple[int, int]] = []
-        pcl_false_positive_list: typing.List[float] = []
-
-        for _, pcl_timeframe in enumerate(pcl_data):
-            timeframe_nbr_associated_lines = 0
+        # associate the whole recording once, the rates are aggregated from the association table
+        pcl_frames = []
+        for pcl_timeframe in pcl_data:
+            gt_with_closest_timestamp = []
             if len(pcl_timeframe.pcl_delimiter_array) > 0:
                 target_timestamp = min(park_marker_gt.keys(), key=lambda k: abs(float(k) - pcl_timeframe.timestamp))
                 gt_with_closest_timestamp = park_marker_gt.get(target_timestamp)
-
-                false_positive = FtPclHelper.calculate_cem_pcl_false_positive_iso(
-                    pcl_timeframe.pcl_delimiter_array,
-                    gt_with_closest_timestamp,
-                    AssociationConstants.PCL_ASSOCIATION_RADIUS,
-                )
-
-                timeframe_nbr_associated_lines = len(pcl_timeframe.pcl_delimiter_array) - false_positive * len(
-                    pcl_timeframe.pcl_delimiter_array
-                )
-
-                pcl_false_positive_list.append(false_positive)
-
-            number_associated_pcl.append((pcl_timeframe.timestamp, timeframe_nbr_associated_lines))
+            pcl_frames.append((pcl_timeframe.timestamp, pcl_timeframe.pcl_delimiter_array, gt_with_closest_timestamp))
+
+        pcl_association = FtPclHelper.associate_pcl_recording(pcl_frames)
+        pcl_counts = CemAssociationEngine.frame_counts(pcl_association).set_index("frame")
+        pcl_counts_with_detections = pcl_counts[pcl_counts[TP] + pcl_counts[FP] > 0]
+        pcl_false_positive_list: typing.List[float] = pcl_counts_with_detections["false_positive_rate"].tolist()
+        number_associated_pcl: typing.List[typing.Tuple[int, int]] = [
+            (timestamp, int(pcl_counts[TP].get(frame, 0))) for frame, (timestamp, _, _) in enumerate(pcl_frames)
+        ]
 
         pmd_false_positive_list: typing.List[float] = []
         pmd_false_positive_per_camera: typing.Dict[PMDCamera, typing.List[float]] = dict()
@@ -33,6 +33,7 @@ import plotly.graph_objects as go
 
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
+from pl_parking.common_cache import file_fingerprint
 from pl_parking.common_ft_helper import CemSignals, MfCustomTestcaseReport, MfCustomTeststepReport, rep
 from pl_parking.PLP.CEM.constants import AssociationConstants, GroundTruthCem
 from pl_parking.PLP.CEM.ft_slot_helper import FtSlotHelper
@@ -84,7 +85,7 @@ class TestStepFtScenarioConfidence(TestStep):
 
         # Load all signals information
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + f_path for f_path in GroundTruthCem.kml_files]
         )
@@ -4,6 +4,8 @@ import logging
 
 from tsf.io.signals import SignalDefinition
 
+from pl_parking.common_array_signals import ArraySignalGroup
+
 _log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
@@ -91,106 +93,61 @@ class TPFSignals(SignalDefinition):
             "dynamicEnvironment.sSigHeader.eSigStatus",
         ]
         # Detections
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_0_POSITION_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].position.x",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].position.x",
-            "dynamicEnvironment.objects._%_.shape.points._0_.position.x",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_1_POSITION_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].position.x",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].position.x",
-            "dynamicEnvironment.objects._%_.shape.points._1_.position.x",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_2_POSITION_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].position.x",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].position.x",
-            "dynamicEnvironment.objects._%_.shape.points._2_.position.x",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_3_POSITION_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].position.x",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].position.x",
-            "dynamicEnvironment.objects._%_.shape.points._3_.position.x",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_0_POSITION_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].position.y",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].position.y",
-            "dynamicEnvironment.objects._%_.shape.points._0_.position.y",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_1_POSITION_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].position.y",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].position.y",
-            "dynamicEnvironment.objects._%_.shape.points._1_.position.y",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_2_POSITION_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].position.y",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].position.y",
-            "dynamicEnvironment.objects._%_.shape.points._2_.position.y",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_3_POSITION_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].position.y",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].position.y",
-            "dynamicEnvironment.objects._%_.shape.points._3_.position.y",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_0_VARIANCE_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].varianceX",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].varianceX",
-            "dynamicEnvironment.objects._%_.shape.points._0_.varianceX",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_1_VARIANCE_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].varianceX",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].varianceX",
-            "dynamicEnvironment.objects._%_.shape.points._1_.varianceX",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_2_VARIANCE_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].varianceX",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].varianceX",
-            "dynamicEnvironment.objects._%_.shape.points._2_.varianceX",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_3_VARIANCE_X] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].varianceX",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].varianceX",
-            "dynamicEnvironment.objects._%_.shape.points._3_.varianceX",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_0_VARIANCE_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].varianceY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].varianceY",
-            "dynamicEnvironment.objects._%_.shape.points._0_.varianceY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_1_VARIANCE_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].varianceY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].varianceY",
-            "dynamicEnvironment.objects._%_.shape.points._1_.varianceY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_2_VARIANCE_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].varianceY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].varianceY",
-            "dynamicEnvironment.objects._%_.shape.points._2_.varianceY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_3_VARIANCE_Y] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].varianceY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].varianceY",
-            "dynamicEnvironment.objects._%_.shape.points._3_.varianceY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_0_COVARIANCE_XY] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].covarianceXY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[0].covarianceXY",
-            "dynamicEnvironment.objects._%_.shape.points._0_.covarianceXY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_1_COVARIANCE_XY] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].covarianceXY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[1].covarianceXY",
-            "dynamicEnvironment.objects._%_.shape.points._1_.covarianceXY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_2_COVARIANCE_XY] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].covarianceXY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[2].covarianceXY",
-            "dynamicEnvironment.objects._%_.shape.points._2_.covarianceXY",
-        ]
-        signal_dict[self.Columns.OBJECTS_SHAPE_POINTS_3_COVARIANCE_XY] = [
-            "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].covarianceXY",
-            "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[3].covarianceXY",
-            "dynamicEnvironment.objects._%_.shape.points._3_.covarianceXY",
-        ]
+        signal_dict.update(
+            ArraySignalGroup(
+                "objects.shape.points[{i}].position.x",
+                [
+                    "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].position.x",
+                    "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].position.x",
+                    "dynamicEnvironment.objects._%_.shape.points._{i}_.position.x",
+                ],
+                4,
+            ).properties()
+        )
+        signal_dict.update(
+            ArraySignalGroup(
+                "objects.shape.points[{i}].position.y",
+                [
+                    "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].position.y",
+                    "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].position.y",
+                    "dynamicEnvironment.objects._%_.shape.points._{i}_.position.y",
+                ],
+                4,
+            ).properties()
+        )
+        signal_dict.update(
+            ArraySignalGroup(
+                "objects.shape.points[{i}].varianceX",
+                [
+                    "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].varianceX",
+                    "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].varianceX",
+                    "dynamicEnvironment.objects._%_.shape.points._{i}_.varianceX",
+                ],
+                4,
+            ).properties()
+        )
+        signal_dict.update(
+            ArraySignalGroup(
+                "objects.shape.points[{i}].varianceY",
+                [
+                    "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].varianceY",
+                    "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].varianceY",
+                    "dynamicEnvironment.objects._%_.shape.points._{i}_.varianceY",
+                ],
+                4,
+            ).properties()
+        )
+        signal_dict.update(
+            ArraySignalGroup(
+                "objects.shape.points[{i}].covarianceXY",
+                [
+                    "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].covarianceXY",
+                    "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.points[{i}].covarianceXY",
+                    "dynamicEnvironment.objects._%_.shape.points._{i}_.covarianceXY",
+                ],
+                4,
+            ).properties()
+        )
         signal_dict[self.Columns.OBJECTS_SHAPE_REFERENCEPOINT_X] = [
             "MTA_ADC5.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.referencePoint.x",
             "SIM VFB.CEM200_TPF2_DATA.m_tpObjectList.objects[%].shapePoints.referencePoint.x",
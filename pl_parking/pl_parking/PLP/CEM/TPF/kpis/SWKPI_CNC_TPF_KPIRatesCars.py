@@ -6,7 +6,6 @@ import os
 import sys
 
 # from pathlib import Path
-import numpy as np
 import pandas as pd
 
 # import tsf.io.sideload as side_load
@@ -114,17 +113,10 @@ class TestStepKPIRates(TestStep):
         pred_df = utils.convert_reader_all_frames(tpf_reader)
         # Filter cars
         pred_df = pred_df[(pred_df["numObj"] == 0) | (pred_df["class"] == 1)]  # Class ID for CAR is 1
-        unique_ts = np.unique(pred_df["ts"])
 
-        kpi_list = []
+        kpi_df = pd.DataFrame([])
         if number_of_unavailable_signals == 0:
-            for ts in unique_ts:
-                this_pred_df = pred_df[pred_df["ts"] == ts]
-                this_gt_df = gt_df[gt_df["ts"] == ts]
-
-                kpi_dict = utils.compute_frame_kpi(gt_df=this_gt_df, pred_df=this_pred_df, ts=ts)
-                kpi_list.append(kpi_dict)
-        kpi_df = pd.DataFrame(kpi_list)
+            kpi_df = utils.compute_frame_kpis(gt_df=gt_df, pred_df=pred_df)
 
         # Compute the average value of the KPIs
         # 1. Compute the KPIs for each frame and then compute the average from that values
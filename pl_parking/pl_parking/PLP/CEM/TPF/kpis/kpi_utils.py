@@ -5,6 +5,7 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import shapely
 from plotly.subplots import make_subplots
 from scipy.optimize import linear_sum_assignment
 from shapely import Polygon, intersection
@@ -19,55 +20,97 @@ tpr_cars = 70  # [%]
 position_accuracy_th = 5  # [m]
 
 
-def associate_based_on_distance(pred_df, gt_df, threshold=8):
+def box_corners(df: pd.DataFrame) -> np.ndarray:
+    """Extract the 4 box corners of every row as an array of shape (N, 4, 2)."""
+    return np.stack(
+        [df[[f"x{i}" for i in range(4)]].to_numpy(dtype=float), df[[f"y{i}" for i in range(4)]].to_numpy(dtype=float)],
+        axis=-1,
+    )
+
+
+def associate_boxes(gt_boxes: np.ndarray, pred_boxes: np.ndarray, threshold=8):
     """
-    Associate the GT object with the PRED object using the Hungarian Algorithm.
-    Will compute the distance between the centroids of the bounding boxes and store them in a distance matrix.
-    Will use the Hungarian Algorithm to get the best association.
-    Will output a pandas dataframe with (GT index, PRED index, distance between GT and PRED).
+    Associate GT boxes with PRED boxes using the Hungarian Algorithm on the distance between box centers.
+
+    :param gt_boxes: GT boxes, shape (G, 4, 2).
+    :param pred_boxes: PRED boxes, shape (P, 4, 2).
+    :param threshold: Maximal center distance of an association.
+    :return: Tuple (gt positions, pred positions, distances) of the associated pairs.
     """
-    gt_start_index = gt_df.index.values[0]
-    pred_start_index = pred_df.index.values[0]
+    if len(gt_boxes) == 0 or len(pred_boxes) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int), np.array([], dtype=float)
 
-    pred_boxes = [[[row[f"x{i}"], row[f"y{i}"]] for i in range(4)] for idx, row in pred_df.iterrows()]
-    gt_boxes = [[[row[f"x{i}"], row[f"y{i}"]] for i in range(4)] for idx, row in gt_df.iterrows()]
-    pred_centers = [[np.mean([pts[0] for pts in box]), np.mean([pts[1] for pts in box])] for box in pred_boxes]
-    gt_centers = [[np.mean([pts[0] for pts in box]), np.mean([pts[1] for pts in box])] for box in gt_boxes]
-    real_objects = np.array(gt_centers)
-    detected_objects = np.array(pred_centers)
+    real_objects = gt_boxes.mean(axis=1)
+    detected_objects = pred_boxes.mean(axis=1)
 
     # Step 1: Calculate pairwise distance matrix between real and detected objects
     distance_matrix = np.linalg.norm(real_objects[:, np.newaxis] - detected_objects, axis=2)
 
-    # Step 2: Apply the distance threshold by masking out distances over the threshold
-    threshold_matrix = distance_matrix.copy()
-    threshold_matrix[threshold_matrix > threshold] = np.inf
-
-    # Step 3: Handle infeasibility by replacing np.inf with a large value
-    large_value = 1e6  # Large value to approximate 'infinite' cost
-    threshold_matrix[np.isinf(threshold_matrix)] = large_value
+    # Step 2: Mask out distances over the threshold with a large value to approximate 'infinite' cost
+    large_value = 1e6
+    threshold_matrix = np.where(distance_matrix > threshold, large_value, distance_matrix)
 
-    # Step 4: Use Hungarian Algorithm to find optimal assignment within threshold
+    # Step 3: Use Hungarian Algorithm to find optimal assignment within threshold
     row_ind, col_ind = linear_sum_assignment(threshold_matrix)
 
     # Filter pairs that are within the threshold
-    matches = []
-    for r, c in zip(row_ind, col_ind):
-        if distance_matrix[r, c] <= threshold:  # Check original distances within threshold
-            matches.append((r, c))  # (real object index, detected object index)
+    distances = distance_matrix[row_ind, col_ind]
+    within = distances <= threshold
+    return row_ind[within], col_ind[within], distances[within]
+
+
+def associate_based_on_distance(pred_df, gt_df, threshold=8):
+    """
+    Associate the GT object with the PRED object using the Hungarian Algorithm.
+    Will compute the distance between the centroids of the bounding boxes and store them in a distance matrix.
+    Will use the Hungarian Algorithm to get the best association.
+    Will output a pandas dataframe with (GT index, PRED index, distance between GT and PRED).
+    """
+    gt_start_index = gt_df.index.values[0]
+    pred_start_index = pred_df.index.values[0]
+
+    gt_pos, pred_pos, distances = associate_boxes(box_corners(gt_df), box_corners(pred_df), threshold)
 
-    # Identify unmatched objects (misses and ghosts)
-    # matched_real = {m[0] for m in matches}
-    # matched_detected = {m[1] for m in matches}
-    # missed_real = set(range(len(real_objects))) - matched_real
-    # ghost_detections = set(range(len(detected_objects))) - matched_detected
     my_dict = [
-        {"gt_idx": m[0] + gt_start_index, "pred_idx": m[1] + pred_start_index, "dist": distance_matrix[m[0], m[1]]}
-        for m in matches
+        {"gt_idx": gt + gt_start_index, "pred_idx": pred + pred_start_index, "dist": dist}
+        for gt, pred, dist in zip(gt_pos, pred_pos, distances)
     ]
     return pd.DataFrame(my_dict)
 
 
+class FrameIndex:
+    """
+    Group the rows of a dataframe by timestamp once, through a stable sort and per-frame offsets.
+
+    Slicing a frame is then O(1) instead of filtering the whole dataframe with df[df.ts == ts].
+    """
+
+    def __init__(self, df: pd.DataFrame, ts_column: str = "ts"):
+        """Sort the dataframe by timestamp and compute the frame offsets."""
+        if df.empty or ts_column not in df.columns:
+            self.df = df
+            self.timestamps = np.array([], dtype=np.int64)
+            self.offsets = np.array([0], dtype=np.int64)
+            return
+        order = np.argsort(df[ts_column].to_numpy(), kind="stable")
+        self.df = df.iloc[order]
+        sorted_ts = self.df[ts_column].to_numpy()
+        self.timestamps, starts = np.unique(sorted_ts, return_index=True)
+        self.offsets = np.append(starts, len(sorted_ts))
+
+    def bounds(self, ts):
+        """Return the (start, stop) positions of a timestamp in the sorted dataframe."""
+        pos = np.searchsorted(self.timestamps, ts)
+        if pos < len(self.timestamps) and self.timestamps[pos] == ts:
+            return self.offsets[pos], self.offsets[pos + 1]
+        return 0, 0
+
+    def frame(self, ts) -> pd.DataFrame:
+        """Return the rows of one timestamp."""
+        start, stop = self.bounds(ts)
+        return self.df.iloc[start:stop]
+
+
 def cast_to_optional_float(string_value: str) -> Optional[float]:
     """Casts a string to an Optional[float].
 
@@ -147,57 +190,56 @@ def generate_html_description() -> str:
     return kpi_description
 
 
-def convert_reader(df: pd.DataFrame) -> pd.DataFrame:
-    """Convert TPF reader."""
-    detection_list = []
-    for _, row in df.iterrows():
-        n = int(row["numberOfObjects"])
-        for i in range(n):
-            obj_dict = {
-                "ts": int(row["sigTimestamp"]),
-                "numObj": n,
-                "id": int(row[("objects.id", i)]),
-                "class": int(row[("objects.objectClass", i)]),
-            }
+def _convert_reader_objects(df: pd.DataFrame, keep_empty_frames: bool) -> pd.DataFrame:
+    """Flatten the per-object TPF reader columns into one row per object, ordered by frame and object."""
+    columns = ["ts", "numObj", "id", "class"] + [f"{axis}{j}" for j in range(4) for axis in ("x", "y")]
+    num_objects = df["numberOfObjects"].to_numpy().astype(int) if len(df) else np.array([], dtype=int)
+    timestamps = df["sigTimestamp"].to_numpy().astype(np.int64) if len(df) else np.array([], dtype=np.int64)
+
+    frame_idx, obj_idx = [], []
+    for i in range(num_objects.max(initial=0)):
+        frames = np.flatnonzero(num_objects > i)
+        frame_idx.append(frames)
+        obj_idx.append(np.full(frames.size, i))
+    frame_idx = np.concatenate(frame_idx) if frame_idx else np.array([], dtype=int)
+    obj_idx = np.concatenate(obj_idx) if obj_idx else np.array([], dtype=int)
+    if keep_empty_frames:
+        empty = np.flatnonzero(num_objects == 0)
+        frame_idx = np.concatenate((frame_idx, empty))
+        obj_idx = np.concatenate((obj_idx, np.full(empty.size, -1)))
+
+    # Same order as iterating over the frames and their objects
+    order = np.lexsort((obj_idx, frame_idx))
+    frame_idx, obj_idx = frame_idx[order], obj_idx[order]
+    is_object = obj_idx >= 0
+
+    def gather(signal: str, fill) -> np.ndarray:
+        block = df[[(signal, i) for i in range(num_objects.max(initial=0))]].to_numpy()
+        values = np.full(frame_idx.size, fill, dtype=block.dtype if block.size else float)
+        values[is_object] = block[frame_idx[is_object], obj_idx[is_object]]
+        return values
+
+    result = {
+        "ts": timestamps[frame_idx],
+        "numObj": num_objects[frame_idx],
+        "id": gather("objects.id", 0).astype(int),
+        "class": gather("objects.objectClass", 0).astype(int),
+    }
+    for j in range(4):  # There are 4 corner points
+        result[f"x{j}"] = gather(f"objects.shape.points[{j}].position.x", 0)
+        result[f"y{j}"] = gather(f"objects.shape.points[{j}].position.y", 0)
 
-            for j in range(4):  # There are 4 corner points
-                obj_dict[f"x{j}"] = row[(f"objects.shape.points[{j}].position.x", i)]
-                obj_dict[f"y{j}"] = row[(f"objects.shape.points[{j}].position.y", i)]
+    return pd.DataFrame(result, columns=columns)
 
-            detection_list.append(obj_dict)
 
-    return pd.DataFrame(detection_list)
+def convert_reader(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert TPF reader."""
+    return _convert_reader_objects(df, keep_empty_frames=False)
 
 
 def convert_reader_all_frames(df: pd.DataFrame) -> pd.DataFrame:
     """Convert TPF reader. Store even the frames with no detections."""
-    detection_list = []
-    for _, row in df.iterrows():
-        n = int(row["numberOfObjects"])
-        if n == 0:
-            obj_dict = {"ts": int(row["sigTimestamp"]), "numObj": 0, "id": 0, "class": 0}
-
-            for j in range(4):  # There are 4 corner points
-                obj_dict[f"x{j}"] = 0
-                obj_dict[f"y{j}"] = 0
-            detection_list.append(obj_dict)
-
-        else:
-            for i in range(n):
-                obj_dict = {
-                    "ts": int(row["sigTimestamp"]),
-                    "numObj": n,
-                    "id": int(row[("objects.id", i)]),
-                    "class": int(row[("objects.objectClass", i)]),
-                }
-
-                for j in range(4):  # There are 4 corner points
-                    obj_dict[f"x{j}"] = row[(f"objects.shape.points[{j}].position.x", i)]
-                    obj_dict[f"y{j}"] = row[(f"objects.shape.points[{j}].position.y", i)]
-
-                detection_list.append(obj_dict)
-
-    return pd.DataFrame(detection_list)
+    return _convert_reader_objects(df, keep_empty_frames=True)
 
 
 def get_iou_shapely(gt_row, pred_row):
@@ -215,6 +257,13 @@ def get_iou_shapely(gt_row, pred_row):
     return iou
 
 
+def get_iou_boxes(gt_boxes: np.ndarray, pred_boxes: np.ndarray) -> np.ndarray:
+    """Get intersection over union between pairs of GT and PRED boxes of shape (N, 4, 2)."""
+    poly_gt = shapely.polygons(gt_boxes)
+    poly_pred = shapely.polygons(pred_boxes)
+    return shapely.area(shapely.intersection(poly_gt, poly_pred)) / shapely.area(shapely.union(poly_gt, poly_pred))
+
+
 def compute_frame_kpi(gt_df, pred_df, ts):
     """Compute the KPIs for the current frame."""
     # Get the values for the current timestamp
@@ -233,11 +282,42 @@ def compute_frame_kpi(gt_df, pred_df, ts):
             num_pred_obj = len(this_pred_df)
             association_df = associate_based_on_distance(gt_df=this_gt_df, pred_df=this_pred_df)
 
-    # Compute TP, FP, FN
-    number_of_pred_obj = num_pred_obj
-    number_of_gt_obj = len(this_gt_df)
-    number_of_associated_obj = len(association_df)
+    return _frame_kpi_dict(ts, num_pred_obj, len(this_gt_df), len(association_df))
+
+
+def compute_frame_kpis(gt_df: pd.DataFrame, pred_df: pd.DataFrame, threshold=8) -> pd.DataFrame:
+    """
+    Compute the KPIs of every PRED timestamp of a recording.
+
+    Both dataframes are grouped by timestamp once and the association runs on the box arrays of each frame.
+    Frames without GT count all their detections as FP.
+    """
+    gt_frames = FrameIndex(gt_df)
+    pred_frames = FrameIndex(pred_df)
+    gt_boxes = box_corners(gt_frames.df) if not gt_df.empty else np.empty((0, 4, 2))
+    pred_boxes = box_corners(pred_frames.df) if not pred_df.empty else np.empty((0, 4, 2))
+    pred_num_obj = pred_frames.df["numObj"].to_numpy() if not pred_df.empty else np.array([])
+
+    kpi_list = []
+    for ts in pred_frames.timestamps:
+        pred_start, pred_stop = pred_frames.bounds(ts)
+        gt_start, gt_stop = gt_frames.bounds(ts)
+
+        if pred_num_obj[pred_start] == 0:
+            num_pred_obj = 0
+            num_associated = 0
+        else:
+            num_pred_obj = pred_stop - pred_start
+            num_associated = len(
+                associate_boxes(gt_boxes[gt_start:gt_stop], pred_boxes[pred_start:pred_stop], threshold)[0]
+            )
+        kpi_list.append(_frame_kpi_dict(ts, num_pred_obj, gt_stop - gt_start, num_associated))
+
+    return pd.DataFrame(kpi_list)
+
 
+def _frame_kpi_dict(ts, number_of_pred_obj, number_of_gt_obj, number_of_associated_obj) -> dict:
+    """Compute TP/FP/FN and the derived rates of one frame."""
     # Compute KPIs #
     tp = number_of_associated_obj
     fp = number_of_pred_obj - number_of_associated_obj
@@ -556,27 +636,38 @@ def match_points_of_the_bounding_boxes(real_objects, detected_objects) -> list:
 def compute_accuracy(gt_df: pd.DataFrame, pred_df: pd.DataFrame) -> pd.DataFrame:
     """Compute the Position Accuracy, Orientation Accuracy and Shape Accuracy for each object from the current time frame."""
     kpi_list = []  # Store the dictionaries with the KPIs
-    unique_ts = np.unique(pred_df["ts"])
-
-    for ts in unique_ts:
-        this_pred_df = pred_df[pred_df["ts"] == ts]
-        this_gt_df = gt_df[gt_df["ts"] == ts]
-
-        current_association_df = associate_based_on_distance(gt_df=this_gt_df, pred_df=this_pred_df, threshold=7)
-        for _, row in current_association_df.iterrows():
-            gt_idx = int(row["gt_idx"])
-            pred_idx = int(row["pred_idx"])
+    translated_pred_bboxes, gt_bboxes = [], []  # Boxes for the Shape Accuracy, computed in bulk at the end
+    if pred_df.empty or gt_df.empty:
+        return pd.DataFrame(kpi_list)
+
+    gt_frames = FrameIndex(gt_df)
+    pred_frames = FrameIndex(pred_df)
+    gt_sorted_boxes = box_corners(gt_frames.df)
+    pred_sorted_boxes = box_corners(pred_frames.df)
+    gt_all_boxes = box_corners(gt_df)
+    pred_all_boxes = box_corners(pred_df)
+
+    for ts in pred_frames.timestamps:
+        pred_start, pred_stop = pred_frames.bounds(ts)
+        gt_start, gt_stop = gt_frames.bounds(ts)
+        if gt_start == gt_stop:
+            continue
+
+        gt_positions, pred_positions, _ = associate_boxes(
+            gt_sorted_boxes[gt_start:gt_stop], pred_sorted_boxes[pred_start:pred_stop], threshold=7
+        )
+        gt_start_index = gt_frames.df.index.values[gt_start]
+        pred_start_index = pred_frames.df.index.values[pred_start]
+        for gt_position, pred_position in zip(gt_positions, pred_positions):
+            gt_idx = int(gt_position + gt_start_index)
+            pred_idx = int(pred_position + pred_start_index)
 
-            pred_obj = pred_df.iloc[pred_idx]
-            gt_obj = gt_df.iloc[gt_idx]
+            pred_bbox = pred_all_boxes[pred_idx]
+            gt_bbox = gt_all_boxes[gt_idx]
 
             # Select the first 3 points from the bounding boxes (PRED and GT)
-            p1 = [pred_obj["x0"], pred_obj["y0"]]
-            p2 = [pred_obj["x1"], pred_obj["y1"]]
-            p3 = [pred_obj["x2"], pred_obj["y2"]]
-            q1 = [gt_obj["x0"], gt_obj["y0"]]
-            q2 = [gt_obj["x1"], gt_obj["y1"]]
-            q3 = [gt_obj["x2"], gt_obj["y2"]]
+            p1, p2, p3 = pred_bbox[0], pred_bbox[1], pred_bbox[2]
+            q1, q2, q3 = gt_bbox[0], gt_bbox[1], gt_bbox[2]
 
             # Make sure to compute the angle between the segments representing the width for both GT and PRED
             if np.linalg.norm(np.array(p1) - np.array(p2)) - np.linalg.norm(np.array(p2) - np.array(p3)) > 0:
@@ -586,9 +677,6 @@ def compute_accuracy(gt_df: pd.DataFrame, pred_df: pd.DataFrame) -> pd.DataFrame
                 q1 = q2
                 q2 = q3
 
-            pred_bbox = np.array([[pred_obj[f"x{i}"], pred_obj[f"y{i}"]] for i in range(4)])
-            gt_bbox = np.array([[gt_obj[f"x{i}"], gt_obj[f"y{i}"]] for i in range(4)])
-
             # Rotation
             # Note: The points are not associated, so the rotation may not be the orientation error
             rotation_rad, rotation_deg = angle_between_segments(p1, p2, q1, q2)
@@ -603,7 +691,7 @@ def compute_accuracy(gt_df: pd.DataFrame, pred_df: pd.DataFrame) -> pd.DataFrame
                 np.mean(gt_bbox[:, 0]) - np.mean(rotated_pred_bbox[:, 0]),
                 np.mean(gt_bbox[:, 1]) - np.mean(rotated_pred_bbox[:, 1]),
             )
-            translated_pred_bbox = np.array([(x + dx, y + dy) for x, y in rotated_pred_bbox])
+            translated_pred_bbox = rotated_pred_bbox + np.array([dx, dy])
 
             matches = match_points_of_the_bounding_boxes(gt_bbox, translated_pred_bbox)
 
@@ -623,13 +711,8 @@ def compute_accuracy(gt_df: pd.DataFrame, pred_df: pd.DataFrame) -> pd.DataFrame
             closest_pred_idx = matches[closest_gt_idx][1]
             position_accuracy = np.linalg.norm(gt_bbox[closest_gt_idx] - pred_bbox[closest_pred_idx])
 
-            # Run the Shape Accuracy
-            poly_pred = Polygon(translated_pred_bbox)
-            poly_gt = Polygon(gt_bbox)
-
-            intersection_poly = intersection(poly_gt, poly_pred)
-            union_poly = poly_gt.union(poly_pred)
-            shape_erorr = intersection_poly.area / union_poly.area  # Intersection over Union
+            translated_pred_bboxes.append(translated_pred_bbox)
+            gt_bboxes.append(gt_bbox)
 
             kpi_dict = {
                 "ts": ts,
@@ -638,11 +721,14 @@ def compute_accuracy(gt_df: pd.DataFrame, pred_df: pd.DataFrame) -> pd.DataFrame
                 "Point-to-Point error": p2p_error,
                 "Position Accuracy": position_accuracy,
                 "Orientation Accuracy": rotation_deg,
-                "Shape Accuracy": shape_erorr,
             }
             kpi_list.append(kpi_dict)
 
-    return pd.DataFrame(kpi_list)
+    kpi_df = pd.DataFrame(kpi_list)
+    if kpi_list:
+        # Run the Shape Accuracy (Intersection over Union) for all pairs at once
+        kpi_df["Shape Accuracy"] = get_iou_boxes(np.array(gt_bboxes), np.array(translated_pred_bboxes))
+    return kpi_df
 
 
 def draw_timeframe_association(gt_df, pred_df, association_df, ts):
@@ -0,0 +1,190 @@
+"""CEM association of PCL delimiters, PMD lines and parking slots to ground truth with array operations"""
+
+import typing
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+import shapely
+from scipy.optimize import linear_sum_assignment
+
+from pl_parking.PLP.CV.PMSD.line_association import LineAssociationEngine
+
+MIN_GT_LINE_SQR_LENGTH = 0.01  # Association.match rejects shorter reference lines
+TP, FP, FN = "TP", "FP", "FN"
+RESULT_COLUMNS = ["frame", "timestamp", "det_idx", "gt_idx", "cost", "status"]
+
+
+class CemAssignmentMode(str, Enum):
+    """Enumerates the supported assignment strategies"""
+
+    SEQUENTIAL = "sequential"  # detections in input order take their cheapest free GT (former loop behaviour)
+    NEAREST = "nearest"  # every row takes its cheapest column, columns may be shared
+    GREEDY = "greedy"  # one-to-one assignment by ascending cost
+    HUNGARIAN = "hungarian"  # optimal one-to-one assignment
+
+
+def lines_to_array(lines) -> np.ndarray:
+    """Stack PCL delimiters or PMD lines into an array (N, 2, 2): line, endpoint, xy"""
+    endpoints = []
+    for line in lines:
+        if hasattr(line, "start_point"):
+            endpoints.append([(line.start_point.x, line.start_point.y), (line.end_point.x, line.end_point.y)])
+        else:
+            endpoints.append([(line.line_start.x, line.line_start.y), (line.line_end.x, line.line_end.y)])
+    return np.array(endpoints, dtype=float).reshape(-1, 2, 2)
+
+
+def slots_to_array(slots) -> np.ndarray:
+    """
+    Stack slot corners into an array (N, 4, 2).
+
+    The corners are ordered like FtSlotHelper.order_points_counter_clockwise, without modifying the slots.
+    """
+    if len(slots) == 0:
+        return np.empty((0, 4, 2))
+    corners = np.array([[(corner.x, corner.y) for corner in slot.slot_corners] for slot in slots], dtype=float)
+    center = corners.mean(axis=1, keepdims=True)
+    angles = np.arctan2(corners[..., 0] - center[..., 0], corners[..., 1] - center[..., 1])
+    order = np.argsort(-angles, axis=1, kind="stable")
+    return np.take_along_axis(corners, order[..., None], axis=1)
+
+
+def line_cost(det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+    """
+    Rectangle association of every (detected, GT) line pair, see Association.rectangle_match.
+
+    :return: Mean hangout distance of the detected endpoints (D, G), inf for pairs outside the GT rectangle.
+    """
+    if len(det) == 0 or len(gt) == 0:
+        return np.full((len(det), len(gt)), np.inf)
+    dist_start = LineAssociationEngine.point_segment_distance(det[:, 0], gt[:, 0], gt[:, 1])
+    dist_end = LineAssociationEngine.point_segment_distance(det[:, 1], gt[:, 0], gt[:, 1])
+    gt_sqr_length = np.sum((gt[:, 1] - gt[:, 0]) ** 2, axis=1)
+    valid = LineAssociationEngine.boundary_true_positive(det, gt) & (gt_sqr_length > MIN_GT_LINE_SQR_LENGTH)
+    return np.where(valid, (dist_start + dist_end) / 2, np.inf)
+
+
+def slot_corner_cost(det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+    """Mean distance of the centers and of the four ordered corners (D, G), see FtSlotHelper.get_slot_distance"""
+    center_distance = np.linalg.norm(det.mean(axis=1)[:, None] - gt.mean(axis=1)[None], axis=-1)
+    corner_distance = np.linalg.norm(det[:, None] - gt[None], axis=-1).sum(axis=-1)
+    return (center_distance + corner_distance) / 5
+
+
+def slot_iou(det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+    """Intersection over union of every (detected, GT) slot pair (D, G)"""
+    if len(det) == 0 or len(gt) == 0:
+        return np.zeros((len(det), len(gt)))
+    det_polygons = shapely.make_valid(shapely.polygons(det))
+    gt_polygons = shapely.make_valid(shapely.polygons(gt))
+    intersection = shapely.area(shapely.intersection(det_polygons[:, None], gt_polygons[None, :]))
+    union = shapely.area(det_polygons)[:, None] + shapely.area(gt_polygons)[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def assign(cost: np.ndarray, mode: CemAssignmentMode) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Assign rows to columns of a cost matrix, infinite costs are never assigned.
+
+    :return: Row and column indices of the assigned pairs.
+    """
+    rows, cols = [], []
+    if cost.size == 0:
+        return np.array(rows, dtype=int), np.array(cols, dtype=int)
+
+    finite = np.isfinite(cost)
+    if mode == CemAssignmentMode.NEAREST:
+        rows = np.flatnonzero(finite.any(axis=1))
+        cols = np.argmin(cost[rows], axis=1)
+    elif mode == CemAssignmentMode.SEQUENTIAL:
+        free = np.ones(cost.shape[1], dtype=bool)
+        for row in range(cost.shape[0]):
+            candidates = np.where(free & finite[row], cost[row], np.inf)
+            col = int(np.argmin(candidates))
+            if np.isfinite(candidates[col]):
+                free[col] = False
+                rows.append(row)
+                cols.append(col)
+    elif mode == CemAssignmentMode.GREEDY:
+        order = np.argsort(np.where(finite, cost, np.inf), axis=None, kind="stable")[: int(finite.sum())]
+        used_rows = np.zeros(cost.shape[0], dtype=bool)
+        used_cols = np.zeros(cost.shape[1], dtype=bool)
+        for row, col in zip(*np.unravel_index(order, cost.shape)):
+            if not used_rows[row] and not used_cols[col]:
+                used_rows[row] = used_cols[col] = True
+                rows.append(row)
+                cols.append(col)
+    else:
+        bounded = np.where(finite, cost, np.nanmax(np.where(finite, cost, 0)) * 2 + 1)
+        rows, cols = linear_sum_assignment(bounded)
+        keep = finite[rows, cols]
+        rows, cols = rows[keep], cols[keep]
+    return np.asarray(rows, dtype=int), np.asarray(cols, dtype=int)
+
+
+@dataclass
+class CemAssociationEngine:
+    """
+    Associate detections to ground truth frame by frame and collect the results in one columnar table.
+
+    Every detection appears once in the table, as TP (with its GT) or FP; every not associated GT appears as FN.
+    """
+
+    cost_function: typing.Callable[[np.ndarray, np.ndarray], np.ndarray] = line_cost
+    mode: CemAssignmentMode = CemAssignmentMode.SEQUENTIAL
+    max_cost: float = np.inf
+
+    def cost(self, det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+        """Cost matrix (D, G) with the pairs above max_cost gated out"""
+        cost = self.cost_function(det, gt) if len(det) and len(gt) else np.full((len(det), len(gt)), np.inf)
+        return np.where(cost < self.max_cost, cost, np.inf)
+
+    def associate_frame(self, det: np.ndarray, gt: np.ndarray, frame=0, timestamp=None) -> pd.DataFrame:
+        """Associate the stacked detections and GT of one frame"""
+        cost = self.cost(det, gt)
+        rows, cols = assign(cost, self.mode)
+
+        gt_of_det = np.full(len(det), -1)
+        gt_of_det[rows] = cols
+        det_cost = np.full(len(det), np.nan)
+        det_cost[rows] = cost[rows, cols]
+        missed_gt = np.setdiff1d(np.arange(len(gt)), cols)
+
+        return pd.DataFrame(
+            {
+                "frame": frame,
+                "timestamp": timestamp,
+                "det_idx": np.concatenate((np.arange(len(det)), np.full(len(missed_gt), -1))),
+                "gt_idx": np.concatenate((gt_of_det, missed_gt)),
+                "cost": np.concatenate((det_cost, np.full(len(missed_gt), np.nan))),
+                "status": np.concatenate((np.where(gt_of_det >= 0, TP, FP), np.full(len(missed_gt), FN))),
+            },
+            columns=RESULT_COLUMNS,
+        )
+
+    def associate_recording(
+        self, frames: typing.Iterable[typing.Tuple[typing.Any, np.ndarray, np.ndarray]]
+    ) -> pd.DataFrame:
+        """Associate a whole recording given as an iterable of (timestamp, detections, gt) per frame"""
+        tables = [
+            self.associate_frame(det, gt, frame=frame, timestamp=timestamp)
+            for frame, (timestamp, det, gt) in enumerate(frames)
+        ]
+        if not tables:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.concat(tables, ignore_index=True)
+
+    @staticmethod
+    def frame_counts(table: pd.DataFrame) -> pd.DataFrame:
+        """TP/FP/FN count and derived rates per frame of an association table"""
+        counts = table.groupby(["frame", "status"]).size().unstack(fill_value=0)
+        counts = counts.reindex(columns=[TP, FP, FN], fill_value=0).rename_axis(columns=None)
+        counts.insert(0, "timestamp", table.groupby("frame")["timestamp"].first())
+        detections = counts[TP] + counts[FP]
+        ground_truth = counts[TP] + counts[FN]
+        counts["precision"] = (counts[TP] / detections).where(detections > 0, 0.0)
+        counts["false_positive_rate"] = (counts[FP] / detections).where(detections > 0, 0.0)
+        counts["true_positive_rate"] = (counts[TP] / ground_truth).where(ground_truth > 0, 0.0)
+        return counts.reset_index()
@@ -35,6 +35,7 @@ from tsf.core.common import PathSpecification
 from tsf.io.sideload import JsonSideLoad
 
 import pl_parking.common_constants as fc
+from pl_parking.common_cache import file_fingerprint
 from pl_parking.common_ft_helper import CemSignals, CustomTeststepReport, rep
 from pl_parking.PLP.CEM.constants import AssociationConstants, ConstantsCem, ConstantsCemInput, GroundTruthCem
 from pl_parking.PLP.CEM.ft_erg_helper import ErgPlots, TranslationRotation
@@ -77,7 +78,7 @@ class TestStepFtPCLFalsePositive(TestStep):
         plot_titles, plots, remarks = rep([], 3)
 
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + f_path for f_path in GroundTruthCem.kml_files]
         )
@@ -28,6 +28,7 @@ import pandas as pd
 import plotly.graph_objects as go
 
 import pl_parking.common_constants as fc
+from pl_parking.common_cache import file_fingerprint
 from pl_parking.common_ft_helper import CemSignals, CustomTeststepReport, rep
 from pl_parking.PLP.CEM.constants import AssociationConstants, ConstantsCem, GroundTruthCem
 from pl_parking.PLP.CEM.ft_slot_helper import FtSlotHelper
@@ -76,7 +77,7 @@ class TestStepFtScenarioConfidence(TestStep):
 
         # Load all signals information
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + f_path for f_path in GroundTruthCem.kml_files]
         )
@@ -253,7 +254,7 @@ class TestStepFtSlotAccuracy(TestStep):
         test_result = fc.NOT_ASSESSED
 
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + f_path for f_path in GroundTruthCem.kml_files]
         )
@@ -910,7 +911,7 @@ class TestStepFtSlotScenario(TestStep):
         test_result = fc.NOT_ASSESSED
 
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + r"config\cem_ground_truth\mring_parking_slots.kml"]
         )
@@ -27,6 +27,7 @@ import numpy as np
 import plotly.graph_objects as go
 
 import pl_parking.common_constants as fc
+from pl_parking.common_cache import file_fingerprint
 from pl_parking.common_ft_helper import CemSignals, CustomTeststepReport, rep
 from pl_parking.PLP.CEM.constants import AssociationConstants, ConstantsCem, ConstantsCemInput, GroundTruthCem
 from pl_parking.PLP.CEM.ft_pcl_helper import FtPclHelper
@@ -69,7 +70,7 @@ class TestStepFtWSAccuracy(TestStep):
         plot_titles, plots, remarks = rep([], 3)
 
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + f_path for f_path in GroundTruthCem.kml_files]
         )
@@ -273,7 +274,7 @@ class TestStepFtWSFalsePositive(TestStep):
         plot_titles, plots, remarks = rep([], 3)
 
         reader = self.readers[SIGNAL_DATA].signals
-        dgps_buffer = DGPSReader(reader).convert_to_class()
+        dgps_buffer = DGPSReader(reader).convert_to_class(cache_key=file_fingerprint(self.artifacts[0].file_path))
         cem_ground_truth_utm = CemGroundTruthHelper.get_cem_ground_truth_from_files_list(
             [os.path.dirname(__file__) + "\\" + f_path for f_path in GroundTruthCem.kml_files]
         )
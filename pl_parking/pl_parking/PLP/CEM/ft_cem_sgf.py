@@ -41,6 +41,27 @@ from pl_parking.PLP.CEM.inputs.input_CemVedodoReader import VedodoReader
 SIGNAL_DATA = "CEM_SGF_Latency_Compensation"
 
 
+def sgf_polygons(static_object_df):
+    """
+    Gather the used polygons of all SGF frames at once.
+
+    :return: Frame position and polygon index of every polygon, the padded polygons and their vertex counts,
+        see polygon_helper.polygons_from_vertex_pool.
+    """
+
+    def array_signal(name):
+        columns = [column for column in static_object_df.columns if isinstance(column, tuple) and column[0] == name]
+        return static_object_df[sorted(columns, key=lambda column: column[1])].to_numpy()
+
+    return polygon_helper.polygons_from_vertex_pool(
+        array_signal("vertex_x"),
+        array_signal("vertex_y"),
+        array_signal("vertexStartIndex_polygon"),
+        array_signal("numVertices_polygon"),
+        static_object_df["numPolygons"].to_numpy(),
+    )
+
+
 # @specification
 # Test script will:
 #
@@ -366,24 +387,16 @@ class TestStepFtSGFOutputConvex(TestStep):
         polygons_vertices = {}
 
         def are_all_polygons_convex():
-            polygon_convex = []
-            for _, row in static_object_df.iterrows():
-                polygon_timestamp = {}
-                for polygon_idx in range(int(row["numPolygons"])):
-                    vertex_start_idx = int(row["vertexStartIndex_polygon", polygon_idx])
-                    num_vertices = int(row["numVertices_polygon", polygon_idx])
-                    vertex_list = [
-                        np.array([row["vertex_x", vertex_idx], row["vertex_y", vertex_idx]])
-                        for vertex_idx in range(vertex_start_idx, vertex_start_idx + num_vertices)
-                    ]
-                    if not polygon_helper.is_polygon_convex(vertex_list):
-                        polygon_convex.append(False)
-                        polygon_timestamp.setdefault(polygon_idx, vertex_list)
-                    else:
-                        polygon_convex.append(True)
-                polygons_vertices.setdefault(row["SGF_timestamp"], polygon_timestamp)
+            frames, polygon_ids, polygons, counts = sgf_polygons(static_object_df)
+            polygon_convex = polygon_helper.are_polygons_convex(polygons, counts)
+            timestamps = static_object_df["SGF_timestamp"].to_numpy()
+            failed = ~polygon_convex
+            for frame, polygon_idx, polygon, count in zip(
+                frames[failed], polygon_ids[failed], polygons[failed], counts[failed]
+            ):
+                polygons_vertices.setdefault(timestamps[frame], {}).setdefault(polygon_idx, list(polygon[:count]))
 
-            return polygon_convex
+            return polygon_convex.tolist()
 
         test_result = fc.PASS if all(are_all_polygons_convex()) else fc.FAIL
 
@@ -471,24 +484,16 @@ class TestStepFtSGFOutputCCWVertexOrder(TestStep):
         polygons_vertices = {}
 
         def do_all_polygons_have_ccw_vertex_order():
-            polygon_ccw_order = []
-            for _, row in static_object_df.iterrows():
-                polygon_timestamp = {}
-                for polygon_idx in range(int(row["numPolygons"])):
-                    vertex_start_idx = int(row["vertexStartIndex_polygon", polygon_idx])
-                    num_vertices = int(row["numVertices_polygon", polygon_idx])
-                    vertex_list = [
-                        np.array([row["vertex_x", vertex_idx], row["vertex_y", vertex_idx]])
-                        for vertex_idx in range(vertex_start_idx, vertex_start_idx + num_vertices)
-                    ]
-                    if not polygon_helper.is_vertex_order_counterclockwise_assuming_convex(vertex_list):
-                        polygon_ccw_order.append(False)
-                        polygon_timestamp.setdefault(polygon_idx, vertex_list)
-                    else:
-                        polygon_ccw_order.append(True)
-                polygons_vertices.setdefault(row["SGF_timestamp"], polygon_timestamp)
+            frames, polygon_ids, polygons, counts = sgf_polygons(static_object_df)
+            polygon_ccw_order = polygon_helper.are_vertex_orders_counterclockwise_assuming_convex(polygons, counts)
+            timestamps = static_object_df["SGF_timestamp"].to_numpy()
+            failed = ~polygon_ccw_order
+            for frame, polygon_idx, polygon, count in zip(
+                frames[failed], polygon_ids[failed], polygons[failed], counts[failed]
+            ):
+                polygons_vertices.setdefault(timestamps[frame], {}).setdefault(polygon_idx, list(polygon[:count]))
 
-            return polygon_ccw_order
+            return polygon_ccw_order.tolist()
 
         test_result = fc.PASS if all(do_all_polygons_have_ccw_vertex_order()) else fc.FAIL
 
@@ -567,26 +572,14 @@ class TestStepFtSGFOutputOrderedByDistance(TestStep):
         input_reader = SGFReader(reader)
         static_object_df = input_reader.data
 
-        def distance_from_origin(row, polygon_idx):
-            vertex_start_idx = int(row["vertexStartIndex_polygon", polygon_idx])
-            num_vertices = int(row["numVertices_polygon", polygon_idx])
-            vertex_list = [
-                np.array([row["vertex_x", vertex_idx], row["vertex_y", vertex_idx]])
-                for vertex_idx in range(vertex_start_idx, vertex_start_idx + num_vertices)
-            ]
-            return polygon_helper.dist_of_point_from_polygon(np.array([0, 0]), vertex_list)
-
         def are_polygons_always_ordered_by_distance():
-            ordered_by_distance = []
-            polygon_distances = []
-            for _, row in static_object_df.iterrows():
-                distances = [distance_from_origin(row, polygon_idx) for polygon_idx in range(int(row["numPolygons"]))]
-                if any(distances[i] > distances[i + 1] for i in range(len(distances) - 1)):
-                    ordered_by_distance.append(False)
-                else:
-                    ordered_by_distance.append(True)
-                polygon_distances.append(distances)
-            return ordered_by_distance, polygon_distances
+            frames, _, polygons, counts = sgf_polygons(static_object_df)
+            distances = polygon_helper.distances_from_polygons(np.zeros((1, 2)), polygons, counts)[0]
+            frame_count = len(static_object_df)
+            unordered = (distances[:-1] > distances[1:]) & (frames[:-1] == frames[1:])
+            ordered_by_distance = np.bincount(frames[:-1][unordered], minlength=frame_count) == 0
+            polygon_distances = np.split(distances, np.cumsum(np.bincount(frames, minlength=frame_count))[:-1])
+            return ordered_by_distance.tolist(), [frame_distances.tolist() for frame_distances in polygon_distances]
 
         polygons_ordered, polygons_distances = are_polygons_always_ordered_by_distance()
 
@@ -26,6 +26,7 @@ import pl_parking.PLP.CEM.TPF.ft_helper as fh_tpf
 import pl_parking.PLP.CV.TPP.ft_helper as fh_tpp
 from pl_parking.PLP.CEM.constants import ConstantsCem, GroundTruthTpf
 from pl_parking.PLP.CEM.ft_tpf_helper import FtTPFHelper, TpfFtp2GtAssociator, TPFMetricsHelper
+from pl_parking.PLP.CEM.ground_truth.gt_loader import GroundTruthLoader
 from pl_parking.PLP.CEM.inputs.input_CemTpfReader import DynamicObject, MaintenanceState, TPFReader
 from pl_parking.PLP.CEM.inputs.input_CemVedodoReader import VedodoReader
 from pl_parking.PLP.CEM.inputs.input_DynamicObjectDetection import (
@@ -1327,10 +1328,14 @@ class TestStepFtTPFLateralPosAcc(TestStep):
         tpf_data = TPFReader(reader).convert_to_class()
         vedodo_reader = self.readers[VEDODO_DATA]
         vedodo_buffer = VedodoReader(vedodo_reader).convert_to_class()
-        ground_truth = pd.read_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
+        ground_truth = GroundTruthLoader.load_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
         rtp_data = DynamicObjectDetectionReader(reader).convert_to_class()
 
         associator = TpfFtp2GtAssociator(vedodo_buffer, ground_truth)
+        associator.prepare(
+            [timeframe.timestamp for timeframe in tpf_data[20:]]
+            + [timeframe.timestamp for timeframes in rtp_data.values() for timeframe in timeframes]
+        )
 
         test_result = fc.NOT_ASSESSED
 
@@ -1457,10 +1462,14 @@ class TestStepFtTPFLongitudePosAcc(TestStep):
         tpf_data = TPFReader(reader).convert_to_class()
         vedodo_reader = self.readers[VEDODO_DATA]
         vedodo_buffer = VedodoReader(vedodo_reader).convert_to_class()
-        ground_truth = pd.read_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
+        ground_truth = GroundTruthLoader.load_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
         rtp_data = DynamicObjectDetectionReader(reader).convert_to_class()
 
         associator = TpfFtp2GtAssociator(vedodo_buffer, ground_truth)
+        associator.prepare(
+            [timeframe.timestamp for timeframe in tpf_data[20:]]
+            + [timeframe.timestamp for timeframes in rtp_data.values() for timeframe in timeframes]
+        )
 
         test_result = fc.NOT_ASSESSED
 
@@ -1839,7 +1848,7 @@ class TestStepFtTPFPrecisionRate(TestStep):
         df = input_reader.data.as_plain_df
         vedodo_reader = self.readers[VEDODO_DATA]
         vedodo_buffer = VedodoReader(vedodo_reader).convert_to_class()
-        ground_truth = pd.read_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
+        ground_truth = GroundTruthLoader.load_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
 
         tpf_metrics_helper = TPFMetricsHelper(vedodo_buffer, ground_truth)
 
@@ -1854,6 +1863,7 @@ class TestStepFtTPFPrecisionRate(TestStep):
         input_reader.data = input_reader.data.loc[input_reader.data.timestamp > first_output_ts]
 
         tpfData = input_reader.convert_to_class()
+        tpf_metrics_helper.prepare(tpf_timeframe.timestamp for tpf_timeframe in tpfData)
 
         if input_reader.number_of_objects > 0:
             failed = 0
@@ -2130,9 +2140,10 @@ class TestStepFtTPFRecallRate(TestStep):
         tpfData = tpf_reader.convert_to_class()
         vedodo_reader = self.readers[VEDODO_DATA]
         vedodo_buffer = VedodoReader(vedodo_reader).convert_to_class()
-        ground_truth = pd.read_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
+        ground_truth = GroundTruthLoader.load_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
 
         tpf_metrics_helper = TPFMetricsHelper(vedodo_buffer, ground_truth)
+        tpf_metrics_helper.prepare(tpf_timeframe.timestamp for tpf_timeframe in tpfData[10:])
 
         if tpf_reader.number_of_objects > 0:
             rows = []
@@ -2510,10 +2521,14 @@ class TestStepFtTPFXYVelAcc(TestStep):
         tpf_data = TPFReader(reader).convert_to_class()
         vedodo_reader = self.readers[VEDODO_DATA]
         vedodo_buffer = VedodoReader(vedodo_reader).convert_to_class()
-        ground_truth = pd.read_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
+        ground_truth = GroundTruthLoader.load_hdf(os.path.dirname(__file__) + "\\" + GroundTruthTpf.tpf_gt_file[0])
         rtp_data = DynamicObjectDetectionReader(reader).convert_to_class()
 
         associator = TpfFtp2GtAssociator(vedodo_buffer, ground_truth)
+        associator.prepare(
+            [timeframe.timestamp for timeframe in tpf_data[20:]]
+            + [timeframe.timestamp for timeframes in rtp_data.values() for timeframe in timeframes]
+        )
 
         rtp_satisfy_dynamics_acc_1m = 0
         rtp_satisfy_dynamics_acc_5m = 0
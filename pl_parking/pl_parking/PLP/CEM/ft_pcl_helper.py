@@ -4,9 +4,17 @@ import math
 import sys
 import typing
 
+import pandas as pd
 from numpy import arccos, cross, dot, pi
 from numpy.linalg import norm
 
+from pl_parking.PLP.CEM.cem_association import (
+    CemAssignmentMode,
+    CemAssociationEngine,
+    assign,
+    line_cost,
+    lines_to_array,
+)
 from pl_parking.PLP.CEM.constants import ConstantsCem
 from pl_parking.PLP.CEM.ft_pose_helper import FtPoseHelper
 from pl_parking.PLP.CEM.ground_truth.vehicle_coordinates_helper import VehicleCoordinateHelper
@@ -229,31 +237,8 @@ class FtPclHelper:
                 association pair list including the unassociated PCL CEM output (the first element of the pair is the \
                     CEM PCL output and the second one is the associated ground truth), unassociated PCL ground truth
         """
-        association: typing.List[typing.Tuple[PCLDelimiter, PCLDelimiter]] = []
-
-        ground_truth_set = set(pcl_ground_truth_list)
-
-        for pcl in pcl_cem_list:
-            min_dist = sys.float_info.max
-            associated_ground_truth = None
-
-            for ground_truth in ground_truth_set:
-                is_valid_association, _, _, line_dist = FtPclHelper.is_pcl_pcl_association_valid(
-                    pcl, ground_truth, association_radius
-                )
-
-                if is_valid_association and line_dist < min_dist:
-                    min_dist = line_dist
-                    associated_ground_truth = ground_truth
-
-            if associated_ground_truth is not None:
-                ground_truth_set.remove(associated_ground_truth)
-
-            association.append((pcl, associated_ground_truth))
-
-        not_associated_ground_truth = list(ground_truth_set)
-
-        return association, not_associated_ground_truth
+        cost = line_cost(lines_to_array(pcl_cem_list), lines_to_array(pcl_ground_truth_list))
+        return FtPclHelper._association_pairs(pcl_cem_list, pcl_ground_truth_list, cost)
 
     @staticmethod
     def associate_pmd_to_ground_truth(
@@ -272,31 +257,43 @@ class FtPclHelper:
                 association pair list including the unassociated PMD (the first element of the pair is the \
                     PMD and the second one is the associated ground truth), unassociated PCL ground truth
         """
-        association: typing.List[typing.Tuple[PMDLine, PMDLine]] = []
-
-        ground_truth_set = set(pmd_ground_truth_list)
-
-        for pmd in pmd_list:
-            min_dist = sys.float_info.max
-            associated_ground_truth = None
+        # the rectangle is built around the PMD line and the GT endpoints are measured against it
+        cost = line_cost(lines_to_array(pmd_ground_truth_list), lines_to_array(pmd_list)).T
+        return FtPclHelper._association_pairs(pmd_list, pmd_ground_truth_list, cost)
 
-            for ground_truth in ground_truth_set:
-                is_valid_association, _, _, line_dist = FtPclHelper.is_pmd_pmd_association_valid(
-                    ground_truth, pmd, association_radius
-                )
-
-                if is_valid_association and line_dist < min_dist:
-                    min_dist = line_dist
-                    associated_ground_truth = ground_truth
+    @staticmethod
+    def _association_pairs(detections, ground_truth, cost):
+        """Convert a sequential assignment on the cost matrix to (detection, gt or None) pairs and unassociated GT."""
+        rows, cols = assign(cost, CemAssignmentMode.SEQUENTIAL)
+        associated = dict(zip(rows.tolist(), cols.tolist()))
+        association = [
+            (detection, ground_truth[associated[idx]] if idx in associated else None)
+            for idx, detection in enumerate(detections)
+        ]
+        associated_ground_truth = set(cols.tolist())
+        not_associated_ground_truth = [gt for idx, gt in enumerate(ground_truth) if idx not in associated_ground_truth]
 
-            if associated_ground_truth is not None:
-                ground_truth_set.remove(associated_ground_truth)
+        return association, not_associated_ground_truth
 
-            association.append((pmd, associated_ground_truth))
+    @staticmethod
+    def associate_pcl_recording(
+        frames: typing.Iterable[typing.Tuple[int, typing.List[PCLDelimiter], typing.List[PCLDelimiter]]],
+        mode: CemAssignmentMode = CemAssignmentMode.SEQUENTIAL,
+    ) -> pd.DataFrame:
+        """Associate the PCL output of a whole recording to the ground truth.
 
-        not_associated_ground_truth = list(ground_truth_set)
+        Args:
+            frames: (timestamp, PCL CEM output, PCL ground truth) per frame.
+            mode: Assignment strategy, sequential reproduces associate_pcl_to_ground_truth.
 
-        return association, not_associated_ground_truth
+        Returns:
+            pd.DataFrame: Columnar association table with one TP/FP row per PCL and one FN row per missed GT,
+                see CemAssociationEngine.
+        """
+        engine = CemAssociationEngine(cost_function=line_cost, mode=mode)
+        return engine.associate_recording(
+            (timestamp, lines_to_array(pcl_cem), lines_to_array(pcl_gt)) for timestamp, pcl_cem, pcl_gt in frames
+        )
 
     @staticmethod
     def calculate_cem_pcl_false_positive_iso(
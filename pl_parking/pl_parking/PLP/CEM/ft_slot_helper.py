@@ -4,6 +4,17 @@ import math
 import sys
 import typing
 
+import numpy as np
+import pandas as pd
+
+from pl_parking.PLP.CEM.cem_association import (
+    CemAssignmentMode,
+    CemAssociationEngine,
+    assign,
+    slot_corner_cost,
+    slot_iou,
+    slots_to_array,
+)
 from pl_parking.PLP.CEM.constants import AssociationConstants, CemSlotScenario
 from pl_parking.PLP.CEM.ft_pose_helper import FtPoseHelper
 from pl_parking.PLP.CEM.ground_truth.vehicle_coordinates_helper import VehicleCoordinateHelper
@@ -111,10 +122,11 @@ class FtSlotHelper:
         Returns:
             Tuple[float, int]: A tuple containing the sum of confidence values and the number of associations.
         """
-        sum_confidence = 0.0
         association = FtSlotHelper.associate_slot_ground_truth(measurements, ground_truth)
-        for gt_num, slot_num in association.items():
-            sum_confidence += FtSlotHelper.get_slot_distance(measurements[slot_num], ground_truth[gt_num])
+        if not association:
+            return 0.0, 0
+        cost = FtSlotHelper.slot_distance_matrix(measurements, ground_truth)
+        sum_confidence = float(cost[list(association.values()), list(association.keys())].sum())
 
         return sum_confidence, len(association)
 
@@ -133,21 +145,55 @@ class FtSlotHelper:
         Returns:
             Dict[int, int]: A dictionary where the keys are indices of ground truth slots and values are indices of associated measured slots.
         """
-        association = {}
+        for slot in [*ground_truth, *measurements]:
+            FtSlotHelper.order_points_counter_clockwise(slot)
 
-        for gt_ixd, gt in enumerate(ground_truth):
-            FtSlotHelper.order_points_counter_clockwise(gt)
-            for slot_ixd, slot in enumerate(measurements):
-                FtSlotHelper.order_points_counter_clockwise(slot)
-                distance = FtSlotHelper.get_slot_distance(slot, gt)
-                if distance < AssociationConstants.MAX_SLOT_DISTANCE_ERG_KPI:
-                    if (
-                        gt_ixd not in association
-                        or FtSlotHelper.get_slot_distance(measurements[association[gt_ixd]], gt) > distance
-                    ):
-                        association[gt_ixd] = slot_ixd
+        cost = FtSlotHelper.slot_distance_matrix(measurements, ground_truth)
+        gt_indices, slot_indices = assign(
+            np.where(cost < AssociationConstants.MAX_SLOT_DISTANCE_ERG_KPI, cost, np.inf).T, CemAssignmentMode.NEAREST
+        )
 
-        return association
+        return dict(zip(gt_indices.tolist(), slot_indices.tolist()))
+
+    @staticmethod
+    def slot_distance_matrix(
+        measurements: typing.List[typing.Union[Slot, PMDSlot]], ground_truth: typing.List[Slot]
+    ) -> np.ndarray:
+        """
+        Calculate get_slot_distance for every (measured, ground truth) slot pair at once.
+
+        Returns:
+            np.ndarray: Distances of shape (measurements, ground truth).
+        """
+        return slot_corner_cost(slots_to_array(measurements), slots_to_array(ground_truth))
+
+    @staticmethod
+    def associate_slot_recording(
+        frames: typing.Iterable[typing.Tuple[int, typing.List[typing.Union[Slot, PMDSlot]], typing.List[Slot]]],
+        mode: CemAssignmentMode = CemAssignmentMode.HUNGARIAN,
+        use_iou: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Associate the slots of a whole recording to the ground truth.
+
+        Args:
+            frames: (timestamp, measured slots, ground truth slots) per frame.
+            mode: Assignment strategy.
+            use_iou: Use 1 - IoU as cost instead of the corner distance; pairs without overlap are not associated.
+
+        Returns:
+            pd.DataFrame: Columnar association table with one TP/FP row per measured slot and one FN row per missed
+                ground truth slot, see CemAssociationEngine.
+        """
+        if use_iou:
+            engine = CemAssociationEngine(cost_function=lambda det, gt: 1 - slot_iou(det, gt), mode=mode, max_cost=1)
+        else:
+            engine = CemAssociationEngine(
+                cost_function=slot_corner_cost, mode=mode, max_cost=AssociationConstants.MAX_SLOT_DISTANCE_ERG_KPI
+            )
+        return engine.associate_recording(
+            (timestamp, slots_to_array(measured), slots_to_array(gt)) for timestamp, measured, gt in frames
+        )
 
     # Slot corners need to be ordered the in same way
     @staticmethod
@@ -3,11 +3,13 @@
 import math
 import sys
 import typing
+from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
 from shapely import geometry
 
+from pl_parking.PLP.CEM.cem_association import CemAssignmentMode, assign
 from pl_parking.PLP.CEM.constants import ConstantsCem, TpfFovConstatns
 from pl_parking.PLP.CEM.ft_pose_helper import FtPoseHelper
 from pl_parking.PLP.CEM.inputs.input_CemTpfReader import DynamicObject, DynPoint, TPFTimeFrame
@@ -106,7 +108,6 @@ class FtTPFHelper:
 
         return iou
 
-
     @staticmethod
     def get_relevant_RTP_Frames(
         sensor_timeframe: typing.List[DynamicObjectDetectionTimeframe], T_6_timestamp: int
@@ -252,6 +253,101 @@ class FtTPFHelper:
             return False
 
 
+ASSOC_DISTANCE_SQUARED = 2.0  # squared association gate between FTP center and interpolated GT position [m^2]
+GT_ANGLE_COLUMNS = ("yaw", "orientation", "heading")
+
+
+@dataclass
+class ResampledGroundTruth:
+    """Ground truth objects interpolated onto a set of timestamps, all arrays are (timestamps, objects)"""
+
+    timestamps: np.ndarray
+    object_ids: np.ndarray
+    values: typing.Dict[str, np.ndarray]
+    valid: np.ndarray
+
+    def row(self, timestamp: int) -> int:
+        """Row of a timestamp, -1 if the timestamp was not resampled"""
+        idx = int(np.searchsorted(self.timestamps, timestamp))
+        return idx if idx < len(self.timestamps) and self.timestamps[idx] == timestamp else -1
+
+
+class GroundTruthResampler:
+    """
+    Interpolate all ground truth objects onto detection timestamps in one vectorized operation.
+
+    An object is valid at t if ts_first < t <= ts_last of its own samples. Angle columns are unwrapped per object
+    before the interpolation and wrapped back to [-pi, pi) afterwards, all other numeric columns
+    (position, velocity, shape) are interpolated linearly.
+    """
+
+    def __init__(self, ground_truth: pd.DataFrame, angle_columns: typing.Sequence[str] = GT_ANGLE_COLUMNS):
+        """Sort the ground truth by object (in order of appearance) and timestamp."""
+        codes, object_ids = pd.factorize(ground_truth["object_id"], sort=False)
+        self.object_ids = np.asarray(object_ids)
+        order = np.lexsort((ground_truth["timestamp"].to_numpy(), codes))
+        self.codes = codes[order]
+        self.timestamps = ground_truth["timestamp"].to_numpy(dtype=np.int64)[order]
+
+        numeric = ground_truth.drop(columns=["timestamp", "object_id"]).select_dtypes("number")
+        self.columns = list(numeric.columns)
+        self.angle_columns = [column for column in self.columns if column in angle_columns]
+        self.data = {column: numeric[column].to_numpy(dtype=float)[order] for column in self.columns}
+        for column in self.angle_columns:
+            self.data[column] = self._unwrap_per_object(self.data[column])
+
+        num_objects = len(self.object_ids)
+        self.first = np.searchsorted(self.codes, np.arange(num_objects), side="left")
+        self.last = np.searchsorted(self.codes, np.arange(num_objects), side="right") - 1
+        self.t_min = int(self.timestamps.min()) if len(self.timestamps) else 0
+
+    def _unwrap_per_object(self, angles: np.ndarray) -> np.ndarray:
+        """np.unwrap restarted at the first sample of every object"""
+        if len(angles) == 0:
+            return angles
+        is_first = np.r_[True, self.codes[1:] != self.codes[:-1]]
+        steps = (np.diff(angles, prepend=angles[0]) + np.pi) % (2 * np.pi) - np.pi
+        steps[is_first] = angles[is_first]
+        cumulated = np.cumsum(steps)
+        starts = np.flatnonzero(is_first)
+        offsets = cumulated[starts] - angles[starts]
+        return cumulated - np.repeat(offsets, np.diff(np.r_[starts, len(angles)]))
+
+    def resample(self, timestamps: typing.Sequence[int]) -> ResampledGroundTruth:
+        """Interpolate every object onto every timestamp (sorted and de-duplicated)."""
+        timestamps = np.unique(np.asarray(timestamps, dtype=np.int64))
+        num_objects = len(self.object_ids)
+        if num_objects == 0 or len(timestamps) == 0:
+            shape = (len(timestamps), num_objects)
+            return ResampledGroundTruth(
+                timestamps, self.object_ids, {c: np.full(shape, np.nan) for c in self.columns}, np.zeros(shape, bool)
+            )
+
+        # one searchsorted over all objects: every object gets its own band of the key axis
+        span = int(max(self.timestamps.max(), timestamps.max())) - self.t_min + 1
+        keys = self.codes * span + (self.timestamps - self.t_min)
+        query = np.arange(num_objects)[None, :] * span + (timestamps[:, None] - self.t_min)
+        index_prev = np.searchsorted(keys, query) - 1
+
+        valid = (index_prev >= self.first[None, :]) & (index_prev < self.last[None, :])
+        index_prev = np.where(valid, index_prev, self.first[None, :])
+        index_next = np.minimum(index_prev + 1, self.last[None, :])
+
+        ts_0 = self.timestamps[index_prev]
+        ts_1 = self.timestamps[index_next]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w_0 = (ts_1 - timestamps[:, None]) / (ts_1 - ts_0)
+            w_1 = (timestamps[:, None] - ts_0) / (ts_1 - ts_0)
+
+        values = {}
+        for column, data in self.data.items():
+            interpolated = w_0 * data[index_prev] + w_1 * data[index_next]
+            if column in self.angle_columns:
+                interpolated = (interpolated + np.pi) % (2 * np.pi) - np.pi
+            values[column] = np.where(valid, interpolated, np.nan)
+        return ResampledGroundTruth(timestamps, self.object_ids, values, valid)
+
+
 class TpfFtp2GtAssociator:
     """This class associates the ground truth to the current FTP objects"""
 
@@ -264,92 +360,81 @@ class TpfFtp2GtAssociator:
                 break
         self.initial_timestamp = int(vedodo_frame.timestamp)
 
-        self.gt_objects = []
-        for v in ground_truth["object_id"].unique():
-            self.gt_objects.append(ground_truth[ground_truth["object_id"] == v])
+        self.resampler = GroundTruthResampler(ground_truth)
+        self.resampled = self.resampler.resample([])
+        self._single_frames: typing.Dict[int, ResampledGroundTruth] = {}
+
+    def prepare(self, timestamps: typing.Iterable[int]):
+        """Interpolate the ground truth onto all timestamps that will be associated, e.g. of a whole recording."""
+        timestamps = np.fromiter(timestamps, dtype=np.int64)
+        self.resampled = self.resampler.resample(np.concatenate((self.resampled.timestamps, timestamps)))
+        self._single_frames.clear()
+
+    def _gt_frame(self, timestamp: int) -> typing.Tuple[ResampledGroundTruth, int]:
+        """Resampled table and row of a timestamp, not prepared timestamps are interpolated on their own"""
+        row = self.resampled.row(timestamp)
+        if row >= 0:
+            return self.resampled, row
+        if timestamp not in self._single_frames:
+            self._single_frames[timestamp] = self.resampler.resample([timestamp])
+        return self._single_frames[timestamp], 0
+
+    def num_gt_objects(self, timestamp: int) -> int:
+        """Number of ground truth objects existing at the timestamp"""
+        resampled, row = self._gt_frame(timestamp)
+        return int(resampled.valid[row].sum())
 
     def associate(self, tpf_timeframe: TPFTimeFrame) -> typing.Dict[int, int]:
         """Associates the TPF objects found in dynamic_objects to the objects found in the ground_truth DataFrame
 
+        Every object, in input order, takes the closest not yet associated GT object inside the association gate.
+
         Inputs:
             tpf_timeframe: the list of dynamic objects containing also timestamps and number of objects
 
         Returns:
             the dict containing the association between the TPF objects and the ground truth objects
         """
-        ASSOC_DISTANCE_SQUARED = 2.0  # TODO: move it to constants
-        gt_pool_at_timeframe = {}
-        associations = {}
         current_timestamp = tpf_timeframe.timestamp
+        resampled, row = self._gt_frame(current_timestamp)
+        valid = resampled.valid[row]
+        gt_ids = resampled.object_ids[valid]
+        gt_x = resampled.values["x"][row, valid]
+        gt_y = resampled.values["y"][row, valid]
+
+        objects = tpf_timeframe.dynamic_objects
+        if len(objects) == 0 or len(gt_ids) == 0:
+            return {}
+
         relative_motion = self.vedodo_buffer.calc_relative_motion(self.initial_timestamp, current_timestamp)
-        # first, create a pool of GT objects existing in the timeframe
-        for gt_object in self.gt_objects:
-            index_prev = gt_object["timestamp"].searchsorted(current_timestamp) - 1
-            if index_prev >= 0 and index_prev < len(gt_object) - 1:
-                gt_id = gt_object.iat[index_prev, 1]
-                ts_0 = gt_object.iat[index_prev, 0]  # the timestamp before the current timestamp
-                ts_1 = gt_object.iat[index_prev + 1, 0]  # the timestamp after the current timestamp
-                x_0 = gt_object.iat[index_prev, 2]  # the x coordinate before the current timestamp
-                x_1 = gt_object.iat[index_prev + 1, 2]  # the x coordinate after the current timestamp
-                y_0 = gt_object.iat[index_prev, 3]  # the y coordinate before the current timestamp
-                y_1 = gt_object.iat[index_prev + 1, 3]  # the y coordinate after the current timestamp
-                w_0 = (ts_1 - current_timestamp) / (ts_1 - ts_0)  # the weight of ts_0
-                w_1 = (current_timestamp - ts_0) / (ts_1 - ts_0)  # the weight of ts_1
-                x_avg = w_0 * x_0 + w_1 * x_1  # the average x coordinate of the GT object
-                y_avg = w_0 * y_0 + w_1 * y_1  # the average y coordinate of the GT object
-                gt_pool_at_timeframe[gt_id] = {"x": x_avg, "y": y_avg, "associated": False}
-
-        # next, create a list of candidates that may be associated
-        for ftp in tpf_timeframe.dynamic_objects:
-            candidates_dist = {}
-            center_x, center_y = FtPoseHelper.transform_point([ftp.center_x, ftp.center_y], relative_motion)
-            for gt_id, gt_object in gt_pool_at_timeframe.items():
-                if gt_object["associated"] is False:
-                    dist_squared = (center_x - gt_object["x"]) ** 2 + (center_y - gt_object["y"]) ** 2
-                    if dist_squared < ASSOC_DISTANCE_SQUARED:
-                        candidates_dist[gt_id] = dist_squared
-
-            # last, go through the candidates and select the best one that has the closest distance
-            curr_dist_squared = sys.float_info.max
-            gt_id = None
-            for candidate, dist in candidates_dist.items():
-                if dist < curr_dist_squared:
-                    gt_id = candidate
-                    curr_dist_squared = dist
-            if gt_id is not None:
-                associations[ftp.object_id] = gt_id
-                gt_pool_at_timeframe[gt_id]["associated"] = True
-
-        return associations
+        centers = np.array([(ftp.center_x, ftp.center_y) for ftp in objects], dtype=float)
+        x_t = centers[:, 0] + relative_motion.longitudinal_translation
+        y_t = centers[:, 1] + relative_motion.lateral_translation
+        cos_yaw, sin_yaw = math.cos(relative_motion.yaw_rotation), math.sin(relative_motion.yaw_rotation)
+        center_x = x_t * cos_yaw - y_t * sin_yaw
+        center_y = x_t * sin_yaw + y_t * cos_yaw
+
+        dist_squared = (center_x[:, None] - gt_x[None, :]) ** 2 + (center_y[:, None] - gt_y[None, :]) ** 2
+        cost = np.where(dist_squared < ASSOC_DISTANCE_SQUARED, dist_squared, np.inf)
+        rows, cols = assign(cost, CemAssignmentMode.SEQUENTIAL)
+        return {objects[r].object_id: gt_ids[c].item() for r, c in zip(rows, cols)}
 
     def get_gt_at_timeframe(
         self, current_timestamp: int
     ) -> typing.Dict[int, typing.Dict[str, typing.Union[float, bool]]]:
         """Get the ground truth data at the specified timestamp."""
-        gt_at_timeframe = {}
-        # first, create a pool of GT objects existing in the timeframe
-        for gt_object in self.gt_objects:
-            index_prev = gt_object["timestamp"].searchsorted(current_timestamp) - 1
-            if 0 <= index_prev < len(gt_object) - 1:
-                gt_id = gt_object.iat[index_prev, 1]
-                ts_0 = gt_object.iat[index_prev, 0]  # the timestamp before the current timestamp
-                ts_1 = gt_object.iat[index_prev + 1, 0]  # the timestamp after the current timestamp
-                x_0 = gt_object.iat[index_prev, 2]  # the x coordinate before the current timestamp
-                vx_0 = gt_object.iat[index_prev, 4]  # the x velocity before the current timestamp
-                x_1 = gt_object.iat[index_prev + 1, 2]  # the x coordinate after the current timestamp
-                vx_1 = gt_object.iat[index_prev + 1, 4]  # the x velocity after the current timestamp
-                y_0 = gt_object.iat[index_prev, 3]  # the y coordinate before the current timestamp
-                vy_0 = gt_object.iat[index_prev, 5]  # the y velocity before the current timestamp
-                y_1 = gt_object.iat[index_prev + 1, 3]  # the y coordinate after the current timestamp
-                vy_1 = gt_object.iat[index_prev + 1, 5]  # the y velocity after the current timestamp
-                w_0 = (ts_1 - current_timestamp) / (ts_1 - ts_0)  # the weight of ts_0
-                w_1 = (current_timestamp - ts_0) / (ts_1 - ts_0)  # the weight of ts_1
-                x_avg = w_0 * x_0 + w_1 * x_1  # the average x coordinate of the GT object
-                vx_avg = w_0 * vx_0 + w_1 * vx_1  # the average x velocity of the GT object
-                y_avg = w_0 * y_0 + w_1 * y_1  # the average y coordinate of the GT object
-                vy_avg = w_0 * vy_0 + w_1 * vy_1  # the average y velocity of the GT object
-                gt_at_timeframe[gt_id] = {"x": x_avg, "vx": vx_avg, "y": y_avg, "vy": vy_avg, "associated": False}
-        return gt_at_timeframe
+        resampled, row = self._gt_frame(current_timestamp)
+        values = resampled.values
+        return {
+            resampled.object_ids[idx].item(): {
+                "x": values["x"][row, idx],
+                "vx": values["velocity_x"][row, idx],
+                "y": values["y"][row, idx],
+                "vy": values["velocity_y"][row, idx],
+                "associated": False,
+            }
+            for idx in np.flatnonzero(resampled.valid[row])
+        }
 
 
 class TPFMetricsHelper:
@@ -359,6 +444,10 @@ class TPFMetricsHelper:
         """Initialize object attributes."""
         self.associator = TpfFtp2GtAssociator(vedodo_buffer=vedodo_buffer, ground_truth=ground_truth)
 
+    def prepare(self, timestamps: typing.Iterable[int]):
+        """Interpolate the ground truth onto the timestamps of all frames that will be evaluated."""
+        self.associator.prepare(timestamps)
+
     def calc(self, tpf_timeframe: TPFTimeFrame) -> float:
         """Calculates the recall rate of the TPF module
         Inputs:
@@ -370,13 +459,7 @@ class TPFMetricsHelper:
         associated_object_list = self.associator.associate(tpf_timeframe)
         total_positives = tpf_timeframe.num_objects
         true_positives = len(associated_object_list)
-        num_gt_objects = sum(
-            [
-                1
-                for obj in self.associator.gt_objects
-                if 0 < obj["timestamp"].searchsorted(tpf_timeframe.timestamp) < len(obj)
-            ]
-        )
+        num_gt_objects = self.associator.num_gt_objects(tpf_timeframe.timestamp)
         false_negatives = num_gt_objects - true_positives  # TODO: check if the GT is in the car FoV
 
         if total_positives > 0:
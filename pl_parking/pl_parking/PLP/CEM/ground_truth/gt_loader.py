@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Unified ground truth loader backed by the local content-hashed cache"""
+import json
+import os
+import typing
+
+import pandas as pd
+
+from pl_parking.common_cache import (
+    combine_keys,
+    file_fingerprint,
+    load_or_build_object,
+    load_or_build_table,
+    load_or_build_tables,
+)
+
+GT_CACHE_NAMESPACE = "ground_truth"
+JSON_CACHE_MIN_BYTES = 1 << 20  # smaller JSON files are parsed directly
+
+
+class GroundTruthLoader:
+    """
+    Normalizes ground truth sources (KML, JSON, HDF5) into columnar tables once and serves them from cache.
+
+    Cache keys are derived from the source content, so renamed or moved files still hit the cache and
+    edited files are parsed again.
+    """
+
+    @staticmethod
+    def load_kml(file_path: str) -> typing.Dict[str, pd.DataFrame]:
+        """
+        Load a KML ground truth file as tables with UTM coordinates.
+
+        :param file_path: Path to the KML file.
+        :return: Dict with "parking_markers" and "parking_slots" tables.
+        """
+        from pl_parking.PLP.CEM.ground_truth.kml_parser import CemGroundTruthHelper
+
+        def build():
+            df = CemGroundTruthHelper.get_df_from_kml(file_path)
+            return {
+                "parking_markers": CemGroundTruthHelper.get_parking_markers_table(df),
+                "parking_slots": CemGroundTruthHelper.get_parking_slots_table(df),
+            }
+
+        return load_or_build_tables(GT_CACHE_NAMESPACE, combine_keys("kml", file_fingerprint(file_path)), build)
+
+    @staticmethod
+    def load_hdf(file_path: str, **kwargs) -> pd.DataFrame:
+        """
+        Load an HDF5 ground truth table (e.g. config/tpf_ground_truth_*.h5).
+
+        :param file_path: Path to the HDF5 file.
+        :param kwargs: Forwarded to pandas.read_hdf.
+        :return: Ground truth DataFrame.
+        """
+        key = combine_keys("hdf", file_fingerprint(file_path), sorted(kwargs.items()))
+        return load_or_build_table(GT_CACHE_NAMESPACE, key, lambda: pd.read_hdf(file_path, **kwargs))
+
+    @staticmethod
+    def load_json_file(file_path: str):
+        """
+        Load a JSON ground truth file, e.g. the per-recording SI slot files.
+
+        Files below JSON_CACHE_MIN_BYTES are parsed directly, unpickling them would not be faster.
+
+        :param file_path: Path to the JSON file.
+        :return: The parsed JSON content.
+        """
+
+        def build():
+            with open(file_path) as file:
+                return json.load(file)
+
+        if os.path.getsize(file_path) < JSON_CACHE_MIN_BYTES:
+            return build()
+        return load_or_build_object(GT_CACHE_NAMESPACE, combine_keys("json", file_fingerprint(file_path)), build)
@@ -4,13 +4,18 @@ import typing
 from dataclasses import dataclass
 
 import geopandas as gpd
+import pandas as pd
 from fiona.drvsupport import supported_drivers
 
 from pl_parking.PLP.CEM.constants import ConstantsCemInput
+from pl_parking.PLP.CEM.ground_truth.gt_loader import GroundTruthLoader
 from pl_parking.PLP.CEM.ground_truth.utm_helper import UtmHelper
 from pl_parking.PLP.CEM.inputs.input_CemPclReader import PCLDelimiter, PCLPoint
 from pl_parking.PLP.CEM.inputs.input_CemSlotReader import Slot, SlotPoint, SlotScenarioConfidences
 
+PARKING_MARKER_COLUMNS = ["start_x", "start_y", "end_x", "end_y"]
+PARKING_SLOT_COLUMNS = [f"{axis}{i}" for i in range(4) for axis in ("x", "y")]
+
 
 @dataclass
 class CemGroundTruth:
@@ -34,32 +39,40 @@ class CemGroundTruthHelper:
         return df
 
     @staticmethod
-    def get_parking_markers(df: gpd.GeoDataFrame) -> typing.List[PCLDelimiter]:
-        """Get parking markers from a GeoDataFrame."""
+    def get_parking_markers_table(df: gpd.GeoDataFrame) -> pd.DataFrame:
+        """Get parking markers from a GeoDataFrame as a table of UTM start and end points."""
         rows = [row for _, row in df.iterrows() if row.Description.split(", ")[0] == "parking_marker"]
 
-        ret: typing.List[PCLDelimiter] = []
+        table = []
 
         for row in rows:
             x, y = row.geometry.xy  # x: long, y: lat
 
-            start_point = (x[0], y[0])
-            end_point = (x[1], y[1])
+            start_point_utm = UtmHelper.get_utm_from_lat_lon(y[0], x[0])
+            end_point_utm = UtmHelper.get_utm_from_lat_lon(y[1], x[1])
+
+            table.append((*start_point_utm, *end_point_utm))
 
-            start_point_utm = UtmHelper.get_utm_from_lat_lon(start_point[1], start_point[0])
-            end_point_utm = UtmHelper.get_utm_from_lat_lon(end_point[1], end_point[0])
+        return pd.DataFrame(table, columns=PARKING_MARKER_COLUMNS, dtype=float)
 
-            pcl_gt = PCLDelimiter(
+    @staticmethod
+    def parking_markers_from_table(table: pd.DataFrame) -> typing.List[PCLDelimiter]:
+        """Convert a parking marker table into PCL delimiters."""
+        return [
+            PCLDelimiter(
                 None,
                 ConstantsCemInput.PCLEnum,
-                PCLPoint(start_point_utm[0], start_point_utm[1]),
-                PCLPoint(end_point_utm[0], end_point_utm[1]),
+                PCLPoint(start_x, start_y),
+                PCLPoint(end_x, end_y),
                 100.0,
             )
+            for start_x, start_y, end_x, end_y in table[PARKING_MARKER_COLUMNS].itertuples(index=False)
+        ]
 
-            ret.append(pcl_gt)
-
-        return ret
+    @staticmethod
+    def get_parking_markers(df: gpd.GeoDataFrame) -> typing.List[PCLDelimiter]:
+        """Get parking markers from a GeoDataFrame."""
+        return CemGroundTruthHelper.parking_markers_from_table(CemGroundTruthHelper.get_parking_markers_table(df))
 
     @staticmethod
     def get_slot_scenario_confidences(scenario_type: str) -> SlotScenarioConfidences:
@@ -78,30 +91,45 @@ class CemGroundTruthHelper:
         return SlotScenarioConfidences(angled, parallel, perpendicular)
 
     @staticmethod
-    def get_parking_slots(df: gpd.GeoDataFrame) -> typing.List[Slot]:
-        """Get parking slots from a GeoDataFrame."""
+    def get_parking_slots_table(df: gpd.GeoDataFrame) -> pd.DataFrame:
+        """Get parking slots from a GeoDataFrame as a table of UTM corners and scenario type."""
         rows = [row for _, row in df.iterrows() if row.Description.split(", ")[0] == "parking_slot"]
 
-        ret: typing.List[Slot] = []
+        table = []
 
         for row in rows:
             x, y = row.geometry.exterior.xy
             description = row.Description.split(", ")
 
-            scenario_type = description[1]
-            scenario_confidences: SlotScenarioConfidences = CemGroundTruthHelper.get_slot_scenario_confidences(
-                scenario_type
-            )
-
             vertices_utm: typing.List[typing.Tuple[float, float]] = [
                 UtmHelper.get_utm_from_lat_lon(y[i], x[i]) for i in range(4)
             ]
-            slot_points: typing.List[SlotPoint] = [SlotPoint(pnt[0], pnt[1]) for pnt in vertices_utm]
+            table.append((*[coord for pnt in vertices_utm for coord in pnt], description[1]))
+
+        table = pd.DataFrame(table, columns=[*PARKING_SLOT_COLUMNS, "scenario_type"])
+        return table.astype({col: float for col in PARKING_SLOT_COLUMNS})
+
+    @staticmethod
+    def parking_slots_from_table(table: pd.DataFrame) -> typing.List[Slot]:
+        """Convert a parking slot table into slots."""
+        ret: typing.List[Slot] = []
+
+        for row in table.itertuples(index=False):
+            scenario_confidences: SlotScenarioConfidences = CemGroundTruthHelper.get_slot_scenario_confidences(
+                row.scenario_type
+            )
+            corners = [getattr(row, col) for col in PARKING_SLOT_COLUMNS]
+            slot_points: typing.List[SlotPoint] = [SlotPoint(corners[i], corners[i + 1]) for i in range(0, 8, 2)]
 
             ret.append(Slot(None, 1.0, slot_points, scenario_confidences))
 
         return ret
 
+    @staticmethod
+    def get_parking_slots(df: gpd.GeoDataFrame) -> typing.List[Slot]:
+        """Get parking slots from a GeoDataFrame."""
+        return CemGroundTruthHelper.parking_slots_from_table(CemGroundTruthHelper.get_parking_slots_table(df))
+
     @staticmethod
     def get_cem_ground_truth(file_path: str) -> CemGroundTruth:
         """Get CEM ground truth from a file."""
@@ -121,10 +149,10 @@ class CemGroundTruthHelper:
         parking_slots = []
 
         for file_path in files:
-            df = CemGroundTruthHelper.get_df_from_kml(file_path)
+            tables = GroundTruthLoader.load_kml(file_path)
 
-            parking_markers += CemGroundTruthHelper.get_parking_markers(df)
+            parking_markers += CemGroundTruthHelper.parking_markers_from_table(tables["parking_markers"])
             wheelstoppers += []
-            parking_slots += CemGroundTruthHelper.get_parking_slots(df)
+            parking_slots += CemGroundTruthHelper.parking_slots_from_table(tables["parking_slots"])
 
         return CemGroundTruth(parking_markers, wheelstoppers, parking_slots)
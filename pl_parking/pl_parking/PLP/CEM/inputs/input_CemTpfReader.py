@@ -5,6 +5,11 @@ import typing
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
+from pl_parking.common_array_signals import column_block
+
 
 class MaintenanceState(Enum):
     """Enumeration for maintenance states."""
@@ -87,6 +92,42 @@ class TPFTimeFrame:
     dynamic_objects: typing.List[DynamicObject]
 
 
+OBJECT_COLUMNS = [
+    "objects.id",
+    "objects.objectClass",
+    "objects.classProbability",
+    "objects.dynamicProperty",
+    "objects.existenceCertainty",
+    "objects.orientation",
+    "objects.orientationStandardDeviation",
+    "objects.velocity.x",
+    "objects.velocity.y",
+    "objects.yawRate",
+    "objects.velocityStandardDeviation.x",
+    "objects.velocityStandardDeviation.y",
+    "objects.yawRateStandardDeviation",
+    "objects.shape.referencePoint.x",
+    "objects.shape.referencePoint.y",
+    "objects.acceleration.x",
+    "objects.acceleration.y",
+    "objects.accelerationStandardDeviation.x",
+    "objects.accelerationStandardDeviation.y",
+    "objects.state",
+    "objects.lifetime",
+]
+# x, y, variance x, variance y, covariance of the 4 shape points, in DynPoint order
+POINT_COLUMNS = [
+    (
+        f"objects.shape.points[{j}].position.x",
+        f"objects.shape.points[{j}].position.y",
+        f"objects.shape.points[{j}].varianceX",
+        f"objects.shape.points[{j}].varianceY",
+        f"objects.shape.points[{j}].covarianceXY",
+    )
+    for j in range(4)
+]
+
+
 class TPFReader:
     """Reader class for TPF."""
 
@@ -104,82 +145,56 @@ class TPFReader:
         else:
             return False
 
+    def object_blocks(self) -> typing.Dict[str, np.ndarray]:
+        """(time x number_of_objects) array of every object signal"""
+        names = [*OBJECT_COLUMNS, *(column for point in POINT_COLUMNS for column in point)]
+        return {name: column_block(self.data, name, self.number_of_objects) for name in names}
+
     def convert_to_class(self) -> typing.List[TPFTimeFrame]:
         """Converts TPF data to a list of TPFTimeFrame objects."""
         timeframes: typing.List[TPFTimeFrame] = []
-
-        for _, row in self.data.iterrows():
+        timestamps = self.data["sigTimestamp"]
+        if isinstance(timestamps, pd.DataFrame):
+            # scalar signal next to array signals, (name, "") column
+            timestamps = timestamps.iloc[:, 0]
+        timestamps = timestamps.to_numpy().astype("int64")
+        blocks = self.object_blocks()
+        # a frame repeating the timestamp of the previous one is skipped
+        new_frame = np.ones(len(timestamps), dtype=bool)
+        new_frame[1:] = timestamps[1:] != timestamps[:-1]
+
+        for row in np.flatnonzero(new_frame):
             objects: typing.List[DynamicObject] = []
-            timestamp = int(row["sigTimestamp"])
-            # self.number_of_objects = int(row["numberOfObjects"])
-            if len(timeframes) > 0 and timestamp == timeframes[-1].timestamp:
-                continue
-
-            for i in range(self.number_of_objects):
-                existence_prob = float(row[("objects.existenceCertainty", i)])
-
-                if existence_prob > 0.:
-                    object_id = int(row[("objects.id", i)])
-                    object_class = ObjectClass(int(row[("objects.objectClass", i)]))
-                    class_certainty = float(row[("objects.classProbability", i)])
-                    dyn_property = DynamicProperty(int(row[("objects.dynamicProperty", i)]))
-                    existence_prob = int(row[("objects.existenceCertainty", i)])
-                    orientation = row[("objects.orientation", i)]
-                    orientation_std = row[("objects.orientationStandardDeviation", i)]
-                    velocity_x = row[("objects.velocity.x", i)]
-                    velocity_y = row[("objects.velocity.y", i)]
-                    yaw_rate = row[("objects.yawRate", i)]
-                    velocity_std_x = row[("objects.velocityStandardDeviation.x", i)]
-                    velocity_std_y = row[("objects.velocityStandardDeviation.y", i)]
-                    yaw_rate_std = row[("objects.yawRateStandardDeviation", i)]
-                    center_x = row[("objects.shape.referencePoint.x", i)]
-                    center_y = row[("objects.shape.referencePoint.y", i)]
-                    acceleration_x = row[("objects.acceleration.x", i)]
-                    acceleration_y = row[("objects.acceleration.y", i)]
-                    acceleration_std_x = row[("objects.accelerationStandardDeviation.x", i)]
-                    acceleration_std_y = row[("objects.accelerationStandardDeviation.y", i)]
-                    state = MaintenanceState(row[("objects.state", i)])
-                    lifetime = int(row[("objects.lifetime", i)])
-
-                    points: typing.List[DynPoint] = []
-                    for j in range(4):
-                        pnt_x = row[(f"objects.shape.points[{j}].position.x", i)]
-                        pnt_y = row[(f"objects.shape.points[{j}].position.y", i)]
-                        pnt_var_x = row[(f"objects.shape.points[{j}].varianceX", i)]
-                        pnt_var_y = row[(f"objects.shape.points[{j}].varianceY", i)]
-                        pnt_covar = row[(f"objects.shape.points[{j}].covarianceXY", i)]
-
-                        points.append(DynPoint(pnt_x, pnt_y, pnt_var_x, pnt_var_y, pnt_covar))
-
-                    dynamic_object = DynamicObject(
-                        object_id,
-                        object_class,
-                        class_certainty,
-                        dyn_property,
-                        # dyn_property_certainty,
-                        points,
-                        existence_prob,
-                        orientation,
-                        orientation_std,
-                        velocity_x,
-                        velocity_y,
-                        yaw_rate,
-                        velocity_std_x,
-                        velocity_std_y,
-                        yaw_rate_std,
-                        center_x,
-                        center_y,
-                        acceleration_x,
-                        acceleration_y,
-                        acceleration_std_x,
-                        acceleration_std_y,
-                        state,
-                        # contained_in_last_sensor_update,
-                        lifetime,
-                    )
-                    objects.append(dynamic_object)
-
-            tf = TPFTimeFrame(timestamp, len(objects), objects)
+            for i in np.flatnonzero(blocks["objects.existenceCertainty"][row] > 0.0):
+                values = {column: block[row, i] for column, block in blocks.items()}
+                points = [DynPoint(*(values[column] for column in point_columns)) for point_columns in POINT_COLUMNS]
+                dynamic_object = DynamicObject(
+                    int(values["objects.id"]),
+                    ObjectClass(int(values["objects.objectClass"])),
+                    float(values["objects.classProbability"]),
+                    DynamicProperty(int(values["objects.dynamicProperty"])),
+                    points,
+                    int(values["objects.existenceCertainty"]),
+                    values["objects.orientation"],
+                    values["objects.orientationStandardDeviation"],
+                    values["objects.velocity.x"],
+                    values["objects.velocity.y"],
+                    values["objects.yawRate"],
+                    values["objects.velocityStandardDeviation.x"],
+                    values["objects.velocityStandardDeviation.y"],
+                    values["objects.yawRateStandardDeviation"],
+                    values["objects.shape.referencePoint.x"],
+                    values["objects.shape.referencePoint.y"],
+                    values["objects.acceleration.x"],
+                    values["objects.acceleration.y"],
+                    values["objects.accelerationStandardDeviation.x"],
+                    values["objects.accelerationStandardDeviation.y"],
+                    MaintenanceState(values["objects.state"]),
+                    int(values["objects.lifetime"]),
+                )
+                objects.append(dynamic_object)
+
+            tf = TPFTimeFrame(int(timestamps[row]), len(objects), objects)
             timeframes.append(tf)
 
         return timeframes
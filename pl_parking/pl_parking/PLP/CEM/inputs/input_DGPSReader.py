@@ -4,8 +4,9 @@ import typing
 from dataclasses import dataclass
 
 import numpy as np
-from scipy.interpolate import interp1d
 
+from pl_parking.common_cache import combine_keys
+from pl_parking.common_dgps import DEGREES, RADIANS, DgpsTrajectory
 from pl_parking.PLP.CEM.ground_truth.utm_helper import UtmHelper
 
 
@@ -27,43 +28,42 @@ class DgpsTimeframe:
 class DGPSBuffer:
     """Buffer class for adressing DGPS data."""
 
-    def __init__(self, buffer: typing.List[DgpsTimeframe]):
-        """Initialize object attributes."""
-        self.buffer = buffer
-        # original signals
-        self.longitude_interpolation_method = interp1d(
-            [tf.timestamp for tf in self.buffer], [tf.longitude for tf in self.buffer]
-        )
-        self.latitude_interpolation_method = interp1d(
-            [tf.timestamp for tf in self.buffer], [tf.latitude for tf in self.buffer]
-        )
-        self.heading_interpolation_method = interp1d(
-            [tf.timestamp for tf in buffer], np.unwrap([tf.heading_deg for tf in self.buffer])
-        )
-        # utm
-        self.utm_x_interpolation_method = interp1d(
-            [tf.timestamp for tf in self.buffer], [tf.utm_x for tf in self.buffer]
-        )
-        self.utm_y_interpolation_method = interp1d(
-            [tf.timestamp for tf in self.buffer], [tf.utm_y for tf in self.buffer]
-        )
-        self.heading_from_north_interpolation_method = interp1d(
-            [tf.timestamp for tf in buffer], np.unwrap([tf.heading_from_north_rad for tf in buffer])
-        )
+    FIELDS = ("longitude", "latitude", "heading_deg", "utm_x", "utm_y", "heading_from_north_rad")
+    ANGLE_PERIODS = {"heading_deg": DEGREES, "heading_from_north_rad": RADIANS}
+
+    def __init__(self, buffer: typing.List[DgpsTimeframe] = None, trajectory: DgpsTrajectory = None):
+        """Initialize object attributes from a list of timeframes or from a shared trajectory."""
+        if trajectory is None:
+            buffer = buffer or []
+            trajectory = DgpsTrajectory(
+                [tf.timestamp for tf in buffer],
+                {name: [getattr(tf, name) for tf in buffer] for name in self.FIELDS},
+                self.ANGLE_PERIODS,
+            )
+        self.trajectory = trajectory
+        self._buffer = buffer
+
+    @property
+    def buffer(self) -> typing.List[DgpsTimeframe]:
+        """DGPS samples as timeframes, created on first access when the buffer was built from a trajectory."""
+        if self._buffer is None:
+            values = [self.trajectory.fields[name] for name in self.FIELDS]
+            self._buffer = [
+                DgpsTimeframe(timestamp, *sample)
+                for timestamp, *sample in zip(self.trajectory.timestamps.tolist(), *[v.tolist() for v in values])
+            ]
+        return self._buffer
+
+    def estimate_vehicle_poses(self, target_timestamps) -> typing.Dict[str, np.ndarray]:
+        """Estimates vehicle poses at many timestamps at once, NaN outside the DGPS recording."""
+        return self.trajectory.interpolate(target_timestamps, self.FIELDS)
 
     def estimate_vehicle_pose(self, target_timestamp: int):
         """Estimates vehicle pose at a target timestamp."""
-        if target_timestamp < self.buffer[0].timestamp or target_timestamp > self.buffer[-1].timestamp:
+        if len(self.trajectory) == 0 or not self.trajectory.covers(target_timestamp):
             return None
-        return DgpsTimeframe(
-            target_timestamp,
-            self.longitude_interpolation_method(target_timestamp)[()],
-            self.latitude_interpolation_method(target_timestamp)[()],
-            self.heading_interpolation_method(target_timestamp)[()],
-            self.utm_x_interpolation_method(target_timestamp)[()],
-            self.utm_y_interpolation_method(target_timestamp)[()],
-            self.heading_from_north_interpolation_method(target_timestamp)[()],
-        )
+        pose = self.estimate_vehicle_poses(target_timestamp)
+        return DgpsTimeframe(target_timestamp, *(pose[name][()] for name in self.FIELDS))
 
 
 class DGPSReader:
@@ -114,25 +114,36 @@ class DGPSReader:
     #     odoString = self.__get_ODO_time_string(reader)
     #     self.offset = self.data["timestamp"].iloc[-1] - reader[odoString][-1]
 
-    def convert_to_class(self) -> DGPSBuffer:
-        """Converts data to a DGPSBuffer class."""
-        dgps_buffer: typing.List[DgpsTimeframe] = []
+    def convert_to_class(self, cache_key: str = None) -> DGPSBuffer:
+        """
+        Converts data to a DGPSBuffer class.
+
+        :param cache_key: Optional key (e.g. the recording content hash) to share the converted trajectory
+                          memory-mapped between test cases, see DgpsTrajectory.load_or_build.
+        """
         self.data = self.data[self.data["dpgs_timestamp"] > 0]
         self.offset = self.data["dpgs_timestamp"].iloc[-1] - self.data["vedodo_timestamp_us"].iloc[-1]
 
-        for _, row in self.data.iterrows():
-            utm_x, utm_y = UtmHelper.get_utm_from_lat_lon(row["dpgs_latitude"], row["dpgs_longitude"])
-            heading_from_north_rad = UtmHelper.get_relative_rotation_from_east(row["dpgs_heading"])  # TODO: check
-
-            dgps = DgpsTimeframe(
-                row["dpgs_timestamp"] - self.offset,
-                row["dpgs_longitude"],
-                row["dpgs_latitude"],
-                row["dpgs_heading"],
-                utm_x,
-                utm_y,
-                heading_from_north_rad,
-            )
-            dgps_buffer.append(dgps)
-
-        return DGPSBuffer(dgps_buffer)
+        if cache_key is not None:
+            key = combine_keys("dgps_buffer", cache_key)
+            return DGPSBuffer(trajectory=DgpsTrajectory.load_or_build(key, self.to_trajectory))
+        return DGPSBuffer(trajectory=self.to_trajectory())
+
+    def to_trajectory(self) -> DgpsTrajectory:
+        """Convert the DGPS columns to UTM in one batch and store them as a trajectory."""
+        latitude = self.data["dpgs_latitude"].astype(float)
+        longitude = self.data["dpgs_longitude"].astype(float)
+        heading = self.data["dpgs_heading"].to_numpy(dtype=float)
+        utm_x, utm_y = UtmHelper.get_utm_from_lat_lon(latitude, longitude)
+        return DgpsTrajectory(
+            self.data["dpgs_timestamp"].to_numpy() - self.offset,
+            {
+                "longitude": longitude.to_numpy(),
+                "latitude": latitude.to_numpy(),
+                "heading_deg": heading,
+                "utm_x": utm_x,
+                "utm_y": utm_y,
+                "heading_from_north_rad": UtmHelper.get_relative_rotation_from_east(heading),  # TODO: check
+            },
+            DGPSBuffer.ANGLE_PERIODS,
+        )
@@ -116,3 +116,232 @@ def dist_of_point_from_polygon(p, vertex_list):
         dist_of_point_from_edge(p, vertex_list[i], vertex_list[(i + 1) % len(vertex_list)])
         for i in range(len(vertex_list))
     )
+
+
+# Batched kernels
+#
+# Polygons are given as a padded array of shape (polygons, max_vertices, 2) together with the number of vertices of
+# every polygon. The padding repeats the first vertex, so the padded edges have zero length and do not change areas
+# or winding numbers.
+
+MAX_BATCH_ELEMENTS = 1 << 22  # upper bound of the temporary (chunk, ...) arrays
+
+
+def _chunk_slices(length, elements_per_item):
+    """Yield slices over `length` items, so that a chunk holds at most MAX_BATCH_ELEMENTS elements."""
+    step = max(1, MAX_BATCH_ELEMENTS // max(1, elements_per_item))
+    for start in range(0, length, step):
+        yield slice(start, min(start + step, length))
+
+
+def _unit(vectors):
+    """Normalize vectors along the last axis, zero vectors become NaN like in the per polygon functions."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _next_index(counts, max_vertices):
+    """Index of the next vertex of every vertex, wrapping at the number of vertices of each polygon."""
+    return (np.arange(max_vertices) + 1) % np.maximum(np.asarray(counts), 1)[:, None]
+
+
+def pad_polygons(vertex_lists):
+    """
+    Pack polygons with different numbers of vertices into one array.
+
+    :param vertex_lists: Iterable of (n, 2) vertex sequences.
+    :return: Padded polygons (polygons, max_vertices, 2) and the number of vertices of every polygon.
+    """
+    vertex_lists = [np.asarray(vertices, dtype=float).reshape(-1, 2) for vertices in vertex_lists]
+    counts = np.array([len(vertices) for vertices in vertex_lists], dtype=int)
+    polygons = np.zeros((len(vertex_lists), max(counts.max(initial=0), 1), 2))
+    for polygon, vertices in zip(polygons, vertex_lists):
+        if len(vertices):
+            polygon[:] = vertices[0]
+            polygon[: len(vertices)] = vertices
+    return polygons, counts
+
+
+def polygons_from_vertex_pool(vertex_x, vertex_y, start_index, num_vertices, num_polygons):
+    """
+    Cut the polygons of all frames out of a shared vertex pool (SGF layout).
+
+    :param vertex_x: Vertex x coordinates (frames, pool_size).
+    :param vertex_y: Vertex y coordinates (frames, pool_size).
+    :param start_index: First vertex of every polygon slot (frames, slots).
+    :param num_vertices: Number of vertices of every polygon slot (frames, slots).
+    :param num_polygons: Number of used polygon slots per frame (frames,).
+    :return: Frame position and slot of every used polygon, the padded polygons and their vertex counts.
+    """
+    start_index = np.asarray(start_index, dtype=int)
+    num_vertices = np.asarray(num_vertices, dtype=int)
+    used = np.arange(start_index.shape[1]) < np.asarray(num_polygons, dtype=int)[:, None]
+    frames, slots = np.nonzero(used)
+    starts = start_index[frames, slots]
+    counts = num_vertices[frames, slots]
+
+    max_vertices = max(int(counts.max(initial=0)), 1)
+    offsets = np.arange(max_vertices)
+    index = starts[:, None] + np.where(offsets < counts[:, None], offsets, 0)
+    index = np.clip(index, 0, max(vertex_x.shape[1] - 1, 0))
+    polygons = np.stack((vertex_x[frames[:, None], index], vertex_y[frames[:, None], index]), axis=-1)
+    return frames, slots, polygons.astype(float), counts
+
+
+def signed_areas(polygons):
+    """Shoelace signed area of every padded polygon, positive for counterclockwise vertex order."""
+    x, y = polygons[..., 0], polygons[..., 1]
+    x_next, y_next = np.roll(x, -1, axis=-1), np.roll(y, -1, axis=-1)
+    return 0.5 * np.sum(x * y_next - x_next * y, axis=-1)
+
+
+def orientations(polygons):
+    """Orientation of every padded polygon: 1 counterclockwise, -1 clockwise, 0 degenerate."""
+    return np.sign(signed_areas(polygons)).astype(int)
+
+
+def _edges(polygons, counts):
+    """Start vertex, end vertex and unit right normal of every edge."""
+    next_index = _next_index(counts, polygons.shape[1])
+    v1 = polygons
+    v2 = np.take_along_axis(polygons, next_index[..., None], axis=1)
+    edge = v2 - v1
+    normals = _unit(np.stack((edge[..., 1], -edge[..., 0]), axis=-1))
+    return v1, v2, normals, next_index
+
+
+def _convex_in_order(base, normals, polygons, other, err_threshold):
+    """True for polygons where no other vertex lies on the right of an edge (beyond the threshold)."""
+    vec_to_other = _unit(polygons[:, None, :, :] - base[:, :, None, :])
+    dots = np.einsum("pic,pijc->pij", normals, vec_to_other)
+    return ~np.any((dots > err_threshold) & other, axis=(1, 2))
+
+
+def are_polygons_convex(polygons, counts, err_threshold=10e-4):
+    """
+    Batched is_polygon_convex.
+
+    :param polygons: Padded polygons (polygons, max_vertices, 2).
+    :param counts: Number of vertices of every polygon.
+    :return: Boolean array, True for convex polygons in either vertex order.
+    """
+    counts = np.asarray(counts)
+    result = np.ones(len(polygons), dtype=bool)
+    max_vertices = polygons.shape[1]
+    for chunk in _chunk_slices(len(polygons), max_vertices * max_vertices * 2):
+        chunk_polygons, chunk_counts = polygons[chunk], counts[chunk]
+        v1, v2, normals, next_index = _edges(chunk_polygons, chunk_counts)
+        index = np.arange(max_vertices)
+        valid = index < chunk_counts[:, None]
+        # every vertex except the two vertices of the edge
+        other = (
+            valid[:, :, None]
+            & valid[:, None, :]
+            & (index[None, :, None] != index[None, None, :])
+            & (next_index[:, :, None] != index[None, None, :])
+        )
+        counterclockwise = _convex_in_order(v1, normals, chunk_polygons, other, err_threshold)
+        # reversed vertex order: the edges run from v2 to v1 and their normals point the other way
+        clockwise = _convex_in_order(v2, -normals, chunk_polygons, other, err_threshold)
+        result[chunk] = counterclockwise | clockwise
+    return result
+
+
+def are_vertex_orders_counterclockwise_assuming_convex(polygons, counts, err_threshold=10e-4):
+    """Batched is_vertex_order_counterclockwise_assuming_convex."""
+    counts = np.asarray(counts)
+    v1, v2, normals, next_index = _edges(polygons, counts)
+    v3 = np.take_along_axis(polygons, np.take_along_axis(next_index, next_index, axis=1)[..., None], axis=1)
+    dots = np.einsum("pic,pic->pi", normals, v3 - v2)
+    valid = np.arange(polygons.shape[1]) < counts[:, None]
+    return ~np.any((dots > err_threshold) & valid, axis=1)
+
+
+def winding_numbers(points, polygons):
+    """
+    Winding number of every point with respect to every padded polygon.
+
+    :param points: Points (points, 2).
+    :param polygons: Padded polygons (polygons, max_vertices, 2).
+    :return: Integer array (points, polygons), non zero for points inside.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    a = polygons[None, :, :, :]
+    b = np.roll(polygons, -1, axis=1)[None, :, :, :]
+    result = np.zeros((len(points), len(polygons)), dtype=int)
+    for chunk in _chunk_slices(len(points), polygons.shape[0] * polygons.shape[1]):
+        px = points[chunk, 0][:, None, None]
+        py = points[chunk, 1][:, None, None]
+        is_left = (b[..., 0] - a[..., 0]) * (py - a[..., 1]) - (px - a[..., 0]) * (b[..., 1] - a[..., 1])
+        upward = (a[..., 1] <= py) & (b[..., 1] > py) & (is_left > 0)
+        downward = (a[..., 1] > py) & (b[..., 1] <= py) & (is_left < 0)
+        result[chunk] = upward.sum(axis=-1) - downward.sum(axis=-1)
+    return result
+
+
+def points_in_polygons(points, polygons):
+    """Boolean (points, polygons) point-in-polygon matrix based on the winding number."""
+    return winding_numbers(points, polygons) != 0
+
+
+def distances_from_polygons(points, polygons, counts):
+    """
+    Batched dist_of_point_from_polygon: distance of every point from every filled padded polygon.
+
+    Points inside a polygon (non zero winding number) have distance zero in either vertex order, polygons without
+    vertices have distance zero like in the per polygon function.
+
+    :param points: Points (points, 2).
+    :param polygons: Padded polygons (polygons, max_vertices, 2).
+    :param counts: Number of vertices of every polygon.
+    :return: Array (points, polygons).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    a = polygons[None, :, :, :]
+    edge = np.roll(polygons, -1, axis=1)[None, :, :, :] - a
+    length_squared = np.sum(edge * edge, axis=-1)
+    result = np.zeros((len(points), len(polygons)))
+    for chunk in _chunk_slices(len(points), polygons.shape[0] * polygons.shape[1] * 2):
+        offset = points[chunk, None, None, :] - a
+        projection = np.sum(offset * edge, axis=-1)
+        t = np.divide(projection, length_squared, out=np.zeros_like(projection), where=length_squared > 0)
+        closest = offset - np.clip(t, 0, 1)[..., None] * edge
+        result[chunk] = np.hypot(closest[..., 0], closest[..., 1]).min(axis=-1)
+    result[points_in_polygons(points, polygons)] = 0.0
+    result[:, np.asarray(counts) == 0] = 0.0
+    return result
+
+
+def _cross(o, a, b):
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def _on_segment(p, q, r):
+    """True where r lies within the bounding box of the segment pq (used for collinear points)."""
+    return (
+        (np.minimum(p[..., 0], q[..., 0]) <= r[..., 0])
+        & (r[..., 0] <= np.maximum(p[..., 0], q[..., 0]))
+        & (np.minimum(p[..., 1], q[..., 1]) <= r[..., 1])
+        & (r[..., 1] <= np.maximum(p[..., 1], q[..., 1]))
+    )
+
+
+def segments_intersect(p1, p2, q1, q2):
+    """
+    Decide if the segments p1p2 and q1q2 intersect, touching and collinear overlapping segments included.
+
+    All arguments are (..., 2) arrays and are broadcast against each other.
+    """
+    p1, p2, q1, q2 = (np.asarray(point, dtype=float) for point in (p1, p2, q1, q2))
+    d1 = _cross(q1, q2, p1)
+    d2 = _cross(q1, q2, p2)
+    d3 = _cross(p1, p2, q1)
+    d4 = _cross(p1, p2, q2)
+    proper = (np.sign(d1) * np.sign(d2) < 0) & (np.sign(d3) * np.sign(d4) < 0)
+    touching = (
+        ((d1 == 0) & _on_segment(q1, q2, p1))
+        | ((d2 == 0) & _on_segment(q1, q2, p2))
+        | ((d3 == 0) & _on_segment(p1, p2, q1))
+        | ((d4 == 0) & _on_segment(p1, p2, q2))
+    )
+    return proper | touching
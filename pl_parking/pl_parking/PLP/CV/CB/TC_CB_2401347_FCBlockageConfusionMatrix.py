@@ -9,7 +9,6 @@ import tempfile
 from pathlib import Path
 
 # import seaborn as sns
-import pandas as pd
 import plotly.graph_objects as go
 
 _log = logging.getLogger(__name__)
@@ -37,6 +36,7 @@ from tsf.core.utilities import debug
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 from pl_parking.common_ft_helper import MfCustomTestcaseReport, MfCustomTeststepReport, rep
+from pl_parking.PLP.CV.CB.blockage_metrics import BlockageGroundTruth, BlockageMetricsEngine, detection_column
 
 __author__ = "uif65342"
 __copyright__ = "2020-2012, Continental AG"
@@ -49,6 +49,7 @@ logging.basicConfig(level=logging.DEBUG)
 """any test must have a specific and UNIQUE alias as it will contain a data frame
 with all the signals for a test script"""
 READER_NAME = "ConfusionMatrixWithFrontCameraBlockageReader"
+GROUND_TRUTH = BlockageGroundTruth.whole_recording(blocked_cameras=["FC"])
 
 
 class Signals(SignalDefinition):
@@ -134,43 +135,9 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
         """Process the test result."""
         _log.debug("Starting processing...")
 
-        """
-        Method calculate_crosstab_RC_LSC_RSC to calculate True Positive here for cameras RC, LSC, RSC
-        """
-
-        def calculate_crosstab_RC_LSC_RSC(self, reader_DF, signalName_to_process):
-            """Create runtime temp csv"""
-            your_file_name_RC_LSC_RSC = f"your_file_{signalName_to_process}.csv"
-            reader_DF.to_csv(your_file_name_RC_LSC_RSC, index=False)
-            reader_DF = pd.read_csv(your_file_name_RC_LSC_RSC)
-
-            y_true = reader_DF["GT_RC_LSC_RSC"]
-            y_pred = reader_DF[signalName_to_process]
-
-            if os.path.exists(your_file_name_RC_LSC_RSC):
-                os.remove(your_file_name_RC_LSC_RSC)
-            else:
-                print(f"The file {your_file_name_RC_LSC_RSC} does not exist")
-
-            """
-            crosstab to calculate confusion matrix , Here getting TP only (as all matching GT and predicted values) ,
-            converting to list and returning it.
-            """
-
-            crosstab_val = pd.crosstab(y_true, y_pred)
-            crosstab_val = crosstab_val.values[0].tolist()
-            return crosstab_val
-
         """Reading all signals from readers """
         reader_DF = self.readers[READER_NAME].signals
 
-        """ adding column with Front camera  GT values as 1 """
-        reader_DF["GT_FC"] = reader_DF.apply(lambda GT_FC: 1, axis=1)
-
-        """ adding column with Rear camera , Left side Camera,
-        Right Side camera, Rear camera GT values as 0 """
-
-        reader_DF["GT_RC_LSC_RSC"] = reader_DF.apply(lambda GT_RC_LSC_RSC: 0, axis=1)
         self.result.details.update(
             {
                 "Plots": [],
@@ -184,64 +151,15 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
         """plots and remarks need to have the same length """
         plot_titles, plots, remarks = rep([], 3)
 
-        """get unique value from column  GroundTruth """
-        unique_GroundTruth = reader_DF["GT_FC"].unique()
+        """confusion matrices of all cameras, FC is blocked and LSC, RC, RSC are clear during the whole recording"""
+        camera_results = BlockageMetricsEngine(GROUND_TRUTH).evaluate(reader_DF)
+        fc_confusion = camera_results["FC"].confusion
+        TN, FP, FN, TP = fc_confusion.to_list()
 
-        """ convert numpy GroundTruth array to list """
-        unique_GroundTruth_list = list(unique_GroundTruth)
-
-        try:
-            # column_names = reader_DF.columns
-            unique_fDetection = reader_DF["FC_detectionStatus"].unique()
-            """convert numpy fDetection array to list"""
-            unique_fDetection_list = list(unique_fDetection)
-        except Exception as e:
-            print(f"Exception found as : {e}")
-
-        """ for labels joined and get unique values from lists unique_GroundTruth_list
-        and unique_fDetection_list
-        """
-        labels_list = list(set(unique_GroundTruth_list + unique_fDetection_list))
-        """sort labels """
-        labels_list.sort()
-
-        reader_DF.to_csv("your_file_name.csv", index=False)
-        reader_DF = pd.read_csv("your_file_name.csv")
-
-        y_true = reader_DF["GT_FC"]
-        y_pred = reader_DF["FC_detectionStatus"]
-
-        """ remove temp file """
-        if os.path.exists("your_file_name.csv"):
-            os.remove("your_file_name.csv")
-        else:
-            print("The file 'your_file_name.csv' does not exist")
-
-        labels = labels_list
-
-        """ confusion_matrix calculation"""
-        cross_tab = pd.crosstab(y_true, y_pred)
-        """ convert to data frame """
-        cm_df = pd.DataFrame(cross_tab, index=labels, columns=labels)
-        """ convert value NA to 0 in dataframe """
-        cm_df = cm_df.fillna(0)
-        """ convert value float to INT in dataframe """
-        cm_df = cm_df.astype(int)
-
-        TN = cm_df.iloc[0].tolist()[0]
-        FP = cm_df.iloc[0].tolist()[1]
-        FN = cm_df.iloc[1].tolist()[0]
-        TP = cm_df.iloc[1].tolist()[1]
-
-        N = FP + TN
-        P = TP + FN
-        if P:
-            TPR = TP / P
-            FPR = FP / P
-
-        if N:
-            TNR = TN / N
-            FNR = FN / N
+        N = fc_confusion.negatives
+        P = fc_confusion.positives
+        TPR, FNR = fc_confusion.tpr, fc_confusion.fnr
+        TNR, FPR = fc_confusion.tnr, fc_confusion.fpr
 
         """ Confusion Matrix Bar Chart """
         Matrix_name = ["TN", "FP", "FN", "TP"]
@@ -295,8 +213,8 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
 
         elif P:
             """Confusion Matrix Bar Chart"""
-            Matrix_Name_Rate = ["TPR", "FPR"]
-            Matrix_Name_Values = [TPR, FPR]
+            Matrix_Name_Rate = ["TPR", "FNR"]
+            Matrix_Name_Values = [TPR, FNR]
 
             fig2 = go.Figure(
                 data=[
@@ -320,8 +238,8 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
 
         elif N:
             """Confusion Matrix Bar Chart"""
-            Matrix_Name_Rate = ["TNR", "FNR"]
-            Matrix_Name_Values = [TNR, FNR]
+            Matrix_Name_Rate = ["TNR", "FPR"]
+            Matrix_Name_Values = [TNR, FPR]
 
             fig2 = go.Figure(
                 data=[
@@ -349,7 +267,7 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
         print(f"Accuracy is : {Accuracy}")
 
         """
-        Accuracy = (TP + TN) / (TP + TN + FP + FN)
+        Accuracy = fc_confusion.accuracy
 
         """
         Precision is a measure of how accurate a model’s positive predictions are. It is defined as the ratio
@@ -357,20 +275,20 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
         Precision=TP/(TP+FP)
 
         """
-        Precision = TP / (TP + FP)
+        Precision = fc_confusion.precision
 
         """
         Recall measures the effectiveness of a classification model in identifying all relevant instances from a dataset.
         It is the ratio of the number of true positive (TP) instances to the sum of true positive and false negative (FN) instances.
         Recall=TP/(TP+FN)
         """
-        Recall = TP / (TP + FN)
+        Recall = fc_confusion.recall
 
         """
         F1-score is used to evaluate the overall performance of a classification model. It is the harmonic mean of precision and recall,
         F1-Score=(2*Precision*Recall)/(Precision+Recall)
         """
-        F1_Score = (2 * Precision * Recall) / (Precision + Recall)
+        F1_Score = fc_confusion.f1_score
 
         """
         Specificity is another important metric in the evaluation of classification models, particularly in binary classification.
@@ -403,24 +321,9 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
         )
         fig3.update_layout(title_text="FC_detectionStatus Matrix for  Accuracy, Precision, Recall, F1_Score")
 
-        """ called method calculate_crosstab_RC_LSC_RSC
-        to calculate confusion matrix for camera RC, LSC, RSC
-        """
-        detectionNameList = [
-            "LSC_detectionStatus",
-            "RC_detectionStatus",
-            "RSC_detectionStatus",
-        ]
-        detectionNameListValue = []
-        for each_detectionNameList in detectionNameList:
-            signalName_to_process = each_detectionNameList
-            retuen_val = calculate_crosstab_RC_LSC_RSC(self, reader_DF, signalName_to_process)
-            detectionNameListValue.append(retuen_val)
-
-        flat_list = []
-        for sublist in detectionNameListValue:
-            for element in sublist:
-                flat_list.append(element)
+        """number of samples matching the GT (not blocked) for cameras LSC, RC, RSC"""
+        detectionNameList = [detection_column(camera) for camera in ("LSC", "RC", "RSC")]
+        flat_list = [camera_results[camera].confusion.correct for camera in ("LSC", "RC", "RSC")]
 
         """ Confusion Matrix Bar Chart """
         fig4 = go.Figure(
@@ -450,6 +353,19 @@ class ConfusionMatrixWithFrontCameraBlockage(TestStep):
         plots.append(fig4)
         remarks.append("No matching output was found")
 
+        summary_df = BlockageMetricsEngine.summary(camera_results).round(3)
+        fig5 = go.Figure(
+            data=[
+                go.Table(
+                    header=dict(values=list(summary_df.columns)),
+                    cells=dict(values=[summary_df[col].tolist() for col in summary_df.columns]),
+                )
+            ]
+        )
+        plot_titles.append("Blockage metrics per camera")
+        plots.append(fig5)
+        remarks.append("Time to detect is given in the time base of the reader index")
+
         result_df = {
             "Verdict": {
                 "value": test_result.title(),
@@ -0,0 +1,272 @@
+"""Camera blockage classification metrics computed in memory with integer coded bincounts"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+CAMERAS = ("FC", "LSC", "RC", "RSC")
+
+
+class DetectionStatus(IntEnum):
+    """Full blockage detection status (pBlockageOutput.sFullBlockage.detectionStatus)"""
+
+    NOT_BLOCKED = 0
+    BLOCKED = 1
+
+
+def detection_column(camera: str) -> str:
+    """Name of the full blockage detection status column of a camera"""
+    return f"{camera}_detectionStatus"
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else float("nan")
+
+
+@dataclass
+class ConfusionMatrix:
+    """Binary confusion matrix, the positive class is camera blocked"""
+
+    tn: int = 0
+    fp: int = 0
+    fn: int = 0
+    tp: int = 0
+
+    @classmethod
+    def from_labels(cls, gt: np.ndarray, pred: np.ndarray) -> "ConfusionMatrix":
+        """Count the four cells of boolean GT/prediction arrays with a single bincount"""
+        codes = gt.astype(np.int64) * 2 + pred.astype(np.int64)
+        tn, fp, fn, tp = np.bincount(codes, minlength=4)[:4].tolist()
+        return cls(tn, fp, fn, tp)
+
+    def __add__(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        return ConfusionMatrix(self.tn + other.tn, self.fp + other.fp, self.fn + other.fn, self.tp + other.tp)
+
+    @property
+    def positives(self) -> int:
+        """Number of GT blocked samples"""
+        return self.tp + self.fn
+
+    @property
+    def negatives(self) -> int:
+        """Number of GT not blocked samples"""
+        return self.tn + self.fp
+
+    @property
+    def total(self) -> int:
+        """Number of evaluated samples"""
+        return self.positives + self.negatives
+
+    @property
+    def correct(self) -> int:
+        """Number of samples where the prediction matches the GT"""
+        return self.tp + self.tn
+
+    @property
+    def tpr(self) -> float:
+        """True positive rate TP / P"""
+        return _ratio(self.tp, self.positives)
+
+    @property
+    def fnr(self) -> float:
+        """False negative rate FN / P"""
+        return _ratio(self.fn, self.positives)
+
+    @property
+    def tnr(self) -> float:
+        """True negative rate (specificity) TN / N"""
+        return _ratio(self.tn, self.negatives)
+
+    @property
+    def fpr(self) -> float:
+        """False positive rate FP / N"""
+        return _ratio(self.fp, self.negatives)
+
+    @property
+    def accuracy(self) -> float:
+        """(TP + TN) / total"""
+        return _ratio(self.correct, self.total)
+
+    @property
+    def precision(self) -> float:
+        """TP / (TP + FP)"""
+        return _ratio(self.tp, self.tp + self.fp)
+
+    @property
+    def recall(self) -> float:
+        """TP / (TP + FN), same as tpr"""
+        return self.tpr
+
+    @property
+    def f1_score(self) -> float:
+        """Harmonic mean of precision and recall"""
+        return _ratio(2 * self.tp, 2 * self.tp + self.fp + self.fn)
+
+    def to_list(self) -> List[int]:
+        """Cells in the order TN, FP, FN, TP"""
+        return [self.tn, self.fp, self.fn, self.tp]
+
+
+@dataclass
+class BlockageGroundTruth:
+    """
+    Ground truth blockage intervals per camera.
+
+    Intervals are closed [start, end] in the time base of the evaluated data (dataframe index or time column).
+    Cameras without intervals are considered not blocked for the whole recording.
+    """
+
+    intervals: Dict[str, List[Tuple[float, float]]] = field(default_factory=dict)
+
+    @classmethod
+    def whole_recording(cls, blocked_cameras: Iterable[str]) -> "BlockageGroundTruth":
+        """GT where the given cameras are blocked during the complete recording"""
+        return cls({camera: [(-np.inf, np.inf)] for camera in blocked_cameras})
+
+    def bounds(self, camera: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted start and end arrays of a camera with overlapping intervals merged"""
+        spans = sorted(self.intervals.get(camera, []))
+        starts, ends = [], []
+        for start, end in spans:
+            if starts and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return np.asarray(starts, dtype=float), np.asarray(ends, dtype=float)
+
+    def labels(self, camera: str, times: np.ndarray) -> np.ndarray:
+        """Boolean GT blocked label of every timestamp"""
+        starts, ends = self.bounds(camera)
+        if starts.size == 0:
+            return np.zeros(len(times), dtype=bool)
+        idx = np.searchsorted(starts, times, side="right") - 1
+        return (idx >= 0) & (times <= ends[np.clip(idx, 0, None)])
+
+
+@dataclass
+class CameraBlockageResult:
+    """Accumulated evaluation of one camera"""
+
+    camera: str
+    confusion: ConfusionMatrix
+    interval_starts: np.ndarray
+    detection_times: np.ndarray  # first blocked detection per GT interval, NaN if not detected
+
+    @property
+    def time_to_detect(self) -> np.ndarray:
+        """Delay between the (first evaluated sample of a) GT interval and the first blocked detection"""
+        return self.detection_times - self.interval_starts
+
+
+class BlockageMetricsEngine:
+    """
+    Evaluate the blockage detection of several cameras against a GT interval specification.
+
+    Data can be given at once with ``evaluate`` or chunk by chunk with ``feed`` followed by ``results``;
+    only the counts and the first detection per GT interval are kept between chunks.
+    """
+
+    def __init__(
+        self,
+        ground_truth: BlockageGroundTruth,
+        cameras: Sequence[str] = CAMERAS,
+        time_column: Optional[str] = None,
+        blocked_status: int = DetectionStatus.BLOCKED,
+    ):
+        """
+        Initialize the engine.
+
+        :param ground_truth: GT blockage intervals per camera.
+        :param cameras: Cameras to evaluate, their status is read from "<camera>_detectionStatus".
+        :param time_column: Column holding the time base of the GT intervals, the dataframe index if None.
+        :param blocked_status: Detection status value meaning "blocked".
+        """
+        self.ground_truth = ground_truth
+        self.cameras = list(cameras)
+        self.time_column = time_column
+        self.blocked_status = blocked_status
+        self.reset()
+
+    def reset(self):
+        """Drop all accumulated data."""
+        self._confusion = {camera: ConfusionMatrix() for camera in self.cameras}
+        self._bounds = {camera: self.ground_truth.bounds(camera) for camera in self.cameras}
+        self._first_gt = {camera: np.full(len(self._bounds[camera][0]), np.nan) for camera in self.cameras}
+        self._first_detection = {camera: np.full(len(self._bounds[camera][0]), np.nan) for camera in self.cameras}
+
+    def _times(self, df: pd.DataFrame) -> np.ndarray:
+        times = df.index if self.time_column is None else df[self.time_column]
+        return np.asarray(times, dtype=float)
+
+    def feed(self, df: pd.DataFrame):
+        """Accumulate the confusion matrices and detection times of one chunk."""
+        if df.empty:
+            return
+        times = self._times(df)
+        for camera in self.cameras:
+            gt = self.ground_truth.labels(camera, times)
+            pred = df[detection_column(camera)].to_numpy() == self.blocked_status
+            self._confusion[camera] = self._confusion[camera] + ConfusionMatrix.from_labels(gt, pred)
+
+            starts, ends = self._bounds[camera]
+            if starts.size == 0:
+                continue
+            self._update_first_times(self._first_gt[camera], starts, ends, times[gt])
+            self._update_first_times(self._first_detection[camera], starts, ends, times[gt & pred])
+
+    @staticmethod
+    def _update_first_times(first: np.ndarray, starts: np.ndarray, ends: np.ndarray, times: np.ndarray):
+        """Store the first of the (sorted) times inside every interval that has no time yet"""
+        if times.size == 0:
+            return
+        pos = np.searchsorted(times, starts, side="left")
+        found = pos < times.size
+        candidate = np.where(found, times[np.clip(pos, 0, times.size - 1)], np.nan)
+        update = found & (candidate <= ends) & np.isnan(first)
+        first[update] = candidate[update]
+
+    def results(self) -> Dict[str, CameraBlockageResult]:
+        """Return the accumulated result of every camera."""
+        return {
+            camera: CameraBlockageResult(
+                camera=camera,
+                confusion=self._confusion[camera],
+                interval_starts=self._first_gt[camera].copy(),
+                detection_times=self._first_detection[camera].copy(),
+            )
+            for camera in self.cameras
+        }
+
+    def evaluate(self, df: pd.DataFrame) -> Dict[str, CameraBlockageResult]:
+        """Evaluate a complete recording."""
+        self.reset()
+        self.feed(df)
+        return self.results()
+
+    @staticmethod
+    def summary(results: Dict[str, CameraBlockageResult]) -> pd.DataFrame:
+        """One row per camera with the confusion matrix, the derived rates and the mean time to detect"""
+        rows = []
+        for camera, result in results.items():
+            cm = result.confusion
+            ttd = result.time_to_detect
+            rows.append(
+                {
+                    "Camera": camera,
+                    "TN": cm.tn,
+                    "FP": cm.fp,
+                    "FN": cm.fn,
+                    "TP": cm.tp,
+                    "Accuracy": cm.accuracy,
+                    "Precision": cm.precision,
+                    "Recall": cm.recall,
+                    "F1_Score": cm.f1_score,
+                    "Detected intervals": f"{int(np.sum(~np.isnan(ttd)))}/{ttd.size}",
+                    "Mean time to detect": float(np.nanmean(ttd)) if np.any(~np.isnan(ttd)) else float("nan"),
+                }
+            )
+        return pd.DataFrame(rows)
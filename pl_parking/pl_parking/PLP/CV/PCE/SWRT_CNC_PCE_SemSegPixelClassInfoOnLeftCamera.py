@@ -24,7 +24,8 @@ from tsf.io.signals import SignalDefinition
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.CV.PCE.ft_helper as ft
-from pl_parking.PLP.CV.PCE.constants import BaseCtrl, PlotlyTemplate, SemSegLabel, SigStatus
+from pl_parking.PLP.CV.PCE.constants import BaseCtrl, PlotlyTemplate, SigStatus
+from pl_parking.PLP.CV.PCE.semseg_statistics import semseg_frame_statistics
 
 _log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
@@ -81,13 +82,6 @@ class PCESemsegClassInfoOnLeftCameraTestStep(TestStep):
     def __init__(self):
         """Initialize object attributes."""
         super().__init__()
-        self.idx = 0
-
-    def get_semseg_imagedata(self, row, camera):
-        """Get semseg image data"""
-        Semseg_Imagedata = int(row[f"SemSeg_imageData_{camera}", self.idx])
-        self.idx = self.idx + 1
-        return Semseg_Imagedata
 
     def process(self):
         """
@@ -126,28 +120,9 @@ class PCESemsegClassInfoOnLeftCameraTestStep(TestStep):
             # Hold the timestamps where the semseg class information is not in expected range
             if not df_filtered.empty:
                 # if 'semseg_sig_status == AL_SIG_STATE_OK' and 'Base_ctrl_opmode is == GS_BASE_OM_RUN'
-                for _, row in df_filtered.iterrows():
-                    pce = PCESemsegClassInfoOnLeftCameraTestStep()
-                    # get the semseg image data offset in every frame
-                    self.idx = int(row["SemSeg_imageDataOffset_lsc"])
-                    # maximum index of semseg image data
-                    maximum_index = self.idx + 532480
-                    # get the class information of each and every pixel
-                    Semseg_Imagedata = list(
-                        map(lambda x: pce.get_semseg_imagedata(row=row, camera="lsc"), range(self.idx, maximum_index))
-                    )
-                    np_Semseg_Imagedata = np.array(Semseg_Imagedata)
-                    # checks if each and every pixel is assigned with valid frame
-                    valid_class = np.logical_and(
-                        np_Semseg_Imagedata >= SemSegLabel.GRAPPA_SEMSEG_LABEL_BACKGROUND,
-                        np_Semseg_Imagedata <= SemSegLabel.GRAPPA_SEMSEG_LABEL_ROAD_SIGN,
-                    )
-                    if valid_class.size > 0 and all(valid_class):
-                        # if valid class is provided for each and every pixel
-                        list_passed.append(True)
-                    else:
-                        # if valid class is not provided for any of the pixel in frame
-                        list_passed.append(False)
+                # class histogram of every frame, all its pixels have to carry a valid class
+                statistics = semseg_frame_statistics(self.artifacts[0].file_path, df, "lsc")
+                list_passed = statistics.passed.tolist()
                 if all(list_passed):
                     # when valid class is provided for all pixels on semseg data output.
                     evaluation_result = "valid class is provided for all pixels on LSC semseg data output"
@@ -0,0 +1,137 @@
+"""
+Per frame class histograms of the GRAPPA semantic segmentation images.
+
+The image payload of every frame (``imageData`` from ``imageDataOffset`` on) is taken as a uint8 view of the
+recorded buffer and all frames of a batch are counted with a single ``np.bincount`` (frame * 256 + label). Only the
+compact histograms are kept, and they are cached per recording (content fingerprint) and camera, so reruns and other
+test cases on the same recording do not decode the images again.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from pl_parking.common_cache import combine_keys, file_fingerprint, load_or_build_table
+from pl_parking.PLP.CV.PCE.constants import BaseCtrl, SemSegLabel, SigStatus
+
+_log = logging.getLogger(__name__)
+
+CAMERAS = ("fc", "rc", "lsc", "rsc")
+SEMSEG_IMAGE_SIZE = 532480  # labels per frame
+NUM_CLASSES = SemSegLabel.GRAPPA_SEMSEG_LABEL_ROAD_SIGN + 1
+NUM_BINS = 256
+BATCH_PIXELS = 1 << 24  # labels counted per bincount call
+SEMSEG_CACHE_NAMESPACE = "semseg_histograms"
+SEMSEG_CACHE_VERSION = "1"
+CLASS_COLUMNS = [f"class_{label}" for label in range(NUM_CLASSES)]
+
+_memo: Dict[str, pd.DataFrame] = {}
+
+
+def select_frames(df: pd.DataFrame, camera: str) -> pd.DataFrame:
+    """Frames with signal state OK in run mode, the last sample of every semseg timestamp"""
+    frames = df[
+        (df[f"semseg_sig_status_{camera}"] == SigStatus.AL_SIG_STATE_OK)
+        & (df[f"Base_ctrl_opmode_{camera}"] == BaseCtrl.GS_BASE_OM_RUN)
+    ]
+    return frames.drop_duplicates(subset=[f"semseg_timestamp_{camera}"], keep="last")
+
+
+def image_labels(image_data) -> np.ndarray:
+    """
+    Image buffers (frames, bytes) as uint8 labels.
+
+    uint8 buffers are used as they are (a view, no copy); other dtypes are converted once, with the values outside
+    0..255 (and NaN) mapped to 255, which is an invalid label as well.
+    """
+    values = np.asarray(image_data)
+    if values.ndim == 1:
+        values = values[:, None]
+    if values.dtype == np.uint8:
+        return values
+    inside = (values >= 0) & (values < NUM_BINS)
+    return np.where(inside, values, NUM_BINS - 1).astype(np.uint8)
+
+
+def frame_histograms(labels: np.ndarray, offsets: np.ndarray, size: int = SEMSEG_IMAGE_SIZE) -> np.ndarray:
+    """
+    Label histogram (frames, 256) of the images labels[frame, offset : offset + size].
+
+    Labels missing because the buffer ends before offset + size are counted in the last bin (invalid).
+    """
+    frames, width = labels.shape
+    offsets = np.clip(np.asarray(offsets, dtype=np.int64), 0, width)
+    stops = np.minimum(offsets + size, width)
+    histograms = np.zeros((frames, NUM_BINS), dtype=np.int64)
+    batch = max(1, BATCH_PIXELS // max(size, 1))
+    # frames sharing the offset are counted together, the images are then plain slices of the buffer
+    for offset in np.unique(offsets):
+        rows = np.flatnonzero(offsets == offset)
+        stop = int(stops[rows[0]])
+        for start in range(0, len(rows), batch):
+            chunk = rows[start : start + batch]
+            keys = labels[chunk, offset:stop].astype(np.int64) + (np.arange(len(chunk)) * NUM_BINS)[:, None]
+            counts = np.bincount(keys.ravel(), minlength=len(chunk) * NUM_BINS)
+            histograms[chunk] = counts.reshape(len(chunk), NUM_BINS)
+    histograms[:, -1] += size - (stops - offsets)
+    return histograms
+
+
+def compute_statistics(df: pd.DataFrame, cameras: Iterable[str] = CAMERAS) -> pd.DataFrame:
+    """
+    Class histogram and invalid label count of every selected frame of the cameras present in df.
+
+    :return: One row per frame: camera, timestamp, class_0 ... class_11, invalid.
+    """
+    tables = []
+    for camera in cameras:
+        if f"SemSeg_imageData_{camera}" not in df or f"semseg_sig_status_{camera}" not in df:
+            continue
+        frames = select_frames(df, camera)
+        labels = image_labels(frames[f"SemSeg_imageData_{camera}"])
+        histograms = frame_histograms(labels, frames[f"SemSeg_imageDataOffset_{camera}"].to_numpy())
+        table = pd.DataFrame(histograms[:, :NUM_CLASSES], columns=CLASS_COLUMNS)
+        table.insert(0, "timestamp", frames[f"semseg_timestamp_{camera}"].to_numpy())
+        table.insert(0, "camera", camera)
+        table["invalid"] = histograms[:, NUM_CLASSES:].sum(axis=1)
+        tables.append(table)
+    if not tables:
+        return pd.DataFrame(columns=["camera", "timestamp", *CLASS_COLUMNS, "invalid"])
+    return pd.concat(tables, ignore_index=True)
+
+
+@dataclass
+class SemSegFrameStatistics:
+    """Histograms of the selected frames of one camera"""
+
+    table: pd.DataFrame
+
+    @property
+    def histograms(self) -> np.ndarray:
+        """Class counts (frames, classes)"""
+        return self.table[CLASS_COLUMNS].to_numpy()
+
+    @property
+    def invalid(self) -> np.ndarray:
+        """Number of labels outside the class range per frame"""
+        return self.table["invalid"].to_numpy()
+
+    @property
+    def passed(self) -> np.ndarray:
+        """True for the frames whose pixels all carry a valid class"""
+        return (self.invalid == 0) & (self.histograms.sum(axis=1) > 0)
+
+
+def semseg_frame_statistics(file_path: Optional[str], df: pd.DataFrame, camera: str) -> SemSegFrameStatistics:
+    """Statistics of one camera, computed once per recording and camera and then served from the cache."""
+    try:
+        key = combine_keys(file_fingerprint(file_path), camera, SEMSEG_IMAGE_SIZE, SEMSEG_CACHE_VERSION)
+    except (OSError, TypeError) as err:
+        _log.debug(f"SemSeg histograms of {file_path} not cached: {err}")
+        return SemSegFrameStatistics(compute_statistics(df, [camera]))
+    if key not in _memo:
+        _memo[key] = load_or_build_table(SEMSEG_CACHE_NAMESPACE, key, lambda: compute_statistics(df, [camera]))
+    return SemSegFrameStatistics(_memo[key])
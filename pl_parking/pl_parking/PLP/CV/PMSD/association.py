@@ -236,15 +236,16 @@ class Association:
     def simple_match(
         gt_lines: list[VehicleLine], detected_lines: list[VehicleLine]
     ) -> list[tuple[VehicleLine, VehicleLine, bool]]:
-        """Simple match"""
-        result: list[tuple[VehicleLine, VehicleLine, bool]] = []
+        """Simple match, each detected line is paired with its nearest GT line"""
+        from pl_parking.PLP.CV.PMSD.line_association import AssignmentMode, LineAssociationEngine
 
-        for line in detected_lines:
-            # not_matched_gt_lines = filter(lambda x: not any(x is gt for pre, gt, _ in result), gt_lines)
-            gt_line_candidate = min(gt_lines, key=line.hangout_distance_line)
-            result.append((line, gt_line_candidate, Association.true_positive(gt_line_candidate, line)))
+        engine = LineAssociationEngine(mode=AssignmentMode.NEAREST)
+        matches = engine.associate_frame(engine.lines_to_array(detected_lines), engine.lines_to_array(gt_lines))
 
-        return result
+        return [
+            (detected_lines[det_idx], gt_lines[gt_idx], bool(tp))
+            for det_idx, gt_idx, tp in zip(matches["det_idx"], matches["gt_idx"], matches["tp"])
+        ]
 
     @staticmethod
     def hangout_match(
@@ -0,0 +1,246 @@
+"""PMSD vectorized line association"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+from pl_parking.PLP.CV.PMSD.association import VehicleLine
+
+BOUNDARY_RADIUS = 0.5  # in meter unit, same as LineBoundary.for_line
+UNASSIGNABLE_COST = 1e9
+RESULT_COLUMNS = ["det_idx", "gt_idx", "cost", "dist_start", "dist_end", "dist_avg", "angle", "overlap", "tp"]
+
+
+class AssignmentMode(str, Enum):
+    """Enumerates the supported assignment strategies"""
+
+    HUNGARIAN = "hungarian"  # optimal one-to-one assignment
+    GREEDY = "greedy"  # one-to-one assignment by ascending cost
+    NEAREST = "nearest"  # each detection takes its nearest GT line (Association.simple_match)
+
+
+@dataclass
+class LineCostWeights:
+    """Weights of the association cost terms"""
+
+    distance: float = 1.0
+    angle: float = 1.0
+    overlap: float = 1.0
+
+
+@dataclass
+class LinePairMetrics:
+    """Pairwise metrics between detected (rows) and GT (columns) lines of one frame"""
+
+    dist_start: np.ndarray
+    dist_end: np.ndarray
+    angle: np.ndarray
+    overlap: np.ndarray
+    true_positive: np.ndarray
+
+    @property
+    def dist_avg(self) -> np.ndarray:
+        """Mean hangout distance of both endpoints"""
+        return (self.dist_start + self.dist_end) / 2
+
+
+@dataclass
+class LineAssociationEngine:
+    """Associates detected lines to GT lines using array operations only"""
+
+    mode: AssignmentMode = AssignmentMode.HUNGARIAN
+    hangout_threshold: float = 0.6
+    angle_threshold: float = 4.0
+    weights: LineCostWeights = field(default_factory=LineCostWeights)
+
+    @staticmethod
+    def lines_to_array(lines: Sequence[VehicleLine]) -> np.ndarray:
+        """Stack lines into an array of shape (N, 2, 2): line, endpoint, xy"""
+        if len(lines) == 0:
+            return np.empty((0, 2, 2), dtype=float)
+        return np.array([[(line.start.x, line.start.y), (line.end.x, line.end.y)] for line in lines], dtype=float)
+
+    @staticmethod
+    def point_segment_distance(points: np.ndarray, seg_start: np.ndarray, seg_end: np.ndarray) -> np.ndarray:
+        """Distance of points (D, 2) to segments (G, 2) -> (D, G), see VehicleLine.hangout_distance_point"""
+        seg = seg_end - seg_start
+        seg_len2 = np.einsum("gi,gi->g", seg, seg)
+        rel = points[:, None, :] - seg_start[None, :, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(seg_len2 > 0, np.einsum("dgi,gi->dg", rel, seg) / seg_len2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        closest = seg_start[None, :, :] + t[..., None] * seg[None, :, :]
+        return np.linalg.norm(points[:, None, :] - closest, axis=-1)
+
+    @staticmethod
+    def line_angles(det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+        """Folded angle in degrees [0, 90] between lines, see VehicleLine.angle"""
+        v_det = det[:, 0] - det[:, 1]
+        v_gt = gt[:, 0] - gt[:, 1]
+        norms = np.linalg.norm(v_det, axis=1)[:, None] * np.linalg.norm(v_gt, axis=1)[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos_theta = np.clip((v_det @ v_gt.T) / norms, -1.0, 1.0)
+        angle = np.degrees(np.arccos(cos_theta))
+        return np.where(angle < 90.0, angle, 180.0 - angle)
+
+    @staticmethod
+    def projection_overlap(det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+        """Fraction of every GT segment covered by the projection of every detected segment"""
+        seg = gt[:, 1] - gt[:, 0]
+        seg_len2 = np.einsum("gi,gi->g", seg, seg)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.einsum("dkgi,gi->dkg", det[:, :, None, :] - gt[None, None, :, 0], seg) / seg_len2
+        lo = np.clip(t.min(axis=1), 0.0, 1.0)
+        hi = np.clip(t.max(axis=1), 0.0, 1.0)
+        return np.nan_to_num(hi - lo, nan=0.0)
+
+    @staticmethod
+    def boundary_true_positive(det: np.ndarray, gt: np.ndarray) -> np.ndarray:
+        """Vectorized LineBoundary.true_positive for every (detected, GT) pair -> (D, G) bool"""
+        dir_vec = gt[:, 0] - gt[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dir_vec = dir_vec / np.linalg.norm(dir_vec, axis=1)[:, None] * BOUNDARY_RADIUS
+        norm_vec = np.stack((-dir_vec[:, 1], dir_vec[:, 0]), axis=1)
+        corners = np.stack(
+            (
+                gt[:, 0] + dir_vec - norm_vec,
+                gt[:, 0] + dir_vec + norm_vec,
+                gt[:, 1] - dir_vec + norm_vec,
+                gt[:, 1] - dir_vec - norm_vec,
+            ),
+            axis=1,
+        )  # (G, 4, 2)
+
+        def point_in(points: np.ndarray) -> np.ndarray:
+            p_c0 = points[:, None, :] - corners[None, :, 0]
+            c1_c0 = corners[:, 1] - corners[:, 0]
+            c3_c0 = corners[:, 3] - corners[:, 0]
+            a = np.einsum("dgi,gi->dg", p_c0, c1_c0)
+            b = np.einsum("dgi,gi->dg", p_c0, c3_c0)
+            return (
+                (a > 0)
+                & (a < np.einsum("gi,gi->g", c1_c0, c1_c0))
+                & (b > 0)
+                & (b < np.einsum("gi,gi->g", c3_c0, c3_c0))
+            )
+
+        def inside(point: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+            sqr_length = np.sum((start - end) ** 2, axis=-1)
+            return sqr_length >= np.sum((point - start) ** 2, axis=-1) + np.sum((point - end) ** 2, axis=-1)
+
+        # LineBoundary.line_crossing only checks the first three edges of the rectangle
+        crossing = np.zeros((det.shape[0], gt.shape[0]), dtype=bool)
+        det_start = det[:, None, 0]
+        det_end = det[:, None, 1]
+        for edge in range(3):
+            b_start = corners[None, :, edge]
+            b_end = corners[None, :, edge + 1]
+            da = b_end - b_start
+            db = det_end - det_start
+            dp = b_start - det_start
+            dap = np.stack((-da[..., 1], da[..., 0]), axis=-1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.sum(dap * dp, axis=-1) / np.sum(dap * db, axis=-1)
+                intersect = scale[..., None] * db + det_start
+                crossing |= inside(intersect, b_start, b_end) & inside(intersect, det_start, det_end)
+
+        return crossing | point_in(det[:, 0]) | point_in(det[:, 1])
+
+    def pair_metrics(self, det: np.ndarray, gt: np.ndarray) -> LinePairMetrics:
+        """Compute all pairwise metrics of one frame with broadcasting"""
+        return LinePairMetrics(
+            dist_start=self.point_segment_distance(det[:, 0], gt[:, 0], gt[:, 1]),
+            dist_end=self.point_segment_distance(det[:, 1], gt[:, 0], gt[:, 1]),
+            angle=self.line_angles(det, gt),
+            overlap=self.projection_overlap(det, gt),
+            true_positive=self.boundary_true_positive(det, gt),
+        )
+
+    def cost_matrix(self, metrics: LinePairMetrics) -> np.ndarray:
+        """Combine metrics into one cost matrix, gated pairs get UNASSIGNABLE_COST"""
+        cost = (
+            self.weights.distance * metrics.dist_avg / self.hangout_threshold
+            + self.weights.angle * metrics.angle / self.angle_threshold
+            + self.weights.overlap * (1.0 - metrics.overlap)
+        )
+        gated = (metrics.dist_avg > self.hangout_threshold) | (metrics.angle > self.angle_threshold)
+        return np.where(gated | ~np.isfinite(cost), UNASSIGNABLE_COST, cost)
+
+    @staticmethod
+    def _greedy(cost: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(cost, axis=None, kind="stable")
+        rows, cols = np.unravel_index(order, cost.shape)
+        used_rows = np.zeros(cost.shape[0], dtype=bool)
+        used_cols = np.zeros(cost.shape[1], dtype=bool)
+        sel_rows, sel_cols = [], []
+        for row, col in zip(rows, cols):
+            if used_rows[row] or used_cols[col]:
+                continue
+            used_rows[row] = used_cols[col] = True
+            sel_rows.append(row)
+            sel_cols.append(col)
+            if used_rows.all() or used_cols.all():
+                break
+        return np.array(sel_rows, dtype=int), np.array(sel_cols, dtype=int)
+
+    @staticmethod
+    def _nearest(metrics: LinePairMetrics) -> tuple[np.ndarray, np.ndarray]:
+        # min(gt_lines, key=line.hangout_distance_line) compares (dist_start, dist_end) tuples
+        dist_start = metrics.dist_start
+        is_min = dist_start == dist_start.min(axis=1, keepdims=True)
+        cols = np.argmin(np.where(is_min, metrics.dist_end, np.inf), axis=1)
+        return np.arange(dist_start.shape[0]), cols
+
+    def associate_frame(self, det: np.ndarray, gt: np.ndarray) -> pd.DataFrame:
+        """Associate one frame of stacked (N, 2, 2) detected and GT lines
+
+        Every detection appears once in HUNGARIAN/NEAREST mode; pairs rejected by the gates are kept with tp=False.
+        """
+        if len(det) == 0 or len(gt) == 0:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+
+        metrics = self.pair_metrics(det, gt)
+        cost = self.cost_matrix(metrics)
+        if self.mode == AssignmentMode.HUNGARIAN:
+            rows, cols = linear_sum_assignment(cost)
+        elif self.mode == AssignmentMode.GREEDY:
+            rows, cols = self._greedy(cost)
+        else:
+            rows, cols = self._nearest(metrics)
+
+        if self.mode == AssignmentMode.NEAREST:
+            tp = metrics.true_positive[rows, cols]
+        else:
+            tp = cost[rows, cols] < UNASSIGNABLE_COST
+
+        return pd.DataFrame(
+            {
+                "det_idx": rows,
+                "gt_idx": cols,
+                "cost": cost[rows, cols],
+                "dist_start": metrics.dist_start[rows, cols],
+                "dist_end": metrics.dist_end[rows, cols],
+                "dist_avg": metrics.dist_avg[rows, cols],
+                "angle": metrics.angle[rows, cols],
+                "overlap": metrics.overlap[rows, cols],
+                "tp": tp,
+            },
+            columns=RESULT_COLUMNS,
+        )
+
+    def associate_recording(
+        self, frames: Iterable[tuple[Sequence[VehicleLine], Sequence[VehicleLine]]]
+    ) -> pd.DataFrame:
+        """Associate a whole recording given as an iterable of (gt_lines, detected_lines) per frame"""
+        results = []
+        for frame_idx, (gt_lines, detected_lines) in enumerate(frames):
+            frame_result = self.associate_frame(self.lines_to_array(detected_lines), self.lines_to_array(gt_lines))
+            frame_result.insert(0, "frame", frame_idx)
+            results.append(frame_result)
+        if not results:
+            return pd.DataFrame(columns=["frame", *RESULT_COLUMNS])
+        return pd.concat(results, ignore_index=True)
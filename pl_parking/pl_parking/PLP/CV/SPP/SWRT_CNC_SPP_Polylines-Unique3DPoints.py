@@ -14,10 +14,6 @@ from pl_parking.PLP.CV.SPP.constants import SensorSource, SppSigStatus
 from pl_parking.PLP.CV.SPP.ft_helper import (
     SPPPreprocessor,
     SPPSignals,
-    extract_polylines,
-    get_number_of_polygons,
-    get_number_of_polylines,
-    get_polylines_sig_status,
 )
 
 TSF_BASE = os.path.abspath(os.path.join(__file__, "..", ".."))
@@ -94,20 +90,20 @@ class SppPolylineUniquePointsTestStep(TestStep):
             SensorSource.SPP_RSC_DATA: DATA_NOK,
         }
 
-        cameras_from_preprocessor, reader_df = self.pre_processors["check_signals"]
+        cameras_from_preprocessor, _ = self.pre_processors["check_signals"]
         for camera, pre_processor_result in cameras_from_preprocessor.items():
             eval_cond = False
             cam_evaluation = " ".join("All detected polylines are described by a set of unique 3D points".split())
 
-            # get the availability of the signals
-            signals_available, list_of_failed = pre_processor_result[0]
+            # get the availability of the signals and the polylines extracted by the preprocessor
+            (signals_available, list_of_failed), camera_polylines = pre_processor_result
 
             if signals_available:
-                # loop over the dataframe
-                for frame, row in reader_df.iterrows():
-                    polylines_sig_status = get_polylines_sig_status(camera, row)
-                    number_of_polygons = get_number_of_polygons(camera, row)
-                    number_of_polylines = get_number_of_polylines(camera, row)
+                # loop over the frames
+                for position, frame in enumerate(camera_polylines.frames):
+                    polylines_sig_status = camera_polylines.sig_status[position]
+                    number_of_polygons = int(camera_polylines.number_of_polygons[position])
+                    number_of_polylines = int(camera_polylines.number_of_polylines[position])
 
                     if (
                         polylines_sig_status == SppSigStatus.AL_SIG_STATE_OK
@@ -117,7 +113,7 @@ class SppPolylineUniquePointsTestStep(TestStep):
                         eval_cond = True
                         start_index = number_of_polygons
                         end_index = number_of_polygons + number_of_polylines
-                        polylines = extract_polylines(camera=camera, start=start_index, end=end_index, row=row)
+                        polylines = camera_polylines.polylines(position, start_index, end_index)
 
                         for polyline_index, polyline in enumerate(polylines):
                             # Use numpy.unique with axis=0 to get unique 3D points and their counts
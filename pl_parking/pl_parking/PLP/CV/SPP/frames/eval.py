@@ -1,9 +1,13 @@
 """Frame Evaluation module for SPP"""
 
 import logging
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict, List
 
 import matplotlib.pyplot as plt
+import numpy as np
+import shapely
 from shapely.geometry import Polygon
 
 from pl_parking.PLP.CV.SPP.constants import SppKPI
@@ -12,6 +16,79 @@ _log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 
+@dataclass
+class FramePolygons:
+    """
+    All polygons of one side (GT or SIM) of a frame as a shapely geometry array.
+
+    Invalid polygons are repaired once with buffer(0); polygons that stay invalid are replaced by an empty
+    geometry and flagged in fixable. Objects without points or with less than 3 points are empty polygons.
+    """
+
+    geometries: np.ndarray
+    fixable: np.ndarray
+
+    @classmethod
+    def from_objects(cls, objects) -> "FramePolygons":
+        """Build the polygons of objects with a points attribute holding (x, y, z) tuples."""
+        xy = [np.asarray(obj.points, dtype=float).reshape(-1, 3)[:, :2] for obj in objects if obj.points is not None]
+        xy = [points for points in xy if len(points) >= 3]
+        geometries = np.full(len(xy), shapely.Polygon(), dtype=object)
+        if xy:
+            rings = shapely.linearrings(np.concatenate(xy), indices=np.repeat(np.arange(len(xy)), [len(p) for p in xy]))
+            geometries = shapely.polygons(rings)
+
+        fixable = np.ones(len(geometries), dtype=bool)
+        invalid = ~shapely.is_valid(geometries)
+        if invalid.any():
+            repaired = shapely.buffer(geometries[invalid], 0)
+            still_invalid = ~shapely.is_valid(repaired)
+            repaired[still_invalid] = shapely.Polygon()
+            geometries[invalid] = repaired
+            fixable[np.flatnonzero(invalid)[still_invalid]] = False
+        return cls(geometries, fixable)
+
+    def __len__(self):
+        return len(self.geometries)
+
+    @cached_property
+    def areas(self) -> np.ndarray:
+        """Area of every polygon"""
+        return shapely.area(self.geometries)
+
+    @property
+    def total_area(self) -> float:
+        """Sum of the polygon areas"""
+        return float(self.areas.sum())
+
+
+@dataclass
+class PolygonOverlaps:
+    """Intersecting GT/SIM polygon pairs of a frame with their intersection area and IoU."""
+
+    gt_index: np.ndarray
+    sim_index: np.ndarray
+    intersection_areas: np.ndarray
+    iou: np.ndarray
+
+    @classmethod
+    def compute(cls, gt: FramePolygons, sim: FramePolygons) -> "PolygonOverlaps":
+        """Find the candidate pairs with an STRtree on the SIM polygons and compute all intersections at once."""
+        if len(gt) == 0 or len(sim) == 0:
+            empty = np.empty(0)
+            return cls(empty.astype(int), empty.astype(int), empty, empty)
+        gt_index, sim_index = shapely.STRtree(sim.geometries).query(gt.geometries, predicate="intersects")
+        intersection_areas = shapely.area(shapely.intersection(gt.geometries[gt_index], sim.geometries[sim_index]))
+        union_areas = gt.areas[gt_index] + sim.areas[sim_index] - intersection_areas
+        iou = np.divide(intersection_areas, union_areas, out=np.zeros_like(intersection_areas), where=union_areas > 0)
+        return cls(gt_index, sim_index, intersection_areas, iou)
+
+    @property
+    def total_area(self) -> float:
+        """Sum of the pairwise intersection areas"""
+        return float(self.intersection_areas.sum())
+
+
 class EvalFrame:
     """Data class representing SPP frame evaluation."""
 
@@ -21,6 +98,7 @@ class EvalFrame:
         "Percentage_Coverage": -1,
         "Percentage_Extralap": -1,
         "Percentage_Underlap": -1,
+        "IoU": -1,
     }
 
     DEFAULT_POLYLINE_RESULTS = {
@@ -107,31 +185,35 @@ class EvalFrame:
         # Show the plot and keep the window open
         plt.show(block=True)
 
+    @cached_property
+    def gt_polygons(self) -> "FramePolygons":
+        """GT drivable area polygons of the frame, built and repaired once."""
+        return FramePolygons.from_objects(self.ground_truth_data.drivable_area)
+
+    @cached_property
+    def sim_polygons(self) -> "FramePolygons":
+        """SIM drivable area polygons of the frame, built and repaired once."""
+        return FramePolygons.from_objects(self.simulation_data.drivable_area)
+
     def evaluate_frame_polygons(self, timestamp) -> List[Dict]:
         """Evaluation of polygons."""
         # self.plot_polygons(timestamp)
-        data = []
-        total_gts_area = 0
-        total_overlap_area = 0
-        total_extralap_area = 0
-        total_underlap_area = 0
-
         frame_result = self.DEFAULT_POLYGON_RESULTS.copy()
         frame_result["Recording"] = self.recording
         frame_result["Timestamp"] = self.timestamp
 
-        gt_polygons = self.ground_truth_data.drivable_area
-        sim_polygons = self.simulation_data.drivable_area
-
-        for gt_polygon in gt_polygons:
-            gt_polygon_area, overlap_area, underlap_area = self.evaluate_gt_polygons(gt_polygon, sim_polygons)
-            total_gts_area += gt_polygon_area
-            total_overlap_area += overlap_area
-            total_underlap_area += underlap_area
+        gt_polygons = self.gt_polygons
+        sim_polygons = self.sim_polygons
+        if len(sim_polygons) > 0 and not gt_polygons.fixable.all():
+            raise ValueError("GT polygon is invalid and could not be fixed.")
+        if len(gt_polygons) > 0 and not sim_polygons.fixable.all():
+            raise ValueError("SIM polygon is invalid and could not be fixed.")
 
-        for sim_polygon in sim_polygons:
-            extralap_area = self.evaluate_sim_polygons(sim_polygon, gt_polygons)
-            total_extralap_area += extralap_area
+        overlaps = PolygonOverlaps.compute(gt_polygons, sim_polygons)
+        total_gts_area = gt_polygons.total_area
+        total_overlap_area = overlaps.total_area
+        total_underlap_area = total_gts_area - total_overlap_area
+        total_extralap_area = sim_polygons.total_area - total_overlap_area
 
         # Calculate the percentage of overlapping areas
         percentage_coverage = (total_overlap_area / total_gts_area) * 100 if total_gts_area > 0 else 0
@@ -145,29 +227,10 @@ class EvalFrame:
         percentage_extralap = (total_extralap_area / total_gts_area) * 100 if total_gts_area > 0 else 0
         frame_result["Percentage_Extralap"] = percentage_extralap
 
-        data.append(frame_result)
-
-        return data
-
-    def evaluate_gt_polygons(self, gt_polygon, sim_polygons):
-        """Evaluation of a GT polygon compared to SIM polygons."""
-        if len(sim_polygons) > 0:
-            gt_polygon = self.get_polygon(gt_polygon)
-            sim_polygons = [self.get_polygon(sim_polygon) for sim_polygon in sim_polygons]
-
-            gt_polygon_area, overlap_area, gt_underlap = self.get_gt_underlap(gt_polygon, sim_polygons)
-
-            return gt_polygon_area, overlap_area, gt_underlap
+        total_union_area = total_gts_area + sim_polygons.total_area - total_overlap_area
+        frame_result["IoU"] = total_overlap_area / total_union_area if total_union_area > 0 else 0
 
-    def evaluate_sim_polygons(self, sim_polygon, gt_polygons):
-        """Evaluation of a SIM polygon compared to GT polygons."""
-        if len(gt_polygons) > 0:
-            sim_polygon = self.get_polygon(sim_polygon)
-            gt_polygons = [self.get_polygon(gt_polygon) for gt_polygon in gt_polygons]
-
-            sim_extralap = self.get_sim_extralap(sim_polygon, gt_polygons)
-
-            return sim_extralap
+        return [frame_result]
 
     @staticmethod
     def overlapping_area(polygon1, polygon2):
@@ -197,56 +260,3 @@ class EvalFrame:
                 return None  # Return None if the polygon cannot be fixed
 
         return polygon
-
-    def get_gt_underlap(self, gt_polygon, sim_polygons):
-        """Compute area, overlap area and underlap area of a GT polygon"""
-        overlap_area = 0
-
-        # Fix the GT polygon
-        gt_polygon = self.fix_invalid_polygon(gt_polygon)
-        if gt_polygon is None:
-            raise ValueError("GT polygon is invalid and could not be fixed.")
-
-        # Compute the area of GT polygon
-        gt_polygon_area = gt_polygon.area
-
-        for _, sim_polygon in enumerate(sim_polygons):
-            # Fix the SIM polygon
-            sim_polygon = self.fix_invalid_polygon(sim_polygon)
-            if sim_polygon is None:
-                continue  # Skip if polygon cannot be fixed
-
-            # Compute the overlapping area
-            current_overlap_area = self.overlapping_area(gt_polygon, sim_polygon)
-            overlap_area += current_overlap_area
-
-        gt_underlap = gt_polygon_area - overlap_area
-
-        return gt_polygon_area, overlap_area, gt_underlap
-
-    def get_sim_extralap(self, sim_polygon, gt_polygons):
-        """Compute extralap area of a SIM polygon"""
-        overlap_area = 0
-        current_overlap_area = 0
-
-        # Fix the SIM polygon
-        sim_polygon = self.fix_invalid_polygon(sim_polygon)
-        if sim_polygon is None:
-            raise ValueError("SIM polygon is invalid and could not be fixed.")
-
-        # Compute the area of SIM polygon
-        sim_polygon_area = sim_polygon.area
-
-        for _, gt_polygon in enumerate(gt_polygons):
-            # Fix the GT polygon
-            gt_polygon = self.fix_invalid_polygon(gt_polygon)
-            if gt_polygon is None:
-                continue  # Skip if polygon cannot be fixed
-
-            # Compute the overlapping area
-            current_overlap_area = self.overlapping_area(gt_polygon, sim_polygon)
-            overlap_area += overlap_area
-
-        sim_extralap = sim_polygon_area - current_overlap_area
-
-        return sim_extralap
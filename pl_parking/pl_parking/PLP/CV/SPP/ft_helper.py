@@ -1,6 +1,9 @@
 """Helper file for SPP Test Scripts."""
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
@@ -24,115 +27,187 @@ _log = logging.getLogger(__name__)
 Empty_Dataframe = pd.DataFrame(columns=["timestamp", "bsig_index", "label_present"]).set_index("timestamp")
 
 
+CAMERA_PREFIXES = {
+    SensorSource.SPP_FC_DATA: "FC",
+    SensorSource.SPP_LSC_DATA: "LSC",
+    SensorSource.SPP_RC_DATA: "RC",
+    SensorSource.SPP_RSC_DATA: "RSC",
+}
+
+
+def camera_column(camera, name, index=None):
+    """
+    Return the SPPSignals column of a camera.
+
+    :param camera: SensorSource of the camera.
+    :param name: Column name without the camera prefix, e.g. "POLYLINES_NUM_VERTICES".
+    :param index: Array index appended to indexed columns.
+    """
+    column = getattr(SPPSignals.Columns, f"{CAMERA_PREFIXES[camera]}_{name}")
+    return column if index is None else column + str(index)
+
+
+def required_polyline_signals(camera):
+    """List the signals of a camera needed by the polyline test steps."""
+    list_of_required_signals = [
+        camera_column(camera, "POLYLINES_TIMESTAMP"),
+        camera_column(camera, "POLYLINES_SIG_STATUS"),
+        camera_column(camera, "POLYLINES_NUMBER_OF_POLYGONS"),
+        camera_column(camera, "POLYLINES_NUMBER_OF_POLYLINES"),
+        camera_column(camera, "SEMPOINTS_INDICATOR_FLAG"),
+        camera_column(camera, "SEMPOINTS_SIG_STATUS"),
+    ]
+    for polyline_idx in range(Polylines.SPP_MAX_NUMBER_POLYLINES):
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_VERTEX_START_INDEX", polyline_idx))
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_NUM_VERTICES", polyline_idx))
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_CONFIDENCE", polyline_idx))
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_SEMANTIC", polyline_idx))
+    for coord_idx in range(Polylines.SPP_MAX_NUMBER_VERTICES):
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_VERTEX_X_COORD", coord_idx))
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_VERTEX_Y_COORD", coord_idx))
+        list_of_required_signals.append(camera_column(camera, "POLYLINES_VERTEX_Z_COORD", coord_idx))
+    return list_of_required_signals
+
+
+@dataclass
+class CameraPolylines:
+    """
+    Polylines of all frames of one camera stored in flat arrays.
+
+    The entries of frame i are polyline_offsets[i]:polyline_offsets[i + 1] of the per polyline arrays, the points
+    of polyline j are point_offsets[j]:point_offsets[j + 1] of points. Polygons come first in every frame, as in
+    the pSppPolylines structure.
+    """
+
+    camera: str
+    frames: np.ndarray
+    sig_status: np.ndarray
+    number_of_polygons: np.ndarray
+    number_of_polylines: np.ndarray
+    polyline_offsets: np.ndarray
+    vertex_start_index: np.ndarray
+    num_vertices: np.ndarray
+    semantic: np.ndarray
+    confidence: np.ndarray
+    point_offsets: np.ndarray
+    points: np.ndarray
+    duration: float = 0.0
+
+    def frame_points(self, position, start, end):
+        """Points (n, 3) of the polylines [start, end) of the frame at the given position."""
+        first, last = self.polyline_offsets[position], self.polyline_offsets[position + 1]
+        return self.points[self.point_offsets[min(first + start, last)] : self.point_offsets[min(first + end, last)]]
+
+    def polylines(self, position, start, end):
+        """Polylines [start, end) of the frame at the given position, in the format of extract_polylines."""
+        first = self.polyline_offsets[position]
+        return [
+            tuple(map(tuple, self.points[self.point_offsets[first + idx] : self.point_offsets[first + idx + 1]]))
+            for idx in range(start, min(end, self.polyline_offsets[position + 1] - first))
+        ]
+
+
+def _columns(reader_df, camera, name, count):
+    return reader_df[[camera_column(camera, name, idx) for idx in range(count)]].to_numpy()
+
+
+def extract_camera_polylines(camera, reader_df):
+    """
+    Extract polygons and polylines of every frame of a camera into a CameraPolylines.
+
+    Only the used entries of each frame (numberOfPolygons + numberOfPolylines) and the vertex columns up to the
+    highest referenced vertex are read.
+    """
+    start_time = time.perf_counter()
+    header = reader_df[
+        [
+            camera_column(camera, "POLYLINES_SIG_STATUS"),
+            camera_column(camera, "POLYLINES_NUMBER_OF_POLYGONS"),
+            camera_column(camera, "POLYLINES_NUMBER_OF_POLYLINES"),
+        ]
+    ].to_numpy(dtype=np.int64)
+    sig_status, number_of_polygons, number_of_polylines = header.T
+
+    counts = np.clip(number_of_polygons + number_of_polylines, 0, Polylines.SPP_MAX_NUMBER_POLYLINES)
+    polyline_offsets = np.concatenate(([0], np.cumsum(counts)))
+    frame_of_polyline = np.repeat(np.arange(len(counts)), counts)
+    index_in_frame = np.arange(polyline_offsets[-1]) - polyline_offsets[frame_of_polyline]
+
+    def per_polyline(name):
+        return _columns(reader_df, camera, name, Polylines.SPP_MAX_NUMBER_POLYLINES)[frame_of_polyline, index_in_frame]
+
+    vertex_start_index = np.clip(per_polyline("POLYLINES_VERTEX_START_INDEX").astype(np.int64), 0, None)
+    vertex_start_index = np.minimum(vertex_start_index, Polylines.SPP_MAX_NUMBER_VERTICES)
+    num_vertices = per_polyline("POLYLINES_NUM_VERTICES").astype(np.int64)
+    num_vertices = np.clip(num_vertices, 0, Polylines.SPP_MAX_NUMBER_VERTICES - vertex_start_index)
+
+    point_offsets = np.concatenate(([0], np.cumsum(num_vertices)))
+    polyline_of_point = np.repeat(np.arange(len(num_vertices)), num_vertices)
+    index_in_polyline = np.arange(point_offsets[-1]) - point_offsets[polyline_of_point]
+    vertex_index = vertex_start_index[polyline_of_point] + index_in_polyline
+    used_vertices = int((vertex_start_index + num_vertices).max(initial=0))
+    frame_of_point = frame_of_polyline[polyline_of_point]
+    points = np.column_stack(
+        [
+            _columns(reader_df, camera, name, used_vertices).astype(float)[frame_of_point, vertex_index]
+            for name in ("POLYLINES_VERTEX_X_COORD", "POLYLINES_VERTEX_Y_COORD", "POLYLINES_VERTEX_Z_COORD")
+        ]
+    )
+
+    return CameraPolylines(
+        camera=camera,
+        frames=reader_df.index.to_numpy(),
+        sig_status=sig_status,
+        number_of_polygons=number_of_polygons,
+        number_of_polylines=number_of_polylines,
+        polyline_offsets=polyline_offsets,
+        vertex_start_index=vertex_start_index,
+        num_vertices=num_vertices,
+        semantic=per_polyline("POLYLINES_SEMANTIC"),
+        confidence=per_polyline("POLYLINES_CONFIDENCE"),
+        point_offsets=point_offsets,
+        points=points,
+        duration=time.perf_counter() - start_time,
+    )
+
+
 class SPPPreprocessor(PreProcessor):
-    """Preprocessor class to compute all data before the teststeps."""
+    """
+    Preprocessor class to compute all data before the teststeps.
+
+    The cameras are processed concurrently. For every camera the result holds the signal availability and,
+    if all signals are available, the extracted CameraPolylines. The time spent per camera is kept in
+    camera_timings.
+    """
+
+    def process_camera(self, camera, reader_df):
+        """Check the signals of one camera and extract its polylines."""
+        start_time = time.perf_counter()
+        availability = check_signals_availability(required_polyline_signals(camera), reader_df)
+        polylines = extract_camera_polylines(camera, reader_df) if availability[0] else None
+        return [availability, polylines], time.perf_counter() - start_time
 
     def pre_process(self):
         """Preprocess the data."""
         reader_df = self.readers[list(self.readers.keys())[0]]
 
-        cameras = {
-            SensorSource.SPP_FC_DATA: DATA_NOK,
-            SensorSource.SPP_LSC_DATA: DATA_NOK,
-            SensorSource.SPP_RC_DATA: DATA_NOK,
-            SensorSource.SPP_RSC_DATA: DATA_NOK,
-        }
-        cameras_to_be_returned = {
-            SensorSource.SPP_FC_DATA: [],
-            SensorSource.SPP_LSC_DATA: [],
-            SensorSource.SPP_RC_DATA: [],
-            SensorSource.SPP_RSC_DATA: [],
-        }
-
-        for camera, _ in cameras.items():
-            list_of_required_signals = []
-
-            if camera is SensorSource.SPP_FC_DATA:
-                list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_TIMESTAMP)
-                list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_SIG_STATUS)
-                list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_NUMBER_OF_POLYGONS)
-                list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_NUMBER_OF_POLYLINES)
-                list_of_required_signals.append(SPPSignals.Columns.FC_SEMPOINTS_INDICATOR_FLAG)
-                list_of_required_signals.append(SPPSignals.Columns.FC_SEMPOINTS_SIG_STATUS)
-
-                for polyline_idx in range(Polylines.SPP_MAX_NUMBER_POLYLINES):
-                    list_of_required_signals.append(
-                        SPPSignals.Columns.FC_POLYLINES_VERTEX_START_INDEX + str(polyline_idx)
-                    )
-                    list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_NUM_VERTICES + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_CONFIDENCE + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_SEMANTIC + str(polyline_idx))
-
-                for coord_idx in range(Polylines.SPP_MAX_NUMBER_VERTICES):
-                    list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_VERTEX_X_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_VERTEX_Y_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.FC_POLYLINES_VERTEX_Z_COORD + str(coord_idx))
-
-            elif camera is SensorSource.SPP_LSC_DATA:
-                list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_TIMESTAMP)
-                list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_SIG_STATUS)
-                list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_NUMBER_OF_POLYGONS)
-                list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_NUMBER_OF_POLYLINES)
-                list_of_required_signals.append(SPPSignals.Columns.LSC_SEMPOINTS_INDICATOR_FLAG)
-                list_of_required_signals.append(SPPSignals.Columns.LSC_SEMPOINTS_SIG_STATUS)
-
-                for polyline_idx in range(Polylines.SPP_MAX_NUMBER_POLYLINES):
-                    list_of_required_signals.append(
-                        SPPSignals.Columns.LSC_POLYLINES_VERTEX_START_INDEX + str(polyline_idx)
-                    )
-                    list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_NUM_VERTICES + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_CONFIDENCE + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_SEMANTIC + str(polyline_idx))
-
-                for coord_idx in range(Polylines.SPP_MAX_NUMBER_VERTICES):
-                    list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_VERTEX_X_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_VERTEX_Y_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.LSC_POLYLINES_VERTEX_Z_COORD + str(coord_idx))
-
-            elif camera is SensorSource.SPP_RC_DATA:
-                list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_TIMESTAMP)
-                list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_SIG_STATUS)
-                list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_NUMBER_OF_POLYGONS)
-                list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_NUMBER_OF_POLYLINES)
-                list_of_required_signals.append(SPPSignals.Columns.RC_SEMPOINTS_INDICATOR_FLAG)
-                list_of_required_signals.append(SPPSignals.Columns.RC_SEMPOINTS_SIG_STATUS)
-
-                for polyline_idx in range(Polylines.SPP_MAX_NUMBER_POLYLINES):
-                    list_of_required_signals.append(
-                        SPPSignals.Columns.RC_POLYLINES_VERTEX_START_INDEX + str(polyline_idx)
-                    )
-                    list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_NUM_VERTICES + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_CONFIDENCE + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_SEMANTIC + str(polyline_idx))
-
-                for coord_idx in range(Polylines.SPP_MAX_NUMBER_VERTICES):
-                    list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_VERTEX_X_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_VERTEX_Y_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RC_POLYLINES_VERTEX_Z_COORD + str(coord_idx))
-
-            elif camera is SensorSource.SPP_RSC_DATA:
-                list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_TIMESTAMP)
-                list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_SIG_STATUS)
-                list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_NUMBER_OF_POLYGONS)
-                list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_NUMBER_OF_POLYLINES)
-                list_of_required_signals.append(SPPSignals.Columns.RSC_SEMPOINTS_INDICATOR_FLAG)
-                list_of_required_signals.append(SPPSignals.Columns.RSC_SEMPOINTS_SIG_STATUS)
-
-                for polyline_idx in range(Polylines.SPP_MAX_NUMBER_POLYLINES):
-                    list_of_required_signals.append(
-                        SPPSignals.Columns.RSC_POLYLINES_VERTEX_START_INDEX + str(polyline_idx)
-                    )
-                    list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_NUM_VERTICES + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_CONFIDENCE + str(polyline_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_SEMANTIC + str(polyline_idx))
-
-                for coord_idx in range(Polylines.SPP_MAX_NUMBER_VERTICES):
-                    list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_VERTEX_X_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_VERTEX_Y_COORD + str(coord_idx))
-                    list_of_required_signals.append(SPPSignals.Columns.RSC_POLYLINES_VERTEX_Z_COORD + str(coord_idx))
-
-            # check the availability of the signals
-            cameras_to_be_returned[camera].append(check_signals_availability(list_of_required_signals, reader_df))
+        cameras = list(CAMERA_PREFIXES)
+        with ThreadPoolExecutor(max_workers=len(cameras)) as executor:
+            results = list(executor.map(lambda camera: self.process_camera(camera, reader_df), cameras))
+
+        # executor.map keeps the order of the cameras, so the merged result does not depend on the scheduling
+        cameras_to_be_returned = {}
+        self.camera_timings = {}
+        for camera, (camera_result, duration) in zip(cameras, results):
+            cameras_to_be_returned[camera] = camera_result
+            self.camera_timings[camera] = duration
+
+        slowest = max(self.camera_timings, key=self.camera_timings.get)
+        _log.info(
+            "SPP preprocessing per camera: "
+            + ", ".join(f"{camera}: {duration:.3f}s" for camera, duration in self.camera_timings.items())
+            + f" (slowest: {slowest})"
+        )
 
         return cameras_to_be_returned, reader_df
 
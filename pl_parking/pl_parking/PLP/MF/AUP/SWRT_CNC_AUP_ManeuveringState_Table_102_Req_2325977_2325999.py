@@ -45,6 +45,7 @@ from tsf.io.signals import SignalDefinition
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
+from pl_parking.common_event_index import screen_preconditions, screened_signals, trigger_precondition
 from pl_parking.common_ft_helper import MfCustomTestcaseReport, MfCustomTeststepReport
 from pl_parking.PLP.MF.AUP.SWRT_CNC_AUP_ManeuveringState_CancelAVG import convert_dict_to_pandas
 from pl_parking.PLP.MF.constants import AUPConstants as aup
@@ -102,6 +103,8 @@ class Signals(SignalDefinition):
 
 
 signals_obj = Signals()
+# recordings without the T2 signal manipulation did not run the scenario and are not assessed
+PRECONDITIONS = [trigger_precondition(signals_obj, Signals.Columns.REAR_CAM, 1)]
 
 """Each test step should have a test step definition.
 This will include step_ number, name, a short description and the type of expected result."""
@@ -116,7 +119,7 @@ This will include step_ number, name, a short description and the type of expect
     ),
     expected_result=BooleanResult(TRUE),
 )
-@register_signals(ALIAS, Signals)
+@register_signals(ALIAS, screened_signals(Signals, PRECONDITIONS))
 class SWRT_CNC_AUP_ManeuveringState_Table_102_Req_2325977_2325999_TS(TestStep):
     """testcase that can be tested by a simple pass/fail test.
     This is a required docstring in which you can add more details about what you verify in test step
@@ -150,6 +153,8 @@ class SWRT_CNC_AUP_ManeuveringState_Table_102_Req_2325977_2325999_TS(TestStep):
         self.result.details.update(
             {"Plots": [], "Plot_titles": [], "Remarks": [], "file_name": os.path.basename(self.artifacts[0].file_path)}
         )
+        if not screen_preconditions(self, PRECONDITIONS):
+            return
         try:
             time_threshold_2 = None
 
@@ -1,4 +1,5 @@
 """The goal of this TC is to validate the system behavior in case the front right door is open during maneuvering state."""
+
 import logging
 import os
 import sys
@@ -15,7 +16,6 @@ from tsf.core.results import FALSE, TRUE, BooleanResult
 from tsf.core.testcase import (
     TestCase,
     TestStep,
-    register_signals,
     testcase_definition,
     teststep_definition,
 )
@@ -25,6 +25,13 @@ import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
 from pl_parking.common_ft_helper import HilClFuntions, MfHilClCustomTestcaseReport, MfHilClCustomTeststepReport
+from pl_parking.common_mdf_streaming import (
+    ChangePointRecorder,
+    DelayedReactionStateMachine,
+    hil_signal_source,
+    register_hil_signals,
+    report_missing_signals,
+)
 from pl_parking.PLP.MF.constants import PlotlyTemplate
 
 TSF_BASE = os.path.abspath(os.path.join(__file__, "..", ".."))
@@ -56,14 +63,16 @@ class ValidationSignals(MDFSignalDefinition):
             self.Columns.DRIVING_DIR: "MTS.AP_Private_CAN.AP_Private_CAN.APHMIInGeneral1.APHMIGeneralDrivingDir",
         }
 
+
 example_obj = ValidationSignals()
 
+
 @teststep_definition(
     name="State transition Maneuvering to Init door state FR",
     description="In case the front right door is open during maneuvering state, the system shall deactivate the AVG.",
     expected_result=BooleanResult(TRUE),
 )
-@register_signals(SIGNAL_DATA, ValidationSignals)
+@register_hil_signals(SIGNAL_DATA, ValidationSignals)
 class ManToInitDoorOpenFRCheck(TestStep):
     """ManToInitDoorOpenFRCheck Test Step."""
 
@@ -82,7 +91,6 @@ class ManToInitDoorOpenFRCheck(TestStep):
             {"Plots": [], "Plot_titles": [], "Remarks": [], "file_name": os.path.basename(self.artifacts[0].file_path)}
         )
 
-        read_data = self.readers[SIGNAL_DATA]
         test_result = fc.INPUT_MISSING  # Result
         # plots and remarks need to have the same length
         plot_titles, plots, remarks = fh.rep([], 3)
@@ -92,12 +100,10 @@ class ManToInitDoorOpenFRCheck(TestStep):
 
         """Prepare signals and variables"""
         signal_summary = {}
-        time_signal = read_data.index
-        HMI_Info = read_data["State_on_HMI"].tolist()
-        door_state = read_data["Door_state"].tolist()
-        driving_dir_sig = read_data["Driv_dir"].tolist()
-        t1_idx = None
-        t2_idx = None
+        source = hil_signal_source(self, SIGNAL_DATA)
+        if report_missing_signals(self, source):
+            return
+        recorder = ChangePointRecorder(["State_on_HMI", "Door_state"])
 
         eval_cond = [True] * 1
         evaluation1 = " ".join(
@@ -106,35 +112,31 @@ class ManToInitDoorOpenFRCheck(TestStep):
         )
 
         """Evaluation part"""
-        # Search for the moment when AVG is activated
-        for cnt in range(0, len(HMI_Info)):
-            if HMI_Info[cnt] == constants.HilCl.Hmi.ParkingProcedureCtrlState.PPC_PERFORM_PARKING:
-                t1_idx = cnt
-                break
-        if t1_idx is not None:
-            # Search for the moment when front right open is open
-            for _ in range(t1_idx, len(HMI_Info)):
-                if door_state[_] == constants.HilCl.Door.DOORSTATE_FRONT_RIGHT_OPEN:
-                    t2_idx = _
-                    break
-            if t2_idx is not None:
-                # taking the timestamp of t2_idx in order to check the reaction after 5 sec
-                t2_timestamp = time_signal[t2_idx]
-                for cnt in range(t2_idx, len(HMI_Info)):
-                    if abs(( float(t2_timestamp) - float(time_signal[cnt]) ) / 10**6) > constants.DgpsConstants.THRESOLD_TIME_S * 10:
-                        t3_idx = cnt
-                        break
-
-                if t3_idx is not None:
+        # Search for the moment when AVG is activated, then search for the moment when front right door is open
+        # and take the reaction of the system after the added delay
+        ppc_state = constants.HilCl.Hmi.ParkingProcedureCtrlState
+        state_machine = DelayedReactionStateMachine(
+            activated=lambda sample: sample.State_on_HMI == ppc_state.PPC_PERFORM_PARKING,
+            triggered=lambda sample: sample.Door_state == constants.HilCl.Door.DOORSTATE_FRONT_RIGHT_OPEN,
+            delay=constants.DgpsConstants.THRESOLD_TIME_S * 10,
+        ).run(source, [recorder])
+        reaction = state_machine.reaction
+
+        if state_machine.activation_time is not None:
+            if state_machine.trigger_time is not None:
+                if reaction is not None:
                     # Check the reaction of the system
-                    if HMI_Info[t3_idx] != constants.HilCl.Hmi.ParkingProcedureCtrlState.PPC_PARKING_CANCELED or driving_dir_sig[t3_idx] != constants.HilCl.Hmi.APHMIGeneralDrivingDir.STANDSTILL:
+                    if (
+                        reaction.State_on_HMI != ppc_state.PPC_PARKING_CANCELED
+                        or reaction.Driv_dir != constants.HilCl.Hmi.APHMIGeneralDrivingDir.STANDSTILL
+                    ):
                         test_result = fc.FAIL
                         eval_cond = [False] * 1
                         evaluation1 = " ".join(
-                        f"The evaluation of {signal_name['State_on_HMI']} signal is FAILED,"
-                        f" AVG not deactivated (APHMIParkingProcedureCtrlState != {constants.HilCl.Hmi.ParkingProcedureCtrlState.PPC_PARKING_CANCELED})"
-                        f" or ego vehicle not in standstill (APHMIGeneralDrivingDir != {constants.HilCl.Hmi.APHMIGeneralDrivingDir.STANDSTILL}).".split()
-                    )
+                            f"The evaluation of {signal_name['State_on_HMI']} signal is FAILED,"
+                            f" AVG not deactivated (APHMIParkingProcedureCtrlState != {constants.HilCl.Hmi.ParkingProcedureCtrlState.PPC_PARKING_CANCELED})"
+                            f" or ego vehicle not in standstill (APHMIGeneralDrivingDir != {constants.HilCl.Hmi.APHMIGeneralDrivingDir.STANDSTILL}).".split()
+                        )
                 else:
                     test_result = fc.FAIL
                     eval_cond = [False] * 1
@@ -145,16 +147,16 @@ class ManToInitDoorOpenFRCheck(TestStep):
                 test_result = fc.FAIL
                 eval_cond = [False] * 1
                 evaluation1 = " ".join(
-                            f"The evaluation of {signal_name['State_on_HMI']} signal is FAILED,"
-                            f" front right door is not open (conti_Veh_CAN.VehInput01.DoorOpen != {constants.HilCl.Door.DOORSTATE_FRONT_RIGHT_OPEN}).".split()
-                        )
+                    f"The evaluation of {signal_name['State_on_HMI']} signal is FAILED,"
+                    f" front right door is not open (conti_Veh_CAN.VehInput01.DoorOpen != {constants.HilCl.Door.DOORSTATE_FRONT_RIGHT_OPEN}).".split()
+                )
         else:
             test_result = fc.FAIL
             eval_cond = [False] * 1
             evaluation1 = " ".join(
-                            f"The evaluation of {signal_name['State_on_HMI']} signal is FAILED,"
-                            f" AVG not activated (APHMIParkingProcedureCtrlState != {constants.HilCl.Hmi.ParkingProcedureCtrlState.PPC_PERFORM_PARKING} ).".split()
-                        )
+                f"The evaluation of {signal_name['State_on_HMI']} signal is FAILED,"
+                f" AVG not activated (APHMIParkingProcedureCtrlState != {constants.HilCl.Hmi.ParkingProcedureCtrlState.PPC_PERFORM_PARKING} ).".split()
+            )
 
         if all(eval_cond):
             test_result = fc.PASS
@@ -166,9 +168,7 @@ class ManToInitDoorOpenFRCheck(TestStep):
         else:
             self.result.measured_result = FALSE
 
-        signal_summary[
-            "Check the reaction of the system after FR door is open."
-        ] = evaluation1
+        signal_summary["Check the reaction of the system after FR door is open."] = evaluation1
 
         self.sig_sum = HilClFuntions.hil_convert_dict_to_pandas(signal_summary)
         plot_titles.append("")
@@ -179,8 +179,9 @@ class ManToInitDoorOpenFRCheck(TestStep):
 
         fig = go.Figure()
 
-        fig.add_trace(go.Scatter(x=time_signal, y=HMI_Info, mode="lines", name=signal_name["State_on_HMI"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=door_state, mode="lines", name=signal_name["Door_state"]))
+        for column in recorder.columns:
+            time_signal, values = recorder.series(column)
+            fig.add_trace(go.Scatter(x=time_signal, y=values, mode="lines", line_shape="hv", name=signal_name[column]))
         fig.layout = go.Layout(yaxis=dict(tickformat="1"), xaxis=dict(tickformat="1"), xaxis_title="Time [us]")
         fig.update_layout(PlotlyTemplate.lgt_tmplt)
 
@@ -1,11 +1,12 @@
 """DGPS helper for ENTRY tests"""
 
-from typing import List
+from typing import Dict, List
 
 import numpy as np
 import pandas as pd
 
 import pl_parking.PLP.MF.constants as fc
+from pl_parking.common_dgps import DgpsTrajectory, to_local_frame
 
 # from pl_parking.PLP.MF.ENTRY.usemLagLeadShrinkHelper import ParkingSlotHelper , \
 # ParkingBoxPoints, EgoInfo
@@ -172,124 +173,54 @@ class DgpsSignalsProcessing:
         - second transformation applied to the dgps points to compensate the odometry transformation
         - third transformation applied to the dgps compensate the difference between odometry estimation of the ego and
         dgps from dgps (only translation)
-        """
-        for i, _ in enumerate(self.__signals[self.sg_dgps_hx][:-1]):
-            [self.__signals[self.sg_dgps_hx].values[i], self.__signals[self.sg_dgps_hy].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_hx].values[i],
-                    self.__signals[self.sg_dgps_hy].values[i],
-                    self.__x_ref,
-                    self.__y_ref,
-                    -self.__angle_ref,
-                )
-            )
-
-            x_diff = self.__signals[self.sg_oddo_x].values[i] - self.__signals[self.sg_dgps_hx].values[i]
-            y_diff = self.__signals[self.sg_oddo_y].values[i] - self.__signals[self.sg_dgps_hy].values[i]
-            [self.__signals[self.sg_dgps_hx].values[i], self.__signals[self.sg_dgps_hy].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_hx].values[i],
-                    self.__signals[self.sg_dgps_hy].values[i],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.X_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.Y_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.ANGLE],
-                )
-            )
-
-            [self.__signals[self.sg_dgps_tx].values[i], self.__signals[self.sg_dgps_ty].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_tx].values[i],
-                    self.__signals[self.sg_dgps_ty].values[i],
-                    self.__x_ref,
-                    self.__y_ref,
-                    -self.__angle_ref,
-                )
-            )
-
-            [self.__signals[self.sg_dgps_tx].values[i], self.__signals[self.sg_dgps_ty].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_tx].values[i],
-                    self.__signals[self.sg_dgps_ty].values[i],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.X_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.Y_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.ANGLE],
-                )
-            )
 
-            [self.__signals[self.sg_dgps_t2x].values[i], self.__signals[self.sg_dgps_t2y].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_t2x].values[i],
-                    self.__signals[self.sg_dgps_t2y].values[i],
-                    self.__x_ref,
-                    self.__y_ref,
-                    -self.__angle_ref,
-                )
-            )
-
-            [self.__signals[self.sg_dgps_t2x].values[i], self.__signals[self.sg_dgps_t2y].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_t2x].values[i],
-                    self.__signals[self.sg_dgps_t2y].values[i],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.X_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.Y_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.ANGLE],
-                )
-            )
-
-            [self.__signals[self.sg_dgps_t3x].values[i], self.__signals[self.sg_dgps_t3y].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_t3x].values[i],
-                    self.__signals[self.sg_dgps_t3y].values[i],
-                    self.__x_ref,
-                    self.__y_ref,
-                    -self.__angle_ref,
-                )
-            )
-
-            [self.__signals[self.sg_dgps_t3x].values[i], self.__signals[self.sg_dgps_t3y].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_t3x].values[i],
-                    self.__signals[self.sg_dgps_t3y].values[i],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.X_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.Y_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.ANGLE],
-                )
-            )
-
-            [self.__signals[self.sg_dgps_t4x].values[i], self.__signals[self.sg_dgps_t4y].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_t4x].values[i],
-                    self.__signals[self.sg_dgps_t4y].values[i],
-                    self.__x_ref,
-                    self.__y_ref,
-                    -self.__angle_ref,
-                )
-            )
-
-            [self.__signals[self.sg_dgps_t4x].values[i], self.__signals[self.sg_dgps_t4y].values[i]] = (
-                transf_global_to_local(
-                    self.__signals[self.sg_dgps_t4x].values[i],
-                    self.__signals[self.sg_dgps_t4y].values[i],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.X_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.Y_COORD],
-                    self.__signals[self.sg_transf_to_odo][i][fc.TransfToOdomConstants.ANGLE],
-                )
+        All samples but the last one are transformed at once on the shared DGPS trajectory arrays.
+        """
+        trajectory = DgpsTrajectory.from_frame(
+            self.__signals, time_column=self.sg_time, columns=[c for pair in self.__point_columns() for c in pair]
+        )
+        count = len(trajectory) - 1
+        if count <= 0:
+            return
+        transf_to_odo = np.stack(self.__signals[self.sg_transf_to_odo].to_numpy()[:count]).astype(float)
+        odo_x = transf_to_odo[:, fc.TransfToOdomConstants.X_COORD]
+        odo_y = transf_to_odo[:, fc.TransfToOdomConstants.Y_COORD]
+        odo_angle = transf_to_odo[:, fc.TransfToOdomConstants.ANGLE]
+
+        transformed = {}
+        for x_column, y_column in self.__point_columns():
+            x, y = to_local_frame(
+                trajectory.fields[x_column][:count],
+                trajectory.fields[y_column][:count],
+                self.__x_ref,
+                self.__y_ref,
+                -self.__angle_ref,
             )
+            if x_column == self.sg_dgps_hx:
+                x_diff = self.__signals[self.sg_oddo_x].to_numpy(dtype=float)[:count] - x
+                y_diff = self.__signals[self.sg_oddo_y].to_numpy(dtype=float)[:count] - y
+            transformed[x_column], transformed[y_column] = to_local_frame(x, y, odo_x, odo_y, odo_angle)
+
+        for x_column, y_column in self.__point_columns():
+            # translation by the difference between the odometry estimation and the dgps position of the ego
+            self.__store_transformed_points(x_column, transformed[x_column] + x_diff, count)
+            self.__store_transformed_points(y_column, transformed[y_column] + y_diff, count)
+
+    def __point_columns(self) -> List[tuple]:
+        """(x, y) columns of the hunter and of the four target DGPS points, the hunter first"""
+        return [
+            (self.sg_dgps_hx, self.sg_dgps_hy),
+            (self.sg_dgps_tx, self.sg_dgps_ty),
+            (self.sg_dgps_t2x, self.sg_dgps_t2y),
+            (self.sg_dgps_t3x, self.sg_dgps_t3y),
+            (self.sg_dgps_t4x, self.sg_dgps_t4y),
+        ]
 
-            self.__translate_dgps_points_odo_estim(x_diff, y_diff, i)
-
-    def __translate_dgps_points_odo_estim(self, x_diff, y_diff, idx):
-        """Translate dgps points applying the difference between odo estimation of ego and dgps points of ego"""
-        self.__signals[self.sg_dgps_hx].values[idx] += x_diff
-        self.__signals[self.sg_dgps_hy].values[idx] += y_diff
-        self.__signals[self.sg_dgps_tx].values[idx] += x_diff
-        self.__signals[self.sg_dgps_ty].values[idx] += y_diff
-        self.__signals[self.sg_dgps_t2x].values[idx] += x_diff
-        self.__signals[self.sg_dgps_t2y].values[idx] += y_diff
-        self.__signals[self.sg_dgps_t3x].values[idx] += x_diff
-        self.__signals[self.sg_dgps_t3y].values[idx] += y_diff
-        self.__signals[self.sg_dgps_t4x].values[idx] += x_diff
-        self.__signals[self.sg_dgps_t4y].values[idx] += y_diff
+    def __store_transformed_points(self, column: str, values: np.ndarray, count: int):
+        """Store the transformed first count samples of a dgps point column, the remaining samples are kept"""
+        column_values = self.__signals[column].to_numpy(dtype=float, copy=True)
+        column_values[:count] = values
+        self.__signals[column] = column_values
 
     def obtain_points_box(self, x1, y1, x2, y2):
         """Obtain the corner points of the box having the middle points of two parallel sides"""
@@ -317,65 +248,58 @@ class DgpsSignalsProcessing:
 
         return box_points
 
+    @staticmethod
+    def obtain_points_boxes(x1, y1, x2, y2) -> Dict[str, np.ndarray]:
+        """Batched obtain_points_box: corner coordinates of all boxes, zero for boxes with identical middle points"""
+        p1 = np.stack((x1, y1), axis=-1).astype(float)
+        p2 = np.stack((x2, y2), axis=-1).astype(float)
+        p_vect = p2 - p1
+        # Perpendicular vector (counter clockwise) to p_vect, normalized
+        p_perpend = np.stack((-p_vect[:, 1], p_vect[:, 0]), axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            p_norm = p_perpend / np.linalg.norm(p_perpend, axis=-1, keepdims=True)
+        has_length = np.any(p_vect != 0.0, axis=-1, keepdims=True)
+        half_width = p_norm * fc.DgpsConstants.WIDTH_BOX_M / 2
+
+        corners = {
+            "p1_left": p1 - half_width,
+            "p1_right": p1 + half_width,
+            "p2_left": p2 - half_width,
+            "p2_right": p2 + half_width,
+        }
+        return {name: np.where(has_length, points, 0.0) for name, points in corners.items()}
+
     def create_boxes(self):
         """Create the boxes from dGPS signals"""
-        box_1_corner_left_x_1 = []
-        box_1_corner_left_y_1 = []
-        box_1_corner_right_x_1 = []
-        box_1_corner_right_y_1 = []
-        box_1_corner_left_x_2 = []
-        box_1_corner_left_y_2 = []
-        box_1_corner_right_x_2 = []
-        box_1_corner_right_y_2 = []
-        box_2_corner_left_x_1 = []
-        box_2_corner_left_y_1 = []
-        box_2_corner_right_x_1 = []
-        box_2_corner_right_y_1 = []
-        box_2_corner_left_x_2 = []
-        box_2_corner_left_y_2 = []
-        box_2_corner_right_x_2 = []
-        box_2_corner_right_y_2 = []
-
-        for _, row in self.__signals.iterrows():
-            box_1_pts = self.obtain_points_box(
-                row[self.sg_dgps_tx], row[self.sg_dgps_ty], row[self.sg_dgps_t2x], row[self.sg_dgps_t2y]
-            )
-            box_2_pts = self.obtain_points_box(
-                row[self.sg_dgps_t3x], row[self.sg_dgps_t3y], row[self.sg_dgps_t4x], row[self.sg_dgps_t4y]
-            )
-            box_1_corner_left_x_1.append(box_1_pts.p1_left[0])
-            box_1_corner_left_y_1.append(box_1_pts.p1_left[1])
-            box_1_corner_right_x_1.append(box_1_pts.p1_right[0])
-            box_1_corner_right_y_1.append(box_1_pts.p1_right[1])
-            box_1_corner_left_x_2.append(box_1_pts.p2_left[0])
-            box_1_corner_left_y_2.append(box_1_pts.p2_left[1])
-            box_1_corner_right_x_2.append(box_1_pts.p2_right[0])
-            box_1_corner_right_y_2.append(box_1_pts.p2_right[1])
-            box_2_corner_left_x_1.append(box_2_pts.p1_left[0])
-            box_2_corner_left_y_1.append(box_2_pts.p1_left[1])
-            box_2_corner_right_x_1.append(box_2_pts.p1_right[0])
-            box_2_corner_right_y_1.append(box_2_pts.p1_right[1])
-            box_2_corner_left_x_2.append(box_2_pts.p2_left[0])
-            box_2_corner_left_y_2.append(box_2_pts.p2_left[1])
-            box_2_corner_right_x_2.append(box_2_pts.p2_right[0])
-            box_2_corner_right_y_2.append(box_2_pts.p2_right[1])
-
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_X_1] = box_1_corner_left_x_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_Y_1] = box_1_corner_left_y_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_X_1] = box_1_corner_right_x_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_Y_1] = box_1_corner_right_y_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_X_2] = box_1_corner_left_x_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_Y_2] = box_1_corner_left_y_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_X_2] = box_1_corner_right_x_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_Y_2] = box_1_corner_right_y_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_X_1] = box_2_corner_left_x_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_Y_1] = box_2_corner_left_y_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_X_1] = box_2_corner_right_x_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_Y_1] = box_2_corner_right_y_1
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_X_2] = box_2_corner_left_x_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_Y_2] = box_2_corner_left_y_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_X_2] = box_2_corner_right_x_2
-        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_Y_2] = box_2_corner_right_y_2
+        box_1 = self.obtain_points_boxes(
+            self.__signals[self.sg_dgps_tx].to_numpy(),
+            self.__signals[self.sg_dgps_ty].to_numpy(),
+            self.__signals[self.sg_dgps_t2x].to_numpy(),
+            self.__signals[self.sg_dgps_t2y].to_numpy(),
+        )
+        box_2 = self.obtain_points_boxes(
+            self.__signals[self.sg_dgps_t3x].to_numpy(),
+            self.__signals[self.sg_dgps_t3y].to_numpy(),
+            self.__signals[self.sg_dgps_t4x].to_numpy(),
+            self.__signals[self.sg_dgps_t4y].to_numpy(),
+        )
+
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_X_1] = box_1["p1_left"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_Y_1] = box_1["p1_left"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_X_1] = box_1["p1_right"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_Y_1] = box_1["p1_right"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_X_2] = box_1["p2_left"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_LEFT_Y_2] = box_1["p2_left"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_X_2] = box_1["p2_right"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_1_CORNER_RIGHT_Y_2] = box_1["p2_right"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_X_1] = box_2["p1_left"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_Y_1] = box_2["p1_left"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_X_1] = box_2["p1_right"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_Y_1] = box_2["p1_right"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_X_2] = box_2["p2_left"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_LEFT_Y_2] = box_2["p2_left"][:, 1]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_X_2] = box_2["p2_right"][:, 0]
+        self.__signals[fc.DgpsBoxesColumns.BOX_2_CORNER_RIGHT_Y_2] = box_2["p2_right"][:, 1]
 
     @staticmethod
     def extract_points_side_lines_dgps_boxes(signals: pd.DataFrame, idx: np.int64) -> List[List[np.ndarray]]:
@@ -561,14 +485,7 @@ def transf_global_to_local(x_global, y_global, x_local, y_local, angle):
     :param angle: the angle between global and local coordinates system
     :return : local point transformed in local coordinates system
     """
-    rotation_matrix = generate_rotation_matrix(-angle)
-    global_pts_matrix = np.array([x_global, y_global])
-    local_pts_matrix = np.array([x_local, y_local])
-    calc_matrix = global_pts_matrix - local_pts_matrix
-    # calc_matrix= np.array([x_global, y_global]) - np.array([x_local, y_local])
-    transformed_pts_matrix = np.dot(rotation_matrix, calc_matrix)
-
-    return [transformed_pts_matrix[0], transformed_pts_matrix[1]]
+    return list(to_local_frame(x_global, y_global, x_local, y_local, angle))
 
 
 def generate_rotation_matrix(angle):
@@ -4,11 +4,11 @@
 import base64
 import json
 import logging
-import math
 import os
 import sys
 from typing import List
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from tsf.core.common import AggregateFunction, PathSpecification, RelationOperator
@@ -35,6 +35,16 @@ from tsf.io.signals import SignalDefinition
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
+from pl_parking.PLP.MF.LSCA.lsca_event_analysis import (
+    frame_durations,
+    gather_vertices,
+    intervention_onsets,
+    min_polygon_distances,
+    object_validity,
+    read_shapes,
+    rigid_transform,
+    to_coordinate_lists,
+)
 
 TSF_BASE = os.path.abspath(os.path.join(__file__, "..", ".."))
 if TSF_BASE not in sys.path:
@@ -219,27 +229,6 @@ columns: table_column_names
         return s
 
 
-import numpy as np
-
-
-def transform_odo_obj_shape(coords, x_odo, y_odo, yaw):
-    """Transform the coordinates based on the odometry position."""
-    if all(coord == 0 for coord in coords):
-        return coords
-
-    rotation_matrix = np.array([[np.cos(yaw), -np.sin(yaw)], [np.sin(yaw), np.cos(yaw)]])
-    for i in range(0, len(coords), 2):
-        point = np.array(coords[i : i + 2])
-        point_a = point[0], point[1]
-        # First, apply the rotation to the point relative to origin (0,0)
-        rotated_point_a = rotation_matrix @ point_a
-        rotated_point_a = rotated_point_a + np.array([x_odo, y_odo])
-        coords[i] = rotated_point_a[0]
-        coords[i + 1] = rotated_point_a[1]
-
-    return coords
-
-
 def transform_coordinates_using_new_origin(old_origin, new_origin, coordinates):
     """
     Transform coordinates from an old origin to a new origin.
@@ -273,27 +262,6 @@ def transform_coordinates_using_new_origin(old_origin, new_origin, coordinates):
     return transformed_coords
 
 
-def calclate_euclidian_dist_between_points(car, object):
-    """
-    Calculate the Euclidean distance between two points in 2D space.
-
-    :param point1: Tuple (x1, y1) - coordinates of the first point
-    :param point2: Tuple (x2, y2) - coordinates of the second point
-    :return: Distance between the two points
-    """
-    smallest_dist = []
-    if object[0][0]:
-
-        for idx, _ in enumerate(car[0]):
-            x1, y1 = car[0][idx], car[1][idx]
-            for idx2, _ in enumerate(object[0]):
-                x2, y2 = object[0][idx2], object[1][idx2]
-                smallest_dist.append(math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2))
-
-        return round(min(smallest_dist), 2)
-    return 0
-
-
 class Signals(SignalDefinition):
     """Signal definition."""
 
@@ -559,9 +527,7 @@ class FalsePositiveStep(TestStep):
             hours_of_driving = 0
             evaluation_text = ""
             gt_detected_data = {}
-            obj_template = []
             fp_ts = []
-            object_df = pd.DataFrame()
 
             df = self.readers[ALIAS]
             df.columns = [f"{col[0]}_{col[1]}" if type(col) is tuple else col for col in df.columns]
@@ -586,19 +552,17 @@ class FalsePositiveStep(TestStep):
             # Get individual brake events from recording
             # Ex: Signal '0001110010110' would mean 3 separate LSCA activations
             # It takes 2 rows at a time and check if first element is != than the second
-            mask_brake_events = lsca_state.rolling(2).apply(
-                lambda x: x[0] == 0 and x[1] == constants.LSCAState.LSCA_STATE_INTERVENTION, raw=True
-            )
+            mask_brake_events = intervention_onsets(lsca_state, constants.LSCAState.LSCA_STATE_INTERVENTION)
 
             # Get the number of seconds that have passed from frame to frame
-            seconds = df[Signals.Columns.TIMESTAMP].rolling(2).apply(lambda x: x[1] - x[0], raw=True)
+            seconds = frame_durations(df[Signals.Columns.TIMESTAMP])
             velocity_df_filtered = pd.concat([seconds, velocity], axis=1)
             velocity_mask = velocity.abs() < VELOCITY_THRESHOLD
             velocity_df_filtered = velocity_df_filtered[velocity_mask]
             seconds_under_10_kmh = velocity_df_filtered[Signals.Columns.TIMESTAMP].sum()
             hours_of_driving = seconds_under_10_kmh / constants.GeneralConstants.S_IN_HOURS
-            total_brake_events = mask_brake_events.sum()
-            timestamp_brake_events = [row for row, val in mask_brake_events.items() if val == 1]
+            total_brake_events = int(mask_brake_events.sum())
+            timestamp_brake_events = mask_brake_events.index[mask_brake_events.to_numpy()].tolist()
 
             # Check if the ground truth data is available and correctly written
             try:
@@ -670,138 +634,125 @@ class FalsePositiveStep(TestStep):
                     evaluation_text = "LSCA component had no FP events."
 
             ############################## This part is just for visualization purposes ##############################
-            for obj in range(signals_obj.MAX_STATIC_OBJ_COUNT):
-                obj_template.clear()
-                for shape_array in range(signals_obj.MAX_STATIC_OBJ_SHAPE):
-                    obj_template.append(signals_obj.Columns.STATIC_OBJ_SHAPE_X.format(obj, shape_array))
-                    obj_template.append(signals_obj.Columns.STATIC_OBJ_SHAPE_Y.format(obj, shape_array))
-
-                object_df[f"Static_Obj_{obj}"] = df[obj_template].apply(lambda row: row.values.tolist(), axis=1)
-            for obj in range(signals_obj.MAX_DYNAMIC_OBJ_COUNT):
-                obj_template.clear()
-                for shape_array in range(signals_obj.MAX_DYNAMIC_OBJ_SHAPE):
-                    obj_template.append(signals_obj.Columns.DYNAMIC_OBJ_SHAPE_X.format(obj, shape_array))
-                    obj_template.append(signals_obj.Columns.DYNAMIC_OBJ_SHAPE_Y.format(obj, shape_array))
-
-                object_df[f"Dynamic_Obj_{obj}"] = df[obj_template].apply(lambda row: row.values.tolist(), axis=1)
+            # All objects of all brake events are gathered and transformed with the ego pose in one batch
+            events = timestamp_brake_events
+            ego_x = df.loc[events, Signals.Columns.odo_x].to_numpy(dtype=float)
+            ego_y = df.loc[events, Signals.Columns.odo_y].to_numpy(dtype=float)
+            ego_yaw = df.loc[events, Signals.Columns.odo_yaw].to_numpy(dtype=float)
+
+            static_valid = object_validity(
+                df,
+                events,
+                Signals.Columns.ACTUAL_SIZE_STAT,
+                Signals.Columns.NUM_STAT_OBJ,
+                signals_obj.MAX_STATIC_OBJ_COUNT,
+                signals_obj.MAX_STATIC_OBJ_SHAPE,
+            )
+            static_vertices = rigid_transform(
+                read_shapes(
+                    df,
+                    events,
+                    Signals.Columns.STATIC_OBJ_SHAPE_X,
+                    Signals.Columns.STATIC_OBJ_SHAPE_Y,
+                    signals_obj.MAX_STATIC_OBJ_COUNT,
+                    signals_obj.MAX_STATIC_OBJ_SHAPE,
+                ),
+                ego_x,
+                ego_y,
+                ego_yaw,
+                static_valid,
+            )
+            dynamic_valid = object_validity(
+                df,
+                events,
+                Signals.Columns.ACTUAL_SIZE_DYN,
+                Signals.Columns.NUM_DYN_OBJ,
+                signals_obj.MAX_DYNAMIC_OBJ_COUNT,
+                signals_obj.MAX_DYNAMIC_OBJ_SHAPE,
+            )
+            dynamic_vertices = rigid_transform(
+                read_shapes(
+                    df,
+                    events,
+                    Signals.Columns.DYNAMIC_OBJ_SHAPE_X,
+                    Signals.Columns.DYNAMIC_OBJ_SHAPE_Y,
+                    signals_obj.MAX_DYNAMIC_OBJ_COUNT,
+                    signals_obj.MAX_DYNAMIC_OBJ_SHAPE,
+                ),
+                ego_x,
+                ego_y,
+                ego_yaw,
+                dynamic_valid,
+            )
 
             vertices_count = max(df[Signals.Columns.cem_sgf_max_vertices])
+            sgf_obj_count = int(df.loc[events, Signals.Columns.cem_sgf_numobj].max()) if events else 0
+            vertex_pool = np.stack(
+                [
+                    df.loc[events, [x.format(i) for i in range(vertices_count)]].to_numpy(dtype=float)
+                    for x in vertice_template
+                ],
+                axis=-1,
+            )
+            sgf_objects = df.loc[events].reindex(
+                columns=[
+                    f"{col}_{obj}"
+                    for col in (Signals.Columns.cem_sgf_first_index_vertex, Signals.Columns.cem_sgf_used_vertices)
+                    for obj in range(sgf_obj_count)
+                ],
+                fill_value=0,
+            )
+            sgf_vertices, sgf_valid = gather_vertices(
+                vertex_pool,
+                sgf_objects.iloc[:, :sgf_obj_count].to_numpy(dtype=int),
+                sgf_objects.iloc[:, sgf_obj_count:].to_numpy(dtype=int),
+            )
+            sgf_valid &= (
+                np.arange(sgf_obj_count) < df.loc[events, Signals.Columns.cem_sgf_numobj].to_numpy(dtype=int)[:, None]
+            )[..., None]
+            sgf_vertices = rigid_transform(sgf_vertices, ego_x, ego_y, ego_yaw, sgf_valid)
+
+            # Objects without any non zero vertex are placeholders
+            for vertices, valid in (
+                (static_vertices, static_valid),
+                (dynamic_vertices, dynamic_valid),
+                (sgf_vertices, sgf_valid),
+            ):
+                valid &= np.any((vertices != 0).any(axis=-1) & valid, axis=-1, keepdims=True)
+
+            vehicle_plots = [constants.DrawCarLayer.draw_car(x, y, yaw) for x, y, yaw in zip(ego_x, ego_y, ego_yaw)]
+            car_outlines = [vehicle_plot[0] for vehicle_plot in vehicle_plots]
+            static_dist = min_polygon_distances(car_outlines, static_vertices, static_valid)
+            dynamic_dist = min_polygon_distances(car_outlines, dynamic_vertices, dynamic_valid)
+            sgf_dist = min_polygon_distances(car_outlines, sgf_vertices, sgf_valid)
+
+            static_pad = max(int(max(df[Signals.Columns.NUM_STAT_OBJ])), 1)
+            dynamic_pad = max(int(max(df[Signals.Columns.NUM_DYN_OBJ])), 1)
+            static_coords = to_coordinate_lists(
+                static_vertices[:, :static_pad], static_valid[:, :static_pad], static_pad
+            )
+            dynamic_coords = to_coordinate_lists(
+                dynamic_vertices[:, :dynamic_pad], dynamic_valid[:, :dynamic_pad], dynamic_pad
+            )
+            sgf_coords = to_coordinate_lists(sgf_vertices, sgf_valid, max(sgf_obj_count, 1))
 
-            if vertices_count > 0:
-                df["vertices"] = df[[x.format(i) for i in range(vertices_count) for x in vertice_template]].apply(
-                    lambda row: row.values.tolist(), axis=1
-                )
-            #         max_tpf_vertices = max(df[Signals.Columns.cem_tpf_numobj])
-            #         for i in range(max_tpf_vertices):
-            #             df[f"tpf_vertices_{i}"] = df[[x.format(i,j)for j in range(signals_obj.MAX_TPF_OBJ_SHAPE) for x in tpf_vertices_template]].apply(
-            #     lambda row: row.values.tolist(), axis=1
-            # )
+            def rounded_distances(distances):
+                return [0 if np.isnan(dist) else round(float(dist), 2) for dist in distances]
 
             collected_info = {
                 ts: {
-                    "static": [],
+                    "static": static_coords[idx],
+                    "static_distance": rounded_distances(static_dist[idx, :static_pad]),
                     "ts": df[Signals.Columns.TIMESTAMP].loc[ts],
-                    "sgf_vertices": [],
-                    "tpf_vertices": [],
-                    #   "gt_object" :transform_odo_obj_shape(GT_OBJ_SHAPE[DRIVING_DIRECTION].copy(),
-                    #                                         df[Signals.Columns.odo_x].loc[ts],
-                    #                  df[Signals.Columns.odo_y].loc[ts],
-                    #                  df[Signals.Columns.odo_yaw].loc[ts])
-                    #       ,
-                    #   "gt_distance": gt_detected_data[ts],
-                    "ego_vehicle": [
-                        df[Signals.Columns.odo_x].loc[ts],
-                        df[Signals.Columns.odo_y].loc[ts],
-                        df[Signals.Columns.odo_yaw].loc[ts],
-                    ],
-                    # "dynamic":[],} for ts in list(gt_detected_data.keys())}
-                    "dynamic": [],
+                    "sgf_vertices": sgf_coords[idx],
+                    "sgf_distance": rounded_distances(sgf_dist[idx]),
+                    "ego_vehicle": [ego_x[idx], ego_y[idx], ego_yaw[idx]],
+                    "vehicle_plot": vehicle_plots[idx],
+                    "dynamic": dynamic_coords[idx],
+                    "dynamic_distance": rounded_distances(dynamic_dist[idx, :dynamic_pad]),
                 }
-                for ts in timestamp_brake_events
+                for idx, ts in enumerate(events)
             }
-            for key, _ in collected_info.items():
-                if df[Signals.Columns.NUM_DYN_OBJ].loc[key] > 0:
-                    for obj in range(df[Signals.Columns.NUM_DYN_OBJ].loc[key]):
-                        actual_size = (
-                            df[f"{Signals.Columns.ACTUAL_SIZE_DYN}_{obj}"].loc[key] * 2
-                        )  # take into account the y axis also
-                        collected_info[key]["dynamic"].append(
-                            transform_odo_obj_shape(
-                                object_df[f"Dynamic_Obj_{obj}"].loc[key][:actual_size],
-                                collected_info[key]["ego_vehicle"][0],
-                                collected_info[key]["ego_vehicle"][1],
-                                collected_info[key]["ego_vehicle"][2],
-                            )
-                        )
-                else:
-                    collected_info[key]["dynamic"].append([None, None, None, None])
-                if df[Signals.Columns.NUM_STAT_OBJ].loc[key] > 0:
-                    for obj in range(df[Signals.Columns.NUM_STAT_OBJ].loc[key]):
-                        actual_size = (
-                            df[f"{Signals.Columns.ACTUAL_SIZE_STAT}_{obj}"].loc[key] * 2
-                        )  # take into account the y axis also
-                        collected_info[key]["static"].append(
-                            transform_odo_obj_shape(
-                                object_df[f"Static_Obj_{obj}"].loc[key][:actual_size],
-                                collected_info[key]["ego_vehicle"][0],
-                                collected_info[key]["ego_vehicle"][1],
-                                collected_info[key]["ego_vehicle"][2],
-                            )
-                        )
-                else:
-                    collected_info[key]["static"].append([None, None, None, None])
-                if df["cem_sgf_numobj"].loc[key] > 0:
-                    for obj in range(df["cem_sgf_numobj"].loc[key]):
-                        start_index = df[f"cem_sgf_first_index_vertex_{obj}"].loc[key] * 2
-                        # start_index = df[f"cem_sgf_first_index_vertex_{obj}"].loc[12967697] * 2
-
-                        end_index = df[f"cem_sgf_used_vertices_{obj}"].loc[key] * 2 + start_index
-                        # end_index = df[f"cem_sgf_used_vertices_{obj}"].loc[12967697]* 2
-                        # array_slice = df["vertices"].loc[key][start_index:end_index]
-                        # vertices = df[f"cem_sgf_vertices_x_{obj}"].loc[key][start_index:end_index]
-                        try:
-                            collected_info[key]["sgf_vertices"].append(
-                                transform_odo_obj_shape(
-                                    df["vertices"].loc[key][start_index:end_index],
-                                    collected_info[key]["ego_vehicle"][0],
-                                    collected_info[key]["ego_vehicle"][1],
-                                    collected_info[key]["ego_vehicle"][2],
-                                )
-                            )
-                        except Exception:
-                            collected_info[key]["sgf_vertices"].append([None, None, None, None])
-                else:
-                    collected_info[key]["sgf_vertices"].append([None, None, None, None])
-                # if df["cem_tpf_numobj"].loc[key] > 0:
-                #     for obj in range(df["cem_tpf_numobj"].loc[key]):
-                #         coords = transform_coordinates_using_new_origin([df[f"{Signals.Columns.TPF_REFERENCE_X}_{obj}"].loc[key],
-                #                                                 df[f"{Signals.Columns.TPF_REFERENCE_Y}_{obj}"].loc[key]],
-                #                                                 [collected_info[key]["ego_vehicle"][0],
-                #                                              collected_info[key]["ego_vehicle"][1]],
-                #                                                df[f"tpf_vertices_{obj}"].loc[key])
-                #         # coords = transform_odo_obj_shape(coords,
-                #         #                                     collected_info[key]["ego_vehicle"][0],
-                #         #                                     collected_info[key]["ego_vehicle"][1],
-                #         #                                     collected_info[key]["ego_vehicle"][2])
-                #         collected_info[key]["tpf_vertices"].append(coords)
-                #         #collected_info[key]["tpf_vertices"].append(df[f"tpf_vertices_{obj}"].loc[key])
-
-                # else:
-                #     collected_info[key]["tpf_vertices"].append([None,None,None,None])
-                if len(collected_info[key]["sgf_vertices"]) < vertices_count:
-                    for _ in range(vertices_count - len(collected_info[key]["sgf_vertices"])):
-                        collected_info[key]["sgf_vertices"].append([None, None, None, None])
-
-                if len(collected_info[key]["static"]) < max(df[Signals.Columns.NUM_STAT_OBJ]):
-                    for _ in range(max(df[Signals.Columns.NUM_STAT_OBJ]) - len(collected_info[key]["static"])):
-                        collected_info[key]["static"].append([None, None, None, None])
-
-                if len(collected_info[key]["dynamic"]) < max(df[Signals.Columns.NUM_DYN_OBJ]):
-                    for _ in range(max(df[Signals.Columns.NUM_DYN_OBJ]) - len(collected_info[key]["dynamic"])):
-                        collected_info[key]["dynamic"].append([None, None, None, None])
-                # if len(collected_info[key]["tpf_vertices"]) < max_tpf_vertices:
-                #     for i in range(max_tpf_vertices-len(collected_info[key]["tpf_vertices"])):
-                #         collected_info[key]["tpf_vertices"].append([None,None,None,None])
 
             fig_with_fames = go.Figure()
             global_x_min = float("inf")
@@ -815,9 +766,7 @@ class FalsePositiveStep(TestStep):
             for key, val in collected_info.items():
 
                 frame_data = []  # np.rad2deg(val.get('ego_vehicle',None)[0][2])
-                new_origin_x, new_origin_y, new_origin_yaw = val.get("ego_vehicle", None)
-
-                vehicle_plot = constants.DrawCarLayer.draw_car(new_origin_x, new_origin_y, new_origin_yaw)
+                vehicle_plot = val["vehicle_plot"]
                 car_x = vehicle_plot[0][0]
                 car_y = vehicle_plot[0][1]
                 vehicle_plot = vehicle_plot[1]
@@ -828,12 +777,9 @@ class FalsePositiveStep(TestStep):
 
                 # Parking box coordinates for the current frame (if they exist)
                 # if val.get("static", None):  # Only create the parking box trace if coordinates exist
-                for coords in val["static"]:
+                for coords, smallest_dist in zip(val["static"], val["static_distance"]):
                     # coords = val["static"]
                     x_coords_static, y_coords_static = coords[::2], coords[1::2]
-                    smallest_dist = calclate_euclidian_dist_between_points(
-                        [car_x, car_y], [x_coords_static, y_coords_static]
-                    )
                     x_coords_static += x_coords_static[:1]
                     y_coords_static += y_coords_static[:1]
                     is_pb_found = True if x_coords_static[0] else False
@@ -870,12 +816,9 @@ class FalsePositiveStep(TestStep):
                         frame_data.append(static_obj_trace)
 
                 # Dynamic object coordinates for the current frame (if they exist)
-                for coords in val["dynamic"]:
+                for coords, smallest_dist in zip(val["dynamic"], val["dynamic_distance"]):
 
                     x_coords_dynamic, y_coords_dynamic = coords[::2], coords[1::2]
-                    smallest_dist = calclate_euclidian_dist_between_points(
-                        [car_x, car_y], [x_coords_dynamic, y_coords_dynamic]
-                    )
                     x_coords_dynamic += x_coords_dynamic[:1]
                     y_coords_dynamic += y_coords_dynamic[:1]
                     is_pb_found = True if x_coords_dynamic[0] else False
@@ -910,10 +853,9 @@ class FalsePositiveStep(TestStep):
                     else:
                         frame_data.append(dynamic_obj_trace)
 
-                for coords in val["sgf_vertices"]:
+                for coords, smallest_dist in zip(val["sgf_vertices"], val["sgf_distance"]):
 
                     x_coords_gt, y_coords_gt = coords[::2], coords[1::2]
-                    smallest_dist = calclate_euclidian_dist_between_points([car_x, car_y], [x_coords_gt, y_coords_gt])
 
                     x_coords_gt += x_coords_gt[:1]
                     y_coords_gt += y_coords_gt[:1]
@@ -0,0 +1,160 @@
+"""LSCA event analysis with array operations over all brake events of a recording"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import shapely
+
+import pl_parking.PLP.MF.constants as constants
+
+
+def intervention_onsets(
+    lsca_state: pd.Series, intervention_state: int = constants.LSCAState.LSCA_STATE_INTERVENTION
+) -> pd.Series:
+    """
+    Mark the samples where LSCA switches from state 0 directly to the intervention state.
+
+    Ex: Signal '0002220020220' would give 3 separate brake events.
+    """
+    values = lsca_state.to_numpy()
+    onsets = np.zeros(len(values), dtype=bool)
+    onsets[1:] = (values[:-1] == 0) & (values[1:] == intervention_state)
+    return pd.Series(onsets, index=lsca_state.index)
+
+
+def frame_durations(timestamps: pd.Series) -> pd.Series:
+    """Time passed from the previous sample, NaN for the first one"""
+    return timestamps.diff()
+
+
+def read_shapes(
+    df: pd.DataFrame, rows: Sequence, x_template: str, y_template: str, obj_count: int, vertex_count: int
+) -> np.ndarray:
+    """
+    Gather the shape arrays of all objects at the given rows.
+
+    :param x_template: Column template formatted with (object, vertex) for the x coordinate.
+    :param y_template: Column template formatted with (object, vertex) for the y coordinate.
+    :return: Array of shape (rows, obj_count, vertex_count, 2).
+    """
+    x_cols = [x_template.format(obj, vertex) for obj in range(obj_count) for vertex in range(vertex_count)]
+    y_cols = [y_template.format(obj, vertex) for obj in range(obj_count) for vertex in range(vertex_count)]
+    x = df.loc[rows, x_cols].to_numpy(dtype=float)
+    y = df.loc[rows, y_cols].to_numpy(dtype=float)
+    return np.stack((x, y), axis=-1).reshape(len(rows), obj_count, vertex_count, 2)
+
+
+def object_validity(
+    df: pd.DataFrame, rows: Sequence, size_column: str, count_column: str, obj_count: int, vertex_count: int
+) -> np.ndarray:
+    """
+    Valid vertices of array objects: object index < number of objects and vertex index < actual size.
+
+    :param size_column: Prefix of the per object "<size_column>_<obj>" actual size columns, missing ones count as 0.
+    :param count_column: Column with the number of objects.
+    :return: Boolean mask (rows, obj_count, vertex_count).
+    """
+    sizes = (
+        df.loc[rows]
+        .reindex(columns=[f"{size_column}_{obj}" for obj in range(obj_count)], fill_value=0)
+        .to_numpy(dtype=int)
+    )
+    counts = df.loc[rows, count_column].to_numpy(dtype=int)
+    return (np.arange(vertex_count) < sizes[..., None]) & (np.arange(obj_count) < counts[:, None])[..., None]
+
+
+def gather_vertices(
+    vertex_pool: np.ndarray, start_index: np.ndarray, used_vertices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cut the objects out of a shared vertex pool, like the SGF output stores them.
+
+    :param vertex_pool: Array (rows, pool_size, 2).
+    :param start_index: First vertex index per object (rows, objects).
+    :param used_vertices: Number of vertices per object (rows, objects).
+    :return: Vertices (rows, objects, max_vertices, 2) and validity mask (rows, objects, max_vertices).
+    """
+    rows, pool_size = vertex_pool.shape[:2]
+    max_vertices = max(int(used_vertices.max(initial=0)), 1)
+    index = start_index[..., None] + np.arange(max_vertices)
+    if pool_size == 0:
+        return np.zeros((*index.shape, 2)), np.zeros(index.shape, dtype=bool)
+    valid = (np.arange(max_vertices) < used_vertices[..., None]) & (index < pool_size)
+    vertices = vertex_pool[np.arange(rows)[:, None, None], np.clip(index, 0, pool_size - 1)]
+    return vertices, valid
+
+
+def rigid_transform(points: np.ndarray, x: np.ndarray, y: np.ndarray, yaw: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Rotate by yaw and translate the (rows, objects, vertices, 2) points of every row by its own ego pose.
+
+    Objects whose valid vertices are all zero are placeholders and stay untouched.
+    """
+    cos = np.cos(yaw)[:, None, None]
+    sin = np.sin(yaw)[:, None, None]
+    px, py = points[..., 0], points[..., 1]
+    moved = np.stack((cos * px - sin * py + x[:, None, None], sin * px + cos * py + y[:, None, None]), axis=-1)
+    is_placeholder = ~np.any((points != 0).any(axis=-1) & valid, axis=-1)
+    return np.where(is_placeholder[..., None, None], points, moved)
+
+
+def to_geometries(vertices: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Build one shapely geometry per object: polygon, line or point depending on the number of valid vertices"""
+    flat_vertices = vertices.reshape(-1, *vertices.shape[-2:])
+    flat_valid = valid.reshape(-1, valid.shape[-1])
+    counts = flat_valid.sum(axis=1)
+    geometries = np.full(len(counts), None, dtype=object)
+
+    for kind, selection in (
+        ("polygon", counts >= 3),
+        ("line", counts == 2),
+        ("point", counts == 1),
+    ):
+        obj_idx = np.flatnonzero(selection)
+        if obj_idx.size == 0:
+            continue
+        coords = flat_vertices[obj_idx][flat_valid[obj_idx]]
+        parts = np.repeat(np.arange(obj_idx.size), counts[obj_idx])
+        if kind == "polygon":
+            geometries[obj_idx] = shapely.polygons(shapely.linearrings(coords, indices=parts))
+        elif kind == "line":
+            geometries[obj_idx] = shapely.linestrings(coords, indices=parts)
+        else:
+            geometries[obj_idx] = shapely.points(coords)
+    return geometries.reshape(valid.shape[:-1])
+
+
+def min_polygon_distances(
+    car_outlines: List[Tuple[Sequence[float], Sequence[float]]], vertices: np.ndarray, valid: np.ndarray
+) -> np.ndarray:
+    """
+    Minimum distance between the ego vehicle polygon and every object of every event.
+
+    :param car_outlines: Per event the (x, y) lists of the vehicle contour.
+    :param vertices: Object vertices (events, objects, vertices, 2) in the same frame as the car outlines.
+    :param valid: Validity mask (events, objects, vertices).
+    :return: Distances (events, objects) in meters, NaN for empty objects.
+    """
+    if len(car_outlines) == 0:
+        return np.empty(valid.shape[:-1])
+    cars = shapely.polygons([np.column_stack(outline) for outline in car_outlines])
+    geometries = to_geometries(vertices, valid)
+    return shapely.distance(cars[:, None], geometries)
+
+
+def to_coordinate_lists(vertices: np.ndarray, valid: np.ndarray, pad_to: int) -> List[List[list]]:
+    """
+    Convert objects to interleaved [x0, y0, x1, y1, ...] lists per event for plotting.
+
+    Empty objects and the padding up to pad_to objects are [None, None, None, None].
+    """
+    events = []
+    for event_vertices, event_valid in zip(vertices, valid):
+        objects = [
+            obj_vertices[obj_valid].ravel().tolist() if obj_valid.any() else [None, None, None, None]
+            for obj_vertices, obj_valid in zip(event_vertices, event_valid)
+        ]
+        objects.extend([None, None, None, None] for _ in range(pad_to - len(objects)))
+        events.append(objects)
+    return events
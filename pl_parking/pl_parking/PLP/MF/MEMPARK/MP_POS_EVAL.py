@@ -24,6 +24,7 @@ from tsf.core.testcase import (
 
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
+import pl_parking.common_temporal as temporal
 from pl_parking.common_ft_helper import MfCustomTestcaseReport, MfCustomTeststepReport, MfSignals
 from pl_parking.PLP.MF.constants import ConstantsMPmaneuver, PlotlyTemplate
 
@@ -89,13 +90,11 @@ class TestStepFtPosesMP(TestStep):
         posyawcheck = signals[MfSignals.Columns.APODOESTIMYAWRATERADPS]
         mp_end_man = signals[MfSignals.Columns.MPSTATE]
 
+        # Validation that the maneuver ended - Status 7, due to possible refinement
+        # of the position the validation is through all the file
         last_mp_status = 0
-        for _, val in enumerate(mp_end_man.values):
-            if val == ConstantsMPmaneuver.MP_END_MANEUVER:
-                # Vaidation that the maneuver ended - Status 7, due to possible refinement
-                # of the position the validation is through all the file
-                # Only last MP index is stored
-                last_mp_status = ConstantsMPmaneuver.MP_END_MANEUVER
+        if temporal.eventually(mp_end_man == ConstantsMPmaneuver.MP_END_MANEUVER):
+            last_mp_status = ConstantsMPmaneuver.MP_END_MANEUVER
 
         savepos_x = 0.0
         savepos_y = 0.0
@@ -125,11 +124,8 @@ class TestStepFtPosesMP(TestStep):
             eval_cond[0] = True
             # "Check Position of Vehicle to be stored"
 
-            for idx, val in enumerate(confirmation_user):
-                if val == ConstantsMPmaneuver.MP_CONFIRM_SLOT:
-                    # Check for the confirmation of the user through all the measurement.
-                    # The value is temporary stored, only the last T1 is stored.
-                    T1 = idx
+            # Check for the confirmation of the user through all the measurement, only the last T1 is stored.
+            T1 = temporal.last_true(confirmation_user == ConstantsMPmaneuver.MP_CONFIRM_SLOT)
 
             if T1 is not None:
                 # "Check End Position of Vehicle at the end of the maneuver MP-States = 7"
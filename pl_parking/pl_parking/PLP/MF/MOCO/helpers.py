@@ -1,14 +1,29 @@
 """File used to store all helper functions used in MOCO kpis"""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
 import numpy as np
 import pandas as pd
 import yaml
 
 import pl_parking.PLP.MF.constants as constants
+from pl_parking.common_cache import combine_keys, file_fingerprint, load_or_build_table
 
+try:
+    import pyarrow.csv
 
-def read_data_from_multiples_trajectories(observed_signals, csv_file):
-    """Function used to collect data from multiple trajectories"""
+    PYARROW_CSV_ENGINE = True
+except ImportError:
+    PYARROW_CSV_ENGINE = False
+
+TRAJECTORY_CACHE_NAMESPACE = "moco_trajectories"
+TRAJECTORY_CACHE_VERSION = "2"
+
+
+def observed_columns(observed_signals) -> Dict[str, str]:
+    """CSV column -> renamed column of every trajectory point of the signals listed in the observed signals yaml"""
     with open(observed_signals) as file:
         signals_data = yaml.safe_load(file)
 
@@ -23,11 +38,55 @@ def read_data_from_multiples_trajectories(observed_signals, csv_file):
             new_name = f"{rename_to}_{idx}"
             columns_to_include[signal_name] = new_name
 
-    df = pd.read_csv(csv_file)
-    df_filtered = df[list(columns_to_include.keys())]
-    df_filtered.rename(columns=columns_to_include, inplace=True)
+    return columns_to_include
+
+
+def read_trajectory_csv(csv_file, columns: Dict[str, str]) -> pd.DataFrame:
+    """
+    Read only the given columns of a CSV export, renamed, with the dtypes inferred over the whole file.
+
+    Only the projected columns are kept while parsing. With pyarrow they are parsed into an Arrow table, which is
+    released column by column while it is converted, so the table is in memory about once and not once per chunk
+    plus once concatenated.
+    """
+    header = pd.read_csv(csv_file, nrows=0).columns
+    missing = [name for name in columns if name not in header]
+    if missing:
+        raise KeyError(f"{len(missing)} observed signals missing in {csv_file}, e.g. {missing[:3]}")
+    if PYARROW_CSV_ENGINE:
+        table = pyarrow.csv.read_csv(
+            csv_file, convert_options=pyarrow.csv.ConvertOptions(include_columns=list(columns))
+        )
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+    else:
+        df = pd.read_csv(csv_file, usecols=list(columns))
+    # usecols keeps the file order, restore the order of the observed signals
+    return df[list(columns)].rename(columns=columns)
+
+
+def load_trajectory_csv(csv_file, columns: Dict[str, str]) -> pd.DataFrame:
+    """read_trajectory_csv, cached locally (Parquet) by content fingerprint of the file and the selected columns"""
+    key = combine_keys(file_fingerprint(csv_file), sorted(columns.items()), TRAJECTORY_CACHE_VERSION)
+    return load_or_build_table(TRAJECTORY_CACHE_NAMESPACE, key, lambda: read_trajectory_csv(csv_file, columns))
 
-    return df_filtered
+
+def read_multiple_trajectory_files(
+    observed_signals, csv_files: Iterable, max_workers: Optional[int] = None
+) -> List[pd.DataFrame]:
+    """Observed signals of several CSV exports, parsed concurrently, in the order of csv_files"""
+    columns = observed_columns(observed_signals)
+    csv_files = list(csv_files)
+    max_workers = max_workers or min(len(csv_files), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda csv_file: load_trajectory_csv(csv_file, columns), csv_files))
+
+
+def read_data_from_multiples_trajectories(observed_signals, csv_file):
+    """Function used to collect data from multiple trajectories, csv_file is one CSV export or several"""
+    if isinstance(csv_file, (str, os.PathLike)):
+        return load_trajectory_csv(csv_file, observed_columns(observed_signals))
+    return pd.concat(read_multiple_trajectory_files(observed_signals, csv_file), ignore_index=True)
 
 
 def get_requested_driving_direction(row):
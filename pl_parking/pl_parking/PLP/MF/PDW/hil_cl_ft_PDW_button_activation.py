@@ -16,7 +16,6 @@ from tsf.core.results import FALSE, TRUE, BooleanResult
 from tsf.core.testcase import (
     TestCase,
     TestStep,
-    register_signals,
     testcase_definition,
     teststep_definition,
 )
@@ -26,6 +25,13 @@ import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
 from pl_parking.common_ft_helper import MfHilClCustomTestcaseReport, MfHilClCustomTeststepReport
+from pl_parking.common_mdf_streaming import (
+    ChangePointRecorder,
+    HilClStateMachine,
+    hil_signal_source,
+    register_hil_signals,
+    report_missing_signals,
+)
 from pl_parking.PLP.MF.constants import PlotlyTemplate
 
 TSF_BASE = os.path.abspath(os.path.join(__file__, "..", ".."))
@@ -79,13 +85,53 @@ class ValidationSignals(MDFSignalDefinition):
 example_obj = ValidationSignals()
 
 
+class PdwButtonActivationStateMachine(HilClStateMachine):
+    """Sample by sample evaluation of the PDW activation by button, usable on full data or on chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self.button_pressed = False
+        self.eval_status_ok = None
+        self.ftti_time = 0
+        self.start_waiting = 0
+
+    def on_sample(self, time, sample):
+        """Process one sample."""
+        if not self.start_waiting:
+            # Check if IG is ON and our function is not in failure state
+            if sample.Veh_ignition and sample.PDW_State != constants.HilCl.PDW.States.FAILURE:
+                # Check if PDW button is pressed
+                if sample.PDW_Button == constants.HilCl.PDW.Button.PDW_TAP_ON:
+                    self.button_pressed = True
+                    self.start_waiting = 1  # Start waiting after button is pressed
+
+                if self.button_pressed:
+                    if not self.ftti_time:  # Start waiting for FTTI time
+                        self.start_waiting = 1
+                    else:
+                        # Check if PDW state has switched to ACTIVATED_BY_BUTTON
+                        if sample.PDW_State != constants.HilCl.PDW.States.ACTIVATED_BY_BUTTON:
+                            self.eval_status_ok = False
+                            self.finished = True
+                        else:
+                            self.eval_status_ok = True
+                            self.ftti_time = 0
+            else:
+                self.finished = True
+        else:
+            # FTTI time delay
+            self.ftti_time += time - self.previous_time
+            if self.ftti_time >= 600000:  # 600ms - system FTTI
+                self.start_waiting = 0
+
+
 @teststep_definition(
     step_number=1,
     name="PDW_button_activation_by_button",
     description="If the PDW button is pressed, the PDW function shall become active.",
     expected_result=BooleanResult(TRUE),
 )
-@register_signals(SIGNAL_DATA, ValidationSignals)
+@register_hil_signals(SIGNAL_DATA, ValidationSignals)
 class PDWButtonActivation(TestStep):
     """Example test step"""
 
@@ -100,56 +146,21 @@ class PDWButtonActivation(TestStep):
             {"Plots": [], "Plot_titles": [], "Remarks": [], "file_name": os.path.basename(self.artifacts[0].file_path)}
         )
 
-        read_data = self.readers[SIGNAL_DATA]
         plot_titles, plots, remarks = fh.rep([], 3)
 
         signal_name = example_obj._properties
 
         """Prepare signals and variables"""
         signal_summary = {}
-        time_signal = read_data.index.tolist()
-        pdw_state = read_data["PDW_State"].tolist()
-        pdw_button = read_data["PDW_Button"].tolist()
-        veh_ignition = read_data["Veh_ignition"].tolist()
-
-        # Variables used in the evaluation
-        button_pressed = False
-        eval_status_ok = None
-        FTTI_time = 0
-        start_waiting = 0
+        source = hil_signal_source(self, SIGNAL_DATA)
+        if report_missing_signals(self, source):
+            return
+        recorder = ChangePointRecorder(["PDW_State", "PDW_Button"])
 
         evaluation1 = f"The evaluation of {signal_name['PDW_State']} is PASSED, PDW State switched to the desired state after preconditions were met"
 
         """Evaluation part"""
-
-        # Go through each signal value based on the measurement's timestamp
-        for frame in range(0, len(time_signal)):
-            if not start_waiting:
-                # Check if IG is ON and our function is not in failure state
-                if veh_ignition[frame] and pdw_state[frame] != constants.HilCl.PDW.States.FAILURE:
-                    # Check if PDW button is pressed
-                    if pdw_button[frame] == constants.HilCl.PDW.Button.PDW_TAP_ON:
-                        button_pressed = True
-                        start_waiting = 1  # Start waiting after button is pressed
-
-                    if button_pressed:
-                        if not FTTI_time:  # Start waiting for FTTI time
-                            start_waiting = 1
-                        else:
-                            # Check if PDW state has switched to ACTIVATED_BY_BUTTON
-                            if pdw_state[frame] != constants.HilCl.PDW.States.ACTIVATED_BY_BUTTON:
-                                eval_status_ok = False
-                                break
-                            else:
-                                eval_status_ok = True
-                                FTTI_time = 0
-                else:
-                    break
-            else:
-                # FTTI time delay
-                FTTI_time += time_signal[frame] - time_signal[frame - 1]
-                if FTTI_time >= 600000:  # 600ms - system FTTI
-                    start_waiting = 0
+        eval_status_ok = PdwButtonActivationStateMachine().run(source, [recorder]).eval_status_ok
 
         if eval_status_ok is None:
             eval_cond = [False]
@@ -178,8 +189,17 @@ class PDWButtonActivation(TestStep):
         """Generate chart if plot function is activated"""
         fig = go.Figure()
         # Graphic signals
-        fig.add_trace(go.Scatter(x=time_signal, y=pdw_state, mode="lines", name=signal_name["PDW_State"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=pdw_button, mode="lines", name=signal_name["PDW_Button"]))
+        for column in ["PDW_State", "PDW_Button"]:
+            time_signal, values = recorder.series(column)
+            fig.add_trace(
+                go.Scatter(
+                    x=time_signal,
+                    y=values,
+                    mode="lines",
+                    line_shape=recorder.line_shape(column),
+                    name=signal_name[column],
+                )
+            )
         fig.layout = go.Layout(yaxis=dict(tickformat="14"), xaxis=dict(tickformat="14"), xaxis_title="Time[us]")
         fig.update_layout(PlotlyTemplate.lgt_tmplt)
 
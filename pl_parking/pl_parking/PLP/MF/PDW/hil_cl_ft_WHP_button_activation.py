@@ -16,7 +16,6 @@ from tsf.core.results import FALSE, TRUE, BooleanResult
 from tsf.core.testcase import (
     TestCase,
     TestStep,
-    register_signals,
     testcase_definition,
     teststep_definition,
 )
@@ -26,6 +25,13 @@ import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
 from pl_parking.common_ft_helper import MfHilClCustomTestcaseReport, MfHilClCustomTeststepReport
+from pl_parking.common_mdf_streaming import (
+    ChangePointRecorder,
+    HilClStateMachine,
+    hil_signal_source,
+    register_hil_signals,
+    report_missing_signals,
+)
 from pl_parking.PLP.MF.constants import PlotlyTemplate
 
 TSF_BASE = os.path.abspath(os.path.join(__file__, "..", ".."))
@@ -105,6 +111,70 @@ class ValidationSignals(MDFSignalDefinition):
 
 example_obj = ValidationSignals()
 
+PLOTTED_SIGNALS = [
+    "Veh_ignition",
+    "Vehicle_velocity",
+    "WHP_State",
+    "Park_Brake",
+    "Park_Brake_State",
+    "Gear_man",
+    "Gear_auto",
+    "Wheel_direction_FL",
+    "Wheel_direction_RR",
+    "Pedal_brake",
+    "PDW_Button",
+]
+
+
+class WhpButtonActivationStateMachine(HilClStateMachine):
+    """Sample by sample evaluation of the WHP activation by button, usable on full data or on chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self.trigger1 = None
+        self.trigger2 = None
+        self.trigger3 = None
+        self.eval_status_ok = None
+        self.ftti_time = 0
+        self.start_waiting = 0
+
+    def on_sample(self, time, sample):
+        """Process one sample."""
+        if not self.start_waiting:
+            # Check if our function is not in failure state
+            if sample.WHP_State != constants.HilCl.WHP.State.FAILURE:
+                self.trigger1 = True
+                # Check if WHP button is pressed
+                if sample.PDW_Button != constants.HilCl.PDW.Button.WHP_TAP_ON and self.trigger2 is None:
+                    # Check if WHP is INACTIVE before WHP button press
+                    if sample.WHP_State != constants.HilCl.WHP.State.INACTIVE:
+                        self.trigger2 = False
+                        self.finished = True
+                    else:
+                        self.trigger2 = True
+                else:
+                    self.trigger3 = True
+                    if self.trigger2:
+                        if not self.ftti_time and self.eval_status_ok is None:  # Start waiting for FTTI time
+                            self.start_waiting = 1
+                            self.trigger3 = False
+                        else:
+                            # Check if WHP is ACTIVE after WHP button was pressed
+                            if sample.WHP_State != constants.HilCl.WHP.State.ACTIVE:
+                                self.eval_status_ok = False
+                            else:
+                                self.eval_status_ok = True
+                                self.ftti_time = 0
+                            self.finished = True
+            else:
+                self.trigger1 = False
+                self.finished = True
+        else:
+            # FTTI time delay
+            self.ftti_time += time - self.previous_time
+            if self.ftti_time >= constants.HilCl.PDW.FTTI.SYSTEM_WO_OBJECTS:  # 200ms - system FTTI
+                self.start_waiting = 0
+
 
 @teststep_definition(
     step_number=1,
@@ -112,7 +182,7 @@ example_obj = ValidationSignals()
     description=("This step is checking if WHP is switching from INACTIVE to ACTIVE state."),
     expected_result=BooleanResult(TRUE),
 )
-@register_signals(SIGNAL_DATA, ValidationSignals)
+@register_hil_signals(SIGNAL_DATA, ValidationSignals)
 class WHP_activation_by_button(TestStep):
     """Example test step"""
 
@@ -127,7 +197,6 @@ class WHP_activation_by_button(TestStep):
             {"Plots": [], "Plot_titles": [], "Remarks": [], "file_name": os.path.basename(self.artifacts[0].file_path)}
         )
 
-        read_data = self.readers[SIGNAL_DATA]
         test_result = fc.INPUT_MISSING  # Result
         # plots and remarks need to have the same length
         plot_titles, plots, remarks = fh.rep([], 3)
@@ -137,39 +206,10 @@ class WHP_activation_by_button(TestStep):
 
         """Prepare signals and variables"""
         signal_summary = {}
-        time_signal = read_data.index.tolist()
-        park_brake = read_data["Park_Brake"].tolist()
-        park_brake_state = read_data["Park_Brake_State"].tolist()
-        gear_manual = read_data["Gear_man"].tolist()
-        gear_automatic = read_data["Gear_auto"].tolist()
-        fl_wheel_direction = read_data["Wheel_direction_FL"].tolist()
-        rr_wheel_direction = read_data["Wheel_direction_RR"].tolist()
-        veh_velocity = read_data["Vehicle_velocity"].tolist()
-        pedal_brake = read_data["Pedal_brake"].tolist()
-        pdw_button = read_data["PDW_Button"].tolist()
-        veh_ignition = read_data["Veh_ignition"].tolist()
-        whp_state = read_data["WHP_State"].tolist()
-        # ap_state = read_data["AUP_State"].tolist()
-        # uss0 = read_data["USS0_dist_to_object"].tolist()
-        # uss1 = read_data["USS1_dist_to_object"].tolist()
-        # uss2 = read_data["USS2_dist_to_object"].tolist()
-        # uss3 = read_data["USS3_dist_to_object"].tolist()
-        # uss4 = read_data["USS4_dist_to_object"].tolist()
-        # uss5 = read_data["USS5_dist_to_object"].tolist()
-        # uss6 = read_data["USS6_dist_to_object"].tolist()
-        # uss7 = read_data["USS7_dist_to_object"].tolist()
-        # uss8 = read_data["USS8_dist_to_object"].tolist()
-        # uss9 = read_data["USS9_dist_to_object"].tolist()
-        # uss10 = read_data["USS10_dist_to_object"].tolist()
-        # uss11 = read_data["USS11_dist_to_object"].tolist()
-
-        # Variables used in the evaluation
-        trigger1 = None
-        trigger2 = None
-        trigger3 = None
-        eval_status_ok = None
-        FTTI_time = 0
-        start_waiting = 0
+        source = hil_signal_source(self, SIGNAL_DATA)
+        if report_missing_signals(self, source):
+            return
+        recorder = ChangePointRecorder(PLOTTED_SIGNALS, continuous=["Vehicle_velocity"])
 
         evaluation1 = " ".join(
             f"The evaluation is PASSED, WHP State {signal_name['WHP_State']} switched to 'ACTIVE' state({constants.HilCl.WHP.State.ACTIVE})"
@@ -178,43 +218,12 @@ class WHP_activation_by_button(TestStep):
         )
 
         """Evaluation part"""
-        # Go through each signal value based on the measurement's timestamp
-        for frame in range(0, len(time_signal)):
-            if not start_waiting:
-                # Check if our function is not in failure state
-                if whp_state[frame] != constants.HilCl.WHP.State.FAILURE:
-                    trigger1 = True
-                    # Check if WHP button is pressed
-                    if pdw_button[frame] != constants.HilCl.PDW.Button.WHP_TAP_ON and trigger2 is None:
-                        # Check if WHP is INACTIVE before WHP button press
-                        if whp_state[frame] != constants.HilCl.WHP.State.INACTIVE:
-                            trigger2 = False
-                            break
-                        else:
-                            trigger2 = True
-                    else:
-                        trigger3 = True
-                        if trigger2:
-                            if not FTTI_time and eval_status_ok is None:  # Start waiting for FTTI time
-                                start_waiting = 1
-                                trigger3 = False
-                            else:
-                                # Check if WHP is ACTIVE after WHP button was pressed
-                                if whp_state[frame] != constants.HilCl.WHP.State.ACTIVE:
-                                    eval_status_ok = False
-                                    break
-                                else:
-                                    eval_status_ok = True
-                                    FTTI_time = 0
-                                    break
-                else:
-                    trigger1 = False
-                    break
-            else:
-                # FTTI time delay
-                FTTI_time += time_signal[frame] - time_signal[frame - 1]
-                if FTTI_time >= constants.HilCl.PDW.FTTI.SYSTEM_WO_OBJECTS:  # 200ms - system FTTI
-                    start_waiting = 0
+        state_machine = WhpButtonActivationStateMachine().run(source, [recorder])
+        trigger1 = state_machine.trigger1
+        trigger2 = state_machine.trigger2
+        trigger3 = state_machine.trigger3
+        eval_status_ok = state_machine.eval_status_ok
+
         """Check if preconditions were ok"""
         if trigger1 is False:
             preconditions = f" Check trigger1! WHP state({signal_name['WHP_State']}) set to Failure ({constants.HilCl.WHP.State.FAILURE})."
@@ -260,21 +269,17 @@ class WHP_activation_by_button(TestStep):
         # First plot
         fig = go.Figure()
         # Graphic signals
-        fig.add_trace(go.Scatter(x=time_signal, y=veh_ignition, mode="lines", name=signal_name["Veh_ignition"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=veh_velocity, mode="lines", name=signal_name["Vehicle_velocity"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=whp_state, mode="lines", name=signal_name["WHP_State"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=park_brake, mode="lines", name=signal_name["Park_Brake"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=park_brake_state, mode="lines", name=signal_name["Park_Brake_State"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=gear_manual, mode="lines", name=signal_name["Gear_man"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=gear_automatic, mode="lines", name=signal_name["Gear_auto"]))
-        fig.add_trace(
-            go.Scatter(x=time_signal, y=fl_wheel_direction, mode="lines", name=signal_name["Wheel_direction_FL"])
-        )
-        fig.add_trace(
-            go.Scatter(x=time_signal, y=rr_wheel_direction, mode="lines", name=signal_name["Wheel_direction_RR"])
-        )
-        fig.add_trace(go.Scatter(x=time_signal, y=pedal_brake, mode="lines", name=signal_name["Pedal_brake"]))
-        fig.add_trace(go.Scatter(x=time_signal, y=pdw_button, mode="lines", name=signal_name["PDW_Button"]))
+        for column in PLOTTED_SIGNALS:
+            time_signal, values = recorder.series(column)
+            fig.add_trace(
+                go.Scatter(
+                    x=time_signal,
+                    y=values,
+                    mode="lines",
+                    line_shape=recorder.line_shape(column),
+                    name=signal_name[column],
+                )
+            )
         # fig.add_trace(go.Scatter(x=time_signal, y=ap_state, mode="lines", name=signal_name["AUP_State"]))
         fig.layout = go.Layout(yaxis=dict(tickformat="14"), xaxis=dict(tickformat="14"), xaxis_title="Time[us]")
         fig.update_layout(PlotlyTemplate.lgt_tmplt)
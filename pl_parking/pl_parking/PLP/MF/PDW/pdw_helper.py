@@ -1,5 +1,7 @@
 """This helper contains info for pdw plot with sectors."""
 
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 
 import pl_parking.PLP.MF.constants as constants
@@ -276,6 +278,115 @@ def plotter_helper(time, signals, columns, signal_paths):
 
 pdw_sector_length = constants.SilCl.PDWConstants.PDWSectorLength
 
+NUMBER_OF_SLICES = 9
+# Upper bounds of the slices 1..8, slice 9 ends at PDW_SECTOR_LENGTH
+SLICE_BOUNDARIES = np.arange(1, NUMBER_OF_SLICES) * pdw_sector_length.SLICE_LENGTH
+
+
+def slice_indices(distances) -> np.ndarray:
+    """
+    Map distances to PDW slices, element wise.
+
+    Distances are rounded to mm first. Slice k covers ((k - 1) * SLICE_LENGTH, k * SLICE_LENGTH], values above
+    PDW_SECTOR_LENGTH (or NaN) give slice 0.
+    """
+    rounded = np.round(np.asarray(distances, dtype=float), 3)
+    slices = np.digitize(rounded, SLICE_BOUNDARIES, right=True) + 1
+    return np.where(rounded <= pdw_sector_length.PDW_SECTOR_LENGTH, slices, 0)
+
+
+class PDWSectorEvaluation:
+    """
+    Evaluate several PDW sectors at once.
+
+    Distances and criticality levels are stacked to arrays of shape (sectors, samples), so minima, per sample
+    slices, critical level timelines and slice occupancy are computed without looping over the samples.
+    """
+
+    def __init__(self, distances: np.ndarray, critical_levels: np.ndarray, names: list):
+        """
+        Initialize the evaluation.
+
+        :param distances: Smallest distance per sector and sample, shape (sectors, samples).
+        :param critical_levels: Criticality level per sector and sample, shape (sectors, samples).
+        :param names: Name (signal path) of every sector.
+        """
+        self.distances = np.asarray(distances, dtype=float)
+        self.critical_levels = np.asarray(critical_levels)
+        self.names = list(names)
+
+    @classmethod
+    def from_signals(cls, smallest_dist_f: list, critical_level_f: list, type_of_sector: list):
+        """Build the evaluation from lists of signals (one pandas Series per sector)."""
+        return cls(
+            np.stack([np.asarray(signal, dtype=float) for signal in smallest_dist_f]),
+            np.stack([np.asarray(signal) for signal in critical_level_f]),
+            type_of_sector,
+        )
+
+    @property
+    def detected(self) -> np.ndarray:
+        """True for the sectors which had a non zero critical level at least once"""
+        return np.any(self.critical_levels != 0, axis=1)
+
+    @property
+    def min_index(self) -> np.ndarray:
+        """Sample index of the first minimum distance of every sector with a detection, -1 for the other sectors"""
+        min_index = np.full(len(self.names), -1)
+        detected = self.detected
+        if detected.any():
+            distances = self.distances[detected]
+            min_index[detected] = np.argmin(np.where(np.isnan(distances), np.inf, distances), axis=1)
+        return min_index
+
+    @property
+    def min_distance(self) -> np.ndarray:
+        """Minimum distance of every sector with a detection rounded to mm by round(), NaN for the other sectors"""
+        return np.array(
+            [
+                round(float(self.distances[sector, index]), 3) if index >= 0 else np.nan
+                for sector, index in enumerate(self.min_index)
+            ]
+        )
+
+    @property
+    def critical_level_at_min(self) -> np.ndarray:
+        """Critical level of every sector at its minimum distance, 0 for the sectors without a detection"""
+        return np.array(
+            [self.critical_levels[sector, index] if index >= 0 else 0 for sector, index in enumerate(self.min_index)],
+            dtype=self.critical_levels.dtype,
+        )
+
+    @property
+    def slices(self) -> np.ndarray:
+        """Slice of every sector and sample, shape (sectors, samples)"""
+        return slice_indices(self.distances)
+
+    @property
+    def min_slice(self) -> np.ndarray:
+        """Slice of every sector at its minimum distance"""
+        return slice_indices(self.min_distance)
+
+    def slice_occupancy(self) -> np.ndarray:
+        """
+        Number of samples with a detection (critical level != 0) per sector and slice.
+
+        :return: Array of shape (sectors, NUMBER_OF_SLICES + 1), column 0 counts detections outside the sector length.
+        """
+        bins = NUMBER_OF_SLICES + 1
+        sector_ids = np.broadcast_to(np.arange(len(self.names))[:, None], self.distances.shape)
+        mask = self.critical_levels != 0
+        codes = sector_ids[mask] * bins + self.slices[mask]
+        return np.bincount(codes, minlength=len(self.names) * bins).reshape(len(self.names), bins)
+
+    def timeline(self, index=None) -> pd.DataFrame:
+        """Per sample slice and critical level of every sector, e.g. to check the slice over time"""
+        data = {}
+        for sector, name in enumerate(self.names):
+            data[f"{name} slice"] = self.slices[sector]
+            data[f"{name} critical level"] = self.critical_levels[sector]
+        return pd.DataFrame(data, index=index)
+
 
 class PDWSectorDistance:
     """Helper for PDW measurements"""
@@ -283,66 +394,26 @@ class PDWSectorDistance:
     def sector_evaluation(smallest_dist_f: list, critical_level_f: list, type_of_sector: list):
         """
         This function evaluate_signals takes smallest_dist_f (an array with 4 signals of smallest_distance for each front)
-        and critical_level_f (an array with 4 signals of critical for each front) as parameters. It then iterates over each front,
-        checks if the critical level (a mask that checks if an object was detected) is non-zero, and evaluates accordingly.
-        Finally, it returns a dictionary signal_summary where each segment of front is associated with its evaluation string.
+        and critical_level_f (an array with 4 signals of critical for each front) as parameters. It evaluates all sectors
+        at once and returns a dictionary signal_summary where each segment of front is associated with its evaluation string.
         """
+        evaluation = PDWSectorEvaluation.from_signals(smallest_dist_f, critical_level_f, type_of_sector)
         signal_summary = {}
-        verdict = []
-
-        for idx, (smallest_dist, critical_level) in enumerate(zip(smallest_dist_f, critical_level_f)):
-            critical_level_mask = any(critical_level)  # Checking if any value in the array is non-zero
-            if critical_level_mask:
-                smallest_dist_front1 = min(smallest_dist)
-                for i, element in enumerate(smallest_dist):
-                    if element == smallest_dist_front1:
-                        idx_crit = i
-                        break
-                verdict.append(True)
-                sector_slice = 0
-                smallest_dist_front = round(min(smallest_dist), 3)
-                if smallest_dist_front <= pdw_sector_length.SLICE_LENGTH:
-                    sector_slice = 1
-                elif (
-                    smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 2)
-                    and smallest_dist_front >= pdw_sector_length.SLICE_LENGTH
-                ):
-                    sector_slice = 2
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 3) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 2
-                ):
-                    sector_slice = 3
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 4) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 3
-                ):
-                    sector_slice = 4
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 5) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 4
-                ):
-                    sector_slice = 5
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 6) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 5
-                ):
-                    sector_slice = 6
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 7) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 6
-                ):
-                    sector_slice = 7
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 8) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 7
-                ):
-                    sector_slice = 8
-                elif smallest_dist_front <= pdw_sector_length.PDW_SECTOR_LENGTH and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 8
-                ):
-                    sector_slice = 9
-                evaluation = f"The criticality level = {critical_level_f[idx].iat[idx_crit]} in slice {sector_slice} with smallest distance detected towards object {smallest_dist_front} m."
+        for name, detected, level, sector_slice, distance in zip(
+            evaluation.names,
+            evaluation.detected,
+            evaluation.critical_level_at_min,
+            evaluation.min_slice,
+            evaluation.min_distance,
+        ):
+            if detected:
+                signal_summary[f"{name}"] = (
+                    f"The criticality level = {level} in slice {sector_slice} with smallest distance detected towards"
+                    f" object {distance} m."
+                )
             else:
-                verdict.append(False)
-                evaluation = "No object detected."
-
-            signal_summary[f"{type_of_sector[idx]}"] = evaluation
-        return signal_summary, verdict
+                signal_summary[f"{name}"] = "No object detected."
+        return signal_summary, evaluation.detected.tolist()
 
     def all_sector_evaluation(
         smallest_dist_f: list,
@@ -353,72 +424,30 @@ class PDWSectorDistance:
     ):
         """
         This function evaluate_signals takes smallest_dist_f (an array with 4 signals of smallest_distance for each front)
-        and critical_level_f (an array with 4 signals of critical for each front) as parameters. It then iterates over each front,
-        checks if the critical level (a mask that checks if an object was detected) is non-zero, and evaluates accordingly.
-        Finally, it returns a dictionary signal_summary where each segment of front is associated with its evaluation string.
+        and critical_level_f (an array with 4 signals of critical for each front) as parameters. It evaluates all sectors
+        at once and returns a dictionary signal_summary where each segment of front and each obstacle distance signal
+        is associated with its evaluation string.
         """
+        evaluation = PDWSectorEvaluation.from_signals(smallest_dist_f, critical_level_f, type_of_sector)
         signal_summary = {}
-        verdict = []
-
-        for idx, (smallest_dist, critical_level, obstacle_dist) in enumerate(
-            zip(smallest_dist_f, critical_level_f, obstacle_dist_f)
+        for name, obstacle_name, obstacle_dist, detected, level, sector_slice, distance in zip(
+            evaluation.names,
+            obstacle_signals_f,
+            obstacle_dist_f,
+            evaluation.detected,
+            evaluation.critical_level_at_min,
+            evaluation.min_slice,
+            evaluation.min_distance,
         ):
-            critical_level_mask = any(critical_level)  # Checking if any value in the array is non-zero
-            if critical_level_mask:
-                smallest_dist_front1 = min(smallest_dist)
-                for i, element in enumerate(smallest_dist):
-                    if element == smallest_dist_front1:
-                        idx_crit = i
-                        break
-                verdict.append(True)
-                smallest_dist_front = round(min(smallest_dist), 3)
-                obstacle_dist_front = round(min(obstacle_dist), 3)
-                sector_slice = 0
-                if smallest_dist_front <= pdw_sector_length.SLICE_LENGTH:
-                    sector_slice = 1
-                elif (
-                    smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 2)
-                    and smallest_dist_front >= pdw_sector_length.SLICE_LENGTH
-                ):
-                    sector_slice = 2
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 3) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 2
-                ):
-                    sector_slice = 3
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 4) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 3
-                ):
-                    sector_slice = 4
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 5) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 4
-                ):
-                    sector_slice = 5
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 6) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 5
-                ):
-                    sector_slice = 6
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 7) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 6
-                ):
-                    sector_slice = 7
-                elif smallest_dist_front <= (pdw_sector_length.SLICE_LENGTH * 8) and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 7
-                ):
-                    sector_slice = 8
-                elif smallest_dist_front <= pdw_sector_length.PDW_SECTOR_LENGTH and smallest_dist_front >= (
-                    pdw_sector_length.SLICE_LENGTH * 8
-                ):
-                    sector_slice = 9
-                evaluation1 = f"The criticality level = {critical_level_f[idx].iat[idx_crit]} in SLICE {sector_slice} with smallest distance detected towards object {smallest_dist_front} m."
-                evaluation2 = f"The criticality level = {critical_level_f[idx].iat[idx_crit]} in SLICE {sector_slice} with smallest distance detected towards object {obstacle_dist_front} m."
+            if detected:
+                text = f"The criticality level = {level} in SLICE {sector_slice} with smallest distance detected towards object"
+                obstacle_dist_min = round(float(np.min(np.asarray(obstacle_dist, dtype=float))), 3)
+                signal_summary[f"{name}"] = f"{text} {distance} m."
+                signal_summary[f"{obstacle_name}"] = f"{text} {obstacle_dist_min} m."
             else:
-                verdict.append(False)
-                evaluation1 = "No object detected."
-                evaluation2 = "No object detected."
-
-            signal_summary[f"{type_of_sector[idx]}"] = evaluation1
-            signal_summary[f"{obstacle_signals_f[idx]}"] = evaluation2
-        return signal_summary, verdict
+                signal_summary[f"{name}"] = "No object detected."
+                signal_summary[f"{obstacle_name}"] = "No object detected."
+        return signal_summary, evaluation.detected.tolist()
 
 
 all_sector_evaluation = PDWSectorDistance.all_sector_evaluation
@@ -9,7 +9,6 @@ The recording name must be included in the filename of the corresponding JSON fi
 
 import base64
 import io
-import json
 import logging
 import math
 import os
@@ -45,7 +44,9 @@ from tsf.io.signals import SignalDefinition
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
 from pl_parking.common_ft_helper import MfCustomTestcaseReport
+from pl_parking.PLP.CEM.ground_truth.gt_loader import GroundTruthLoader
 from pl_parking.PLP.MF.constants import SlotOffer
+from pl_parking.PLP.MF.SI.rectangle_fit import fits_on_angle_grid, pad_polygons
 
 __author__ = "BA ADAS ENP SIMU KPI"
 __copyright__ = "2020-2022, Continental AG"
@@ -136,6 +137,54 @@ def check_rectangle_fit(polygon, x, y, width, length, step_angle=1):
     Returns:
     - bool: True if the rectangle fits at some angle, False otherwise.
     """
+    return check_rectangle_fits([polygon], [(x, y)], width, length, step_angle)[0]
+
+
+def check_rectangle_fits(polygons, centers, width, length, step_angle=1):
+    """
+    check_rectangle_fit for several polygons, e.g. all overlap polygons of a frame.
+
+    The convex polygons are solved together with the batched half-plane tests of rectangle_fit, other geometries
+    fall back to rotating a shapely rectangle.
+
+    Parameters:
+    - polygons (list of Polygon): The polygons where the vehicle needs to fit.
+    - centers (list of tuples): The (x, y) center of the rectangle in every polygon.
+    - width, length (float): The width and length of the rectangle (vehicle).
+    - step_angle (int): The angle step in degrees (default is 1 degree).
+
+    Returns:
+    - list of bool: True for the polygons where the rectangle fits at some angle.
+    """
+    convex = [index for index, polygon in enumerate(polygons) if is_convex_polygon(polygon)]
+    fits = [None] * len(polygons)
+    if convex:
+        vertices, counts = pad_polygons([np.asarray(polygons[index].exterior.coords)[:-1] for index in convex])
+        convex_centers = [centers[index] for index in convex]
+        convex_fits, _ = fits_on_angle_grid(vertices, counts, convex_centers, width, length, step_angle)
+        for index, fit in zip(convex, convex_fits):
+            fits[index] = bool(fit)
+    for index, polygon in enumerate(polygons):
+        if fits[index] is None:
+            x, y = centers[index]
+            fits[index] = check_rectangle_fit_rotating(polygon, x, y, width, length, step_angle)
+    return fits
+
+
+def is_convex_polygon(polygon) -> bool:
+    """True for non empty, simple polygons without holes equal to their convex hull"""
+    return (
+        isinstance(polygon, Polygon)
+        and not polygon.is_empty
+        and polygon.is_valid
+        and not polygon.interiors
+        and polygon.area > 0
+        and polygon.convex_hull.area - polygon.area <= 1e-9 * polygon.area
+    )
+
+
+def check_rectangle_fit_rotating(polygon, x, y, width, length, step_angle=1):
+    """Brute force variant of check_rectangle_fit: rotate a shapely rectangle and test polygon.contains."""
     half_width = width / 2
     half_length = length / 2
 
@@ -150,7 +199,7 @@ def check_rectangle_fit(polygon, x, y, width, length, step_angle=1):
     # Create the rectangular polygon
     rect_polygon = Polygon(rect_coords)
 
-    # Iterate through angles from 0 to 360 degrees
+    # Iterate through angles from 0 to 180 degrees
     for angle in range(0, 180, step_angle):
         # Rotate the rectangle
         rotated_rect_polygon = rotate(rect_polygon, angle, origin="centroid")
@@ -786,9 +835,8 @@ class Preprocessor(PreProcessor):
 
         try:
             json_path = os.path.join(directory, json_files[0])  # Use the first matching JSON file
-            with open(json_path) as file:
-                file_data = json.loads(file.read())
-                time_obj_string_timestamp = get_time_obj_string(file_data)
+            file_data = GroundTruthLoader.load_json_file(json_path)
+            time_obj_string_timestamp = get_time_obj_string(file_data)
         except Exception as e:
             _log.error("An error occurred: %s", e)
             raise FileNotFoundError("No JSON file found matching the identifier.") from e
@@ -1174,20 +1222,41 @@ class GenericTestStep(TestStep):
                             y_coordinates.append(point["y"])
                 final_dict[timestamp]["pb_to_be_collinear_with"].append((x_coordinates, y_coordinates))
 
-                for association in final_associations.values():
-                    if parking_box_id != association["ID_parking_box"]:
-                        continue
+                # Extract (x, y) coordinates from the parking box with the specified object ID
+                gt_slot_for_calculation = []
+                for parking_box in file_data["ApplicationStarted"][0]["timedObjs"][0]["parkingBoxes"]:
+                    if parking_box["objectId"] == parking_box_id:
+                        for point in parking_box["slotCoordinates_m"]:
+                            gt_slot_for_calculation.append((point["x"], point["y"]))
+
+                # Overlap polygons of all associations of the frame, the vehicle rectangle is fitted in one batch
+                associations = [
+                    association
+                    for association in final_associations.values()
+                    if parking_box_id == association["ID_parking_box"]
+                ]
+                overlaps = [
+                    calculate_overlap(
+                        gt_slot_for_calculation,
+                        [(coords["x"], coords["y"]) for coords in association["scanned_coordinates"]],
+                    )
+                    for association in associations
+                ]
+                intersections = [intersection for intersection, _ in overlaps]
+                rectangle_fits = check_rectangle_fits(
+                    intersections,
+                    [(intersection.centroid.x, intersection.centroid.y) for intersection in intersections],
+                    vehicle_width,
+                    vehicle_length,
+                )
+
+                for association, (_, overlap_percentage), vehicle_rectangle_fits in zip(
+                    associations, overlaps, rectangle_fits
+                ):
                     scanned_slot_for_calculation = []
-                    gt_slot_for_calculation = []
                     short_distance_check = False
                     long_distance_check = False
 
-                    # Extract (x, y) coordinates from the parking box with the specified object ID
-                    for parking_box in file_data["ApplicationStarted"][0]["timedObjs"][0]["parkingBoxes"]:
-                        if parking_box["objectId"] == parking_box_id:
-                            for point in parking_box["slotCoordinates_m"]:
-                                gt_slot_for_calculation.append((point["x"], point["y"]))
-
                     # Extract the type of the parking box and check if it matches the scenario
                     for parking_box in file_data["ApplicationStarted"][0]["timedObjs"][0]["parkingBoxes"]:
                         if (
@@ -1212,12 +1281,6 @@ class GenericTestStep(TestStep):
 
                     vehicle_scanned_slot = (x_axis_slot, y_axis_slot)
 
-                    intersection, overlap_percentage = calculate_overlap(
-                        gt_slot_for_calculation, scanned_slot_for_calculation
-                    )
-                    centroid = intersection.centroid
-                    x, y = centroid.x, centroid.y
-                    vehicle_rectangle_fits = check_rectangle_fit(intersection, x, y, vehicle_width, vehicle_length)
                     vehicle_fits = "FITS" if vehicle_rectangle_fits else "DOES NOT FIT"
                     json_orientation = calculate_polygon_orientation(gt_slot_for_calculation)
                     signal_orientation = calculate_polygon_orientation(scanned_slot_for_calculation)
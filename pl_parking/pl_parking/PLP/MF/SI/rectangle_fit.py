@@ -0,0 +1,155 @@
+"""
+Analytic fit of a rotated rectangle (the ego vehicle) with a fixed center into convex slot polygons.
+
+For an edge with outward normal angle phi and slack s (distance of the rectangle center to the edge line), the
+rectangle rotated by theta stays inside the edge half-plane while
+
+    L/2 * |cos(phi - theta)| + W/2 * |sin(phi - theta)| <= s
+
+The left side equals R * cos(|phi - theta| -+ beta) with R = hypot(L/2, W/2) and beta = atan2(W/2, L/2), so every
+edge excludes the two open angle intervals phi -+ beta +- arccos(s / R) (modulo 180 degrees). The feasible angles
+are the complement of the union of the excluded intervals of all edges. ``fits_on_angle_grid`` additionally evaluates
+the half-plane test on the rotation grid of the former brute force search.
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+DEFAULT_TOLERANCE = 1e-9  # m, corners on the slot boundary count as inside (like Polygon.contains)
+
+
+@dataclass
+class RectangleFit:
+    """Fit result of a batch of slots"""
+
+    fits: np.ndarray  # (slots,) True if the rectangle fits at some angle
+    intervals: List[np.ndarray]  # per slot (k, 2) feasible rotation intervals in degrees within [0, 180]
+
+    @property
+    def widest(self) -> np.ndarray:
+        """Widest feasible interval per slot (slots, 2) in degrees, NaN if the rectangle does not fit"""
+        widest = np.full((len(self.intervals), 2), np.nan)
+        for slot, intervals in enumerate(self.intervals):
+            if len(intervals):
+                widest[slot] = intervals[np.argmax(intervals[:, 1] - intervals[:, 0])]
+        return widest
+
+
+def pad_polygons(polygons) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack polygons given as (n_i, 2) vertex sequences into (slots, max_vertices, 2) and their vertex counts"""
+    counts = np.array([len(polygon) for polygon in polygons], dtype=int)
+    vertices = np.zeros((len(polygons), max(counts.max(initial=0), 1), 2))
+    for slot, polygon in enumerate(polygons):
+        vertices[slot, : counts[slot]] = polygon
+    return vertices, counts
+
+
+def _half_planes(vertices: np.ndarray, counts: np.ndarray, centers: np.ndarray):
+    """Outward normal angles, slacks of the centers and validity of every edge (slots, max_vertices)"""
+    slots, max_vertices = vertices.shape[:2]
+    index = np.arange(max_vertices)
+    valid = index < counts[:, None]
+    following = np.where(index + 1 < counts[:, None], index + 1, 0)
+    start = vertices
+    end = vertices[np.arange(slots)[:, None], following]
+
+    # counter clockwise order, so that (dy, -dx) points outwards
+    signed_area = np.where(valid, start[..., 0] * end[..., 1] - end[..., 0] * start[..., 1], 0).sum(axis=1)
+    direction = np.where(signed_area < 0, -1.0, 1.0)[:, None, None] * (end - start)
+    length = np.hypot(direction[..., 0], direction[..., 1])
+    valid &= length > 0
+
+    phi = np.arctan2(-direction[..., 0], direction[..., 1])
+    slack = np.cos(phi) * (start[..., 0] - centers[:, None, 0]) + np.sin(phi) * (start[..., 1] - centers[:, None, 1])
+    return phi, slack, valid
+
+
+def _excess(theta: np.ndarray, phi, slack, valid, half_length, half_width) -> np.ndarray:
+    """Largest protrusion of the rectangle rotated by theta (slots, k) over the slot edges, <= 0 means inside"""
+    alpha = phi[:, None, :] - theta[..., None]
+    support = half_length[:, None, None] * np.abs(np.cos(alpha)) + half_width[:, None, None] * np.abs(np.sin(alpha))
+    return np.where(valid[:, None, :], support - slack[:, None, :], -np.inf).max(axis=-1, initial=-np.inf)
+
+
+def _prepare(vertices, counts, centers, width, length):
+    vertices = np.asarray(vertices, dtype=float)
+    counts = np.asarray(counts, dtype=int)
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    half_width = np.broadcast_to(np.asarray(width, dtype=float) / 2, len(vertices))
+    half_length = np.broadcast_to(np.asarray(length, dtype=float) / 2, len(vertices))
+    return (*_half_planes(vertices, counts, centers), half_length, half_width)
+
+
+def fit_rectangles(
+    vertices: np.ndarray, counts: np.ndarray, centers: np.ndarray, width, length, tolerance: float = DEFAULT_TOLERANCE
+) -> RectangleFit:
+    """
+    Feasible rotations of a width x length rectangle centered at the given points inside convex polygons.
+
+    Rotation 0 aligns the length with the x axis, angles are counter clockwise like shapely.affinity.rotate.
+
+    :param vertices: Convex slot polygons (slots, max_vertices, 2), any orientation, not closed.
+    :param counts: Number of vertices of every slot.
+    :param centers: Rectangle center per slot (slots, 2).
+    :param width: Rectangle width, scalar or per slot.
+    :param length: Rectangle length, scalar or per slot.
+    :param tolerance: Allowed protrusion in meters.
+    """
+    phi, slack, valid, half_length, half_width = _prepare(vertices, counts, centers, width, length)
+    radius = np.hypot(half_length, half_width)[:, None]
+    beta = np.arctan2(half_width, half_length)[:, None]
+    gamma = np.arccos(np.clip(np.divide(slack, radius, out=np.ones_like(slack), where=radius > 0), -1, 1))
+
+    # candidate angles: 0 and the bounds of all excluded intervals, the feasible set is closed so it contains
+    # one of them whenever it is not empty
+    bounds = np.concatenate([phi - beta - gamma, phi - beta + gamma, phi + beta - gamma, phi + beta + gamma], axis=1)
+    bounds = np.where(np.tile(valid, 4), np.mod(bounds, np.pi), 0.0)
+    candidates = np.sort(np.concatenate([np.zeros((len(bounds), 1)), bounds, np.full((len(bounds), 1), np.pi)], 1), 1)
+    middles = (candidates[:, :-1] + candidates[:, 1:]) / 2
+
+    feasible = _excess(candidates, phi, slack, valid, half_length, half_width) <= tolerance
+    feasible_middle = _excess(middles, phi, slack, valid, half_length, half_width) <= tolerance
+    segments = feasible[:, :-1] & feasible[:, 1:] & feasible_middle
+
+    intervals = []
+    for slot in range(len(candidates)):
+        intervals.append(_merge(np.degrees(candidates[slot]), feasible[slot], segments[slot]))
+    return RectangleFit(fits=feasible.any(axis=1), intervals=intervals)
+
+
+def _merge(angles: np.ndarray, feasible: np.ndarray, segments: np.ndarray) -> np.ndarray:
+    """Join feasible points and segments between consecutive candidate angles into closed intervals"""
+    intervals = []
+    for index, angle in enumerate(angles):
+        if not feasible[index]:
+            continue
+        if intervals and index > 0 and segments[index - 1]:
+            intervals[-1][1] = angle
+        elif not intervals or angle > intervals[-1][1]:
+            intervals.append([angle, angle])
+    return np.array(intervals, dtype=float).reshape(-1, 2)
+
+
+def fits_on_angle_grid(
+    vertices: np.ndarray,
+    counts: np.ndarray,
+    centers: np.ndarray,
+    width,
+    length,
+    step_angle: float = 1,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit decision on an angle grid and the exact feasible rotations, see fit_rectangles for the arguments.
+
+    :return: fits (slots,), True for the slots where the rectangle fits at one of the rotations 0, step_angle, ...
+        below 180 degrees, the same decision as rotating a shapely rectangle in steps. interval (slots, 2), the
+        widest feasible rotation interval in degrees, NaN if the rectangle fits at no angle.
+    """
+    phi, slack, valid, half_length, half_width = _prepare(vertices, counts, centers, width, length)
+    grid = np.radians(np.arange(0, 180, step_angle))
+    grid = np.broadcast_to(grid, (len(phi), len(grid)))
+    fits = (_excess(grid, phi, slack, valid, half_length, half_width) <= tolerance).any(axis=1)
+    return fits, fit_rectangles(vertices, counts, centers, width, length, tolerance).widest
@@ -2,8 +2,8 @@
 
 import logging
 import os
-from collections import Counter
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from tsf.core.results import DATA_NOK, FALSE, TRUE, BooleanResult
@@ -20,6 +20,7 @@ from tsf.core.testcase import (
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
 import pl_parking.PLP.MF.constants as constants
+from pl_parking.common_array_signals import array_block
 from pl_parking.common_ft_helper import MfCustomTestcaseReport, MfCustomTeststepReport, MfSignals
 
 _log = logging.getLogger(__name__)
@@ -66,18 +67,16 @@ class TaposdUniquePoseId(TestStep):
             frame_test_status = []
             signal_name = example_obj._properties
             num_valid_poses = read_data["numValidPoses"]
-            poseID = {}
-            for idx in range(8):
-                poseID[idx] = read_data[f"poseId{idx}"]
+            pose_ids = array_block(read_data, MfSignals.POSE_IDS)
+            # ids of the valid poses of every frame sorted, a duplicate equals its neighbour (NaN never does)
+            valid_ids = np.where(np.arange(pose_ids.shape[1]) < num_valid_poses.to_numpy()[:, None], pose_ids, np.nan)
+            valid_ids.sort(axis=1)
+            duplicate_ids = (valid_ids[:, 1:] == valid_ids[:, :-1]).any(axis=1)
             eval_cond = True
             for idx in range(0, len(num_valid_poses)):
-                Poseidlist = []
                 if num_valid_poses.iloc[idx] > 0:
-                    for poses in range(int(num_valid_poses.iloc[idx])):
-                        Poseidlist.append(poseID[poses].iloc[idx])
-                    id_counts = Counter(Poseidlist)
                     # Checkforduplicates
-                    if any(count > 1 for count in id_counts.values()):
+                    if duplicate_ids[idx]:
                         evaluation = " ".join(
                             f"The evaluation of PoseId and "
                             f"{signal_name['numValidPoses']} is FAILED at frame {idx} where duplicate id's found".split()
@@ -126,7 +125,7 @@ class TaposdUniquePoseId(TestStep):
                 fig.add_trace(
                     go.Scatter(
                         x=frame_number_list,
-                        y=poseID[i],
+                        y=pose_ids[:, i],
                         mode="lines",
                         name="poseId" + str(i),
                         hovertemplate="Frame: %{x}<br>Value: %{y}<br><extra></extra>",
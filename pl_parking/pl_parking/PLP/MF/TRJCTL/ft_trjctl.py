@@ -14,6 +14,7 @@ if TRC_ROOT not in sys.path:
     sys.path.append(TRC_ROOT)
 
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 from tsf.core.results import DATA_NOK, FALSE, TRUE, BooleanResult
 from tsf.core.testcase import (
@@ -26,6 +27,7 @@ from tsf.core.testcase import (
 
 import pl_parking.common_constants as fc
 import pl_parking.common_ft_helper as fh
+import pl_parking.common_temporal as temporal
 from pl_parking.common_ft_helper import MfCustomTestcaseReport, MfCustomTeststepReport, MfSignals
 from pl_parking.PLP.MF.constants import ConstantsTrajctl, GeneralConstants, PlotlyTemplate
 
@@ -395,9 +397,6 @@ class TestStepFtParkingTrajctl2(TestStep):
         T11 = None
         T12 = None
         T15 = None
-        idx_last = None
-        total_time = 0
-        first_valid_index = None
         signal_name = signals_obj._properties
 
         car_ay = read_data["Car_ay"]
@@ -421,27 +420,16 @@ class TestStepFtParkingTrajctl2(TestStep):
         self.sig_sum = None
         self.fig = None
 
-        t3 = None
         signal_summary = {}
-        total_time = 0
-        idx_last = None
-        first_valid_index = None
 
         # final_verdict = fc.INPUT_MISSING
 
-        for idx, val in enumerate(reached_status):
-            if val > 0:
-                if idx_last is not None:
-                    total_time += (idx - idx_last) / GeneralConstants.IDX_TO_S
-                    if first_valid_index is None:
-                        first_valid_index = idx - 1
-                    if round(total_time, 6) >= GeneralConstants.T_POSE_REACHED:
-                        t3 = first_valid_index
-                        break
-                idx_last = idx
-            else:
-                idx_last = None
-                total_time = 0
+        # t3: start of the first "AP.targetPosesPort.selectedPoseData.reachedStatus" >0 run lasting 0.8 sec,
+        # measured on the sample clock (IDX_TO_S samples per second)
+        pose_reached = pd.Series(
+            np.asarray(reached_status) > 0, index=np.arange(len(reached_status)) / GeneralConstants.IDX_TO_S
+        )
+        t3 = temporal.intervals(pose_reached).at_least(GeneralConstants.T_POSE_REACHED).first_start()
 
         evaluation1 = " ".join(
             f"The evaluation of {signal_name['LatDistToTarget']}             is PASSED with values < values of"
@@ -599,19 +587,7 @@ class TestStepFtParkingTrajctl2(TestStep):
             T15 = np.argmax(head_unit_screen == GeneralConstants.MANEUVER_FINISH)
 
         # T11: "AP.targetPosesPort.selectedPoseData.reachedStatus" >0 for 0.8 sec
-        for idx, val in enumerate(reached_status):
-            if val > 0:
-                if idx_last is not None:
-                    total_time += (idx - idx_last) / GeneralConstants.IDX_TO_S
-                    if first_valid_index is None:
-                        first_valid_index = idx
-                    if round(total_time, 6) >= GeneralConstants.T_POSE_REACHED:
-                        T11 = first_valid_index
-                        break
-                idx_last = idx
-            else:
-                idx_last = None
-                total_time = 0
+        T11 = t3
 
         # T12: "AP.planningCtrlPort.apStates" == 3
         # for i, val in enumerate(ap_state):
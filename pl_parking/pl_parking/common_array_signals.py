@@ -0,0 +1,104 @@
+"""
+Array signal groups: array indexed channels declared once by pattern and index range.
+
+A group expands to signal definition properties in one of two layouts:
+
+- array columns, the name has no placeholder: the channel patterns use the reader's ``%`` index and the signals
+  come back as MultiIndex ``(name, i)`` columns,
+- flat columns, the name has an ``{i}`` placeholder: one ``name.format(i=i)`` column per index, as spelled out
+  in older definitions (``relatedParkingBoxID_0`` ... ``relatedParkingBoxID_7``).
+
+``array_block`` returns a group of a read data frame as one contiguous (time x size) array, whatever the layout,
+so the evaluation can work on all elements at once instead of column by column or row by row. ``column_block`` does
+the same for array columns given by name.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+INDEX_PLACEHOLDER = "{i}"
+READER_INDEX = "%"
+
+
+@dataclass(frozen=True)
+class ArraySignalGroup:
+    """
+    Array indexed channels of one signal.
+
+    :param name: Column name, with an {i} placeholder for flat columns.
+    :param channels: Channel pattern or alternative patterns, {i} marks the index. A % left in the patterns of a
+        flat group is the reader's index of an inner array (e.g. points of every object).
+    :param size: Number of elements.
+    :param dtype: Dtype of the array block.
+    """
+
+    name: str
+    channels: Union[str, Sequence[str]]
+    size: int
+    dtype: str = "float64"
+
+    @property
+    def flat(self) -> bool:
+        """True if every element has its own column"""
+        return INDEX_PLACEHOLDER in self.name
+
+    @property
+    def patterns(self) -> List[str]:
+        """Channel patterns"""
+        return [self.channels] if isinstance(self.channels, str) else list(self.channels)
+
+    def column(self, index: int) -> Union[str, tuple]:
+        """Column of one element in a read data frame"""
+        return self.name.replace(INDEX_PLACEHOLDER, str(index)) if self.flat else (self.name, index)
+
+    def columns(self) -> List[Union[str, tuple]]:
+        """Columns of all elements, in index order"""
+        return [self.column(index) for index in range(self.size)]
+
+    def properties(self) -> Dict[str, Union[str, List[str]]]:
+        """Signal definition properties (column -> channel or alternative channels) of the group"""
+
+        def channels(index) -> Union[str, List[str]]:
+            names = [pattern.replace(INDEX_PLACEHOLDER, index) for pattern in self.patterns]
+            return names[0] if len(names) == 1 else names
+
+        if not self.flat:
+            return {self.name: channels(READER_INDEX)}
+        return {self.column(index): channels(str(index)) for index in range(self.size)}
+
+
+def group_properties(*groups: ArraySignalGroup) -> Dict[str, Union[str, List[str]]]:
+    """Signal definition properties of several groups, to be unpacked into the properties dict of a definition"""
+    properties = {}
+    for group in groups:
+        properties.update(group.properties())
+    return properties
+
+
+def array_block(df: pd.DataFrame, group: ArraySignalGroup) -> np.ndarray:
+    """
+    Elements of a group as a C-contiguous (time x size) array.
+
+    Elements missing in the data frame (array shorter than the group, unavailable flat columns) are NaN, a group
+    without any element in the data frame raises KeyError.
+    """
+    if not group.flat:
+        return column_block(df, group.name, group.size, group.dtype)
+    columns = group.columns()
+    if not df.columns.isin(columns).any():
+        raise KeyError(group.name)
+    return np.ascontiguousarray(df.reindex(columns=columns).to_numpy(dtype=group.dtype))
+
+
+def column_block(df: pd.DataFrame, name: str, size: int, dtype: str = "float64") -> np.ndarray:
+    """
+    Array columns (name, 0) ... (name, size - 1) of a read data frame as a C-contiguous (time x size) array.
+
+    Elements beyond the array read are NaN, a signal missing in the data frame raises KeyError.
+    """
+    if not isinstance(df.columns, pd.MultiIndex) or name not in df.columns.get_level_values(0):
+        raise KeyError(name)
+    return np.ascontiguousarray(df[name].reindex(columns=range(size)).to_numpy(dtype=dtype))
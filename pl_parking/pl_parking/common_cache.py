@@ -0,0 +1,218 @@
+"""
+Local, content-addressed cache for parsed data shared between test cases and reruns.
+
+Entries are stored below ``PL_PARKING_CACHE_DIR`` (defaults to a folder in the system temp directory).
+Tables are written as Parquet when pyarrow is available, otherwise as pickle.
+
+Recordings are identified by ``file_fingerprint``, a content hash of the file size and sampled blocks (or of the
+full content with ``PL_PARKING_FULL_CONTENT_HASH=1``), so copies of a recording under other names share entries.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+_log = logging.getLogger(__name__)
+
+CACHE_ENV_VAR = "PL_PARKING_CACHE_DIR"
+FULL_HASH_ENV_VAR = "PL_PARKING_FULL_CONTENT_HASH"
+CACHE_FORMAT_VERSION = "2"
+HASH_CHUNK_SIZE = 1 << 20
+FINGERPRINT_NAMESPACE = "fingerprints"
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+FINGERPRINT_BLOCKS = 32  # sampled blocks spread evenly over the file, first and last block included
+COLUMNS_METADATA_KEY = b"pl_parking.columns"  # original column labels of a Parquet table, pickled
+
+_file_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def get_cache_dir(namespace: str = "") -> Path:
+    """Return (and create) the cache folder of a namespace."""
+    root = Path(os.environ.get(CACHE_ENV_VAR, Path(tempfile.gettempdir()) / "pl_parking_cache"))
+    folder = root / namespace if namespace else root
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def file_content_hash(path) -> str:
+    """
+    Compute the sha1 of a file content.
+
+    The digest is memoized in-process by (path, mtime, size), so a file is read at most once per run.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _file_hash_memo.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _file_hash_memo[memo_key] = digest
+    return digest
+
+
+def full_hash_enabled() -> bool:
+    """Return True if recording fingerprints should hash the complete file content."""
+    return os.environ.get(FULL_HASH_ENV_VAR, "0").lower() in ("1", "true", "yes")
+
+
+def _sampled_hash(path, size: int) -> str:
+    sha = hashlib.sha1(str(size).encode())
+    with open(path, "rb") as file:
+        if size <= FINGERPRINT_BLOCKS * FINGERPRINT_BLOCK_SIZE:
+            sha.update(file.read())
+        else:
+            step = (size - FINGERPRINT_BLOCK_SIZE) / (FINGERPRINT_BLOCKS - 1)
+            for block in range(FINGERPRINT_BLOCKS):
+                file.seek(int(block * step))
+                sha.update(file.read(FINGERPRINT_BLOCK_SIZE))
+    return sha.hexdigest()
+
+
+def file_fingerprint(path, full: bool = None) -> str:
+    """
+    Content fingerprint of a file, cached on disk by (path, mtime, size).
+
+    :param full: Hash the complete content instead of the size and sampled blocks, defaults to full_hash_enabled().
+    """
+    full = full_hash_enabled() if full is None else full
+    stat = os.stat(path)
+    key = combine_keys("fingerprint", os.path.abspath(path), stat.st_mtime_ns, stat.st_size, full)
+    if full:
+        return load_or_build_object(FINGERPRINT_NAMESPACE, key, lambda: "full-" + file_content_hash(path))
+    return load_or_build_object(FINGERPRINT_NAMESPACE, key, lambda: "sampled-" + _sampled_hash(path, stat.st_size))
+
+
+def combine_keys(*parts) -> str:
+    """Build a single cache key out of several parts (hashes, parameters, versions)."""
+    sha = hashlib.sha1(CACHE_FORMAT_VERSION.encode())
+    for part in parts:
+        sha.update(str(part).encode())
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def _table_path(namespace: str, key: str, name: str) -> Path:
+    suffix = ".parquet" if PARQUET_AVAILABLE else ".pkl"
+    return get_cache_dir(namespace) / key / f"{name}{suffix}"
+
+
+def _write_table(df: pd.DataFrame, path: Path):
+    """Write a table to a temporary file and move it into place, so no reader sees a partly written table."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        if PARQUET_AVAILABLE:
+            # Parquet needs string column names, the original labels go into the schema metadata
+            table = pyarrow.Table.from_pandas(df.set_axis([str(col) for col in df.columns], axis=1))
+            metadata = {**(table.schema.metadata or {}), COLUMNS_METADATA_KEY: pickle.dumps(df.columns)}
+            pyarrow.parquet.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _read_table(path: Path) -> pd.DataFrame:
+    """Read a table written by _write_table, with its original column labels."""
+    if not PARQUET_AVAILABLE:
+        return pd.read_pickle(path)
+    table = pyarrow.parquet.read_table(path)
+    columns = (table.schema.metadata or {}).get(COLUMNS_METADATA_KEY)
+    df = table.to_pandas()
+    return df if columns is None else df.set_axis(pickle.loads(columns), axis=1)
+
+
+def load_or_build_tables(
+    namespace: str, key: str, builder: Callable[[], Dict[str, pd.DataFrame]]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Return the tables cached under (namespace, key) or build and store them.
+
+    :param namespace: Cache sub folder, e.g. "ground_truth".
+    :param key: Content hash identifying the source data.
+    :param builder: Callable returning a dict of table name -> DataFrame.
+    :return: Dict of table name -> DataFrame.
+    """
+    entry = get_cache_dir(namespace) / key
+    marker = entry / "complete"
+    if marker.exists():
+        try:
+            names = marker.read_text().split()
+            return {name: _read_table(_table_path(namespace, key, name)) for name in names}
+        except Exception as err:  # noqa: BLE001
+            _log.warning(f"Cache entry {entry} is unreadable, rebuilding it: {err}")
+
+    tables = builder()
+    try:
+        entry.mkdir(parents=True, exist_ok=True)
+        for name, df in tables.items():
+            _write_table(df, _table_path(namespace, key, name))
+        marker.write_text("\n".join(tables.keys()))
+    except Exception as err:  # noqa: BLE001
+        _log.warning(f"Could not write cache entry {entry}: {err}")
+    return tables
+
+
+def load_or_build_table(namespace: str, key: str, builder: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Single table variant of load_or_build_tables."""
+    return load_or_build_tables(namespace, key, lambda: {"table": builder()})["table"]
+
+
+def _object_path(namespace: str, key: str) -> Path:
+    return get_cache_dir(namespace) / f"{key}.pkl"
+
+
+def load_object(namespace: str, key: str, default=None):
+    """Return the pickled python object cached under (namespace, key), default if there is none."""
+    path = _object_path(namespace, key)
+    if path.exists():
+        try:
+            with open(path, "rb") as file:
+                return pickle.load(file)
+        except Exception as err:  # noqa: BLE001
+            _log.warning(f"Cache entry {path} is unreadable: {err}")
+    return default
+
+
+def store_object(namespace: str, key: str, obj) -> bool:
+    """Pickle a python object under (namespace, key), return False if it could not be written."""
+    path = _object_path(namespace, key)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as file:
+            pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as err:  # noqa: BLE001
+        _log.warning(f"Could not write cache entry {path}: {err}")
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+
+_MISSING = object()
+
+
+def load_or_build_object(namespace: str, key: str, builder: Callable):
+    """Return a pickled python object cached under (namespace, key) or build and store it."""
+    obj = load_object(namespace, key, _MISSING)
+    if obj is _MISSING:
+        obj = builder()
+        store_object(namespace, key, obj)
+    return obj
@@ -0,0 +1,168 @@
+"""
+DGPS trajectory store shared by the CEM ground truth generation and the MF ENTRY tests.
+
+A ``DgpsTrajectory`` holds the DGPS trace of a recording as one contiguous float64 matrix (time + one row per
+field). Angle fields are unwrapped once with their own period (360 for degrees, 2*pi for radians), so linear
+interpolation never jumps across the wrap-around. Trajectories can be written to the local cache as a .npy file and
+opened memory-mapped, which lets several test cases of a run share one DGPS trace without converting it again.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pl_parking.common_cache import get_cache_dir
+
+_log = logging.getLogger(__name__)
+
+DGPS_CACHE_NAMESPACE = "dgps"
+DEGREES = 360.0
+RADIANS = 2 * np.pi
+
+
+def to_local_frame(x, y, origin_x, origin_y, angle) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched transformation of global points into a local frame translated by origin and rotated by angle.
+
+    All arguments broadcast against each other, e.g. one origin per sample.
+    """
+    dx = np.asarray(x, dtype=float) - origin_x
+    dy = np.asarray(y, dtype=float) - origin_y
+    cos_angle, sin_angle = np.cos(angle), np.sin(angle)
+    return cos_angle * dx + sin_angle * dy, -sin_angle * dx + cos_angle * dy
+
+
+@dataclass
+class DgpsTrajectory:
+    """
+    DGPS trace as contiguous arrays with batched, angle aware interpolation.
+
+    :param timestamps: Sample times, strictly increasing.
+    :param fields: Field name -> samples, one value per timestamp.
+    :param angle_periods: Field name -> period of the angle fields, they are interpolated on unwrapped copies.
+    """
+
+    timestamps: np.ndarray
+    fields: Dict[str, np.ndarray]
+    angle_periods: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Store the samples contiguously and unwrap the angle fields once."""
+        self.timestamps = np.ascontiguousarray(self.timestamps, dtype=float)
+        self.fields = {name: np.ascontiguousarray(values, dtype=float) for name, values in self.fields.items()}
+        self._unwrap_angles()
+
+    def _unwrap_angles(self):
+        self._unwrapped = {
+            name: np.unwrap(self.fields[name], period=period) for name, period in self.angle_periods.items()
+        }
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        time_column: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        angle_periods: Optional[Dict[str, float]] = None,
+    ) -> "DgpsTrajectory":
+        """Build a trajectory from dataframe columns, the time base is the index if time_column is None."""
+        columns = [column for column in df.columns if column != time_column] if columns is None else list(columns)
+        times = df.index.to_numpy() if time_column is None else df[time_column].to_numpy()
+        return cls(times, {column: df[column].to_numpy() for column in columns}, dict(angle_periods or {}))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def start(self) -> float:
+        """First sample time"""
+        return self.timestamps[0]
+
+    @property
+    def end(self) -> float:
+        """Last sample time"""
+        return self.timestamps[-1]
+
+    def covers(self, timestamps) -> np.ndarray:
+        """True for the timestamps inside [start, end]"""
+        timestamps = np.asarray(timestamps, dtype=float)
+        if len(self) == 0:
+            return np.zeros(timestamps.shape, dtype=bool)
+        return (timestamps >= self.start) & (timestamps <= self.end)
+
+    def _samples(self, name: str) -> np.ndarray:
+        return self._unwrapped.get(name, self.fields[name])
+
+    def interpolate(self, timestamps, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Linear interpolation of fields at many timestamps at once.
+
+        Angle fields are interpolated on the unwrapped samples and returned continuous (not wrapped).
+        Timestamps outside [start, end] give NaN.
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        inside = self.covers(timestamps)
+        names = self.fields if names is None else names
+        return {
+            name: np.where(inside, np.interp(timestamps, self.timestamps, self._samples(name)), np.nan)
+            for name in names
+        }
+
+    def velocities(self, timestamps, x_name: str, y_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Velocity of the (x, y) position fields per time unit, from central differences of the samples"""
+        if len(self) < 2:
+            nan = np.full(np.shape(timestamps), np.nan)
+            return nan, nan.copy()
+        derivative = {
+            "vx": np.gradient(self.fields[x_name], self.timestamps),
+            "vy": np.gradient(self.fields[y_name], self.timestamps),
+        }
+        velocity = DgpsTrajectory(self.timestamps, derivative).interpolate(timestamps)
+        return velocity["vx"], velocity["vy"]
+
+    def save(self, path) -> Path:
+        """Write the trajectory as one .npy matrix (time row first) and a .json header with the field names."""
+        path = Path(path).with_suffix(".npy")
+        matrix = np.vstack([self.timestamps, *self.fields.values()])  # raw samples, angles are unwrapped on load
+        tmp_path = path.with_name(path.stem + ".tmp.npy")
+        np.save(tmp_path, matrix)
+        path.with_suffix(".json").write_text(json.dumps({"fields": list(self.fields), "angles": self.angle_periods}))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "DgpsTrajectory":
+        """Open a saved trajectory, memory-mapped by default (the fields are views on the mapped matrix)."""
+        path = Path(path).with_suffix(".npy")
+        header = json.loads(path.with_suffix(".json").read_text())
+        matrix = np.load(path, mmap_mode="r" if mmap else None)
+        fields = {name: matrix[row + 1] for row, name in enumerate(header["fields"])}
+        trajectory = cls.__new__(cls)
+        trajectory.timestamps = matrix[0]
+        trajectory.fields = fields
+        trajectory.angle_periods = header["angles"]
+        trajectory._unwrap_angles()
+        return trajectory
+
+    @classmethod
+    def load_or_build(cls, key: str, builder: Callable[[], "DgpsTrajectory"], mmap: bool = True) -> "DgpsTrajectory":
+        """Return the trajectory cached under key (see common_cache.combine_keys) or build and cache it."""
+        path = get_cache_dir(DGPS_CACHE_NAMESPACE) / f"{key}.npy"
+        if path.exists() and path.with_suffix(".json").exists():
+            try:
+                return cls.load(path, mmap=mmap)
+            except Exception as err:  # noqa: BLE001
+                _log.warning(f"DGPS cache entry {path} is unreadable, rebuilding it: {err}")
+
+        trajectory = builder()
+        try:
+            trajectory.save(path)
+        except Exception as err:  # noqa: BLE001
+            _log.warning(f"Could not write DGPS cache entry {path}: {err}")
+        return trajectory
@@ -0,0 +1,279 @@
+"""
+Per recording index of the AP state, core state, parking mode and gear transitions.
+
+The index is built from a handful of channels and cached locally, keyed by the content fingerprint of the recording
+(copies share the entry); single channels, e.g. the signal manipulation that triggers a scenario, are indexed the same
+way on demand. Test steps declare ``Precondition``s on these events. Registered through ``screened_signals``, their
+signals are only decoded when the recording meets the preconditions, and ``screen_preconditions`` marks them not
+assessed otherwise.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from tsf.core.results import DATA_NOK
+from tsf.io.datamodel import SignalDataFrame
+from tsf.io.signals import SignalDefinition
+
+from pl_parking.common_cache import combine_keys, file_fingerprint, load_or_build_table
+from pl_parking.common_mdf_streaming import US_PER_SECOND
+from pl_parking.common_signal_readers import DelegatingReader, channel_candidates, wrap_readers
+
+_log = logging.getLogger(__name__)
+
+EVENT_INDEX_NAMESPACE = "event_index"
+EVENT_INDEX_VERSION = "1"
+INDEX_COLUMNS = ["event", "timestamp", "value"]
+SUPPORTED_EXTENSIONS = (".mf4", ".mdf", ".dat")
+
+AP_STATE = "ap_state"
+CORE_STATE = "core_state"
+PARKING_MODE = "parking_mode"
+GEAR = "gear"
+
+EVENT_CHANNELS = {
+    AP_STATE: ["AP.planningCtrlPort.apStates", "Ap.planningCtrlPort.apStates"],
+    CORE_STATE: ["AP.PARKSMCoreStatusPort.parksmCoreState_nu"],
+    PARKING_MODE: ["AP.CtrlCommandPort.ppcParkingMode_nu", "AP.EM_DATA.EmCtrlCommandPort.ppcParkingMode_nu"],
+    GEAR: [
+        "AP.odoInputPort.odoSigFcanPort.gearboxCtrlStatus.gearCur_nu",
+        "MTS.ADAS_CAN.Conti_Veh_CAN.Gear.ActualGear",
+    ],
+}
+
+_indexes: Dict[str, Optional["EventIndex"]] = {}
+_channel_changes: Dict[Tuple[str, Tuple[str, ...]], Optional[pd.Series]] = {}
+_unmet: Dict[Tuple[str, tuple], List[str]] = {}
+
+
+def change_points(timestamps: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """First sample and every sample whose value differs from the previous one, as (timestamp, value) rows"""
+    values = np.asarray(values, dtype=float)
+    changed = np.ones(len(values), dtype=bool)
+    changed[1:] = (values[1:] != values[:-1]) & ~(np.isnan(values[1:]) & np.isnan(values[:-1]))
+    return pd.DataFrame({"timestamp": np.asarray(timestamps)[changed].astype("int64"), "value": values[changed]})
+
+
+@dataclass
+class EventIndex:
+    """Transitions of the indexed events of one recording, timestamps in microseconds"""
+
+    transitions: pd.DataFrame
+
+    @property
+    def events(self) -> List[str]:
+        """Events found in the recording"""
+        return list(self.transitions["event"].unique())
+
+    def has(self, event: str) -> bool:
+        """True if the recording contains the channel of the event"""
+        return bool((self.transitions["event"] == event).any())
+
+    def changes(self, event: str) -> pd.Series:
+        """Values of an event at its change points, indexed by timestamp"""
+        rows = self.transitions[self.transitions["event"] == event]
+        return pd.Series(rows["value"].to_numpy(), index=rows["timestamp"].to_numpy(), name=event)
+
+    def reaches(self, event: str, values: Iterable) -> bool:
+        """True if the event takes one of the values at some time"""
+        return bool(self.changes(event).isin(list(values)).any())
+
+    def first_time(self, event: str, values: Iterable) -> Optional[int]:
+        """First timestamp at which the event takes one of the values"""
+        changes = self.changes(event)
+        hits = changes.index[changes.isin(list(values)).to_numpy()]
+        return int(hits[0]) if len(hits) else None
+
+    def transitions_between(self, event: str, source: Iterable, target: Iterable) -> np.ndarray:
+        """Timestamps of the transitions from one of the source values to one of the target values"""
+        changes = self.changes(event)
+        previous = changes.shift()
+        hit = previous.isin(list(source)).to_numpy() & changes.isin(list(target)).to_numpy()
+        return changes.index[hit].to_numpy()
+
+
+def _channels_from_mdf(file_path: str) -> Dict[str, tuple]:
+    from asammdf import MDF
+
+    found = {}
+    with MDF(file_path) as mdf:
+        for event, candidates in EVENT_CHANNELS.items():
+            channel = next((name for name in candidates if name in mdf.channels_db), None)
+            if channel is None:
+                continue
+            signal = mdf.get(channel, raw=True)
+            found[event] = ((signal.timestamps * US_PER_SECOND).round().astype("int64"), signal.samples)
+    return found
+
+
+def build_event_index(file_path: str) -> EventIndex:
+    """Decode the event channels of a recording (each on its own time base) and keep their change points."""
+    channels = _channels_from_mdf(file_path)
+    tables = [change_points(timestamps, values).assign(event=event) for event, (timestamps, values) in channels.items()]
+    transitions = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=INDEX_COLUMNS)
+    return EventIndex(transitions[INDEX_COLUMNS])
+
+
+def recording_key(file_path: str) -> str:
+    """Cache key of a recording, from its content fingerprint"""
+    return combine_keys(file_fingerprint(file_path), EVENT_INDEX_VERSION)
+
+
+def get_event_index(file_path: str) -> Optional[EventIndex]:
+    """
+    Event index of a recording, built once and then served from memory or the local cache.
+
+    :return: None if the recording format is not supported or the index cannot be built.
+    """
+    file_path = os.path.abspath(file_path)
+    if file_path not in _indexes:
+        index = None
+        if os.path.splitext(file_path)[1].lower() in SUPPORTED_EXTENSIONS:
+            try:
+                table = load_or_build_table(
+                    EVENT_INDEX_NAMESPACE, recording_key(file_path), lambda: build_event_index(file_path).transitions
+                )
+                index = EventIndex(table)
+            except Exception as err:  # noqa: BLE001
+                _log.warning(f"Event index of {file_path} could not be built: {err}")
+        _indexes[file_path] = index
+    return _indexes[file_path]
+
+
+def build_channel_changes(file_path: str, channels: Sequence[str]) -> pd.DataFrame:
+    """Change points of the first of the channels found in a recording, no rows if none of them is recorded"""
+    from asammdf import MDF
+
+    with MDF(file_path) as mdf:
+        channel = next((name for name in channels if name in mdf.channels_db), None)
+        if channel is None:
+            return pd.DataFrame(columns=["timestamp", "value"])
+        signal = mdf.get(channel, raw=True)
+    return change_points((signal.timestamps * US_PER_SECOND).round().astype("int64"), signal.samples)
+
+
+def get_channel_changes(file_path: str, channels: Sequence[str]) -> Optional[pd.Series]:
+    """
+    Values of a channel at its change points, indexed by timestamp, built once and then served from the cache.
+
+    :param channels: Alternative names of the channel, in order of preference.
+    :return: None if the recording format is not supported or the channel is not recorded.
+    """
+    file_path = os.path.abspath(file_path)
+    memo_key = (file_path, tuple(channels))
+    if memo_key not in _channel_changes:
+        changes = None
+        if os.path.splitext(file_path)[1].lower() in SUPPORTED_EXTENSIONS:
+            try:
+                key = combine_keys(recording_key(file_path), "channel", *channels)
+                table = load_or_build_table(
+                    EVENT_INDEX_NAMESPACE, key, lambda: build_channel_changes(file_path, channels)
+                )
+                if len(table):
+                    changes = pd.Series(table["value"].to_numpy(), index=table["timestamp"].to_numpy())
+            except Exception as err:  # noqa: BLE001
+                _log.warning(f"Changes of {channels[0]} in {file_path} could not be read: {err}")
+        _channel_changes[memo_key] = changes
+    return _channel_changes[memo_key]
+
+
+@dataclass(frozen=True)
+class Precondition:
+    """
+    The recording has to reach one of the values of an event.
+
+    :param event: Indexed event (AP_STATE, ...) or, with channels, the name used in the reasons.
+    :param channels: Alternative channel names of an event outside of the index.
+    """
+
+    event: str
+    values: Sequence
+    description: str = ""
+    channels: Sequence[str] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "values", tuple(self.values))
+        object.__setattr__(self, "channels", tuple(self.channels))
+
+    def changes(self, file_path: str) -> Optional[pd.Series]:
+        """Values of the event at its change points, None if the recording does not tell"""
+        if self.channels:
+            return get_channel_changes(file_path, self.channels)
+        index = get_event_index(file_path)
+        return index.changes(self.event) if index is not None and index.has(self.event) else None
+
+    def check(self, file_path: str) -> Optional[str]:
+        """Reason why the precondition is not met, None if it is met or cannot be decided"""
+        changes = self.changes(file_path)
+        if changes is None or changes.isin(list(self.values)).any():
+            return None
+        description = self.description or f"{self.event} in {list(self.values)}"
+        return f"Precondition not met, the recording never reaches {description}"
+
+
+def trigger_precondition(signal_definition: SignalDefinition, column: str, value) -> Precondition:
+    """Precondition that the scenario trigger (e.g. the T2 signal manipulation) happens in the recording"""
+    channels = channel_candidates(signal_definition, column)
+    return Precondition(column, [value], f"{column} == {value}", channels)
+
+
+def unmet_preconditions(file_path: str, preconditions: Iterable[Precondition]) -> List[str]:
+    """Reasons of the preconditions a recording does not meet, empty if all are met or they cannot be decided"""
+    preconditions = tuple(preconditions)
+    memo_key = (os.path.abspath(file_path), preconditions)
+    if memo_key not in _unmet:
+        reasons = (precondition.check(file_path) for precondition in preconditions)
+        _unmet[memo_key] = [reason for reason in reasons if reason]
+    return _unmet[memo_key]
+
+
+class ScreeningReader(DelegatingReader):
+    """Reads the signals of a screened signal definition only if the recording meets its preconditions"""
+
+    def read_signals(self) -> SignalDataFrame:
+        """Signals of the signal definition, an empty frame without decoding if the preconditions are not met"""
+        if unmet_preconditions(self.file_path, self._defs.preconditions):
+            return SignalDataFrame()
+        return super().read_signals()
+
+
+def screened_signals(definition: Type[SignalDefinition], preconditions: Iterable[Precondition]) -> type:
+    """
+    Signal definition whose recordings are only decoded when they meet the preconditions.
+
+    Use it with register_signals and call screen_preconditions first thing in process().
+    """
+
+    class ScreenedSignals(definition):
+        def __init__(self):
+            super().__init__()
+            self.preconditions = tuple(preconditions)
+            wrap_readers(self, ScreeningReader)
+
+    ScreenedSignals.__name__ = definition.__name__
+    ScreenedSignals.__qualname__ = definition.__qualname__
+    ScreenedSignals.__module__ = definition.__module__
+    return ScreenedSignals
+
+
+def screen_preconditions(test_step, preconditions: Iterable[Precondition]) -> bool:
+    """
+    Check the preconditions of a test step on its recording before it evaluates its signals.
+
+    A test step whose recording does not meet them gets DATA_NOK (not assessed) and the reasons in its report.
+
+    :return: True if the test step should be evaluated.
+    """
+    reasons = unmet_preconditions(test_step.artifacts[0].file_path, preconditions)
+    if not reasons:
+        return True
+    test_step.result.measured_result = DATA_NOK
+    test_step.result.details.setdefault("Plots", []).append("<p>Not assessed: " + "<br>".join(reasons) + "</p>")
+    test_step.result.details.setdefault("Plot_titles", []).append("Preconditions")
+    test_step.result.details.setdefault("Remarks", []).append("")
+    _log.info(f"{type(test_step).__name__} not assessed: {'; '.join(reasons)}")
+    return False
@@ -3,6 +3,7 @@ General utility for framework functionalities like signal definition,
 function addition, and table overview customization.
 """
 
+import base64
 import functools
 import logging
 import math
@@ -13,10 +14,10 @@ import time
 import traceback
 import warnings
 from copy import deepcopy
-from json import dumps
+from json import JSONDecoder, dumps
 from typing import List
 
-import jinja2
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from shapely import LineString, Point, Polygon, affinity, box, difference
@@ -38,6 +39,9 @@ from tsf.io.signals import SignalDefinition
 from tsf.testbench._internals.report_common import TestrunContainer
 
 import pl_parking.common_constants as fc
+import pl_parking.common_report_render as report_render
+from pl_parking.common_array_signals import ArraySignalGroup
+from pl_parking.common_html_table import html_table, html_table_header, interactive_html_table
 
 _log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
@@ -109,7 +113,7 @@ class RegressionTestsStagesCustomOverview(CustomReportStatistics):
 
         # pdl = dict()
         l = []  # noqa E741
-        color_verdict = []
+        cell_colors = defaultdict(dict)
         for tcr in self.environment.testrun.testcase_results:
 
             for result in tcr.teststep_results:
@@ -155,7 +159,7 @@ class RegressionTestsStagesCustomOverview(CustomReportStatistics):
                     f"""<a href="../teststeps_details/{result.teststep_definition.id}_details_for_{result.collection_entry.id}.html" align="center" style="width: 100%; height: 100%; display: block;background-color: {get_color(verdict)}; color: #ffffff">{verdict}<br>({ratio})</a>"""
                 )
                 d[test_step_name_linked][file_name] = step_file_result
-                color_verdict.append(get_color(verdict))
+                cell_colors[test_step_name_linked][file_name] = get_color(verdict)
                 # file_name = result.collection_entry.name
 
                 j[file_name][tcr.testcase_definition.name] = {"Result": verdict}
@@ -166,51 +170,11 @@ class RegressionTestsStagesCustomOverview(CustomReportStatistics):
             json.dump(j, outfile, indent=4)
 
         s = pd.DataFrame(d)
+        colors = pd.DataFrame(cell_colors).reindex(index=s.index, columns=s.columns)
 
-        s.columns = pd.MultiIndex.from_tuples(zip(l, s.columns))
-
-        pd.set_option("display.max_colwidth", None)
-        html = s.to_html(classes="table table-hover height:500px", escape=False, col_space=100)
-
-        html = html.split("\n")
-        html_new = []
-
-        for i in range(len(html)):
-            if "<td>" not in html[i]:
-                html_new.append(html[i])
-
-            elif "<td>" in html[i]:
-                bg_col = (html[i].split(";background-color: ")[-1]).split("; color:")[0]
-                if "<td>NaN</td>" in html[i]:
-                    bg_col = '<td><a href="" align="center" style="width: 100%; height: 100%; display: block;background-color: #ffffff; color: #ffffff"> </a></td>'
-                    html_new.append(bg_col)
-                else:
-                    html_new.append(html[i].replace("<td>", f"<td bgcolor={bg_col}>"))
-        html_new_str = "\n".join(html_new)
-        html_new_str = html_new_str.replace("<thead>", '<thead class= "sticky-top" id = "myHeader">')
-        return (
-            '<div class="table-container">'
-            + html_new_str
-            + "</div>"
-            + """
-<style>
-    .table-container {
-      max-height: 600px; /* Set a maximum height for scroll */
-      overflow-y: auto; /* Enable vertical scrolling */
-    }
+        s.columns = colors.columns = pd.MultiIndex.from_tuples(zip(l, s.columns))
 
-    th {
-      background-color: #f2f2f2;
-    }
-
-    thead {
-      position: sticky;
-      top: 0;
-      background-color: #f2f2f2; /* Optional: Set background color for the sticky header */
-      z-index: 0; /* Ensure the header stays above the table body */
-    }
-  </style>"""
-        )
+        return interactive_html_table(s, "regression_stages_overview", cell_colors=colors, col_space=100)
 
 
 class CustomSOverview(CustomReportStatistics):
@@ -416,7 +380,7 @@ class MF_SIL_CustomSOverview(CustomReportStatistics):
         path_to_report = ""
         test_case_without_link = []
         path_to_report = "/".join(path_split[-4:])
-        color_verdict = []
+        cell_colors = defaultdict(dict)
         for tcr in self.environment.testrun.testcase_results:
             # verdict_list = []
 
@@ -472,7 +436,7 @@ class MF_SIL_CustomSOverview(CustomReportStatistics):
 
                     d[test_step_name_linked][file_name] = step_file_result
                     ceva[result.teststep_definition.name][file_name] = step_file_result_mf_sil
-                    color_verdict.append(get_color(verdict))
+                    cell_colors[test_step_name_linked][file_name] = get_color(verdict)
                     # file_name = result.collection_entry.name
 
                     # final_verdict_testcase = fc.FAIL
@@ -506,48 +470,11 @@ class MF_SIL_CustomSOverview(CustomReportStatistics):
         with open(os.path.join(self.environment.output_folder, "mf_sil_graph_links.txt"), "w") as file:
             file.write(str(path_to_report))
         s = pd.DataFrame(d)
+        colors = pd.DataFrame(cell_colors).reindex(index=s.index, columns=s.columns)
 
-        s.columns = pd.MultiIndex.from_tuples(zip(l, s.columns))
-        pd.set_option("display.max_colwidth", None)
-        html = s.to_html(classes="table table-hover height:500px", escape=False, col_space=100)
-
-        html = html.split("\n")
-        html_new = []
-
-        for i in range(len(html)):
-            if "<td>" not in html[i]:
-                html_new.append(html[i])
-
-            elif "<td>" in html[i]:
-                bg_col = (html[i].split(";background-color: ")[-1]).split("; color:")[0]
+        s.columns = colors.columns = pd.MultiIndex.from_tuples(zip(l, s.columns))
 
-                html_new.append(html[i].replace("<td>", f"<td bgcolor={bg_col}>"))
-        html_new_str = "\n".join(html_new)
-        html_new_str = html_new_str.replace("<thead>", '<thead class= "sticky-top" id = "myHeader">')
-
-        return (
-            '<div class="table-container">'
-            + html_new_str
-            + "</div>"
-            + """
-<style>
-    .table-container {
-      max-height: 600px; /* Set a maximum height for scroll */
-      overflow-y: auto; /* Enable vertical scrolling */
-    }
-
-    th {
-      background-color: #f2f2f2;
-    }
-
-    thead {
-      position: sticky;
-      top: 0;
-      background-color: #f2f2f2; /* Optional: Set background color for the sticky header */
-      z-index: 0; /* Ensure the header stays above the table body */
-    }
-  </style>"""
-        )
+        return interactive_html_table(s, "mf_sil_overview", cell_colors=colors, col_space=100)
 
 
 class Non_MF_SIL_CustomSOverview(CustomReportStatistics):
@@ -890,8 +817,6 @@ class RootCauseOverview(CustomReportStatistics):
                         result_dict[result.teststep_definition.name] = {}
                     for file in results:
                         result_dict[result.teststep_definition.name][file["file_name"].lower()] = file["file_name"]
-        # jinja_env = jinja2.Environment(loader=jinja2.FileSystemLoader(os.path.join(TSF_BASE, "templates")))
-        jinja_env = jinja2.Environment()
         for tcr in self.environment.testrun.testcase_results:
             if "Root" in tcr.testcase_definition.name or "Output" in tcr.testcase_definition.name:
                 for result in tcr.teststep_results:
@@ -994,7 +919,7 @@ class RootCauseOverview(CustomReportStatistics):
             z-index: 0; /* Ensure the header stays above the table body */
         }
         </style>"""
-        template = jinja_env.from_string(template_string)
+        template = report_render.template_from_string(template_string, "root_cause_overview")
 
         tst_case_names = list(d_for_export[list(d_for_export.keys())[0]]["test_case_name"].keys())
         tst_stp_names = list(d_for_export[list(d_for_export.keys())[0]]["test_case_name"][tst_case_names[0]].keys())
@@ -1044,7 +969,8 @@ class RootCauseOverview(CustomReportStatistics):
                     f"{step2}_{root_output_tests[1]}"
                 ] = val2
 
-        html = template.render(
+        html = report_render.render(
+            template,
             data=data_for_jinja_template,
             cs_list=tst_case_names * len(tst_stp_names),
             cs_dict=cs_dict,
@@ -1172,23 +1098,7 @@ class RootCauseOverview(CustomReportStatistics):
 
 #         s.columns = pd.MultiIndex.from_tuples(zip(l, s.columns))
 
-#         pd.set_option("display.max_colwidth", None)
-#         html = s.to_html(classes="table table-hover height:500px", escape=False, col_space=100)
-
-#         html = html.split("\n")
-#         html_new = []
-
-#         for i in range(len(html)):
-#             if "<td>" not in html[i]:
-#                 html_new.append(html[i])
-
-#             elif "<td>" in html[i]:
-#                 bg_col = (html[i].split(";background-color: ")[-1]).split("; color:")[0]
-
-#                 html_new.append(html[i].replace("<td>", f"<td bgcolor={bg_col}>"))
-#         html_new_str = "\n".join(html_new)
-#         html_new_str = html_new_str.replace("<thead>", '<thead class= "sticky-top" id = "myHeader">')
-
+#
 #         new_df = defaultdict(dict)
 #         step_percentage = defaultdict(dict)
 #         for use_id in usecase_dict.keys():
@@ -1235,7 +1145,7 @@ class RootCauseOverview(CustomReportStatistics):
 #                     percent = f"{percent:.2f} %"
 #                 step_percentage[key].append(percent)
 
-#         table_header = html_new_str.split("</thead>")[0] + "</thead>"
+#         table_header = html_table_header(s, classes="table table-hover height:500px")
 
 #         template = jinja_env.get_template("aup_table_template.html")
 
@@ -1281,7 +1191,6 @@ class AupKPIStatistics(CustomReportStatistics):
         usecase_dict = defaultdict(dict)
 
         usecase_dict = {key: {} for key in constants.ParkingUseCases.parking_usecase_id.keys()}
-        TSF_BASE = os.path.abspath(os.path.join(__file__, "..", ".."))
         for tcr in self.environment.testrun.testcase_results:
             test_case_name_list.append(
                 str(
@@ -1307,7 +1216,6 @@ class AupKPIStatistics(CustomReportStatistics):
                     #     if use_case_id.lower() in file["file_path"].lower():
                     #         usecase_dict[use_case_id].update({file["file_name"]: {}})
         usecase_dict = {key: val for key, val in usecase_dict.items() if key and val}
-        jinja_env = jinja2.Environment(loader=jinja2.FileSystemLoader(os.path.join(TSF_BASE, "templates")))
         l = []  # noqa E741
         color_verdict = []
         for tcr in self.environment.testrun.testcase_results:
@@ -1439,11 +1347,10 @@ class AupKPIStatistics(CustomReportStatistics):
                     percent = f"{percent:.2f} %"
                 step_percentage[key].append(percent)
 
-        table_header = html_new_str.split("</thead>")[0] + "</thead>"
-
-        template = jinja_env.get_template("aup_table_template.html")
+        table_header = html_table_header(s, classes="table table-hover height:500px")
 
-        html = template.render(
+        html = report_render.render(
+            "aup_table_template.html",
             data=new_df,
             usecases=step_percentage,
             thead=table_header,
@@ -1613,13 +1520,16 @@ def build_html_table(dataframe: pd.DataFrame, table_remark="", table_title="", t
     html_string = "<br>"
     html_string += "<h4>" + table_title + "</h4>"
 
-    # Convert DataFrame to HTML table
-    table_html = dataframe.to_html(classes="table table-hover ", index=False, escape=False)
-
-    # Apply styling to the table headers and rows
-    table_html = table_html.replace("<th>", '<th style ="background-color: #FFA500">')
-    table_html = table_html.replace('<tr style="text-align: right;">', '<tr style="text-align: center;">')
-    table_html = table_html.replace("<tr>", '<tr style="text-align: center;">')
+    # Convert DataFrame to HTML table, with styled headers and rows
+    table_html = html_table(
+        dataframe,
+        classes="table table-hover ",
+        index=False,
+        thead="<thead>",
+        na_rep="NaN",
+        th_attrs=' style ="background-color: #FFA500"',
+        tr_attrs=' style="text-align: center;"',
+    )
 
     # Add table remark with styling
     table_remark = "<h6>" + table_remark + "</h6>"
@@ -1730,6 +1640,7 @@ class CustomTeststepReport(CustomReportTestStep):
 
             if "Plots" in json_entries.details and len(json_entries.details["Plots"]) > 0:
                 s += f"<h3>{json_entries.details['file_name']}</h3><br>"
+                lint_plots(json_entries.details["Plots"], json_entries.details["file_name"])
                 for plot in range(len(json_entries.details["Plots"])):
                     try:
                         s += json_entries.details["Remarks"][plot]
@@ -1888,6 +1799,7 @@ class MfCustomTeststepReport(CustomReportTestStep):
         for k, v in processing_details.details.items():
             if "Plots" in k:
                 s += "<div>"
+                lint_plots(v, _plots_label(processing_details, teststep_result))
                 for plot in v:
 
                     s += plot
@@ -6856,6 +6768,8 @@ class EntrySignalsss(SignalDefinition):
 class MfSignals(SignalDefinition):
     """MF signal definition."""
 
+    POSE_IDS = ArraySignalGroup("poseId{i}", ".targetPosesPort.targetPoses_{i}.pose_ID", 8)
+
     class Columns(SignalDefinition.Columns):
         """Column defines."""
 
@@ -7247,7 +7161,7 @@ class MfSignals(SignalDefinition):
             self.Columns.LONGMAXDEVIATION: ".evaluationPort.longMaxDeviation_m",
             self.Columns.YAWMAXDEVIATION: ".evaluationPort.yawMaxDeviation_rad",
             self.Columns.NUMVALIDPARKINGBOXES_NU: ".parkingBoxPort.numValidParkingBoxes_nu",
-            self.Columns.PARKINGBOX0: ".parkingBoxPort.parkingBoxes_0.parkingBoxID_nu",
+            **ArraySignalGroup("parkingBox{i}", ".parkingBoxPort.parkingBoxes_{i}.parkingBoxID_nu", 8).properties(),
             self.Columns.NUMBEROFSTROKES: ".numberOfStrokes",
             self.Columns.TRAJCTRLREQUESTPORT: ".trajCtrlRequestPort.remoteReq_nu",
             self.Columns.WHEELANGLEACCELERATION: ".steeringWheelAngleAcceleration",
@@ -7260,14 +7174,9 @@ class MfSignals(SignalDefinition):
             self.Columns.STATEVARDM: ".psmDebugPort.stateVarDM_nu",
             self.Columns.STATEVARRDM: ".psmDebugPort.stateVarRDM_nu",
             self.Columns.CAR_OUTSIDE_PB: ".evaluationPort.car_outside_PB",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_0: ".evaluationPort.staticStructColidesTarget_Pose_0",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_1: ".evaluationPort.staticStructColidesTarget_Pose_1",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_2: ".evaluationPort.staticStructColidesTarget_Pose_2",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_3: ".evaluationPort.staticStructColidesTarget_Pose_3",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_4: ".evaluationPort.staticStructColidesTarget_Pose_4",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_5: ".evaluationPort.staticStructColidesTarget_Pose_5",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_6: ".evaluationPort.staticStructColidesTarget_Pose_6",
-            self.Columns.STATICSTRUCTCOLIDESTARGET_POSE_7: ".evaluationPort.staticStructColidesTarget_Pose_7",
+            **ArraySignalGroup(
+                "staticStructColidesTarget_Pose_{i}", ".evaluationPort.staticStructColidesTarget_Pose_{i}", 8
+            ).properties(),
             self.Columns.LSCADISABLED: ".lscaDisabled_nu",
             self.Columns.CAR_VX: "Car.vx",
             self.Columns.CARYAWRATE: "Car.YawRate",
@@ -7319,198 +7228,58 @@ class MfSignals(SignalDefinition):
             self.Columns.PLANNEDPATHYPOS_8: "trjplaVisuPort.plannedPathYPos_m_8",
             self.Columns.RESETCOUNTER: ".targetPosesPort.resetCounter",
             self.Columns.RESETCOUNTER_NU: ".envModelPort.resetOriginResult.resetCounter_nu",
-            self.Columns.PARKINGSCENARIO0: ".parkingBoxPort.parkingBoxes_0.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO1: ".parkingBoxPort.parkingBoxes_1.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO2: ".parkingBoxPort.parkingBoxes_2.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO3: ".parkingBoxPort.parkingBoxes_3.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO4: ".parkingBoxPort.parkingBoxes_4.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO5: ".parkingBoxPort.parkingBoxes_5.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO6: ".parkingBoxPort.parkingBoxes_6.parkingScenario_nu",
-            self.Columns.PARKINGSCENARIO7: ".parkingBoxPort.parkingBoxes_7.parkingScenario_nu",
+            **ArraySignalGroup(
+                "parkingScenario_nu{i}", ".parkingBoxPort.parkingBoxes_{i}.parkingScenario_nu", 8
+            ).properties(),
             self.Columns.NUMVALIDPOSES: ".targetPosesPort.numValidPoses",
             self.Columns.NUMVALIDCTRLPOINTS_NU: ".plannedTrajPort.numValidCtrlPoints_nu",
-            self.Columns.RELATEDPARKINGBOXID_0: ".targetPosesPort.targetPoses_0.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_1: ".targetPosesPort.targetPoses_1.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_2: ".targetPosesPort.targetPoses_2.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_3: ".targetPosesPort.targetPoses_3.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_4: ".targetPosesPort.targetPoses_4.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_5: ".targetPosesPort.targetPoses_5.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_6: ".targetPosesPort.targetPoses_6.relatedParkingBoxID",
-            self.Columns.RELATEDPARKINGBOXID_7: ".targetPosesPort.targetPoses_7.relatedParkingBoxID",
+            **ArraySignalGroup(
+                "relatedParkingBoxID_{i}", ".targetPosesPort.targetPoses_{i}.relatedParkingBoxID", 8
+            ).properties(),
             self.Columns.PARKINGBOX0: ".parkingBoxPort.parkingBoxes_0.parkingBoxID_nu",
-            self.Columns.PARKINGBOX1: ".parkingBoxPort.parkingBoxes_1.parkingBoxID_nu",
-            self.Columns.PARKINGBOX2: ".parkingBoxPort.parkingBoxes_2.parkingBoxID_nu",
-            self.Columns.PARKINGBOX3: ".parkingBoxPort.parkingBoxes_3.parkingBoxID_nu",
-            self.Columns.PARKINGBOX4: ".parkingBoxPort.parkingBoxes_4.parkingBoxID_nu",
-            self.Columns.PARKINGBOX5: ".parkingBoxPort.parkingBoxes_5.parkingBoxID_nu",
-            self.Columns.PARKINGBOX6: ".parkingBoxPort.parkingBoxes_6.parkingBoxID_nu",
-            self.Columns.PARKINGBOX7: ".parkingBoxPort.parkingBoxes_7.parkingBoxID_nu",
             self.Columns.NUMVALIDPARKINGBOXES: ".parkingBoxPort.numValidParkingBoxes_nu",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_0: ".parkingBoxPort.parkingBoxes_0.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_1: ".parkingBoxPort.parkingBoxes_1.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_2: ".parkingBoxPort.parkingBoxes_2.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_3: ".parkingBoxPort.parkingBoxes_3.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_4: ".parkingBoxPort.parkingBoxes_4.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_5: ".parkingBoxPort.parkingBoxes_5.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_6: ".parkingBoxPort.parkingBoxes_6.slotCoordinates_RearRight_y",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_X_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_FrontLeft_x",
-            self.Columns.SLOTCOORDINATES_FRONTLEFT_Y_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_FrontLeft_y",
-            self.Columns.SLOTCOORDINATES_REARLEFT_X_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_RearLeft_x",
-            self.Columns.SLOTCOORDINATES_REARLEFT_Y_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_RearLeft_y",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_X_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_FrontRight_x",
-            self.Columns.SLOTCOORDINATES_FRONTRIGHT_Y_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_FrontRight_y",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_X_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_RearRight_x",
-            self.Columns.SLOTCOORDINATES_REARRIGHT_Y_7: ".parkingBoxPort.parkingBoxes_7.slotCoordinates_RearRight_y",
+            **ArraySignalGroup(
+                "slotCoordinates_FrontLeft_x_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_FrontLeft_x", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_FrontLeft_y_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_FrontLeft_y", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_RearLeft_x_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_RearLeft_x", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_RearLeft_y_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_RearLeft_y", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_FrontRight_x_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_FrontRight_x", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_FrontRight_y_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_FrontRight_y", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_RearRight_x_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_RearRight_x", 8
+            ).properties(),
+            **ArraySignalGroup(
+                "slotCoordinates_RearRight_y_{i}", ".parkingBoxPort.parkingBoxes_{i}.slotCoordinates_RearRight_y", 8
+            ).properties(),
             self.Columns.TRAJTYPE_NU: ".plannedTrajPort.trajType_nu",
             self.Columns.APCHOSENTARGETPOSEID: ".planningCtrlPort.apChosenTargetPoseId_nu",
-            self.Columns.TARGETPOSESTYPE0: ".targetPosesPort.targetPoses_0.type",
-            self.Columns.TARGETPOSESTYPE1: ".targetPosesPort.targetPoses_1.type",
-            self.Columns.TARGETPOSESTYPE2: ".targetPosesPort.targetPoses_2.type",
-            self.Columns.TARGETPOSESTYPE3: ".targetPosesPort.targetPoses_3.type",
-            self.Columns.TARGETPOSESTYPE4: ".targetPosesPort.targetPoses_4.type",
-            self.Columns.TARGETPOSESTYPE5: ".targetPosesPort.targetPoses_5.type",
-            self.Columns.TARGETPOSESTYPE6: ".targetPosesPort.targetPoses_6.type",
-            self.Columns.TARGETPOSESTYPE7: ".targetPosesPort.targetPoses_7.type",
-            self.Columns.TARGETPOSEID0: ".targetPosesPort.targetPoses_0.pose_ID",
-            self.Columns.TARGETPOSEID1: ".targetPosesPort.targetPoses_1.pose_ID",
-            self.Columns.TARGETPOSEID2: ".targetPosesPort.targetPoses_2.pose_ID",
-            self.Columns.TARGETPOSEID3: ".targetPosesPort.targetPoses_3.pose_ID",
-            self.Columns.TARGETPOSEID4: ".targetPosesPort.targetPoses_4.pose_ID",
-            self.Columns.TARGETPOSEID5: ".targetPosesPort.targetPoses_5.pose_ID",
-            self.Columns.TARGETPOSEID6: ".targetPosesPort.targetPoses_6.pose_ID",
-            self.Columns.TARGETPOSEID7: ".targetPosesPort.targetPoses_7.pose_ID",
-            self.Columns.TARGETPOSEREACHABLE0: ".targetPosesPort.targetPoses_0.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE1: ".targetPosesPort.targetPoses_1.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE2: ".targetPosesPort.targetPoses_2.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE3: ".targetPosesPort.targetPoses_3.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE4: ".targetPosesPort.targetPoses_4.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE5: ".targetPosesPort.targetPoses_5.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE6: ".targetPosesPort.targetPoses_6.reachableStatus",
-            self.Columns.TARGETPOSEREACHABLE7: ".targetPosesPort.targetPoses_7.reachableStatus",
-            self.Columns.TARGETPOSESIDE0: ".targetPosesPort.targetPoses_0.targetSide",
-            self.Columns.TARGETPOSESIDE1: ".targetPosesPort.targetPoses_1.targetSide",
-            self.Columns.TARGETPOSESIDE2: ".targetPosesPort.targetPoses_2.targetSide",
-            self.Columns.TARGETPOSESIDE3: ".targetPosesPort.targetPoses_3.targetSide",
-            self.Columns.TARGETPOSESIDE4: ".targetPosesPort.targetPoses_4.targetSide",
-            self.Columns.TARGETPOSESIDE5: ".targetPosesPort.targetPoses_5.targetSide",
-            self.Columns.TARGETPOSESIDE6: ".targetPosesPort.targetPoses_6.targetSide",
-            self.Columns.TARGETPOSESIDE7: ".targetPosesPort.targetPoses_7.targetSide",
-            self.Columns.TARGETPOSEPOSX0: ".targetPosesPort.targetPoses_0.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX1: ".targetPosesPort.targetPoses_1.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX2: ".targetPosesPort.targetPoses_2.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX3: ".targetPosesPort.targetPoses_3.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX4: ".targetPosesPort.targetPoses_4.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX5: ".targetPosesPort.targetPoses_5.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX6: ".targetPosesPort.targetPoses_6.pose.pos.x",
-            self.Columns.TARGETPOSEPOSX7: ".targetPosesPort.targetPoses_7.pose.pos.x",
-            self.Columns.TARGETPOSEPOSY0: ".targetPosesPort.targetPoses_0.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY1: ".targetPosesPort.targetPoses_1.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY2: ".targetPosesPort.targetPoses_2.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY3: ".targetPosesPort.targetPoses_3.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY4: ".targetPosesPort.targetPoses_4.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY5: ".targetPosesPort.targetPoses_5.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY6: ".targetPosesPort.targetPoses_6.pose.pos.y",
-            self.Columns.TARGETPOSEPOSY7: ".targetPosesPort.targetPoses_7.pose.pos.y",
-            self.Columns.TARGETPOSEYAWRAD0: ".targetPosesPort.targetPoses_0.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD1: ".targetPosesPort.targetPoses_1.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD2: ".targetPosesPort.targetPoses_2.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD3: ".targetPosesPort.targetPoses_3.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD4: ".targetPosesPort.targetPoses_4.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD5: ".targetPosesPort.targetPoses_5.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD6: ".targetPosesPort.targetPoses_6.pose.yaw_rad",
-            self.Columns.TARGETPOSEYAWRAD7: ".targetPosesPort.targetPoses_7.pose.yaw_rad",
+            **ArraySignalGroup("poseType{i}", ".targetPosesPort.targetPoses_{i}.type", 8).properties(),
+            **self.POSE_IDS.properties(),
+            **ArraySignalGroup(
+                "targetPoseReachableStatus{i}", ".targetPosesPort.targetPoses_{i}.reachableStatus", 8
+            ).properties(),
+            **ArraySignalGroup("targetPoseSide{i}", ".targetPosesPort.targetPoses_{i}.targetSide", 8).properties(),
+            **ArraySignalGroup("targetPosePositionX{i}", ".targetPosesPort.targetPoses_{i}.pose.pos.x", 8).properties(),
+            **ArraySignalGroup("targetPosePositionY{i}", ".targetPosesPort.targetPoses_{i}.pose.pos.y", 8).properties(),
+            **ArraySignalGroup("targetPoseYawRad{i}", ".targetPosesPort.targetPoses_{i}.pose.yaw_rad", 8).properties(),
             self.Columns.EGOPOSITIONAPX: ".envModelPort.egoVehiclePoseForAP.pos_x_m",
             self.Columns.EGOPOSITIONAPY: ".envModelPort.egoVehiclePoseForAP.pos_y_m",
             self.Columns.EGOPOSITIONAPYAW: ".envModelPort.egoVehiclePoseForAP.yaw_rad",
-            self.Columns.TRAJCURVATURE0: ".plannedTrajPort.plannedTraj_0.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE1: ".plannedTrajPort.plannedTraj_1.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE2: ".plannedTrajPort.plannedTraj_2.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE3: ".plannedTrajPort.plannedTraj_3.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE4: ".plannedTrajPort.plannedTraj_4.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE5: ".plannedTrajPort.plannedTraj_5.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE6: ".plannedTrajPort.plannedTraj_6.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE7: ".plannedTrajPort.plannedTraj_7.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE8: ".plannedTrajPort.plannedTraj_8.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE9: ".plannedTrajPort.plannedTraj_9.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE10: ".plannedTrajPort.plannedTraj_10.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE11: ".plannedTrajPort.plannedTraj_11.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE12: ".plannedTrajPort.plannedTraj_12.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE13: ".plannedTrajPort.plannedTraj_13.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE14: ".plannedTrajPort.plannedTraj_14.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE15: ".plannedTrajPort.plannedTraj_15.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE16: ".plannedTrajPort.plannedTraj_16.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE17: ".plannedTrajPort.plannedTraj_17.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE18: ".plannedTrajPort.plannedTraj_18.crvRARReq_1pm",
-            self.Columns.TRAJCURVATURE19: ".plannedTrajPort.plannedTraj_19.crvRARReq_1pm",
-            self.Columns.TRAJVELOCITYLIMIT0: ".plannedTrajPort.plannedTraj_0.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT1: ".plannedTrajPort.plannedTraj_1.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT2: ".plannedTrajPort.plannedTraj_2.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT3: ".plannedTrajPort.plannedTraj_3.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT4: ".plannedTrajPort.plannedTraj_4.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT5: ".plannedTrajPort.plannedTraj_5.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT6: ".plannedTrajPort.plannedTraj_6.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT7: ".plannedTrajPort.plannedTraj_7.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT8: ".plannedTrajPort.plannedTraj_8.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT9: ".plannedTrajPort.plannedTraj_9.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT10: ".plannedTrajPort.plannedTraj_10.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT11: ".plannedTrajPort.plannedTraj_11.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT12: ".plannedTrajPort.plannedTraj_12.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT13: ".plannedTrajPort.plannedTraj_13.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT14: ".plannedTrajPort.plannedTraj_14.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT15: ".plannedTrajPort.plannedTraj_15.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT16: ".plannedTrajPort.plannedTraj_16.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT17: ".plannedTrajPort.plannedTraj_17.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT18: ".plannedTrajPort.plannedTraj_18.velocityLimitReq_mps",
-            self.Columns.TRAJVELOCITYLIMIT19: ".plannedTrajPort.plannedTraj_19.velocityLimitReq_mps",
+            **ArraySignalGroup("trajCurvature{i}", ".plannedTrajPort.plannedTraj_{i}.crvRARReq_1pm", 20).properties(),
+            **ArraySignalGroup(
+                "trajVelocityLimit{i}", ".plannedTrajPort.plannedTraj_{i}.velocityLimitReq_mps", 20
+            ).properties(),
             # self.Columns.TRAJVELOCITYLIMIT: [".plannedTrajPort.plannedTraj_%.velocityLimitReq_mps",]
         }
 
@@ -9541,6 +9310,7 @@ class MfHilClCustomTeststepReport(CustomReportTestStep):
         for k, v in processing_details.details.items():
             if "Plots" in k:
                 s += "<div>"
+                lint_plots(v, _plots_label(processing_details, teststep_result))
                 for plot in v:
 
                     s += plot
@@ -9650,6 +9420,66 @@ class BackButtonOverviewNonRegression(CustomReportOverview):
         return r
 
 
+def round_signal(input_signal, round_legnt: int) -> np.ndarray:
+    """
+    Round a signal like round() does for every sample, but for the whole array at once.
+
+    Integer and boolean signals are returned unchanged (as integers), because round() does not alter them.
+    Samples of np.ndarray and pd.Series signals are numpy floats, whose round() is np.round. The samples of other
+    sequences are Python floats, rounded by the builtin round() on their exact binary value (round(7.295, 2) is 7.29,
+    np.round gives 7.3): np.round is only kept where the value is not close to a half, the others use round().
+
+    :param input_signal: Signal values (list, pd.Series or np.ndarray).
+    :param round_legnt: Number of decimals.
+    :return: The rounded signal as np.ndarray.
+    """
+    values = np.asarray(input_signal)
+    if values.dtype == bool:
+        return values.astype(np.int64)
+    if np.issubdtype(values.dtype, np.integer):
+        return values
+    values = values.astype(float)
+    rounded = np.round(values, round_legnt)
+    if isinstance(input_signal, (np.ndarray, pd.Series)):
+        return rounded
+    scaled = values * 10.0**round_legnt
+    with np.errstate(invalid="ignore"):
+        near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for idx in np.flatnonzero(near_half):
+        rounded[idx] = round(float(values[idx]), round_legnt)
+    return rounded
+
+
+def run_length_encode(values):
+    """
+    Run-length encode a 1-D signal.
+
+    Consecutive NaN samples are considered different from each other, like in a `!=` comparison.
+
+    :param values: Signal values.
+    :return: Tuple (starts, ends, run_values); run i covers the samples starts[i]..ends[i] (inclusive).
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, values[:0]
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    ends = np.concatenate((starts[1:] - 1, [values.size - 1]))
+    return starts, ends, values[starts]
+
+
+def mask_intervals(mask):
+    """
+    Find the runs of True samples in a boolean mask.
+
+    :param mask: Boolean signal.
+    :return: Tuple (starts, ends) with the first and last index (inclusive) of every run of True samples.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    edges = np.diff(np.concatenate(([False], mask, [False])).astype(np.int8))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+
 class HilClFuntions:
     """Utility class for handling rising and falling edge functions."""
 
@@ -9693,21 +9523,8 @@ class HilClFuntions:
         Returns:
             list: List of indices where rising edges occur.
         """
-        previous_value = None
-        collected_idx = []
-
-        for cnt in range(0, len(input_signal)):
-            if cnt == 0:
-                previous_value = round(input_signal[cnt], round_legnt)
-                continue
-
-            if previous_value < round(input_signal[cnt], round_legnt):
-                collected_idx.append(cnt)
-                previous_value = round(input_signal[cnt], round_legnt)
-
-            else:
-                previous_value = round(input_signal[cnt], round_legnt)
-        return collected_idx
+        values = round_signal(input_signal, round_legnt)
+        return (np.flatnonzero(values[:-1] < values[1:]) + 1).tolist()
 
     def FallingEdge(input_signal, round_legnt):
         """
@@ -9720,22 +9537,8 @@ class HilClFuntions:
         Returns:
             list: List of indices where falling edges occur.
         """
-        previous_value = None
-        collected_idx = []
-
-        for cnt in range(0, len(input_signal)):
-            if cnt == 0:
-                previous_value = round(input_signal[cnt], round_legnt)
-                continue
-
-            if previous_value > round(input_signal[cnt], round_legnt):
-                collected_idx.append(cnt)
-                previous_value = round(input_signal[cnt], round_legnt)
-
-            else:
-                previous_value = round(input_signal[cnt], round_legnt)
-
-        return collected_idx
+        values = round_signal(input_signal, round_legnt)
+        return (np.flatnonzero(values[:-1] > values[1:]) + 1).tolist()
 
     def AddStatesToEvalString(input_signal, eval_string, input_dict, input_time_signal):
         """
@@ -9767,17 +9570,11 @@ class HilClFuntions:
             round_legnt (int): Length for rounding the input signal.
 
         Returns:
-            list: List of indices where falling edges occur.
+            dict: Index -> state value for every index where the (rounded) state changes.
         """
-        previous_value = None
-        collected_states = {}
-
-        for cnt in range(t_start_idx, t_end_idx):
-            if previous_value != round(input_signal[cnt], round_legnt):
-                previous_value = round(input_signal[cnt], round_legnt)
-                collected_states.update({cnt: round(input_signal[cnt], round_legnt)})
-
-        return collected_states
+        values = round_signal(input_signal, round_legnt)[t_start_idx:t_end_idx]
+        starts, _, run_values = run_length_encode(values)
+        return dict(zip((starts + t_start_idx).tolist(), run_values.tolist()))
 
     @staticmethod
     def object_generator(obj_size: int, coordinate_list: List[tuple]):
@@ -11414,6 +11211,7 @@ class MOCOCustomTeststepReport(CustomReportTestStep):
         for k, v in processing_details.details.items():
             if "Plots" in k:
                 s += "<div>"
+                lint_plots(v, _plots_label(processing_details, teststep_result))
                 for plot in v:
                     s += plot
                 s += "</div>"
@@ -11579,19 +11377,9 @@ def highlight_segments(fig, signal, state, time, fillcolor, annotation_text):
     Returns:
     None
     """
-    scanning = []
-    start_scan = None
-    for idx in range(len(signal)):
-        if signal.iat[idx] == state:
-            if start_scan is None:
-                start_scan = time.iat[idx]
-            end = time.iat[idx]
-        else:
-            if start_scan is not None:
-                scanning.append([start_scan, end])
-                start_scan = None
-    if start_scan is not None:
-        scanning.append([start_scan, end])
+    starts, ends = mask_intervals(np.asarray(signal) == state)
+    time_values = np.asarray(time)
+    scanning = [[time_values[start], time_values[end]] for start, end in zip(starts, ends)]
 
     for segment in scanning:
         fig.add_vrect(
@@ -11785,6 +11573,151 @@ def create_rects(time_intervals, final_df):
     return rects
 
 
+WEBGL_POINT_THRESHOLD = 10000  # points per trace above which SVG rendering gets sluggish, WebGL is used instead
+FIGURE_POINT_BUDGET = 200000  # points per figure a report page still opens quickly with
+
+_figure_budget_violations = []
+_PLOTLY_NEW_PLOT = re.compile(r'Plotly\.newPlot\(\s*"[^"]*",\s*')  # followed by the json list of traces
+_json_decoder = JSONDecoder()
+
+
+def scatter_trace(x, y, threshold=WEBGL_POINT_THRESHOLD, **kwargs):
+    """go.Scatter trace, or go.Scattergl when the trace has more than threshold points."""
+    trace_class = go.Scattergl if len(x) > threshold else go.Scatter
+    return trace_class(x=x, y=y, **kwargs)
+
+
+def step_change_points(x, y):
+    """
+    Reduce a step signal to its change points.
+
+    Keeps the first sample, every sample whose value differs from the previous one and the last sample, so a
+    line_shape="hv" trace through the kept points draws the same steps.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) < 3:
+        return x, y
+    y_series = pd.Series(y)
+    changed = (y_series != y_series.shift()).to_numpy() & ~(y_series.isna() & y_series.shift().isna()).to_numpy()
+    changed[[0, -1]] = True
+    return x[changed], y[changed]
+
+
+def step_trace(x, y, name=None, marker_color=None, mode="lines+markers", threshold=WEBGL_POINT_THRESHOLD, **kwargs):
+    """Step signal trace (line_shape="hv") with change points only, WebGL above threshold points."""
+    x, y = step_change_points(x, y)
+    return scatter_trace(
+        x,
+        y,
+        threshold=threshold,
+        mode=mode,
+        line_shape="hv",
+        name=name,
+        marker=dict(color=marker_color) if marker_color else None,
+        **kwargs,
+    )
+
+
+def rendered_figure_traces(html):
+    """Traces (dicts) of the plotly figures in html rendered by Figure.to_html, empty for other html"""
+    traces = []
+    for match in _PLOTLY_NEW_PLOT.finditer(html):
+        try:
+            data, _ = _json_decoder.raw_decode(html, match.end())
+        except ValueError:
+            continue
+        traces.extend(trace for trace in data if isinstance(trace, dict))
+    return traces
+
+
+def _point_count(values):
+    """Number of points of trace data, also of the base64 typed arrays newer plotly versions render"""
+    if values is None:
+        return 0
+    if isinstance(values, dict):
+        if "shape" in values:
+            return int(str(values["shape"]).split(",")[0])
+        return len(base64.b64decode(values.get("bdata", ""))) // np.dtype(values.get("dtype", "f8")).itemsize
+    return len(values)
+
+
+def figure_point_counts(fig):
+    """Number of points per trace of a figure, or of the figures in rendered html"""
+    traces = rendered_figure_traces(fig) if isinstance(fig, str) else [trace.to_plotly_json() for trace in fig.data]
+    return [(trace.get("type"), trace.get("name"), _point_count(trace.get("x", trace.get("y")))) for trace in traces]
+
+
+def lint_figure(fig, label=""):
+    """
+    Check a figure against the plotting budget, logs and records every violation.
+
+    A figure violates the budget with more than FIGURE_POINT_BUDGET points in total or with an SVG scatter trace
+    above WEBGL_POINT_THRESHOLD points.
+
+    :param fig: Plotly figure or html, e.g. an entry of details["Plots"]; html without figures is within budget.
+    :param label: Name of the figure in the budget report, by default the code location rendering it.
+    :return: Description of the violations, empty if the figure is within budget.
+    """
+    counts = figure_point_counts(fig)
+    total = sum(count for _, _, count in counts)
+    problems = []
+    if total > FIGURE_POINT_BUDGET:
+        problems.append(f"{total} points in total (budget {FIGURE_POINT_BUDGET})")
+    for trace_type, name, count in counts:
+        if trace_type == "scatter" and count > WEBGL_POINT_THRESHOLD:
+            problems.append(f"SVG trace '{name}' with {count} points (WebGL above {WEBGL_POINT_THRESHOLD})")
+    if problems:
+        label = label or _figure_origin()
+        _figure_budget_violations.append((label, problems))
+        _log.warning(f"Figure {label} exceeds the plotting budget: {'; '.join(problems)}")
+    return problems
+
+
+def lint_plots(plots, label=""):
+    """Lint every figure of a details["Plots"] list while the report renders it, return the plots"""
+    for plot in plots:
+        if isinstance(plot, (str, go.Figure)):
+            lint_figure(plot, label)
+    return plots
+
+
+def _figure_origin():
+    """Module and line outside of this helper and plotly which rendered the figure"""
+    for frame in traceback.extract_stack()[::-1]:
+        if frame.filename != __file__ and "plotly" not in frame.filename:
+            return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    return "<unknown>"
+
+
+def _plots_label(processing_details, teststep_result):
+    """Test step and recording of the plots a report renders, names them in the budget report"""
+    return f"{teststep_result.teststep_definition.name}: {processing_details.details.get('file_name', '')}"
+
+
+def figure_budget_violations():
+    """All (figure, problems) recorded by lint_figure in this process"""
+    return list(_figure_budget_violations)
+
+
+def figure_budget_report(violations=None):
+    """
+    HTML table of figures exceeding the plotting budget, empty string if there are none.
+
+    :param violations: (figure, problems) pairs, by default all recorded by lint_figure in this process.
+    """
+    violations = figure_budget_violations() if violations is None else violations
+    if not violations:
+        return ""
+    table = pd.DataFrame(
+        {
+            "Figure": [label for label, _ in violations],
+            "Violations": ["<br>".join(problems) for _, problems in violations],
+        }
+    )
+    return build_html_table(table, table_title="Figures exceeding the plotting budget")
+
+
 def create_config(data_pairs, annotation_text, rects=None):
     """Returns: dict: Configuration dictionary."""
     if rects is None:
@@ -11822,19 +11755,6 @@ def create_plot(data, plot_titles, plots, remarks, config, final_data=None):
             - 'layout': Dictionary for layout settings with keys 'xaxis_title', 'yaxis_title'
         - final_data: Optional DataFrame for final data to plot; if not provided, only main data will be plotted.
     """
-
-    def add_trace(fig, x, y, name, marker_color=None):
-        fig.add_trace(
-            go.Scatter(
-                x=x,
-                y=y,
-                mode="lines+markers",
-                line_shape="hv",
-                name=name,
-                marker=dict(color=marker_color) if marker_color else None,
-            )
-        )
-
     # Add initial elements to plot_titles, plots, and remarks
     plot_titles.append("")
     plots.append("")
@@ -11844,9 +11764,9 @@ def create_plot(data, plot_titles, plots, remarks, config, final_data=None):
 
     # Add traces based on config data pairs
     for x, y, name, marker_color in config["data_pairs"]:
-        add_trace(fig, data[x], data[y], name, marker_color)
+        fig.add_trace(step_trace(data[x], data[y], name, marker_color))
         if final_data is not None:
-            add_trace(fig, final_data[x], final_data[y], f"{name}_state_change", "green")
+            fig.add_trace(step_trace(final_data[x], final_data[y], f"{name}_state_change", "green"))
 
     # Determine rectangles and annotations positions based on config
     rects = config["rects"]
@@ -11887,19 +11807,6 @@ def create_plot(data, plot_titles, plots, remarks, config, final_data=None):
 
 def update_plots(data, plot_titles, plots, remarks, data_pairs):
     """Updates plot titles, plots, and remarks based on the provided data pairs."""
-
-    def add_trace(fig, x, y, name, marker_color=None):
-        fig.add_trace(
-            go.Scatter(
-                x=x,
-                y=y,
-                mode="lines+markers",
-                line_shape="hv",
-                name=name,
-                marker=dict(color=marker_color) if marker_color else None,
-            )
-        )
-
     # Add initial elements to plot_titles, plots, and remarks
     plot_titles.append("")
     plots.append("")
@@ -11908,7 +11815,7 @@ def update_plots(data, plot_titles, plots, remarks, data_pairs):
     fig = go.Figure()
 
     for x, y, name, marker_color in data_pairs:
-        add_trace(fig, data[x], data[y], name, marker_color)
+        fig.add_trace(step_trace(data[x], data[y], name, marker_color))
 
     plots.append(fig)
     return plots
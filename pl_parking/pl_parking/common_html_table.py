@@ -0,0 +1,293 @@
+"""
+Columnar HTML table generation for report pages.
+
+``html_table_chunks`` builds the table markup column by column with vectorized string operations and yields it in
+chunks of rows, ``html_table`` joins the chunks. For the large statistics overviews ``interactive_html_table`` ships
+the cells once as compact JSON and renders them in the browser, either page by page or with virtual scrolling (only
+the visible rows are in the DOM). Sort orders of every column are computed here, so sorting in the page is a lookup.
+"""
+
+import json
+from functools import reduce
+from html import escape as escape_html
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 500  # rows per yielded chunk
+TAG_PATTERN = r"<[^>]*>"
+STICKY_THEAD = '<thead class= "sticky-top" id = "myHeader">'
+
+TABLE_STYLE = """
+<style>
+    .table-container {
+      max-height: 600px; /* Set a maximum height for scroll */
+      overflow-y: auto; /* Enable vertical scrolling */
+    }
+
+    th {
+      background-color: #f2f2f2;
+    }
+
+    thead {
+      position: sticky;
+      top: 0;
+      background-color: #f2f2f2; /* Optional: Set background color for the sticky header */
+      z-index: 0; /* Ensure the header stays above the table body */
+    }
+  </style>"""
+
+# Renders the rows of one interactive table from its JSON payload: pages or virtual scrolling, sorting on header click
+TABLE_SCRIPT = """
+<script>
+(function () {
+  const id = "%(table_id)s";
+  const payload = JSON.parse(document.getElementById(id + "-data").textContent);
+  const container = document.getElementById(id + "-container");
+  const body = document.getElementById(id).tBodies[0];
+  const pager = document.getElementById(id + "-pager");
+  const width = payload.rows.length ? payload.rows[0].length : 1;
+  let order = payload.rows.map((_, i) => i);
+  let page = 0;
+  let rowHeight = 0;
+  let sorted = {key: null, descending: false};
+
+  function rowHtml(i) {
+    const row = payload.rows[i];
+    const colors = payload.colors ? payload.colors[i] : null;
+    let html = "<tr><th>" + row[0] + "</th>";
+    for (let j = 1; j < row.length; j++) {
+      const color = colors && colors[j - 1] ? ' bgcolor="' + colors[j - 1] + '"' : "";
+      html += "<td" + color + ">" + row[j] + "</td>";
+    }
+    return html + "</tr>";
+  }
+
+  function spacer(height) {
+    return height > 0 ? '<tr style="height:' + height + 'px"><td colspan="' + width + '"></td></tr>' : "";
+  }
+
+  function render() {
+    if (payload.pageSize) {
+      const pages = Math.max(1, Math.ceil(order.length / payload.pageSize));
+      page = Math.min(page, pages - 1);
+      body.innerHTML = order.slice(page * payload.pageSize, (page + 1) * payload.pageSize).map(rowHtml).join("");
+      pager.querySelector("span").textContent = (page + 1) + " / " + pages;
+      return;
+    }
+    if (!rowHeight) {
+      body.innerHTML = order.slice(0, 1).map(rowHtml).join("");
+      rowHeight = body.rows.length ? body.rows[0].getBoundingClientRect().height || 24 : 24;
+    }
+    const visible = Math.ceil(container.clientHeight / rowHeight) + 20;
+    const first = Math.max(0, Math.floor(container.scrollTop / rowHeight) - 10);
+    const last = Math.min(order.length, first + visible);
+    body.innerHTML = spacer(first * rowHeight) + order.slice(first, last).map(rowHtml).join("")
+      + spacer((order.length - last) * rowHeight);
+  }
+
+  document.querySelectorAll("#" + id + " th[data-sort]").forEach(function (th) {
+    th.style.cursor = "pointer";
+    th.addEventListener("click", function () {
+      const key = th.dataset.sort;
+      sorted = {key: key, descending: sorted.key === key && !sorted.descending};
+      order = payload.orders[key].slice();
+      if (sorted.descending) order.reverse();
+      render();
+    });
+  });
+  if (payload.pageSize) {
+    pager.querySelectorAll("button").forEach(function (button) {
+      button.addEventListener("click", function () {
+        page = Math.max(0, page + Number(button.dataset.step));
+        render();
+      });
+    });
+  } else {
+    container.addEventListener("scroll", function () { window.requestAnimationFrame(render); });
+  }
+  render();
+})();
+</script>"""
+
+
+def _cell_text(values: pd.Series, na_rep: str, escape: bool) -> pd.Series:
+    """
+    Cell strings of one column like DataFrame.to_html.
+
+    Numbers, dates and booleans are formatted by Series.to_string (e.g. floats with 6 decimals), other cells by str.
+    Long cells are not truncated.
+    """
+    if len(values) and values.dtype != object and not pd.api.types.is_string_dtype(values.dtype):
+        lines = values.to_string(index=False, header=False, na_rep=na_rep, length=False, dtype=False, name=False)
+        text = pd.Series(lines.split("\n"), index=values.index, dtype=object).str.strip()
+    else:
+        # like to_html, None and pd.NA are shown as such and only NaN and NaT as na_rep
+        missing = values.isna() & values.map(lambda cell: cell is not None and cell is not pd.NA)
+        text = values.map(str).astype(object).where(~missing, na_rep)
+    return text.map(escape_html) if escape else text
+
+
+def _header_spans(labels: List, levels: int) -> List[List]:
+    """(label, colspan) per header row, neighbours sharing the same label prefix are merged like DataFrame.to_html"""
+    rows = []
+    tuples = [label if isinstance(label, tuple) else (label,) for label in labels]
+    for level in range(levels):
+        spans = []
+        for label in tuples:
+            if spans and level < levels - 1 and spans[-1][0] == label[: level + 1]:
+                spans[-1][1] += 1
+            else:
+                spans.append([label[: level + 1], 1])
+        rows.append([(prefix[-1], span) for prefix, span in spans])
+    return rows
+
+
+def html_table_header(
+    df: pd.DataFrame,
+    classes: str = "table table-hover",
+    index: bool = True,
+    thead: str = STICKY_THEAD,
+    table_id: str = "",
+    th_attrs: str = "",
+    sortable: bool = False,
+) -> str:
+    """Opening table tag and the header of a table, sortable header cells carry data-sort (index or position)"""
+    levels = df.columns.nlevels
+    table_id = f' id="{table_id}"' if table_id else ""
+    parts = [f'<table border="1" class="dataframe {classes}"{table_id}>', thead]
+    for level, spans in enumerate(_header_spans(list(df.columns), levels)):
+        sort_row = sortable and level == levels - 1
+        parts.append('<tr style="text-align: center;">')
+        if index:
+            parts.append(f'<th{th_attrs} data-sort="index"></th>' if sort_row else f"<th{th_attrs}></th>")
+        position = 0
+        for label, span in spans:
+            colspan = f' colspan="{span}" halign="left"' if span > 1 else ""
+            sort = f' data-sort="{position}"' if sort_row else ""
+            parts.append(f"<th{th_attrs}{colspan}{sort}>{label}</th>")
+            position += span
+        parts.append("</tr>")
+    parts.append("</thead>")
+    return "".join(parts)
+
+
+def html_table_chunks(
+    df: pd.DataFrame,
+    classes: str = "table table-hover",
+    index: bool = True,
+    thead: str = STICKY_THEAD,
+    cell_colors: Optional[pd.DataFrame] = None,
+    na_rep: str = "",
+    escape: bool = False,
+    table_id: str = "",
+    th_attrs: str = "",
+    tr_attrs: str = "",
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[str]:
+    """
+    Yield the HTML of a table in chunks of rows.
+
+    :param df: Table content, cells are inserted as they are (HTML allowed) unless escape is set.
+    :param cell_colors: Background color per cell, same shape as df, NaN for none.
+    :param na_rep: Text of missing cells.
+    :param th_attrs: Attributes of the header cells, e.g. ' style="..."'.
+    :param tr_attrs: Attributes of the body rows.
+    """
+    yield html_table_header(df, classes, index, thead, table_id, th_attrs)
+    yield "<tbody>"
+    if len(df.columns):
+        columns = []
+        for position in range(len(df.columns)):
+            opening = "<td>"
+            if cell_colors is not None:
+                colors = cell_colors.iloc[:, position]
+                opening = ("<td bgcolor=" + colors.astype(str) + ">").where(colors.notna(), "<td>").to_numpy(object)
+            columns.append(opening + _cell_text(df.iloc[:, position], na_rep, escape).to_numpy(object) + "</td>")
+        cells = reduce(np.add, columns)
+    else:
+        cells = np.full(len(df), "", dtype=object)
+    row_start = f"<tr{tr_attrs}>"
+    if index:
+        row_start = row_start + "<th>" + df.index.astype(str).to_numpy(object) + "</th>"
+    rows = row_start + cells + "</tr>"
+    for start in range(0, len(rows), chunk_rows):
+        yield "".join(rows[start : start + chunk_rows])
+    yield "</tbody></table>"
+
+
+def html_table(df: pd.DataFrame, **kwargs) -> str:
+    """HTML of a table, see html_table_chunks for the arguments"""
+    return "".join(html_table_chunks(df, **kwargs))
+
+
+def sort_orders(df: pd.DataFrame, sort_keys: Optional[Dict] = None) -> Dict[str, List[int]]:
+    """
+    Ascending row order per column (by position) and of the index.
+
+    Without an explicit key a column sorts numerically if all its non empty cells are numbers, otherwise by its
+    text without HTML tags, case insensitive. Missing cells sort last.
+
+    :param sort_keys: Column label (or "index") -> sort key series or array, overrides the derived key.
+    """
+    sort_keys = sort_keys or {}
+    keys = {"index": sort_keys.get("index", pd.Series(df.index, index=df.index))}
+    for position, label in enumerate(df.columns):
+        keys[str(position)] = sort_keys.get(label, df.iloc[:, position])
+    orders = {}
+    for name, key in keys.items():
+        key = pd.Series(np.asarray(key, dtype=object))
+        if key.dtype == object:
+            text = key.astype(str).str.replace(TAG_PATTERN, "", regex=True).str.strip().where(key.notna(), None)
+            numbers = pd.to_numeric(text, errors="coerce")
+            key = numbers if numbers.notna().sum() == text.notna().sum() else text.str.lower()
+        orders[name] = key.sort_values(kind="stable", na_position="last").index.tolist()
+    return orders
+
+
+def interactive_html_table(
+    df: pd.DataFrame,
+    table_id: str,
+    page_size: Optional[int] = None,
+    cell_colors: Optional[pd.DataFrame] = None,
+    sort_keys: Optional[Dict] = None,
+    classes: str = "table table-hover",
+    na_rep: str = "",
+    col_space: Optional[int] = None,
+) -> str:
+    """
+    Table whose rows are rendered in the browser from one JSON payload.
+
+    The table scrolls within a container of at most 600 px height, the header stays visible.
+
+    :param table_id: Unique element id within the page.
+    :param page_size: Rows per page, None for virtual scrolling over all rows.
+    :param cell_colors: Background color per cell, same shape as df, NaN for none.
+    :param sort_keys: Explicit sort keys, see sort_orders.
+    :param col_space: Minimum width of the header cells in px, like DataFrame.to_html(col_space=...).
+    """
+    text = {position: _cell_text(df.iloc[:, position], na_rep, False) for position in range(len(df.columns))}
+    rows = pd.DataFrame({"index": df.index.astype(str), **text}).to_numpy(object).tolist()
+    colors = None
+    if cell_colors is not None:
+        colors = cell_colors.astype(object).where(cell_colors.notna(), None).to_numpy(object).tolist()
+    payload = {"rows": rows, "colors": colors, "orders": sort_orders(df, sort_keys), "pageSize": page_size}
+    data = json.dumps(payload, separators=(",", ":")).replace("</", "<\\/").replace("<!--", "\\u003c!--")
+
+    th_attrs = f' style="min-width: {col_space}px;"' if col_space else ""
+    pager = ""
+    if page_size:
+        pager = (
+            f'<div id="{table_id}-pager"><button data-step="-1">&lt;</button> <span></span> '
+            f'<button data-step="1">&gt;</button></div>'
+        )
+    return (
+        f'<div class="table-container" id="{table_id}-container">'
+        + html_table_header(df, classes, True, STICKY_THEAD, table_id, th_attrs, sortable=True)
+        + "<tbody></tbody></table></div>"
+        + pager
+        + f'<script type="application/json" id="{table_id}-data">{data}</script>'
+        + TABLE_SCRIPT % {"table_id": table_id}
+        + TABLE_STYLE
+    )
@@ -0,0 +1,292 @@
+"""
+Chunked, bounded-memory evaluation of long HiL closed loop MDF recordings.
+
+The HiL state machine checks walk the signals sample by sample. Instead of loading whole channels,
+``MdfChunkReader`` yields time aligned chunks through asammdf's ``iter_to_dataframe`` and a
+``HilClStateMachine`` consumes them one after the other, carrying its state across chunk boundaries.
+The same state machine is fed with the complete dataframe in the regular (full load) path.
+
+The chunks have the time base of asammdf's ``MDF.to_dataframe``, the union of the timestamps of the channels
+(test_mdf_streaming checks that the chunks put together equal the full decode). The TSF reader of the regular path
+may sample the channels differently, so verdicts of both paths are not guaranteed to be identical and streaming is
+opt-in (``PL_PARKING_HIL_STREAMING``).
+
+Test steps register their signals with ``register_hil_signals`` and get their data with ``hil_signal_source``: with
+streaming enabled the definition is not registered with the framework (which would decode the whole file before
+``process``) and the step reads the chunks itself. ``report_missing_signals`` gives a streamed step whose recording
+lacks channels the usual missing input result.
+
+Ported so far are the checks with a single activation, trigger and delayed reaction: the AUP deactivation checks for
+open doors and unbuckled driver belt and the PDW / WHP button activation. The other ``hil_cl_ft_*`` scripts still load
+their recordings completely.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Type, Union
+
+import pandas as pd
+from asammdf import MDF
+from tsf.core.results import DATA_NOK
+from tsf.core.testcase import TestStep, register_signals
+from tsf.io.mdf import MDFSignalDefinition
+
+import pl_parking.common_constants as fc
+
+_log = logging.getLogger(__name__)
+
+HIL_STREAMING_ENV_VAR = "PL_PARKING_HIL_STREAMING"
+DEFAULT_CHUNK_RAM_SIZE = 64 * 1024 * 1024  # bytes per chunk
+US_PER_SECOND = 1e6
+
+
+def hil_streaming_enabled() -> bool:
+    """Return True if HiL evaluations should read MDF files in chunks instead of loading them completely."""
+    return os.environ.get(HIL_STREAMING_ENV_VAR, "0").lower() in ("1", "true", "yes")
+
+
+def register_hil_signals(alias: str, definition: Type[MDFSignalDefinition]) -> Callable:
+    """
+    Register the signals of a HiL test step, like ``register_signals``.
+
+    With streaming enabled the definition is only attached to the step (``streamed_signals``), the framework then does
+    not load the recording and ``hil_signal_source`` reads it in chunks. The switch is evaluated when the test script
+    is imported.
+    """
+    if not hil_streaming_enabled():
+        return register_signals(alias, definition)
+
+    def decorator(step_class):
+        step_class.streamed_signals = {**getattr(step_class, "streamed_signals", {}), alias: definition}
+        return step_class
+
+    return decorator
+
+
+def hil_signal_source(step: TestStep, alias: str) -> Union[pd.DataFrame, "MdfChunkReader"]:
+    """Data of a signal alias registered with register_hil_signals: the full dataframe or a chunk reader."""
+    streamed_signals = getattr(step, "streamed_signals", {})
+    if alias in streamed_signals:
+        return MdfChunkReader(step.artifacts[0].file_path, streamed_signals[alias]())
+    return step.readers[alias]
+
+
+def report_missing_signals(step: TestStep, source: Union[pd.DataFrame, "MdfChunkReader"]) -> bool:
+    """
+    Give a streamed test step whose recording lacks channels of its signal definition the missing input result.
+
+    :return: True if signals are missing and the step should not be evaluated.
+    """
+    missing = source.missing_columns() if isinstance(source, MdfChunkReader) else []
+    if not missing:
+        return False
+    from pl_parking.common_ft_helper import get_color  # the report helpers are only needed here
+
+    step.result.measured_result = DATA_NOK
+    step.result.details.setdefault("Plots", []).append("<p>Input missing: " + ", ".join(missing) + "</p>")
+    step.result.details.setdefault("Plot_titles", []).append("")
+    step.result.details.setdefault("Remarks", []).append("")
+    step.result.details["Additional_results"] = {
+        "Verdict": {"value": fc.INPUT_MISSING.title(), "color": get_color(fc.INPUT_MISSING)}
+    }
+    return True
+
+
+class MdfChunkReader:
+    """
+    Iterate over an MDF file in time aligned chunks with the columns of a signal definition.
+
+    The index of every chunk is the measurement time in microseconds, like the dataframes provided by the
+    regular TSF reader.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        signal_definition: MDFSignalDefinition,
+        raster: Union[float, str, None] = None,
+        chunk_ram_size: int = DEFAULT_CHUNK_RAM_SIZE,
+    ):
+        """
+        Initialize the chunk reader.
+
+        :param file_path: Path to the .mf4 file.
+        :param signal_definition: Signal definition whose _properties map columns to channel names.
+        :param raster: Common time raster (seconds or channel name); by default the union of all timestamps.
+        :param chunk_ram_size: Approximate size of one chunk in bytes.
+        """
+        self.file_path = file_path
+        self.signal_definition = signal_definition
+        self.raster = raster
+        self.chunk_ram_size = chunk_ram_size
+        self._missing = None
+
+    def resolve_channels(self, mdf: MDF) -> Dict[str, str]:
+        """Map the first available channel name of every column to the column name."""
+        channel_to_column = {}
+        self._missing = []
+        for column, channel_names in self.signal_definition._properties.items():
+            candidates = [channel_names] if isinstance(channel_names, str) else list(channel_names)
+            channel = next((name for name in candidates if name in mdf.channels_db), None)
+            if channel is None:
+                _log.warning(f"None of the channels {candidates} for column '{column}' found in {self.file_path}")
+                self._missing.append(column)
+                continue
+            channel_to_column[channel] = column
+        return channel_to_column
+
+    def missing_columns(self) -> List[str]:
+        """Columns of the signal definition without any of their channels in the recording"""
+        if self._missing is None:
+            with MDF(self.file_path) as mdf:
+                self.resolve_channels(mdf)
+        return self._missing
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        with MDF(self.file_path) as mdf:
+            channel_to_column = self.resolve_channels(mdf)
+            if self._missing:
+                raise KeyError(f"Columns {self._missing} not found in {self.file_path}")
+            for chunk in mdf.iter_to_dataframe(
+                channels=list(channel_to_column),
+                raster=self.raster,
+                time_from_zero=False,
+                chunk_ram_size=self.chunk_ram_size,
+            ):
+                chunk = chunk.rename(columns=channel_to_column)
+                chunk.index = (chunk.index.to_numpy() * US_PER_SECOND).round().astype("int64")
+                yield chunk
+
+
+class ChangePointRecorder:
+    """
+    Keep only the samples where a signal changes, which bounds the plot data of state signals.
+
+    State signals are meant to be plotted as steps (``line_shape="hv"``). For the continuous columns the last sample
+    before every change is kept as well, so a linear plot of the kept samples matches the full signal.
+    """
+
+    def __init__(self, columns: List[str], continuous: Iterable[str] = ()):
+        """Initialize the recorder for the given columns."""
+        self.columns = columns
+        self.continuous = set(continuous)
+        self._last: Dict[str, object] = {}
+        self._last_time = None
+        self.times: Dict[str, List] = {column: [] for column in columns}
+        self.values: Dict[str, List] = {column: [] for column in columns}
+
+    def feed(self, chunk: pd.DataFrame):
+        """Record the change points of one chunk."""
+        if chunk.empty:
+            return
+        for column in self.columns:
+            values = chunk[column]
+            changed = values.ne(values.shift()).to_numpy()
+            if column in self._last:
+                changed[0] = values.iloc[0] != self._last[column]
+            keep = changed.copy()
+            if column in self.continuous:
+                keep[:-1] |= changed[1:]
+                keep[-1] = True  # the next chunk may start with a change
+            self.times[column].extend(values.index[keep].tolist())
+            self.values[column].extend(values[keep].tolist())
+            self._last[column] = values.iloc[-1]
+        self._last_time = chunk.index[-1]
+
+    def line_shape(self, column: str) -> str:
+        """Plotly line shape of a column: steps for state signals, linear for continuous ones."""
+        return "linear" if column in self.continuous else "hv"
+
+    def series(self, column: str):
+        """Return (time, value) lists of one column, closed with the last sample time."""
+        times, values = list(self.times[column]), list(self.values[column])
+        if values and self._last_time is not None and times[-1] != self._last_time:
+            times.append(self._last_time)
+            values.append(values[-1])
+        return times, values
+
+
+class HilClStateMachine(ABC):
+    """
+    Base class of sample by sample HiL closed loop evaluations.
+
+    Subclasses implement ``on_sample`` and set ``self.finished`` to stop the evaluation early (the equivalent
+    of ``break`` in the former loops). ``self.previous_time`` holds the timestamp of the previous sample, also
+    across chunk boundaries.
+    """
+
+    def __init__(self):
+        """Initialize the state machine."""
+        self.finished = False
+        self.previous_time = None
+
+    @abstractmethod
+    def on_sample(self, time, sample):
+        """Process one sample, sample is a namedtuple with the dataframe columns as attributes."""
+
+    def feed(self, chunk: pd.DataFrame) -> bool:
+        """Process all samples of a chunk, return True when the evaluation finished."""
+        for sample in chunk.itertuples(index=True, name="Sample"):
+            if self.finished:
+                break
+            self.on_sample(sample.Index, sample)
+            self.previous_time = sample.Index
+        return self.finished
+
+    def run(self, source: Union[pd.DataFrame, Iterable[pd.DataFrame]], recorders: Iterable[ChangePointRecorder] = ()):
+        """
+        Evaluate a complete dataframe or an iterable of chunks.
+
+        :param source: Full dataframe (regular path) or chunk iterable, e.g. an MdfChunkReader (streaming path).
+        :param recorders: Change point recorders that are fed with every chunk, also after the state machine finished.
+        :return: The state machine itself.
+        """
+        chunks = [source] if isinstance(source, pd.DataFrame) else source
+        for chunk in chunks:
+            if not self.finished:
+                self.feed(chunk)
+            for recorder in recorders:
+                recorder.feed(chunk)
+            if self.finished and not recorders:
+                break
+        return self
+
+
+class DelayedReactionStateMachine(HilClStateMachine):
+    """
+    Wait for an activation, then for a trigger, and take the sample at which a delay after the trigger has elapsed.
+
+    This is the common structure of the AUP state transition checks (e.g. AVG active, a door is opened, the system
+    reaction is checked some seconds later). ``reaction`` stays None if the recording ends before.
+    """
+
+    def __init__(self, activated: Callable, triggered: Callable, delay: float):
+        """
+        Initialize the state machine.
+
+        :param activated: Predicate on a sample, True when the function under test is active.
+        :param triggered: Predicate on a sample, True when the trigger condition occurs (checked from the activation on).
+        :param delay: Reaction delay after the trigger in seconds.
+        """
+        super().__init__()
+        self.activated = activated
+        self.triggered = triggered
+        self.delay = delay
+        self.activation_time = None
+        self.trigger_time = None
+        self.reaction = None
+
+    def on_sample(self, time, sample):
+        """Process one sample."""
+        if self.activation_time is None:
+            if not self.activated(sample):
+                return
+            self.activation_time = time
+        if self.trigger_time is None:
+            if not self.triggered(sample):
+                return
+            self.trigger_time = time
+        if (time - self.trigger_time) / US_PER_SECOND > self.delay:
+            self.reaction = sample
+            self.finished = True
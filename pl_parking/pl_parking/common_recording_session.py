@@ -0,0 +1,308 @@
+"""
+Recording sessions shared by all test cases of a run.
+
+Every test case reads its recording through the readers of its own signal definitions, so a run of many test cases
+over the same recording decodes overlapping channels again and again. While ``recording_sessions`` is active, the
+signal definitions TSF creates read through a ``SessionReader`` (see common_signal_readers) and the session of the
+recording serves their signals:
+
+- bsig recordings have one time base for all channels, the session decodes the union of the channels of all test
+  cases selected for the recording once and serves every signal definition its columns of it,
+- other formats are resampled per signal definition, so a decode is shared between identical signal definitions.
+
+Signal definitions the union does not cover (array columns, relative channels without root, columns missing in the
+union decode) are decoded on their own and shared the same way. The decoded frames are kept within a memory budget,
+the least recently used ones are dropped first. Every reader gets a copy of its columns, so a test step changing its
+data does not affect the others.
+"""
+
+import contextlib
+import copy
+import functools
+import inspect
+import logging
+import os
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from tsf.io.datamodel import SignalDataFrame
+from tsf.io.signals import SignalDefinition
+
+from pl_parking.common_array_signals import READER_INDEX
+from pl_parking.common_signal_readers import DelegatingReader, channel_candidates, is_wrapped, wrap_readers
+
+_log = logging.getLogger(__name__)
+
+SESSION_ENV_VAR = "PL_PARKING_RECORDING_SESSION"
+MEMORY_BUDGET_ENV_VAR = "PL_PARKING_SESSION_MEMORY_MB"
+DEFAULT_MEMORY_BUDGET = 4 * 1024 * 1024 * 1024  # bytes
+UNION_EXTENSIONS = (".bsig",)  # formats with a single time base for all channels
+UNION = "union"
+
+# Definition in register_signals(ALIAS, Definition) and register_signals(ALIAS, screened_signals(Definition, ...))
+REGISTERED_DEFINITION = re.compile(r"register_signals\(\s*[^,()]+,\s*(?:screened_signals\(\s*)?([\w.]+)")
+
+_active: Optional["SessionRegistry"] = None
+
+
+def recording_session_enabled() -> bool:
+    """Return True if recordings should be decoded once per run and shared between the test cases."""
+    return os.environ.get(SESSION_ENV_VAR, "0").lower() in ("1", "true", "yes")
+
+
+def memory_budget() -> int:
+    """Memory budget of all sessions in bytes, configurable in MB through PL_PARKING_SESSION_MEMORY_MB."""
+    budget_mb = os.environ.get(MEMORY_BUDGET_ENV_VAR)
+    return int(float(budget_mb) * 1024 * 1024) if budget_mb else DEFAULT_MEMORY_BUDGET
+
+
+def registered_signal_definitions(step_class: type) -> List[type]:
+    """Signal definition classes a test step registers with register_signals, found in its source"""
+    try:
+        source = inspect.getsource(step_class)
+    except (OSError, TypeError):
+        return []
+    namespace = vars(sys.modules[step_class.__module__])
+    definitions = []
+    for name in REGISTERED_DEFINITION.findall(source):
+        obj = namespace.get(name.split(".")[0])
+        for attribute in name.split(".")[1:]:
+            obj = getattr(obj, attribute, None)
+        if isinstance(obj, type) and issubclass(obj, SignalDefinition):
+            definitions.append(obj)
+    return definitions
+
+
+def resolved_columns(signal_definition: SignalDefinition) -> Optional[Dict[str, Tuple[str, ...]]]:
+    """
+    Absolute channel candidates of every column of a signal definition.
+
+    :return: None if the definition cannot be read as part of a union (array columns, relative channels left).
+    """
+    try:
+        columns = {
+            column: tuple(channel_candidates(signal_definition, column)) for column in signal_definition._properties
+        }
+    except (AttributeError, KeyError, TypeError):
+        return None
+    for candidates in columns.values():
+        if any(name.startswith(".") or READER_INDEX in name for name in candidates):
+            return None
+    return columns
+
+
+def definition_key(reader: DelegatingReader) -> str:
+    """Key of identical signal definitions read by the same kind of reader, they share their decode"""
+    settings = sorted(
+        (name, repr(value))
+        for name, value in vars(reader._defs).items()
+        if name not in ("_extension_map", "preconditions")  # do not change the decoded signals
+    )
+    return repr((reader.original_class, settings))
+
+
+@dataclass
+class SessionStatistics:
+    """Decode bookkeeping of a session"""
+
+    file_path: str
+    testcases: int = 0
+    reads: int = 0
+    decodes: int = 0
+    union_channels: int = 0
+    evicted: int = 0
+    memory_bytes: int = 0
+    union_skipped_reason: str = ""
+
+    @property
+    def saved_decodes(self) -> int:
+        """Number of signal reads served without decoding the recording"""
+        return max(self.reads - self.decodes, 0)
+
+    def as_dict(self) -> dict:
+        """Plain dict, e.g. for a json report."""
+        return {
+            "file_path": self.file_path,
+            "testcases": self.testcases,
+            "reads": self.reads,
+            "decodes": self.decodes,
+            "saved_decodes": self.saved_decodes,
+            "union_channels": self.union_channels,
+            "evicted": self.evicted,
+            "memory_mb": round(self.memory_bytes / 1024 / 1024, 1),
+            "union_skipped_reason": self.union_skipped_reason,
+        }
+
+
+class RecordingSession:
+    """Signals of one recording, decoded once and shared by the signal definitions reading it"""
+
+    def __init__(self, registry: "SessionRegistry", file_path: str, definitions: Iterable[SignalDefinition], testcases):
+        """Plan the union decode of the given signal definitions"""
+        self.registry = registry
+        self.file_path = file_path
+        self.statistics = SessionStatistics(file_path, testcases=testcases)
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.union: Optional[Dict[Tuple[str, ...], str]] = None
+        if os.path.splitext(file_path)[1].lower() in UNION_EXTENSIONS:
+            candidates = {}
+            for definition in definitions:
+                columns = resolved_columns(definition)
+                if columns is not None:
+                    candidates.update(dict.fromkeys(columns.values()))
+            self.union = {channels: f"channel_{position}" for position, channels in enumerate(candidates)}
+            self.statistics.union_channels = len(self.union)
+
+    def union_definition(self, template: SignalDefinition) -> SignalDefinition:
+        """Signal definition with one column per channel of the union"""
+        definition = copy.copy(template)
+        definition._properties = {key: list(channels) for channels, key in self.union.items()}
+        return definition
+
+    def signals(self, reader: DelegatingReader) -> SignalDataFrame:
+        """Signals of the signal definition of a reader, decoded at most once per union or identical definition"""
+        self.statistics.reads += 1
+        columns = resolved_columns(reader._defs)
+        if self.union and columns is not None and set(columns.values()) <= self.union.keys():
+            frame = self.frame(UNION, lambda: reader.read_with(self.union_definition(reader._defs)))
+            keys = [self.union[channels] for channels in columns.values()]
+            if frame is not None and set(keys) <= set(frame.columns):
+                return SignalDataFrame(frame[keys].set_axis(list(columns), axis=1))
+            if frame is not None:
+                self.statistics.union_skipped_reason = "columns missing in the union decode"
+        frame = self.frame(definition_key(reader), lambda: reader.original_reader().signals)
+        return SignalDataFrame(frame.copy())
+
+    def frame(self, key: str, decode: Callable[[], pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Decoded frame under key, decoded now if it is not kept (None if the union decode fails)"""
+        if key in self.frames:
+            self.registry.touch(self, key)
+            return self.frames[key]
+        try:
+            frame = decode()
+        except Exception as err:  # noqa: BLE001
+            if key != UNION:
+                raise
+            self.statistics.union_skipped_reason = str(err)
+            _log.warning(f"Union decode of {self.file_path} failed, signal definitions are decoded on their own: {err}")
+            self.union = None
+            return None
+        self.statistics.decodes += 1
+        self.registry.keep(self, key, frame)
+        return frame
+
+
+class SessionRegistry:
+    """Sessions of the recordings of a run and the memory budget of their decoded frames"""
+
+    def __init__(self, budget: Optional[int] = None):
+        """Create an empty registry, budget in bytes defaults to memory_budget()"""
+        self.budget = memory_budget() if budget is None else budget
+        self.sessions: Dict[str, RecordingSession] = {}
+        self.kept: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+
+    def add(self, file_path: str, testcase_classes: Iterable[type]):
+        """Open the session of a recording for the test cases selected for it"""
+        testcase_classes = list(testcase_classes)
+        definitions = []
+        for definition_class in dict.fromkeys(
+            definition_class
+            for testcase_class in testcase_classes
+            for step_class in test_step_classes(testcase_class)
+            for definition_class in registered_signal_definitions(step_class)
+        ):
+            try:
+                definitions.append(definition_class())
+            except Exception as err:  # noqa: BLE001
+                _log.debug(f"Could not instantiate {definition_class.__name__}: {err}")
+        file_path = os.path.abspath(file_path)
+        self.sessions[file_path] = RecordingSession(self, file_path, definitions, len(testcase_classes))
+
+    def get(self, file_path: str) -> Optional[RecordingSession]:
+        """Return the session of a recording, if any."""
+        return self.sessions.get(os.path.abspath(file_path))
+
+    def keep(self, session: RecordingSession, key: str, frame: pd.DataFrame):
+        """Keep a decoded frame, dropping the least recently used ones when the budget is exceeded"""
+        size = int(frame.memory_usage(index=True, deep=False).sum())
+        if size > self.budget:
+            _log.info(f"Decoded signals of {session.file_path} exceed the session memory budget and are not kept")
+            return
+        while self.kept and sum(self.kept.values()) + size > self.budget:
+            (file_path, evicted_key), evicted_size = self.kept.popitem(last=False)
+            evicted_session = self.sessions[file_path]
+            del evicted_session.frames[evicted_key]
+            evicted_session.statistics.evicted += 1
+        session.frames[key] = frame
+        self.kept[(session.file_path, key)] = size
+        session.statistics.memory_bytes = max(
+            session.statistics.memory_bytes,
+            sum(size for (file_path, _), size in self.kept.items() if file_path == session.file_path),
+        )
+
+    def touch(self, session: RecordingSession, key: str):
+        """Mark a kept frame as recently used"""
+        self.kept.move_to_end((session.file_path, key))
+
+    def statistics(self) -> List[SessionStatistics]:
+        """Statistics of every session"""
+        return [session.statistics for session in self.sessions.values()]
+
+
+def test_step_classes(testcase_class: type) -> List[type]:
+    """Step classes of a test case, which returns a constant list from its test_steps property"""
+    try:
+        steps = testcase_class.test_steps
+        return list(steps.fget(testcase_class) if isinstance(steps, property) else steps)
+    except Exception as err:  # noqa: BLE001
+        _log.debug(f"Could not list the test steps of {testcase_class.__name__}: {err}")
+        return []
+
+
+class SessionReader(DelegatingReader):
+    """Reads the signals of a signal definition from the session of its recording, if there is one"""
+
+    def read_signals(self) -> SignalDataFrame:
+        """Signals of the signal definition, served by the session of the recording"""
+        session = _active.get(self.file_path) if _active is not None else None
+        if session is None:
+            return super().read_signals()
+        return session.signals(self)
+
+
+@contextlib.contextmanager
+def recording_sessions(assignments: Dict[str, Iterable[type]], budget: Optional[int] = None):
+    """
+    Serve the signal reads of the given recordings from shared sessions while active.
+
+    The signal definitions created meanwhile read through a SessionReader, the former initialization of
+    SignalDefinition is restored on exit.
+
+    :param assignments: Recording path -> test case classes selected for it.
+    :param budget: Memory budget of the kept decodes in bytes, defaults to memory_budget().
+    :return: The statistics of every session, filled while the test cases run.
+    """
+    global _active
+    registry = SessionRegistry(budget)
+    for file_path, testcase_classes in assignments.items():
+        registry.add(file_path, testcase_classes)
+
+    original_init = SignalDefinition.__init__
+
+    @functools.wraps(original_init)
+    def session_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        if not is_wrapped(self, SessionReader):
+            wrap_readers(self, SessionReader)
+
+    SignalDefinition.__init__ = session_init
+    _active = registry
+    try:
+        yield registry.statistics()
+    finally:
+        SignalDefinition.__init__ = original_init
+        _active = None
@@ -0,0 +1,99 @@
+"""
+Process-wide Jinja rendering for the custom report pages.
+
+One ``jinja2.Environment`` is shared by all report classes. File templates from ``templates/`` are compiled once
+per process and their bytecode is kept in the local cache (see common_cache), so later processes skip the Jinja
+compilation as well. Inline templates are compiled once per name and source string. Every render is timed per
+template, runner_caller writes the times after the report was built.
+"""
+
+import functools
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+
+import jinja2
+
+from pl_parking.common_cache import get_cache_dir
+
+_log = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.abspath(os.path.join(__file__, "..", "..", "templates"))
+BYTECODE_CACHE_NAMESPACE = "jinja"
+
+
+@dataclass
+class RenderMetrics:
+    """Render time statistics of one template"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average render time"""
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def add(self, seconds: float):
+        """Record one render"""
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+_metrics: Dict[str, RenderMetrics] = {}
+_inline_templates: Dict[Tuple[Optional[str], str], jinja2.Template] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_environment() -> jinja2.Environment:
+    """Shared environment loading from the templates folder, with an on-disk bytecode cache."""
+    try:
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(get_cache_dir(BYTECODE_CACHE_NAMESPACE)))
+    except OSError as err:
+        _log.warning(f"Jinja bytecode cache disabled: {err}")
+        bytecode_cache = None
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR), bytecode_cache=bytecode_cache, auto_reload=False
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(name: str) -> jinja2.Template:
+    """Compiled template of the templates folder"""
+    return get_environment().get_template(name)
+
+
+def template_from_string(source: str, name: Optional[str] = None) -> jinja2.Template:
+    """Compiled inline template, compiled once per name and source; name labels its render metrics"""
+    key = (name, source)
+    if key not in _inline_templates:
+        template = get_environment().from_string(source)
+        template.name = name
+        _inline_templates[key] = template
+    return _inline_templates[key]
+
+
+def _resolve(template: Union[str, jinja2.Template]) -> jinja2.Template:
+    return get_template(template) if isinstance(template, str) else template
+
+
+def _metric_name(template: jinja2.Template) -> str:
+    return template.name or "<string>"
+
+
+def render(template: Union[str, jinja2.Template], **context) -> str:
+    """Render a template given by name or object to a string."""
+    template = _resolve(template)
+    start = time.perf_counter()
+    html = template.render(**context)
+    _metrics.setdefault(_metric_name(template), RenderMetrics()).add(time.perf_counter() - start)
+    return html
+
+
+def render_metrics() -> Dict[str, RenderMetrics]:
+    """Render time statistics per template name (unnamed inline templates are grouped as "<string>")"""
+    return {name: RenderMetrics(m.count, m.total_seconds, m.max_seconds) for name, m in _metrics.items()}
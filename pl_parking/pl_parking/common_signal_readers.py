@@ -0,0 +1,154 @@
+"""
+Readers standing in for the TSF reader of a signal definition.
+
+A signal definition maps file extensions to reader classes (``_extension_map``). ``wrap_readers`` routes these
+entries through a ``DelegatingReader`` subclass, which keeps the original reader and hands every call to it unless it
+can serve the signals itself, e.g. without decoding the recording. Wrapping again stacks the readers, the outer one
+reads through the inner one.
+"""
+
+import functools
+import os
+from typing import Dict, List, Type
+
+from tsf.io.datamodel import SignalDataFrame
+from tsf.io.generic import IReader, ISignalReader
+from tsf.io.signals import SignalDefinition
+
+
+def recording_path(filename) -> str:
+    """Path of the recording a reader is created for, the first one if TSF passes several files"""
+    if isinstance(filename, (list, tuple)):
+        filename = filename[0]
+    return os.path.abspath(os.fspath(filename))
+
+
+def channel_candidates(signal_definition: SignalDefinition, column: str) -> List[str]:
+    """
+    Channel names which may hold a column of a signal definition, in order of preference.
+
+    Names starting with "." are relative to the roots of the signal definition.
+    """
+    names = signal_definition._properties[column]
+    names = [names] if isinstance(names, str) else list(names)
+    roots = getattr(signal_definition, "_root", None) or [""]
+    roots = [roots] if isinstance(roots, str) else roots
+    candidates = []
+    for name in names:
+        candidates.extend([f"{root}{name}" for root in roots] if name.startswith(".") else [name])
+    return candidates
+
+
+@functools.lru_cache(maxsize=None)
+def _delegating_class(reader_class: Type["DelegatingReader"], original_class: type) -> Type["DelegatingReader"]:
+    """reader_class reading through original_class"""
+    return type(
+        reader_class.__name__,
+        (reader_class,),
+        {
+            "original_class": original_class,
+            "__module__": reader_class.__module__,
+            "__qualname__": reader_class.__qualname__,
+        },
+    )
+
+
+def wrap_readers(signal_definition: SignalDefinition, reader_class: Type["DelegatingReader"]) -> SignalDefinition:
+    """Route every file extension of a signal definition instance through reader_class, keeping the current readers"""
+    current: Dict[str, type] = dict(getattr(signal_definition, "_extension_map", None) or {})
+    signal_definition._extension_map = {
+        extension: _delegating_class(reader_class, original_class) for extension, original_class in current.items()
+    }
+    return signal_definition
+
+
+def is_wrapped(signal_definition: SignalDefinition, reader_class: Type["DelegatingReader"]) -> bool:
+    """True if a file extension of the signal definition instance is read through reader_class"""
+    extension_map = getattr(signal_definition, "_extension_map", None) or {}
+    return any(isinstance(cls, type) and issubclass(cls, reader_class) for cls in extension_map.values())
+
+
+class DelegatingReader(IReader, ISignalReader):
+    """
+    Reader handing every call to the reader the signal definition originally maps the file extension to.
+
+    Subclasses override ``read_signals`` to serve the signals another way; the original reader is only opened when
+    it is actually needed. ``wrap_readers`` sets the original reader class.
+    """
+
+    original_class: type = None
+
+    def __init__(self, filename, signal_definition: SignalDefinition, **kwargs):
+        """Create the original reader, it is not opened yet"""
+        super().__init__(**kwargs)
+        self.filename = filename
+        self.file_path = recording_path(filename)
+        self._defs = signal_definition
+        self._kwargs = kwargs
+        self._reader = self.original_class(filename, signal_definition, **kwargs)
+        self._open_args = None
+        self._opened = False
+        self._signals = None
+
+    @property
+    def file_extensions(self) -> List[str]:
+        """File extensions of the original reader."""
+        return self._reader.file_extensions
+
+    def open(self, *args, **kwargs):
+        """Remember the arguments, the original reader is opened on first use."""
+        self._open_args = (args, kwargs)
+
+    def close(self):
+        """Close the original reader if it was opened."""
+        if self._opened:
+            self._reader.close()
+            self._opened = False
+
+    @property
+    def artifacts(self):
+        """Artifacts of the original reader."""
+        return self._reader.artifacts
+
+    def original_reader(self):
+        """The original reader, opened"""
+        if not self._opened:
+            args, kwargs = self._open_args or ((), {})
+            self._reader.open(*args, **kwargs)
+            self._opened = True
+        return self._reader
+
+    def read_with(self, signal_definition: SignalDefinition) -> SignalDataFrame:
+        """Signals of another signal definition read from the same recording by a new original reader"""
+        reader = self.original_class(self.filename, signal_definition, **self._kwargs)
+        args, kwargs = self._open_args or ((), {})
+        reader.open(*args, **kwargs)
+        try:
+            return reader.signals
+        finally:
+            reader.close()
+
+    def read_signals(self) -> SignalDataFrame:
+        """Signals of the signal definition, read by the original reader"""
+        return self.original_reader().signals
+
+    @property
+    def signals(self) -> SignalDataFrame:
+        """Signals of the signal definition, read once."""
+        if self._signals is None:
+            self._signals = self.read_signals()
+        return self._signals
+
+    def signal_data(self, items: List[str]) -> Dict:
+        """Fetch list of signals in single call."""
+        return {item: self.signals[item].values for item in items}
+
+    def __getitem__(self, item):
+        """Expose the signal df."""
+        return self.signals[item]
+
+    def __getattr__(self, name):
+        """Everything else is taken from the original reader."""
+        if name == "_reader":
+            raise AttributeError(name)
+        return getattr(self._reader, name)
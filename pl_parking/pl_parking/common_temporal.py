@@ -0,0 +1,143 @@
+"""
+Duration qualified temporal conditions on timestamp indexed boolean series.
+
+Operators take boolean ``pd.Series`` whose index is the time base (seconds, microseconds, sample clock...) and
+return boolean series on the same index, so they compose with ``&``, ``|``, ``~`` and with each other:
+
+    held = holds_for(reached_status > 0, 0.8)
+    ok = always_between(abs(lat_dist) < lat_max, 0, 2.0) | ~held
+
+Analysis helpers turn a series into satisfying intervals (run-length encoding) or the position of the first
+violation. All operators are O(N) scans (window bounds use one searchsorted on the sorted time base).
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TOLERANCE = 1e-6  # duration comparisons tolerate float accumulation of the time base
+
+
+def _values(condition: pd.Series) -> np.ndarray:
+    return condition.to_numpy(dtype=bool)
+
+
+def _time(condition: pd.Series) -> np.ndarray:
+    return condition.index.to_numpy(dtype=float)
+
+
+def _next_position(mask: np.ndarray) -> np.ndarray:
+    """Smallest j >= i with mask[j], len(mask) if there is none"""
+    positions = np.where(mask, np.arange(len(mask)), len(mask))
+    return np.minimum.accumulate(positions[::-1])[::-1]
+
+
+def _previous_position(mask: np.ndarray) -> np.ndarray:
+    """Largest j <= i with mask[j], -1 if there is none"""
+    return np.maximum.accumulate(np.where(mask, np.arange(len(mask)), -1))
+
+
+def _window_positions(time: np.ndarray, lower: float, upper: float) -> Tuple[np.ndarray, np.ndarray]:
+    """First and one past last sample position inside [t + lower, t + upper] for every sample time t"""
+    first = np.searchsorted(time, time + lower, side="left")
+    stop = np.searchsorted(time, time + upper, side="right")
+    return first, stop
+
+
+@dataclass
+class Intervals:
+    """Runs of consecutive True samples, start and end are inclusive sample positions"""
+
+    index: pd.Index
+    starts: np.ndarray
+    ends: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Time from the first to the last sample of every run"""
+        time = self.index.to_numpy(dtype=float)
+        return time[self.ends] - time[self.starts]
+
+    def at_least(self, duration: float, tolerance: float = DEFAULT_TOLERANCE) -> "Intervals":
+        """Runs lasting at least duration"""
+        keep = self.durations >= duration - tolerance
+        return Intervals(self.index, self.starts[keep], self.ends[keep])
+
+    def first_start(self) -> Optional[int]:
+        """Position of the first sample of the first run, None if there is no run"""
+        return int(self.starts[0]) if len(self) else None
+
+    def to_list(self) -> List[Tuple]:
+        """(start, end) index labels of every run"""
+        return list(zip(self.index[self.starts], self.index[self.ends]))
+
+
+def intervals(condition: pd.Series) -> Intervals:
+    """Run-length encode the samples where the condition holds."""
+    values = _values(condition)
+    edges = np.diff(np.concatenate(([False], values, [False])).astype(np.int8))
+    return Intervals(condition.index, np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1)
+
+
+def first_true(condition: pd.Series) -> Optional[int]:
+    """Position of the first sample where the condition holds, None if it never holds"""
+    values = _values(condition)
+    return int(np.argmax(values)) if values.any() else None
+
+
+def last_true(condition: pd.Series) -> Optional[int]:
+    """Position of the last sample where the condition holds, None if it never holds"""
+    values = _values(condition)
+    return int(len(values) - 1 - np.argmax(values[::-1])) if values.any() else None
+
+
+def first_violation(condition: pd.Series) -> Optional[int]:
+    """Position of the first sample where the condition does not hold, None if it always holds"""
+    return first_true(~condition.astype(bool))
+
+
+def holds_for(condition: pd.Series, duration: float, tolerance: float = DEFAULT_TOLERANCE) -> pd.Series:
+    """True from the moment the condition has held without interruption for at least duration"""
+    values = _values(condition)
+    time = _time(condition)
+    run_start = _previous_position(~values) + 1
+    held = values & (time - time[np.minimum(run_start, len(values) - 1)] >= duration - tolerance)
+    return pd.Series(held, index=condition.index)
+
+
+def eventually_within(condition: pd.Series, window: float, lower: float = 0.0) -> pd.Series:
+    """True at t if the condition holds at some sample in [t + lower, t + window]"""
+    values = _values(condition)
+    first, stop = _window_positions(_time(condition), lower, window)
+    next_true = np.append(_next_position(values), len(values))
+    return pd.Series(next_true[first] < stop, index=condition.index)
+
+
+def always_between(condition: pd.Series, lower: float, upper: float) -> pd.Series:
+    """True at t if the condition holds at every sample in [t + lower, t + upper] (also if there is none)"""
+    values = _values(condition)
+    first, stop = _window_positions(_time(condition), lower, upper)
+    next_false = np.append(_next_position(~values), len(values))
+    return pd.Series(next_false[first] >= stop, index=condition.index)
+
+
+def until(hold: pd.Series, release: pd.Series) -> pd.Series:
+    """True at t if release holds at some sample t' >= t and hold holds at every sample in [t, t')"""
+    next_release = _next_position(_values(release))
+    next_break = _next_position(~_values(hold))
+    return pd.Series((next_release < len(next_release)) & (next_release <= next_break), index=hold.index)
+
+
+def eventually(condition: pd.Series) -> bool:
+    """True if the condition holds at some sample"""
+    return bool(_values(condition).any())
+
+
+def always(condition: pd.Series) -> bool:
+    """True if the condition holds at every sample"""
+    return bool(_values(condition).all())
@@ -0,0 +1,46 @@
+"""Array blocks of flat and array column groups."""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pl_parking.common_array_signals import ArraySignalGroup, array_block, column_block
+
+POSE_IDS = ArraySignalGroup("poseId{i}", ".targetPosesPort.targetPoses_{i}.pose_ID", 4)
+
+
+def test_flat_group_block():
+    """Flat columns in index order, unavailable elements NaN."""
+    df = pd.DataFrame({"poseId2": [5, 6], "poseId0": [1, 2], "other": [0, 0]})
+    block = array_block(df, POSE_IDS)
+    assert block.flags["C_CONTIGUOUS"] and block.dtype == np.float64
+    np.testing.assert_array_equal(block, [[1, np.nan, 5, np.nan], [2, np.nan, 6, np.nan]])
+    assert array_block(df, ArraySignalGroup("poseId{i}", "", 3, dtype="float32")).dtype == np.float32
+    with pytest.raises(KeyError):
+        array_block(df, ArraySignalGroup("missing{i}", "", 2))
+
+
+def test_array_group_block():
+    """Array columns are read by column_block."""
+    df = pd.DataFrame(np.arange(6).reshape(2, 3), columns=pd.MultiIndex.from_product([["ids"], range(3)]))
+    group = ArraySignalGroup("ids", ".ids[{i}]", 4)
+    np.testing.assert_array_equal(array_block(df, group), column_block(df, "ids", 4))
+    np.testing.assert_array_equal(array_block(df, group)[:, 3], [np.nan, np.nan])
+
+
+def test_duplicate_pose_ids():
+    """Sorted block of the valid poses finds the duplicates the former per frame Counter found."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"poseId{i}": rng.integers(0, 6, 500) for i in range(4)})
+    num_valid_poses = pd.Series(rng.integers(0, 5, 500))
+
+    expected = [
+        any(count > 1 for count in Counter(df[f"poseId{pose}"].iloc[idx] for pose in range(n)).values())
+        for idx, n in enumerate(num_valid_poses)
+    ]
+    pose_ids = array_block(df, POSE_IDS)
+    valid_ids = np.where(np.arange(pose_ids.shape[1]) < num_valid_poses.to_numpy()[:, None], pose_ids, np.nan)
+    valid_ids.sort(axis=1)
+    assert ((valid_ids[:, 1:] == valid_ids[:, :-1]).any(axis=1) == expected).all()
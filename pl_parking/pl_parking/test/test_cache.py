@@ -0,0 +1,28 @@
+"""Tables of the local cache read back as they were built."""
+
+import numpy as np
+import pandas as pd
+
+from pl_parking import common_cache
+
+
+def build_tables():
+    """Tables with column labels Parquet cannot store as they are"""
+    return {
+        "flat": pd.DataFrame({0: [1.0, 2.0], "name": ["a", "b"], 2.5: [True, False]}),
+        "array": pd.DataFrame(
+            np.arange(6).reshape(2, 3), columns=pd.MultiIndex.from_tuples([("ids", 0), ("ids", 1), ("x", "")])
+        ),
+    }
+
+
+def test_warm_read_equals_cold_build(tmp_path, monkeypatch):
+    """Column labels, values and dtypes of a cached table do not depend on the cache being warm."""
+    monkeypatch.setenv(common_cache.CACHE_ENV_VAR, str(tmp_path))
+    cold = common_cache.load_or_build_tables("tables", "key", build_tables)
+    warm = common_cache.load_or_build_tables("tables", "key", lambda: {})
+    assert cold.keys() == warm.keys()
+    for name, table in build_tables().items():
+        pd.testing.assert_frame_equal(cold[name], table)
+        pd.testing.assert_frame_equal(warm[name], table)
+    assert not list(tmp_path.rglob("*.tmp"))
@@ -0,0 +1,87 @@
+"""Chunked reading of MDF recordings compared with the full decode."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from asammdf import MDF, Signal
+from tsf.io.mdf import MDFSignalDefinition
+
+from pl_parking.common_mdf_streaming import (
+    US_PER_SECOND,
+    ChangePointRecorder,
+    DelayedReactionStateMachine,
+    MdfChunkReader,
+    report_missing_signals,
+)
+
+CHANNELS = {"state": "Fast.state", "speed": "Fast.speed", "door": "Slow.door"}
+
+
+class RecordingSignals(MDFSignalDefinition):
+    """Columns of the synthetic recording"""
+
+    def __init__(self, properties=None):
+        """Map the columns to the channels of the synthetic recording."""
+        super().__init__()
+        self._properties = dict(CHANNELS if properties is None else properties)
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    """Recording with two channel groups at different rates, so the time base is the union of their timestamps"""
+    fast = np.arange(0, 60, 0.01)
+    slow = np.arange(0.005, 60, 0.033)
+    mdf = MDF(version="4.10")
+    mdf.append(
+        [Signal((fast > 10).astype("uint8"), fast, name="Fast.state"), Signal(np.sin(fast), fast, name="Fast.speed")]
+    )
+    mdf.append([Signal(((slow > 25) & (slow < 40)).astype("uint8"), slow, name="Slow.door")])
+    file_path = tmp_path_factory.mktemp("mdf") / "recording.mf4"
+    mdf.save(file_path)
+    mdf.close()
+    return str(file_path)
+
+
+def full_frame(file_path):
+    """Complete decode of the recording, renamed and indexed like the chunks"""
+    with MDF(file_path) as mdf:
+        frame = mdf.to_dataframe(channels=list(CHANNELS.values()), time_from_zero=False)
+    frame = frame.rename(columns={channel: column for column, channel in CHANNELS.items()})
+    frame.index = (frame.index.to_numpy() * US_PER_SECOND).round().astype("int64")
+    return frame
+
+
+def test_chunks_equal_full_decode(recording):
+    """The chunks put together are the full decode on the union time base."""
+    chunks = list(MdfChunkReader(recording, RecordingSignals(), chunk_ram_size=20000))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks), full_frame(recording))
+
+
+def test_state_machine_on_chunks_and_full_frame(recording):
+    """Verdict and recorded change points do not depend on the chunking."""
+
+    def evaluate(source):
+        recorder = ChangePointRecorder(["state", "door", "speed"], continuous=["speed"])
+        machine = DelayedReactionStateMachine(lambda s: s.state == 1, lambda s: s.door == 1, delay=2.0)
+        machine.run(source, [recorder])
+        return machine, recorder
+
+    streamed, streamed_recorder = evaluate(MdfChunkReader(recording, RecordingSignals(), chunk_ram_size=20000))
+    loaded, loaded_recorder = evaluate(full_frame(recording))
+
+    assert streamed.reaction is not None
+    assert (streamed.activation_time, streamed.trigger_time) == (loaded.activation_time, loaded.trigger_time)
+    assert streamed.reaction == loaded.reaction
+    for column in ["state", "door", "speed"]:
+        assert streamed_recorder.series(column) == loaded_recorder.series(column)
+
+
+def test_missing_channels(recording):
+    """Columns without a channel in the recording are reported instead of failing on the first sample."""
+    reader = MdfChunkReader(recording, RecordingSignals({**CHANNELS, "belt": ["Belt.state", "Belt.state2"]}))
+    assert reader.missing_columns() == ["belt"]
+    with pytest.raises(KeyError):
+        next(iter(reader))
+    assert MdfChunkReader(recording, RecordingSignals()).missing_columns() == []
+    assert not report_missing_signals(object(), full_frame(recording))
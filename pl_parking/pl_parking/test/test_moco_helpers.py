@@ -0,0 +1,65 @@
+"""Planned trajectories read from MOCO CSV exports."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pl_parking.PLP.MF.MOCO import helpers
+
+OBSERVED_SIGNALS = os.path.join(os.path.dirname(helpers.__file__), "observed_signals.yaml")
+
+
+def write_export(path, rows, seed):
+    """CSV export with every observed signal and some other columns, point ids as integers"""
+    rng = np.random.default_rng(seed)
+    columns = helpers.observed_columns(OBSERVED_SIGNALS)
+    export = {"timestamp": np.arange(rows), "unobserved": rng.normal(size=rows)}
+    for name in columns:
+        export[name] = rng.normal(size=rows) if "crvRAReq" not in name else rng.integers(0, 5, rows)
+    pd.DataFrame(export).to_csv(path, index=False)
+    return path
+
+
+def expected(csv_files):
+    """Observed columns of the exports read completely by pandas"""
+    columns = helpers.observed_columns(OBSERVED_SIGNALS)
+    return pd.concat(
+        [pd.read_csv(path)[list(columns)].rename(columns=columns) for path in csv_files], ignore_index=True
+    )
+
+
+@pytest.fixture
+def exports(tmp_path, monkeypatch):
+    """Three exports of different length, with an empty cache"""
+    monkeypatch.setenv("PL_PARKING_CACHE_DIR", str(tmp_path / "cache"))
+    return [write_export(tmp_path / f"trajectory_{seed}.csv", 50 + 30 * seed, seed) for seed in range(3)]
+
+
+@pytest.mark.parametrize("pyarrow_engine", [True, False])
+def test_single_export(exports, monkeypatch, pyarrow_engine):
+    """One export: observed columns only, renamed, in yaml order, with the dtypes pandas infers."""
+    if pyarrow_engine and not helpers.PYARROW_CSV_ENGINE:
+        pytest.skip("pyarrow is not installed")
+    monkeypatch.setattr(helpers, "PYARROW_CSV_ENGINE", pyarrow_engine)
+    df = helpers.read_data_from_multiples_trajectories(OBSERVED_SIGNALS, exports[0])
+    pd.testing.assert_frame_equal(df, expected(exports[:1]))
+    assert df["crvRAReq_1pm_0"].dtype == np.int64
+
+
+def test_several_exports(exports):
+    """Several exports are concatenated in the given order, a second read comes from the cache."""
+    cold = helpers.read_data_from_multiples_trajectories(OBSERVED_SIGNALS, exports)
+    warm = helpers.read_data_from_multiples_trajectories(OBSERVED_SIGNALS, exports)
+    pd.testing.assert_frame_equal(cold, expected(exports))
+    pd.testing.assert_frame_equal(warm, cold)
+
+
+def test_missing_observed_signal(tmp_path, monkeypatch):
+    """An export without an observed signal is rejected."""
+    monkeypatch.setenv("PL_PARKING_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "incomplete.csv"
+    pd.DataFrame({"timestamp": [0, 1]}).to_csv(path, index=False)
+    with pytest.raises(KeyError):
+        helpers.read_data_from_multiples_trajectories(OBSERVED_SIGNALS, path)
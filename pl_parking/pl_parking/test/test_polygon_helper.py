@@ -0,0 +1,119 @@
+"""Property-based tests of the batched polygon kernels against the per polygon functions, and their benchmark."""
+
+import time
+
+import numpy as np
+import pytest
+from hypothesis import assume, given
+from hypothesis import strategies as st
+from shapely.geometry import LineString, MultiPoint, Polygon
+from shapely.geometry.polygon import orient
+
+from pl_parking.PLP.CEM import polygon_helper
+
+coordinates = st.floats(min_value=-50, max_value=50, allow_nan=False, allow_infinity=False)
+points = st.tuples(coordinates, coordinates)
+vertex_lists = st.lists(points, min_size=3, max_size=10)
+
+
+def counterclockwise_hull(vertices):
+    """Vertices of the convex hull in counterclockwise order, None if it is degenerate"""
+    hull = MultiPoint(vertices).convex_hull
+    if not isinstance(hull, Polygon) or hull.area < 1e-3:
+        return None
+    return np.asarray(orient(hull).exterior.coords)[:-1]
+
+
+def min_edge_distance(point, vertices):
+    """Distance of a point from the boundary of a polygon"""
+    return min(
+        polygon_helper.dist_of_point_from_edge(point, vertices[i], vertices[(i + 1) % len(vertices)])
+        for i in range(len(vertices))
+    )
+
+
+@given(st.lists(vertex_lists, min_size=1, max_size=5))
+def test_are_polygons_convex_matches_is_polygon_convex(vertex_lists):
+    """Batched convexity and vertex order decisions equal the per polygon functions"""
+    polygons, counts = polygon_helper.pad_polygons(vertex_lists)
+    vertex_arrays = [np.asarray(vertices, dtype=float) for vertices in vertex_lists]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        convex = [polygon_helper.is_polygon_convex(vertices) for vertices in vertex_arrays]
+        counterclockwise = [
+            polygon_helper.is_vertex_order_counterclockwise_assuming_convex(vertices) for vertices in vertex_arrays
+        ]
+    assert polygon_helper.are_polygons_convex(polygons, counts).tolist() == convex
+    assert polygon_helper.are_vertex_orders_counterclockwise_assuming_convex(polygons, counts).tolist() == (
+        counterclockwise
+    )
+
+
+@given(vertex_lists, st.lists(points, min_size=1, max_size=20))
+def test_points_in_polygons_matches_is_inside_polygon(vertices, query_points):
+    """Winding number inside test equals the half-plane test for convex counterclockwise polygons, in either order"""
+    hull = counterclockwise_hull(vertices)
+    assume(hull is not None)
+    query_points = np.asarray(query_points, dtype=float)
+    # points on the boundary are decided differently within floating point accuracy
+    assume(all(min_edge_distance(point, hull) > 1e-6 for point in query_points))
+    polygons, _ = polygon_helper.pad_polygons([hull, hull[::-1]])
+    inside = polygon_helper.points_in_polygons(query_points, polygons)
+    expected = [polygon_helper.is_inside_polygon(point, hull) for point in query_points]
+    assert inside[:, 0].tolist() == expected
+    assert inside[:, 1].tolist() == expected
+
+
+@given(vertex_lists, st.lists(points, min_size=1, max_size=20))
+def test_distances_from_polygons_matches_dist_of_point_from_polygon(vertices, query_points):
+    """Batched point to polygon distances equal the per polygon function for convex counterclockwise polygons"""
+    hull = counterclockwise_hull(vertices)
+    assume(hull is not None)
+    query_points = np.asarray(query_points, dtype=float)
+    polygons, counts = polygon_helper.pad_polygons([hull])
+    distances = polygon_helper.distances_from_polygons(query_points, polygons, counts)[:, 0]
+    expected = [polygon_helper.dist_of_point_from_polygon(point, hull) for point in query_points]
+    np.testing.assert_allclose(distances, expected, atol=1e-9)
+
+
+@given(vertex_lists)
+def test_signed_areas_and_orientations(vertices):
+    """Shoelace areas equal the shapely area, with the sign of the vertex order"""
+    hull = counterclockwise_hull(vertices)
+    assume(hull is not None)
+    polygons, _ = polygon_helper.pad_polygons([hull, hull[::-1]])
+    area = Polygon(hull).area
+    np.testing.assert_allclose(polygon_helper.signed_areas(polygons), [area, -area], rtol=1e-9)
+    assert polygon_helper.orientations(polygons).tolist() == [1, -1]
+
+
+@given(points, points, points, points)
+def test_segments_intersect_matches_shapely(p1, p2, q1, q2):
+    """Segment intersection, touching and collinear overlap included, equals shapely for non degenerate segments"""
+    assume(p1 != p2 and q1 != q2)
+    first, second = LineString([p1, p2]), LineString([q1, q2])
+    # near misses are decided within floating point accuracy and left out
+    assume(first.intersects(second) or first.distance(second) > 1e-9)
+    assert bool(polygon_helper.segments_intersect(p1, p2, q1, q2)) == first.intersects(second)
+
+
+@pytest.mark.benchmark
+def test_points_in_polygons_throughput():
+    """1e5 points x 100 polygons of 8 vertices: batched winding numbers against the per point half-plane test"""
+    rng = np.random.default_rng(0)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, size=(100, 8)), axis=1)
+    radii = rng.uniform(1, 5, size=(100, 1))
+    centers = rng.uniform(-20, 20, size=(100, 1, 2))
+    polygons = centers + radii[..., None] * np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+    query_points = rng.uniform(-25, 25, size=(100_000, 2))
+
+    start = time.perf_counter()
+    inside = polygon_helper.points_in_polygons(query_points, polygons)
+    batched = inside.size / (time.perf_counter() - start)
+
+    sample = query_points[:200]
+    start = time.perf_counter()
+    expected = [[polygon_helper.is_inside_polygon(point, polygon) for polygon in polygons] for point in sample]
+    scalar = len(sample) * len(polygons) / (time.perf_counter() - start)
+
+    assert inside[: len(sample)].tolist() == expected
+    print(f"points_in_polygons: {batched:.3g} tests/s, is_inside_polygon: {scalar:.3g} tests/s")
@@ -0,0 +1,64 @@
+"""Randomized comparison of the batched rectangle fit with the brute force search of the slot offer KPI."""
+
+import numpy as np
+import pytest
+from shapely.affinity import rotate
+from shapely.geometry import MultiPoint, Polygon
+
+from pl_parking.PLP.MF.SI.rectangle_fit import fit_rectangles, fits_on_angle_grid, pad_polygons
+
+
+def brute_force_fit(polygon, x, y, width, length, step_angle=1):
+    """Former check_rectangle_fit: rotate a shapely rectangle in steps and test polygon.contains"""
+    rectangle = Polygon(
+        [
+            (x - length / 2, y - width / 2),
+            (x + length / 2, y - width / 2),
+            (x + length / 2, y + width / 2),
+            (x - length / 2, y + width / 2),
+        ]
+    )
+    return [
+        angle for angle in range(0, 180, step_angle) if polygon.contains(rotate(rectangle, angle, origin="centroid"))
+    ]
+
+
+def random_slots(seed, count):
+    """Convex hulls of random points around the origin with a center inside and a rectangle of about slot size"""
+    rng = np.random.default_rng(seed)
+    slots = []
+    while len(slots) < count:
+        points = rng.normal(scale=rng.uniform(1, 4, size=2), size=(rng.integers(3, 12), 2))
+        polygon = MultiPoint(points).convex_hull
+        if not isinstance(polygon, Polygon) or polygon.area < 1e-3:
+            continue
+        center = polygon.centroid
+        x, y = center.x + rng.uniform(-0.3, 0.3), center.y + rng.uniform(-0.3, 0.3)
+        width, length = rng.uniform(0.5, 3), rng.uniform(1, 6)
+        slots.append((polygon, (x, y), width, length))
+    return slots
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fits_on_angle_grid_matches_brute_force(seed):
+    """Same decision as the brute force search, its fitting angles are within the exact intervals"""
+    slots = random_slots(seed, 200)
+    vertices, counts = pad_polygons([np.asarray(polygon.exterior.coords)[:-1] for polygon, *_ in slots])
+    centers = [center for _, center, *_ in slots]
+    widths = np.array([width for *_, width, _ in slots])
+    lengths = np.array([length for *_, length in slots])
+
+    fits, interval = fits_on_angle_grid(vertices, counts, centers, widths, lengths)
+    exact = fit_rectangles(vertices, counts, centers, widths, lengths)
+
+    for slot, (polygon, (x, y), width, length) in enumerate(slots):
+        angles = brute_force_fit(polygon, x, y, width, length)
+        assert fits[slot] == bool(angles)
+        # every fitting grid angle lies in one of the exact feasible intervals
+        for angle in angles:
+            assert any(start - 1e-6 <= angle <= end + 1e-6 for start, end in exact.intervals[slot])
+        if exact.fits[slot]:
+            assert 0 <= interval[slot, 0] <= interval[slot, 1] <= 180
+        else:
+            assert np.isnan(interval[slot]).all()
+    assert 0 < fits.sum() < len(slots)
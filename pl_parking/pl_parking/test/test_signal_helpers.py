@@ -0,0 +1,241 @@
+"""Vectorized signal helpers of common_ft_helper compared with the former per sample loops, and their benchmark."""
+
+import math
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from pl_parking.common_ft_helper import (
+    HilClFuntions,
+    highlight_segments,
+    mask_intervals,
+    round_signal,
+    run_length_encode,
+)
+
+BENCHMARK_SAMPLES = 1_000_000
+
+
+def loop_rising_edge(input_signal, round_legnt):
+    """Former HilClFuntions.RisingEdge"""
+    previous_value = None
+    collected_idx = []
+
+    for cnt in range(0, len(input_signal)):
+        if cnt == 0:
+            previous_value = round(input_signal[cnt], round_legnt)
+            continue
+
+        if previous_value < round(input_signal[cnt], round_legnt):
+            collected_idx.append(cnt)
+            previous_value = round(input_signal[cnt], round_legnt)
+
+        else:
+            previous_value = round(input_signal[cnt], round_legnt)
+    return collected_idx
+
+
+def loop_falling_edge(input_signal, round_legnt):
+    """Former HilClFuntions.FallingEdge"""
+    previous_value = None
+    collected_idx = []
+
+    for cnt in range(0, len(input_signal)):
+        if cnt == 0:
+            previous_value = round(input_signal[cnt], round_legnt)
+            continue
+
+        if previous_value > round(input_signal[cnt], round_legnt):
+            collected_idx.append(cnt)
+            previous_value = round(input_signal[cnt], round_legnt)
+
+        else:
+            previous_value = round(input_signal[cnt], round_legnt)
+
+    return collected_idx
+
+
+def loop_states(input_signal, t_start_idx, t_end_idx, round_legnt):
+    """Former HilClFuntions.States"""
+    previous_value = None
+    collected_states = {}
+
+    for cnt in range(t_start_idx, t_end_idx):
+        if previous_value != round(input_signal[cnt], round_legnt):
+            previous_value = round(input_signal[cnt], round_legnt)
+            collected_states.update({cnt: round(input_signal[cnt], round_legnt)})
+
+    return collected_states
+
+
+def loop_highlight_segments(fig, signal, state, time, fillcolor, annotation_text):
+    """Former highlight_segments"""
+    scanning = []
+    start_scan = None
+    for idx in range(len(signal)):
+        if signal.iat[idx] == state:
+            if start_scan is None:
+                start_scan = time.iat[idx]
+            end = time.iat[idx]
+        else:
+            if start_scan is not None:
+                scanning.append([start_scan, end])
+                start_scan = None
+    if start_scan is not None:
+        scanning.append([start_scan, end])
+
+    for segment in scanning:
+        fig.add_vrect(
+            x0=segment[0],
+            x1=segment[1],
+            fillcolor=fillcolor,
+            line_width=0,
+            opacity=0.5,
+            annotation_text=annotation_text,
+            layer="below",
+        )
+
+
+def loop_run_length_encode(values):
+    """Runs of equal samples, one sample at a time"""
+    starts, ends, run_values = [], [], []
+    for idx, value in enumerate(values):
+        if idx == 0 or value != values[idx - 1]:
+            if starts:
+                ends.append(idx - 1)
+            starts.append(idx)
+            run_values.append(value)
+    if starts:
+        ends.append(len(values) - 1)
+    return starts, ends, run_values
+
+
+def loop_mask_intervals(mask):
+    """Runs of True samples, one sample at a time"""
+    starts, ends = [], []
+    for idx, value in enumerate(mask):
+        if value and (idx == 0 or not mask[idx - 1]):
+            starts.append(idx)
+        if value and (idx == len(mask) - 1 or not mask[idx + 1]):
+            ends.append(idx)
+    return starts, ends
+
+
+def state_signal(samples, seed, states=5, run=20):
+    """Float signal of random states held for random numbers of samples, with some noise below the rounding"""
+    rng = np.random.default_rng(seed)
+    values = np.repeat(rng.integers(0, states, samples // run + 1), run)[:samples].astype(float)
+    values[rng.random(samples) < 0.05] += 1e-4
+    return values
+
+
+def same_values(actual, expected):
+    """Element-wise equality, NaN equal to NaN"""
+    return len(actual) == len(expected) and all(
+        a == e or (isinstance(a, float) and isinstance(e, float) and math.isnan(a) and math.isnan(e))
+        for a, e in zip(actual, expected)
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("container", [list, np.asarray, pd.Series])
+def test_round_signal(seed, container):
+    """round_signal rounds every sample like round() does on it, also near halves."""
+    rng = np.random.default_rng(seed)
+    values = np.concatenate((rng.uniform(-10, 10, 2000), np.round(rng.uniform(-10, 10, 500), 3), [np.nan]))
+    signal = container(values.tolist() if container is list else values)
+    expected = [round(value, 2) for value in (signal if container is list else list(np.asarray(signal)))]
+    assert same_values(round_signal(signal, 2).tolist(), [float(value) for value in expected])
+    assert round_signal([True, False], 2).tolist() == [1, 0]
+    assert round_signal(np.arange(3), 2).dtype.kind == "i"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_run_length_encode_and_mask_intervals(seed):
+    """Runs of the vectorized helpers equal the runs found sample by sample, NaN samples are runs of their own."""
+    values = state_signal(3000, seed)
+    values[np.random.default_rng(seed).random(values.size) < 0.01] = np.nan
+    starts, ends, run_values = run_length_encode(values)
+    expected_starts, expected_ends, expected_values = loop_run_length_encode(values.tolist())
+    assert starts.tolist() == expected_starts and ends.tolist() == expected_ends
+    assert same_values(run_values.tolist(), expected_values)
+    assert [array.tolist() for array in run_length_encode([])] == [[], [], []]
+
+    mask = values > 2
+    assert [array.tolist() for array in mask_intervals(mask)] == list(loop_mask_intervals(mask.tolist()))
+    assert [array.tolist() for array in mask_intervals([])] == [[], []]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("container", [list, np.asarray, pd.Series])
+def test_edges_and_states(seed, container):
+    """RisingEdge, FallingEdge and States return what the former loops returned."""
+    values = state_signal(3000, seed)
+    signal = container(values.tolist() if container is list else values)
+    assert HilClFuntions.RisingEdge(signal, 2) == loop_rising_edge(signal, 2)
+    assert HilClFuntions.FallingEdge(signal, 2) == loop_falling_edge(signal, 2)
+    assert HilClFuntions.States(signal, 100, 2500, 2) == loop_states(signal, 100, 2500, 2)
+    assert HilClFuntions.States(signal, 0, len(values), 0) == loop_states(signal, 0, len(values), 0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_highlight_segments(seed):
+    """highlight_segments adds a rectangle for every interval the former loop found."""
+    signal = pd.Series(state_signal(2000, seed, run=50).round().astype(int))
+    time_signal = pd.Series(np.arange(signal.size) * 0.02 + 3)
+    assert highlighted(highlight_segments, signal, time_signal) == highlighted(
+        loop_highlight_segments, signal, time_signal
+    )
+
+
+def highlighted(function, signal, time_signal):
+    """Layout of a figure with the segments of state 2 highlighted by function"""
+    fig = go.Figure()
+    function(fig, signal, 2, time_signal, "red", "state 2")
+    return fig.layout.to_plotly_json()
+
+
+def timed(function):
+    """Result and duration of one call"""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+@pytest.mark.benchmark
+def test_signal_helpers_throughput():
+    """1e6 samples: vectorized helpers against the former loops, results compared"""
+    values = state_signal(BENCHMARK_SAMPLES, 0, run=2000)
+    series = pd.Series(values)
+    mask = values > 2
+    states = pd.Series(state_signal(BENCHMARK_SAMPLES, 1, run=50_000).round().astype(int))  # rectangles are slow
+    time_signal = pd.Series(np.arange(values.size, dtype=float))
+    cases = {
+        "round_signal": (lambda: round_signal(values, 2).tolist(), lambda: [round(v, 2) for v in values]),
+        "run_length_encode": (
+            lambda: tuple(array.tolist() for array in run_length_encode(values)),
+            lambda: loop_run_length_encode(values.tolist()),
+        ),
+        "mask_intervals": (
+            lambda: tuple(array.tolist() for array in mask_intervals(mask)),
+            lambda: loop_mask_intervals(mask.tolist()),
+        ),
+        "RisingEdge": (lambda: HilClFuntions.RisingEdge(series, 2), lambda: loop_rising_edge(series, 2)),
+        "FallingEdge": (lambda: HilClFuntions.FallingEdge(series, 2), lambda: loop_falling_edge(series, 2)),
+        "States": (
+            lambda: HilClFuntions.States(series, 0, values.size, 2),
+            lambda: loop_states(series, 0, values.size, 2),
+        ),
+        "highlight_segments": (
+            lambda: highlighted(highlight_segments, states, time_signal),
+            lambda: highlighted(loop_highlight_segments, states, time_signal),
+        ),
+    }
+    for name, (vectorized, loop) in cases.items():
+        result, vectorized_seconds = timed(vectorized)
+        expected, loop_seconds = timed(loop)
+        assert result == expected, name
+        print(f"{name}: {vectorized_seconds:.3f} s vectorized, {loop_seconds:.3f} s loop on {values.size} samples")
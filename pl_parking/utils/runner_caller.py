@@ -1,5 +1,8 @@
+import contextlib
+import functools
 import importlib
 import json as j5
+import time
 from datetime import datetime
 from hashlib import md5
 from os import remove
@@ -12,9 +15,15 @@ from tsf.db.processing_input import ProcessingInputSet
 from tsf.testbench import report
 from tsf.testbench import runner
 from tsf.testbench import trc_classic_runner
+from pl_parking.common_cache import combine_keys, file_fingerprint, load_object, store_object
+from pl_parking.common_ft_helper import figure_budget_report, figure_budget_violations
+from pl_parking.common_recording_session import recording_session_enabled, recording_sessions
+from pl_parking.common_report_render import render_metrics
 import sys
 import os
 
+RESULTS_NAMESPACE = "step_results"
+
 
 def create_database(payload, tmp_folder):
     try:
@@ -74,6 +83,176 @@ def create_database(payload, tmp_folder):
     return assignments, input_sets, sqlite_path
 
 
+def recording_fingerprints(payload):
+    """Content fingerprint of every selected recording by absolute path, unreadable recordings are left out."""
+    fingerprints = {}
+    for entry in payload["tableData"]:
+        try:
+            fingerprints[os.path.abspath(entry["bsig"])] = file_fingerprint(entry["bsig"])
+        except OSError as err:
+            print(f"Recording {entry['bsig']} could not be fingerprinted, its results are not reused: {err}")
+    return fingerprints
+
+
+def find_duplicate_recordings(payload, fingerprints):
+    """
+    Find the selected recordings whose content was already selected under another path.
+
+    Returns one report entry per copy, every recording stays scheduled and gets its own results.
+    """
+    kept = {}
+    duplicates = []
+    for entry in payload["tableData"]:
+        fingerprint = fingerprints.get(os.path.abspath(entry["bsig"]))
+        if fingerprint is None:
+            continue
+        if fingerprint not in kept:
+            kept[fingerprint] = entry["bsig"]
+            continue
+        duplicates.append(
+            {
+                "recording": entry["bsig"],
+                "same_content_as": kept[fingerprint],
+                "fingerprint": fingerprint,
+                "size_mb": round(os.path.getsize(entry["bsig"]) / 1024 / 1024, 1),
+            }
+        )
+    return duplicates
+
+
+def code_version():
+    """Key of the evaluation code, it changes whenever a python file of pl_parking changes."""
+    package = Path(importlib.import_module("pl_parking").__file__).parent
+    files = sorted(package.rglob("*.py"))
+    return combine_keys(*((file.relative_to(package), file.stat().st_mtime_ns, file.stat().st_size) for file in files))
+
+
+def _test_step_classes(testcase_class):
+    steps = testcase_class.test_steps
+    # test cases return a constant list of step classes from their test_steps property
+    return steps.fget(testcase_class) if isinstance(steps, property) else steps
+
+
+@contextlib.contextmanager
+def reusing_results(testcase_classes, fingerprints, reused):
+    """
+    Evaluate every test step once per recording content, also across runs.
+
+    While active, the steps of the given test cases store the measured result and details of their evaluations in the
+    cache, keyed by step, recording fingerprint and code version. Evaluating a step on the same content again, under
+    another path or in a later run, takes them over instead of processing again; every reuse is appended to reused.
+    The original process methods are restored on exit. Only the steps run in this process are wrapped, so this does
+    not apply with multiprocessing.
+    """
+    version = code_version() if fingerprints else None
+
+    def reusing(step_class, process):
+        step_name = f"{step_class.__module__}.{step_class.__qualname__}"
+
+        @functools.wraps(process)
+        def reusing_process(self, *args, **kwargs):
+            file_path = self.artifacts[0].file_path
+            fingerprint = fingerprints.get(os.path.abspath(file_path))
+            if fingerprint is None:
+                return process(self, *args, **kwargs)
+            key = combine_keys(step_name, fingerprint, version)
+            cached = load_object(RESULTS_NAMESPACE, key)
+            if cached is not None:
+                measured_result, details, seconds = cached
+                self.result.measured_result = measured_result
+                self.result.details.update(details)
+                if "file_name" in details:
+                    self.result.details["file_name"] = os.path.basename(file_path)
+                reused.append({"test_step": step_name, "recording": file_path, "processing_s": round(seconds, 3)})
+                return None
+            start = time.perf_counter()
+            outcome = process(self, *args, **kwargs)
+            seconds = time.perf_counter() - start
+            store_object(RESULTS_NAMESPACE, key, (self.result.measured_result, self.result.details, seconds))
+            return outcome
+
+        return reusing_process
+
+    originals = {}
+    for testcase_class in testcase_classes if fingerprints else []:
+        try:
+            step_classes = _test_step_classes(testcase_class)
+        except Exception as err:  # noqa: BLE001
+            print(f"Results not reused for {testcase_class.__name__}: {err}")
+            continue
+        for step_class in step_classes:
+            if step_class not in originals:
+                originals[step_class] = step_class.__dict__.get("process")
+                step_class.process = reusing(step_class, step_class.process)
+    try:
+        yield reused
+    finally:
+        for step_class, process in originals.items():
+            if process is None:
+                del step_class.process
+            else:
+                step_class.process = process
+
+
+def write_reuse_report(duplicates, reused, tmp_folder):
+    """Write the duplicate recordings and the reused test step results, print the processing time skipped."""
+    seconds = sum(result["processing_s"] for result in reused)
+    report_content = {
+        "reused_test_step_results": reused,
+        "skipped_processing_s": round(seconds, 1),
+        "duplicate_recordings": duplicates,
+    }
+    with open(os.path.join(tmp_folder, "reused_results.json"), "w") as report_file:
+        report_file.write(j5.dumps(report_content, indent=4))
+    print(
+        f"Reused {len(reused)} test step results, {seconds:.1f} s of processing skipped"
+        f" ({len(duplicates)} duplicate recordings selected)"
+    )
+
+
+def recording_testcases(payload, testcase_classes):
+    """Test case classes selected for every recording, testcase_classes maps the test case paths to their classes."""
+    recordings = {}
+    for entry in payload["tableData"]:
+        classes = [testcase_classes[path] for path in entry["functionalTest"] if path in testcase_classes]
+        recordings.setdefault(entry["bsig"], []).extend(classes)
+    return recordings
+
+
+def write_session_report(statistics, tmp_folder):
+    """Write the decode statistics of the recording sessions and print the number of saved decodes."""
+    with open(os.path.join(tmp_folder, "recording_sessions.json"), "w") as report_file:
+        report_file.write(j5.dumps([stats.as_dict() for stats in statistics], indent=4))
+    reads = sum(stats.reads for stats in statistics)
+    decodes = sum(stats.decodes for stats in statistics)
+    print(f"Recording sessions: {reads} signal reads served by {decodes} decodes, {reads - decodes} decodes saved")
+
+
+def write_figure_budget_report(report_folder):
+    """Write the figures the report rendered above the plotting budget, print how many there were."""
+    violations = figure_budget_violations()
+    with open(os.path.join(report_folder, "figure_budget.html"), "w") as report_file:
+        report_file.write(figure_budget_report(violations))
+    print(f"{len(violations)} report figures exceed the plotting budget, see figure_budget.html")
+
+
+def write_render_report(report_folder):
+    """Write the render times of the report templates and print the total."""
+    metrics = render_metrics()
+    report_content = {
+        name: {
+            "count": m.count,
+            "total_s": round(m.total_seconds, 3),
+            "mean_s": round(m.mean_seconds, 3),
+            "max_s": round(m.max_seconds, 3),
+        }
+        for name, m in metrics.items()
+    }
+    with open(os.path.join(report_folder, "render_times.json"), "w") as report_file:
+        report_file.write(j5.dumps(report_content, indent=4))
+    print(f"Report templates rendered in {sum(m.total_seconds for m in metrics.values()):.1f} s")
+
+
 def main():
     log_level_arg = []
     log_level_map = {
@@ -105,6 +284,12 @@ def main():
     use_multiprocessing = general_settings.get("useMultiprocessing", False)
     if "report_prefix" in data and data["report_prefix"]:
         report_path = functional_tab_data["reportPath"] + "/tsf_report_" + str(data["report_prefix"])
+    # step results are reused in this process only, the steps of a multiprocessing run are evaluated elsewhere
+    fingerprints = {}
+    duplicates = []
+    if general_settings.get("reuseDuplicateResults", True) and not use_multiprocessing:
+        fingerprints = recording_fingerprints(functional_tab_data)
+        duplicates = find_duplicate_recordings(functional_tab_data, fingerprints)
     dict_assignments, input_sets, sqlite_path = create_database(functional_tab_data, tmp_path)
 
     inputs = []
@@ -185,6 +370,7 @@ def main():
     if use_multiprocessing:
         runner_args.append("--multiprocessing")
     # import test case classes and update assignments
+    testcase_classes = []
     for tc_name in dict_assignments:
         p, m = tc_name.rsplit(".", 1)
         mod = importlib.import_module(p)
@@ -198,14 +384,33 @@ def main():
 
             met.assignments = []
             met.assignments.append(assignment)
+        testcase_classes.append(met)
+
+    # decode every recording once for all its test cases, only possible when the test cases run in this process
+    sessions = contextlib.nullcontext([])
+    if recording_session_enabled() and not use_multiprocessing:
+        sessions = recording_sessions(
+            recording_testcases(functional_tab_data, dict(zip(dict_assignments, testcase_classes)))
+        )
 
-    # call runner
-    if str_test_type == "tsf":
-        runner.main(runner_args)
-    else:
-        trc_classic_runner.main(*runner_args)
+    # call runner, steps already evaluated on the same recording content take over those results
+    reused = []
+    with sessions as session_statistics, reusing_results(testcase_classes, fingerprints, reused):
+        if str_test_type == "tsf":
+            runner.main(runner_args)
+        else:
+            trc_classic_runner.main(*runner_args)
+    if reused:
+        write_reuse_report(duplicates, reused, tmp_path)
+    if any(stats.reads for stats in session_statistics):
+        write_session_report(session_statistics, tmp_path)
 
     report.main(report_args)
+    # the report classes lint every figure they render
+    if figure_budget_violations():
+        write_figure_budget_report(report_path)
+    if render_metrics():
+        write_render_report(report_path)
 
 
 if __name__ == "__main__":